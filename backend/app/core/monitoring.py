@@ -1,7 +1,13 @@
 # backend/app/core/monitoring.py
-from prometheus_client import Counter, Gauge, generate_latest, CONTENT_TYPE_LATEST
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
 from prometheus_client import CollectorRegistry
 from prometheus_client import multiprocess
+from prometheus_client import start_http_server
 from starlette.responses import Response
 from starlette.applications import Starlette
 from starlette.routing import Route
@@ -17,8 +23,117 @@ trade_counter = Counter("vyra_trades_total", "Total trades executed", registry=r
 exec_latency = Gauge("vyra_execution_latency_seconds", "Order execution latency", registry=registry)
 current_equity = Gauge("vyra_current_equity", "Current equity snapshot", registry=registry)
 
-async def _metrics(request):
+# Signal pipeline stages. `target` is a bounded per-stage dimension: data source for
+# collect, strategy name for strategy_eval, AI provider for ai_filter; "all" otherwise.
+# Never a symbol - label cardinality would grow with the asset list.
+PIPELINE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+stage_latency = Histogram(
+    "vyra_signal_stage_seconds",
+    "Signal pipeline stage duration",
+    ["stage", "target"],
+    buckets=PIPELINE_BUCKETS,
+    registry=registry,
+)
+stage_errors = Counter(
+    "vyra_signal_stage_errors_total",
+    "Signal pipeline stage failures",
+    ["stage", "target"],
+    registry=registry,
+)
+cycle_latency = Histogram(
+    "vyra_signal_cycle_seconds",
+    "Full signal generator cycle duration",
+    buckets=PIPELINE_BUCKETS,
+    registry=registry,
+)
+signal_funnel = Counter(
+    "vyra_signal_funnel_total",
+    "Signals reaching each pipeline step (pattern_completed, filtered, ai_approved, sent)",
+    ["strategy", "step"],
+    registry=registry,
+)
+# Sharded signal generator: per-worker lag as seen by the coordinator
+shard_worker_lag = Gauge(
+    "vyra_shard_worker_lag_seconds",
+    "Dispatch-to-result time of the worker's last completed cycle",
+    ["worker"],
+    registry=registry,
+)
+shard_worker_behind = Gauge(
+    "vyra_shard_worker_cycles_behind",
+    "Cycles the worker was still busy with when the coordinator dispatched the latest one",
+    ["worker"],
+    registry=registry,
+)
+# Strategy execution budget (services/strategy_executor.py)
+strategy_budget_exceeded = Counter(
+    "vyra_strategy_budget_exceeded_total",
+    "Cycles in which a strategy ran out of its evaluation time budget",
+    ["strategy"],
+    registry=registry,
+)
+strategy_evals_skipped = Counter(
+    "vyra_strategy_evals_skipped_total",
+    "Symbol evaluations skipped because the strategy was out of budget or still busy",
+    ["strategy"],
+    registry=registry,
+)
+event_loop_lag = Histogram(
+    "vyra_event_loop_lag_seconds",
+    "How late the event loop woke a periodic timer (time the loop was blocked)",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    registry=registry,
+)
+# Event-driven signal generator (services/candle_events.py)
+candle_events = Counter(
+    "vyra_candle_events_total",
+    "Closed-candle triggers by source; coalesced = symbol already pending evaluation",
+    ["source", "outcome"],
+    registry=registry,
+)
+candle_trigger_latency = Histogram(
+    "vyra_candle_trigger_seconds",
+    "Time from a closed-candle trigger to its symbol's strategies having been evaluated",
+    buckets=PIPELINE_BUCKETS,
+    registry=registry,
+)
+
+
+@contextmanager
+def observe_stage(stage: str, target: str = "all") -> Iterator[None]:
+    """Time a pipeline stage; exceptions are counted and re-raised."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        stage_errors.labels(stage=stage, target=target).inc()
+        raise
+    finally:
+        stage_latency.labels(stage=stage, target=target).observe(time.perf_counter() - start)
+
+
+def record_funnel(strategy: str, step: str) -> None:
+    """Count one signal reaching a funnel step."""
+    signal_funnel.labels(strategy=strategy or "unknown", step=step).inc()
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    """Run until cancelled, observing how late each `interval` sleep wakes up in event_loop_lag."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        event_loop_lag.observe(max(0.0, loop.time() - start - interval))
+
+
+def start_metrics_server(port: int, addr: str = "127.0.0.1") -> None:
+    """Serve /metrics from a background thread (for processes without an ASGI app)."""
+    start_http_server(port, addr=addr, registry=registry)
+
+
+async def metrics_endpoint(request):
     data = generate_latest(registry)
     return Response(content=data, media_type=CONTENT_TYPE_LATEST)
 
-metrics_app = Starlette(routes=[Route("/metrics", _metrics)])
+metrics_app = Starlette(routes=[Route("/metrics", metrics_endpoint)])
@@ -15,6 +15,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from backend.app.core.config import settings
 from backend.app.core.logger import logger
 from backend.app.db.session import init_db 
+from backend.app.core.monitoring import metrics_endpoint
 
 # import routers
 from backend.app.api.v1 import auth as auth_router
@@ -149,6 +150,9 @@ def create_app() -> FastAPI:
     if signals_router is not None:
         app.include_router(signals_router.router, prefix="/api/v1", tags=["Signals"])
 
+    # Prometheus scrape endpoint (shares the registry used by the signal pipeline)
+    app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
     @app.get("/", tags=["Root"])
     async def root() -> dict:
         return {
@@ -1,6 +1,7 @@
 # backend/app/services/backtest/backtester.py
 import math
-from typing import List, Dict, Any, Callable, Optional
+from typing import List, Dict, Any, Callable, Optional, Tuple
+import numpy as np
 from backend.app.services.slippage import apply_slippage
 import statistics
 
@@ -11,6 +12,9 @@ class Backtester:
     - strategy_fn: callable(symbol, price_history) -> decision dict with {'action','size'(notional) optional}
     - initial_cash: starting cash
     - fee_pct: e.g., 0.002 for 0.2%
+
+    run() calls strategy_fn bar by bar; run_vectorized() takes precomputed entry/exit
+    arrays and produces the same trades and equity curve with NumPy array operations.
     """
 
     def __init__(self, prices: List[Dict[str,Any]], slippage_apply: Callable = apply_slippage, fee_pct: float = 0.002, symbol: str = "SYM"):
@@ -18,6 +22,7 @@ class Backtester:
         self.slippage_apply = slippage_apply
         self.fee_pct = fee_pct
         self.symbol = symbol
+        self._arrays: Optional[Tuple[np.ndarray, np.ndarray]] = None  # cached by price_arrays()
 
     def run(self, strategy_fn: Callable[[str, List[float]], Dict[str,Any]], initial_cash: float = 10000.0, risk_max_pct: float = 0.1) -> Dict[str,Any]:
         cash = initial_cash
@@ -115,3 +120,155 @@ class Backtester:
             "equity_curve": equity_curve,
             "trades": trades,
         }
+
+    # ------------------------------------------------------------------
+    # Vectorized mode
+    # ------------------------------------------------------------------
+
+    def price_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Close prices and the ADV proxy used by the slippage model (adv, else volume, else 1.0). Cached."""
+        if self._arrays is not None:
+            return self._arrays
+        n = len(self.prices)
+        closes = np.fromiter((float(bar["close"]) for bar in self.prices), dtype=np.float64, count=n)
+        adv = np.fromiter((float(bar.get("adv") or bar.get("volume") or 0.0) for bar in self.prices),
+                          dtype=np.float64, count=n)
+        adv[adv == 0.0] = 1.0
+        self._arrays = (closes, adv)
+        return self._arrays
+
+    def run_vectorized(self, entries, exits, initial_cash: float = 10000.0,
+                       risk_max_pct: float = 0.1) -> Dict[str, Any]:
+        """
+        Vectorized equivalent of run() for precomputed signals.
+
+        - entries/exits: boolean arrays, one per bar (a bar with both counts as an entry,
+          like a strategy_fn that returns "buy")
+        - positions are derived with a forward-fill of the last buy/sell action, so only
+          the (few) trades are visited in Python; the equity curve, returns, Sharpe and
+          drawdown are pure array operations
+        - trade sizing compounds on cash exactly like run(); if an entry would be skipped
+          (size <= 0 or not affordable after slippage and fees) the result falls back to
+          run() over the same actions so both modes always agree
+
+        Returns the same dict as run(). Trades and equity curve are identical; Sharpe
+        and return statistics agree to floating-point rounding (NumPy vs statistics sums).
+        """
+        closes, adv = self.price_arrays()
+        n = len(closes)
+        entries = np.asarray(entries, dtype=bool)
+        exits = np.asarray(exits, dtype=bool)
+        if entries.shape != (n,) or exits.shape != (n,):
+            raise ValueError(f"entries/exits must have shape ({n},)")
+        if n == 0:
+            return self._result(initial_cash, np.empty(0), [])
+
+        actions = np.where(entries, 1, np.where(exits, -1, 0)).astype(np.int8)
+
+        # Holding after bar t <=> the last non-zero action up to t was a buy
+        last_action_idx = np.maximum.accumulate(np.where(actions != 0, np.arange(n), 0))
+        holding = (actions[last_action_idx] == 1)
+        previous = np.concatenate(([False], holding[:-1]))
+        entry_bars = np.flatnonzero(holding & ~previous)
+        exit_bars = np.flatnonzero(~holding & previous)
+
+        cash_delta = np.zeros(n + 1)
+        cash_delta[0] = initial_cash
+        qty_delta = np.zeros(n)
+        trades: List[Dict[str, Any]] = []
+
+        cash = initial_cash
+        for k, t in enumerate(entry_bars):
+            t = int(t)
+            price = float(closes[t])
+            size_notional = cash * risk_max_pct
+            if size_notional <= 0:
+                return self._run_actions(actions, initial_cash, risk_max_pct)
+            qty = size_notional / price
+            fill_price = self.slippage_apply("buy", price, size_notional, float(adv[t]))
+            fee = size_notional * self.fee_pct
+            cost = qty * fill_price + fee
+            if cost > cash - 1e-8:
+                return self._run_actions(actions, initial_cash, risk_max_pct)
+            cash -= cost
+            cash_delta[t + 1] -= cost
+            qty_delta[t] += qty
+            entry_notional = qty * fill_price
+            trades.append({"type": "buy", "time": t, "price": fill_price, "qty": qty,
+                           "notional": entry_notional, "fee": fee, "reason": None})
+
+            if k < len(exit_bars):
+                x = int(exit_bars[k])
+                fill_price = self.slippage_apply("sell", float(closes[x]), entry_notional, float(adv[x]))
+                fee = qty * fill_price * self.fee_pct
+                proceeds = qty * fill_price - fee
+                cash += proceeds
+                cash_delta[x + 1] += proceeds
+                qty_delta[x] -= qty
+                trades.append({"type": "sell", "time": x, "price": fill_price, "qty": qty,
+                               "notional": qty * fill_price, "fee": fee,
+                               "pnl": proceeds - entry_notional, "reason": None})
+
+        # Same left-to-right accumulation order as the loop, so cash/qty match bit for bit
+        cash_series = np.cumsum(cash_delta)[1:]
+        qty_series = np.cumsum(qty_delta)
+        equity_curve = cash_series + np.where(qty_series != 0.0, qty_series * closes, 0.0)
+
+        # Close any open position at the last price (adds one equity point, like run())
+        if holding[-1]:
+            qty = trades[-1]["qty"]
+            entry_notional = trades[-1]["notional"]
+            fill_price = self.slippage_apply("sell", float(closes[-1]), entry_notional, float(adv[-1]))
+            fee = qty * fill_price * self.fee_pct
+            proceeds = qty * fill_price - fee
+            cash += proceeds
+            trades.append({"type": "sell_end", "time": n - 1, "price": fill_price, "qty": qty,
+                           "notional": qty * fill_price, "fee": fee, "pnl": proceeds - entry_notional})
+            equity_curve = np.append(equity_curve, cash)
+
+        return self._result(initial_cash, equity_curve, trades)
+
+    def _run_actions(self, actions: np.ndarray, initial_cash: float, risk_max_pct: float) -> Dict[str, Any]:
+        """Replay an action array (+1 buy, -1 sell, 0 hold) through the bar-by-bar engine."""
+        names = {1: "buy", -1: "sell", 0: "hold"}
+        decisions = [{"action": names[int(a)]} for a in actions]
+
+        def decide(symbol, history):
+            return decisions[len(history) - 1]
+
+        if len(self.prices) != len(actions):
+            # Array-only Backtester (e.g. a tuner worker on memory-mapped prices)
+            closes, adv = self.price_arrays()
+            engine = Backtester([{"close": float(c), "adv": float(v)} for c, v in zip(closes, adv)],
+                                self.slippage_apply, self.fee_pct, self.symbol)
+            return engine.run(decide, initial_cash=initial_cash, risk_max_pct=risk_max_pct)
+        return self.run(decide, initial_cash=initial_cash, risk_max_pct=risk_max_pct)
+
+    @staticmethod
+    def _result(initial_cash: float, equity_curve: np.ndarray, trades: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if len(equity_curve) > 1:
+            prev, cur = equity_curve[:-1], equity_curve[1:]
+            returns = np.where(prev > 0, (cur - prev) / np.where(prev > 0, prev, 1.0), 0.0)
+        else:
+            returns = np.empty(0)
+        avg_ret = float(returns.mean()) if len(returns) else 0.0
+        std_ret = float(returns.std()) if len(returns) > 1 else 0.0
+        sharpe = (avg_ret / std_ret) * (252**0.5) if std_ret > 0 else 0.0
+
+        if len(equity_curve):
+            peak = np.maximum.accumulate(equity_curve)
+            drawdowns = np.where(peak > 0, (peak - equity_curve) / np.where(peak > 0, peak, 1.0), 0.0)
+            max_dd = float(max(drawdowns.max(), 0.0))
+        else:
+            max_dd = 0.0
+
+        final_equity = float(equity_curve[-1]) if len(equity_curve) else initial_cash
+        return {
+            "initial_cash": initial_cash,
+            "final_equity": final_equity,
+            "total_return": (final_equity - initial_cash) / initial_cash if len(equity_curve) else 0.0,
+            "sharpe": sharpe,
+            "max_drawdown": max_dd,
+            "equity_curve": equity_curve.tolist(),
+            "trades": trades,
+        }
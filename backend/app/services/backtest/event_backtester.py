@@ -0,0 +1,383 @@
+# backend/app/services/backtest/event_backtester.py
+"""
+Event-driven backtester for pattern-completion strategies.
+
+Streams historical OHLCV candles bar by bar through the same
+StrategyBase.update_data / check_for_signal path the live signal generator uses,
+then simulates each signal as a trade:
+- entry at the signal bar's close (SL/TP keep the strategy's % offsets from its entry)
+- exits on stop-loss, take-profit or duration_minutes expiry, checked on later bars
+- fills go through the slippage model (rolling dollar volume as the liquidity proxy) plus fees
+- one open position per (strategy, symbol); signals while a position is open are skipped
+
+Each strategy gets a private cooldown store driven by the simulated bar clock, so the
+6h duplicate-signal cooldown behaves as it would live.
+"""
+
+import csv
+import heapq
+import math
+import statistics
+from collections import Counter, defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from backend.app.core.logger import logger
+from backend.app.services.cooldown_store import CooldownStore
+from backend.app.services.slippage import apply_slippage
+from backend.app.strategies.base import StrategyBase
+
+# Trade time limits per strategy (minutes) - mirrors SignalGenerator._calculate_time_limit
+DEFAULT_DURATION_MINUTES: Dict[str, int] = {
+    "vwap": 3,
+    "liquidity_zones": 3,
+    "order_blocks": 4,
+    "fair_value_gaps": 3,
+    "market_structure": 8,
+    "support_resistance": 8,
+    "volume_profile": 4,
+    "momentum": 5,
+    "rsi_macd_momentum": 5,
+    "mean_reversion": 15,
+    "breakout": 45,
+    "volume_breakout": 45,
+    "volatility_breakout": 45,
+    "trend_following": 180,
+    "sentiment": 240,
+    "social_copy": 180,
+}
+FALLBACK_DURATION_MINUTES = 5
+
+
+def to_epoch(ts: Any) -> float:
+    """Candle timestamp (epoch seconds/ms, naive-UTC or aware datetime, ISO string) -> epoch seconds."""
+    if isinstance(ts, (int, float)):
+        return float(ts) / 1000.0 if ts > 1e11 else float(ts)
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    if isinstance(ts, datetime):
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        return ts.timestamp()
+    raise TypeError(f"Unsupported candle timestamp: {ts!r}")
+
+
+@dataclass
+class BacktestTrade:
+    """One simulated trade from signal to exit."""
+
+    strategy: str
+    symbol: str
+    action: str
+    entry_time: float
+    entry_price: float
+    stop_loss: float
+    take_profit: float
+    expires_at: float
+    qty: float
+    notional: float
+    confidence: float = 0.0
+    entry_fee: float = 0.0
+    exit_time: Optional[float] = None
+    exit_price: Optional[float] = None
+    exit_reason: Optional[str] = None
+    exit_fee: float = 0.0
+    pnl: float = 0.0
+    return_pct: float = 0.0
+    bars_held: int = 0
+
+
+@dataclass
+class _Position:
+    trade: BacktestTrade
+    side: int  # +1 long, -1 short
+
+
+@dataclass
+class _SymbolState:
+    """Rolling liquidity proxy for the slippage model (sum of close*volume over adv_window bars)."""
+
+    window: deque = field(default_factory=deque)
+    dollar_volume: float = 0.0
+
+
+class EventBacktester:
+    """
+    Replays candles through StrategyBase subclasses and simulates SL/TP/expiry exits.
+
+    Usage:
+        bt = EventBacktester({"vwap": VWAPStrategy(), "order_blocks": OrderBlocksStrategy()})
+        result = bt.run({"BTCUSDT": btc_candles, "ETHUSDT": eth_candles})
+        result["metrics"]["vwap"]["win_rate"]
+    """
+
+    def __init__(
+        self,
+        strategies: Dict[str, StrategyBase],
+        notional_per_trade: float = 1000.0,
+        fee_pct: float = 0.001,
+        slippage_apply: Callable[[str, float, float, float], float] = apply_slippage,
+        adv_window: int = 1440,
+        duration_minutes: Optional[Dict[str, int]] = None,
+        initial_capital: float = 10000.0,
+    ):
+        """
+        Args:
+            strategies: name -> strategy instance (state is reset at the start of each run)
+            notional_per_trade: Quote-currency size of every simulated trade
+            fee_pct: Fee per side as a fraction of notional (0.001 = 0.1%)
+            slippage_apply: (side, price, size_notional, adv) -> fill price
+            adv_window: Bars in the rolling dollar-volume window used as ADV (1440 = one day of 1m bars)
+            duration_minutes: Per-strategy expiry overrides (used when a signal has no duration_minutes)
+            initial_capital: Starting equity for per-strategy drawdown
+        """
+        self.strategies = strategies
+        self.notional_per_trade = notional_per_trade
+        self.fee_pct = fee_pct
+        self.slippage_apply = slippage_apply
+        self.adv_window = adv_window
+        self.duration_minutes = {**DEFAULT_DURATION_MINUTES, **(duration_minutes or {})}
+        self.initial_capital = initial_capital
+        self.now = 0.0  # simulated clock (epoch seconds of the bar being processed)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def run(self, candles: Dict[str, Sequence[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Replay candles for every symbol in timestamp order.
+
+        Args:
+            candles: symbol -> chronologically sorted candles with timestamp, open, high, low, close, volume
+
+        Returns:
+            {"trades": {strategy: [trade dicts]}, "metrics": {strategy: {...}},
+             "bars": int, "signals": {strategy: int}, "skipped_signals": {...}, "errors": {...}}
+        """
+        self._reset_strategies()
+
+        positions: Dict[tuple, _Position] = {}
+        trades: Dict[str, List[BacktestTrade]] = defaultdict(list)
+        signals: Counter = Counter()
+        skipped: Counter = Counter()
+        errors: Counter = Counter()
+        liquidity: Dict[str, _SymbolState] = defaultdict(_SymbolState)
+        strategy_items = list(self.strategies.items())
+        bars = 0
+
+        for ts, symbol, candle in self._stream(candles):
+            bars += 1
+            self.now = ts
+            o = float(candle["open"]) if candle.get("open") is not None else float(candle["close"])
+            h = float(candle["high"]) if candle.get("high") is not None else float(candle["close"])
+            lo = float(candle["low"]) if candle.get("low") is not None else float(candle["close"])
+            c = float(candle["close"])
+            adv = self._update_liquidity(liquidity[symbol], c, float(candle.get("volume") or 0.0), candle)
+
+            for name, strategy in strategy_items:
+                key = (name, symbol)
+                position = positions.get(key)
+                if position is not None:
+                    position.trade.bars_held += 1
+                    if self._check_exit(position, ts, o, h, lo, adv):
+                        trades[name].append(position.trade)
+                        del positions[key]
+                        position = None
+
+                try:
+                    strategy.update_data(symbol, candle)
+                    signal = strategy.check_for_signal(symbol)
+                except Exception as e:
+                    errors[name] += 1
+                    if errors[name] == 1:
+                        logger.warning(f"Backtest: {name} raised on {symbol}: {e}")
+                    continue
+
+                if not signal or signal.get("action") not in ("buy", "sell"):
+                    continue
+                signals[name] += 1
+                if position is not None:
+                    skipped[name] += 1
+                    continue
+                positions[key] = self._open_position(name, symbol, signal, ts, c, adv)
+
+        # Close anything still open at the last close of its symbol
+        for (name, symbol), position in positions.items():
+            last = candles[symbol][-1]
+            self._close(position, to_epoch(last["timestamp"]), float(last["close"]), "end_of_data",
+                        self._adv(liquidity[symbol], last))
+            trades[name].append(position.trade)
+
+        trade_dicts = {name: [asdict(t) for t in trades.get(name, [])] for name in self.strategies}
+        return {
+            "bars": bars,
+            "trades": trade_dicts,
+            "metrics": {name: self.compute_metrics(trade_dicts[name]) for name in self.strategies},
+            "signals": dict(signals),
+            "skipped_signals": dict(skipped),
+            "errors": dict(errors),
+        }
+
+    def compute_metrics(self, trades: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Per-strategy trade statistics (Sharpe is per trade, not annualised)."""
+        if not trades:
+            return {"trades": 0, "win_rate": 0.0, "total_pnl": 0.0, "avg_pnl": 0.0, "avg_return_pct": 0.0,
+                    "profit_factor": 0.0, "sharpe": 0.0, "max_drawdown": 0.0, "avg_bars_held": 0.0,
+                    "exit_reasons": {}}
+
+        pnls = [t["pnl"] for t in trades]
+        returns = [t["return_pct"] for t in trades]
+        gross_win = sum(p for p in pnls if p > 0)
+        gross_loss = -sum(p for p in pnls if p < 0)
+        std = statistics.pstdev(returns) if len(returns) > 1 else 0.0
+
+        equity = self.initial_capital
+        peak = equity
+        max_dd = 0.0
+        for pnl in pnls:
+            equity += pnl
+            peak = max(peak, equity)
+            if peak > 0:
+                max_dd = max(max_dd, (peak - equity) / peak)
+
+        return {
+            "trades": len(trades),
+            "win_rate": sum(1 for p in pnls if p > 0) / len(pnls),
+            "total_pnl": sum(pnls),
+            "avg_pnl": sum(pnls) / len(pnls),
+            "avg_return_pct": sum(returns) / len(returns),
+            "profit_factor": gross_win / gross_loss if gross_loss > 0 else (math.inf if gross_win > 0 else 0.0),
+            "sharpe": statistics.mean(returns) / std if std > 0 else 0.0,
+            "max_drawdown": max_dd,
+            "avg_bars_held": sum(t["bars_held"] for t in trades) / len(trades),
+            "exit_reasons": dict(Counter(t["exit_reason"] for t in trades)),
+        }
+
+    @staticmethod
+    def write_trade_logs(result: Dict[str, Any], directory: str) -> List[Path]:
+        """Write one CSV trade log per strategy. Returns the written paths."""
+        out_dir = Path(directory)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        fieldnames = list(BacktestTrade.__dataclass_fields__)
+        paths = []
+        for name, trades in result["trades"].items():
+            path = out_dir / f"{name}_trades.csv"
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(trades)
+            paths.append(path)
+        return paths
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _reset_strategies(self) -> None:
+        """
+        Drop every symbol's state (history, incremental caches, multi-timeframe bars) and give
+        each strategy a private cooldown store on the simulated clock, so a rerun starts cold.
+        """
+        clock = lambda: self.now  # noqa: E731
+        for name, strategy in self.strategies.items():
+            held = set()
+            for attribute in strategy.state_attributes:
+                value = getattr(strategy, attribute, None)
+                if isinstance(value, dict):
+                    held.update(value)
+            for symbol in held:
+                strategy.drop_symbol(symbol)
+            strategy.cooldowns = CooldownStore(f"backtest:{name}", ttl_seconds=strategy.min_signal_gap, clock=clock)
+
+    @staticmethod
+    def _stream(candles: Dict[str, Sequence[Dict[str, Any]]]) -> Iterable[tuple]:
+        """Merge per-symbol candle streams into one (ts, symbol, candle) stream ordered by time."""
+        streams = [
+            ((to_epoch(c["timestamp"]), symbol, c) for c in series)
+            for symbol, series in candles.items()
+        ]
+        return heapq.merge(*streams, key=lambda event: (event[0], event[1]))
+
+    def _update_liquidity(self, state: _SymbolState, close: float, volume: float, candle: Dict[str, Any]) -> float:
+        dollar_volume = close * volume
+        state.window.append(dollar_volume)
+        state.dollar_volume += dollar_volume
+        if len(state.window) > self.adv_window:
+            state.dollar_volume -= state.window.popleft()
+        return self._adv(state, candle)
+
+    @staticmethod
+    def _adv(state: _SymbolState, candle: Dict[str, Any]) -> float:
+        adv = candle.get("adv")
+        if adv:
+            return float(adv)
+        return state.dollar_volume if state.dollar_volume > 0 else 1.0
+
+    def _open_position(self, name: str, symbol: str, signal: Dict[str, Any], ts: float,
+                       close: float, adv: float) -> _Position:
+        action = signal["action"]
+        side = 1 if action == "buy" else -1
+
+        # Keep the strategy's SL/TP distances (as % of its entry) relative to the simulated entry
+        signal_entry = float(signal.get("entry") or close)
+        scale = close / signal_entry if signal_entry > 0 else 1.0
+        stop_loss = float(signal.get("stop_loss") or 0.0) * scale
+        take_profit = float(signal.get("take_profit") or 0.0) * scale
+
+        duration = signal.get("duration_minutes") or self.duration_minutes.get(name, FALLBACK_DURATION_MINUTES)
+        fill = self.slippage_apply(action, close, self.notional_per_trade, adv)
+        qty = self.notional_per_trade / fill
+
+        trade = BacktestTrade(
+            strategy=name,
+            symbol=symbol,
+            action=action,
+            entry_time=ts,
+            entry_price=fill,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            expires_at=ts + float(duration) * 60.0,
+            qty=qty,
+            notional=qty * fill,
+            confidence=float(signal.get("confidence") or 0.0),
+            entry_fee=qty * fill * self.fee_pct,
+        )
+        return _Position(trade=trade, side=side)
+
+    def _check_exit(self, position: _Position, ts: float, o: float, h: float, lo: float, adv: float) -> bool:
+        """Exit on expiry (at the open), else SL/TP touched intrabar. SL wins if both are touched."""
+        trade = position.trade
+        if ts >= trade.expires_at:
+            self._close(position, ts, o, "expiry", adv)
+            return True
+
+        sl, tp = trade.stop_loss, trade.take_profit
+        if position.side > 0:
+            if sl > 0 and lo <= sl:
+                self._close(position, ts, min(o, sl), "stop_loss", adv)
+                return True
+            if tp > 0 and h >= tp:
+                self._close(position, ts, max(o, tp), "take_profit", adv)
+                return True
+        else:
+            if sl > 0 and h >= sl:
+                self._close(position, ts, max(o, sl), "stop_loss", adv)
+                return True
+            if tp > 0 and lo <= tp:
+                self._close(position, ts, min(o, tp), "take_profit", adv)
+                return True
+        return False
+
+    def _close(self, position: _Position, ts: float, price: float, reason: str, adv: float) -> None:
+        trade = position.trade
+        exit_side = "sell" if position.side > 0 else "buy"
+        fill = self.slippage_apply(exit_side, price, trade.notional, adv)
+        trade.exit_time = ts
+        trade.exit_price = fill
+        trade.exit_reason = reason
+        trade.exit_fee = trade.qty * fill * self.fee_pct
+        trade.pnl = position.side * trade.qty * (fill - trade.entry_price) - trade.entry_fee - trade.exit_fee
+        trade.return_pct = trade.pnl / trade.notional if trade.notional else 0.0
@@ -0,0 +1,374 @@
+# backend/app/services/backtest/history_store.py
+"""
+Local OHLCV history for backtests.
+
+- Candles are stored per symbol/interval in monthly partitions:
+  {root}/{symbol}/{interval}/{YYYY-MM}.npy, each a [6, n_bars] float64 array with one
+  contiguous row per column (timestamp in epoch ms, open, high, low, close, volume)
+- Reads memory-map the partitions; a range inside one month is a zero-copy view
+- Writes merge into the touched months (new bars win on duplicate timestamps) and
+  replace each partition atomically
+- download_binance()/download_oanda() page klines from the REST adapters in data_feed;
+  top_up() continues from the last stored bar
+- import_csv() loads Binance kline dumps (no header) or headered OHLCV CSVs offline
+
+Backtester/tuner integration: load() -> column arrays, load_candles() -> candle dicts
+(EventBacktester, walk_forward, hyperparam_tuner), backtester() -> array-backed Backtester.
+"""
+
+import asyncio
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from backend.app.core.logger import logger
+from backend.app.services.backtest.backtester import Backtester
+
+COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+INTERVAL_MS: Dict[str, int] = {
+    "1m": 60_000, "3m": 180_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "2h": 7_200_000, "4h": 14_400_000, "6h": 21_600_000, "8h": 28_800_000,
+    "12h": 43_200_000, "1d": 86_400_000,
+}
+
+# Binance interval -> OANDA granularity
+OANDA_GRANULARITY: Dict[str, str] = {
+    "1m": "M1", "5m": "M5", "15m": "M15", "30m": "M30", "1h": "H1", "2h": "H2",
+    "4h": "H4", "6h": "H6", "8h": "H8", "12h": "H12", "1d": "D",
+}
+
+
+def to_ms(ts: Any) -> int:
+    """datetime (naive = UTC), ISO string or epoch seconds/ms -> epoch ms."""
+    if isinstance(ts, (int, float, np.integer, np.floating)):
+        return int(ts) if ts > 1e11 else int(ts * 1000)
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    if isinstance(ts, datetime):
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        return int(round(ts.timestamp() * 1000))
+    raise TypeError(f"Unsupported timestamp: {ts!r}")
+
+
+class HistoryStore:
+    """
+    Usage:
+        store = HistoryStore()
+        store.import_csv("BTCUSDT-1m-2024-01.csv", "BTCUSDT", "1m")
+        await top_up(store, "BTCUSDT", "1m")
+        bars = store.load("BTCUSDT", "1m", start="2024-01-01", end="2025-01-01")
+        bars["close"]  # np.ndarray
+    """
+
+    def __init__(self, root: str = "data/history"):
+        self.root = Path(root)
+
+    def _dir(self, symbol: str, interval: str) -> Path:
+        return self.root / symbol.upper().replace("/", "-") / interval
+
+    def partitions(self, symbol: str, interval: str) -> List[Path]:
+        """Monthly partition files in chronological order."""
+        directory = self._dir(symbol, interval)
+        if not directory.exists():
+            return []
+        return sorted(directory.glob("????-??.npy"))
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def write(self, symbol: str, interval: str, bars: np.ndarray) -> int:
+        """
+        Merge a [6, n] bar array (COLUMNS order, epoch-ms timestamps) into the store.
+        Returns the number of bars that were not stored before.
+        """
+        bars = np.asarray(bars, dtype=np.float64)
+        if bars.ndim != 2 or bars.shape[0] != len(COLUMNS):
+            raise ValueError(f"bars must have shape ({len(COLUMNS)}, n)")
+        if bars.shape[1] == 0:
+            return 0
+
+        directory = self._dir(symbol, interval)
+        directory.mkdir(parents=True, exist_ok=True)
+        months = bars[0].astype("datetime64[ms]").astype("datetime64[M]")
+        added = 0
+        for month in np.unique(months):
+            chunk = bars[:, months == month]
+            path = directory / f"{month}.npy"
+            before = 0
+            if path.exists():
+                existing = np.load(path)
+                before = existing.shape[1]
+                chunk = np.hstack([existing, chunk])
+            merged = self._dedupe(chunk)
+            added += merged.shape[1] - before
+            tmp = path.with_suffix(".npy.tmp")
+            with open(tmp, "wb") as f:
+                np.save(f, merged)
+            os.replace(tmp, path)
+        return added
+
+    @staticmethod
+    def _dedupe(bars: np.ndarray) -> np.ndarray:
+        """Sort by timestamp; on duplicates keep the last occurrence (newer data wins)."""
+        order = np.argsort(bars[0], kind="stable")
+        bars = bars[:, order]
+        keep = np.ones(bars.shape[1], dtype=bool)
+        keep[:-1] = bars[0, 1:] != bars[0, :-1]
+        return np.ascontiguousarray(bars[:, keep])
+
+    def write_candles(self, symbol: str, interval: str, candles: Sequence[Dict[str, Any]]) -> int:
+        """Merge candle dicts (timestamp/open_time/time, open, high, low, close, volume)."""
+        if not candles:
+            return 0
+        bars = np.empty((len(COLUMNS), len(candles)))
+        for i, c in enumerate(candles):
+            ts = c.get("open_time", c.get("timestamp", c.get("time")))
+            bars[:, i] = (to_ms(ts), c["open"], c["high"], c["low"], c["close"], c.get("volume") or 0.0)
+        return self.write(symbol, interval, bars)
+
+    def import_csv(self, path: str, symbol: str, interval: str) -> int:
+        """
+        Import a CSV dump. Binance kline files (no header: open_time, open, high, low, close,
+        volume, close_time, ...) and headered files with a timestamp/open_time/time/date column
+        plus open/high/low/close[/volume] are both accepted. Returns bars added.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            first = f.readline().split(",")[0].strip()
+        has_header = not first.replace(".", "", 1).lstrip("-").isdigit()
+
+        if has_header:
+            df = pd.read_csv(path)
+            df.columns = [str(c).strip().lower() for c in df.columns]
+            ts_col = next((c for c in ("timestamp", "open_time", "time", "date", "datetime") if c in df.columns), None)
+            if ts_col is None:
+                raise ValueError(f"{path}: no timestamp column (expected timestamp/open_time/time/date)")
+            ts = df[ts_col]
+            if pd.api.types.is_numeric_dtype(ts):
+                timestamps = ts.to_numpy(dtype=np.float64)
+                timestamps = np.where(timestamps > 1e11, timestamps, timestamps * 1000.0)
+            else:
+                dt = pd.to_datetime(ts, utc=True)
+                elapsed = (dt - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(milliseconds=1)
+                timestamps = elapsed.to_numpy(dtype=np.float64)
+        else:
+            df = pd.read_csv(path, header=None, usecols=range(6), names=list(COLUMNS))
+            timestamps = df["timestamp"].to_numpy(dtype=np.float64)
+            timestamps = np.where(timestamps > 1e14, timestamps / 1000.0, timestamps)  # 2025+ dumps use microseconds
+
+        volume = df["volume"].to_numpy(dtype=np.float64) if "volume" in df.columns else np.zeros(len(df))
+        bars = np.vstack([
+            timestamps,
+            df["open"].to_numpy(dtype=np.float64),
+            df["high"].to_numpy(dtype=np.float64),
+            df["low"].to_numpy(dtype=np.float64),
+            df["close"].to_numpy(dtype=np.float64),
+            volume,
+        ])
+        added = self.write(symbol, interval, bars)
+        logger.info(f"Imported {path}: {added} new {symbol} {interval} bars")
+        return added
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def load(self, symbol: str, interval: str, start: Any = None, end: Any = None) -> Dict[str, np.ndarray]:
+        """
+        Column arrays for bars with start <= timestamp < end (either bound optional).
+
+        A range within a single month is returned as memory-mapped views; longer ranges are
+        concatenated from the memory-mapped partitions (one copy, no parsing).
+        """
+        start_ms = to_ms(start) if start is not None else None
+        end_ms = to_ms(end) if end is not None else None
+        first_month = np.datetime64(start_ms, "ms").astype("datetime64[M]") if start_ms is not None else None
+        last_month = np.datetime64(end_ms - 1, "ms").astype("datetime64[M]") if end_ms is not None else None
+
+        parts = []
+        for path in self.partitions(symbol, interval):
+            month = np.datetime64(path.stem, "M")
+            if (first_month is not None and month < first_month) or (last_month is not None and month > last_month):
+                continue
+            parts.append(np.load(path, mmap_mode="r"))
+
+        if not parts:
+            data = np.empty((len(COLUMNS), 0))
+        elif len(parts) == 1:
+            data = parts[0]
+        else:
+            data = np.concatenate(parts, axis=1)
+
+        lo = int(np.searchsorted(data[0], start_ms, side="left")) if start_ms is not None else 0
+        hi = int(np.searchsorted(data[0], end_ms, side="left")) if end_ms is not None else data.shape[1]
+        data = data[:, lo:hi]
+        return {name: data[i] for i, name in enumerate(COLUMNS)}
+
+    def load_candles(self, symbol: str, interval: str, start: Any = None, end: Any = None) -> List[Dict[str, Any]]:
+        """Candle dicts ({timestamp (epoch ms), open, high, low, close, volume}) for candle-based engines."""
+        bars = self.load(symbol, interval, start, end)
+        rows = np.vstack([bars[name] for name in COLUMNS]).T.tolist()
+        return [
+            {"timestamp": int(ts), "open": o, "high": h, "low": lo, "close": c, "volume": v}
+            for ts, o, h, lo, c, v in rows
+        ]
+
+    def backtester(
+        self, symbol: str, interval: str, start: Any = None, end: Any = None, fee_pct: float = 0.002
+    ) -> Backtester:
+        """Array-backed Backtester (run_vectorized) over stored closes, volume as the ADV proxy."""
+        bars = self.load(symbol, interval, start, end)
+        adv = np.array(bars["volume"], dtype=np.float64)
+        adv[adv == 0.0] = 1.0
+        bt = Backtester([], fee_pct=fee_pct, symbol=symbol)
+        bt._arrays = (np.asarray(bars["close"]), adv)
+        return bt
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[int]:
+        """Open time (epoch ms) of the newest stored bar, or None."""
+        for path in reversed(self.partitions(symbol, interval)):
+            data = np.load(path, mmap_mode="r")
+            if data.shape[1]:
+                return int(data[0, -1])
+        return None
+
+    def info(self, symbol: str, interval: str) -> Dict[str, Any]:
+        bars, first, last = 0, None, None
+        for path in self.partitions(symbol, interval):
+            data = np.load(path, mmap_mode="r")
+            if data.shape[1]:
+                bars += data.shape[1]
+                first = int(data[0, 0]) if first is None else first
+                last = int(data[0, -1])
+        return {"symbol": symbol, "interval": interval, "bars": bars, "first": first, "last": last,
+                "partitions": len(self.partitions(symbol, interval))}
+
+
+# ----------------------------------------------------------------------
+# Downloading
+# ----------------------------------------------------------------------
+
+def _now_ms() -> int:
+    return int(datetime.now(timezone.utc).timestamp() * 1000)
+
+
+async def download_binance(
+    store: HistoryStore,
+    symbol: str,
+    interval: str,
+    start_ms: int,
+    end_ms: Optional[int] = None,
+    adapter=None,
+    page_limit: int = 1000,
+    flush_bars: int = 100_000,
+    pause: float = 0.1,
+) -> int:
+    """
+    Page Binance klines [start_ms, end_ms) into the store. Only closed candles are kept.
+    Pages are buffered and flushed every `flush_bars` so a month partition is not rewritten
+    once per request. Returns bars added.
+    """
+    if adapter is None:
+        from backend.app.services.data_feed import BinanceMarketDataAdapter
+        adapter = BinanceMarketDataAdapter()
+    step = INTERVAL_MS[interval]
+    end_ms = end_ms if end_ms is not None else _now_ms()
+    buffer: List[Dict[str, Any]] = []
+    added = 0
+    cursor = start_ms
+
+    while cursor < end_ms:
+        page = await adapter.get_klines(
+            symbol, interval=interval, limit=page_limit, start_time=cursor, end_time=end_ms - 1
+        )
+        closed = [k for k in page if k["close_time"] < _now_ms()]
+        if not closed:
+            break
+        buffer.extend(closed)
+        cursor = closed[-1]["open_time"] + step
+        if len(buffer) >= flush_bars:
+            added += store.write_candles(symbol, interval, buffer)
+            buffer = []
+        if len(page) < page_limit:
+            break
+        if pause:
+            await asyncio.sleep(pause)
+
+    added += store.write_candles(symbol, interval, buffer)
+    logger.info(f"Downloaded {symbol} {interval} from Binance: {added} new bars")
+    return added
+
+
+async def download_oanda(
+    store: HistoryStore,
+    instrument: str,
+    interval: str,
+    start_ms: int,
+    end_ms: Optional[int] = None,
+    adapter=None,
+    page_limit: int = 5000,
+    flush_bars: int = 100_000,
+    pause: float = 0.1,
+) -> int:
+    """Page OANDA mid candles [start_ms, end_ms) into the store (complete candles only). Returns bars added."""
+    if adapter is None:
+        from backend.app.services.data_feed import OandaMarketDataAdapter
+        adapter = OandaMarketDataAdapter()
+    granularity = OANDA_GRANULARITY[interval]
+    end_ms = end_ms if end_ms is not None else _now_ms()
+    buffer: List[Dict[str, Any]] = []
+    added = 0
+    cursor = start_ms
+
+    while cursor < end_ms:
+        from_time = datetime.fromtimestamp(cursor / 1000, tz=timezone.utc).isoformat().replace("+00:00", "Z")
+        page = await adapter.get_candles(instrument, granularity=granularity, count=page_limit, from_time=from_time)
+        closed = [c for c in page if c.get("complete", True) and to_ms(c["time"]) < end_ms]
+        if not closed:
+            break
+        buffer.extend(closed)
+        cursor = to_ms(closed[-1]["time"]) + INTERVAL_MS[interval]
+        if len(buffer) >= flush_bars:
+            added += store.write_candles(instrument, interval, buffer)
+            buffer = []
+        if len(page) < page_limit:
+            break
+        if pause:
+            await asyncio.sleep(pause)
+
+    added += store.write_candles(instrument, interval, buffer)
+    logger.info(f"Downloaded {instrument} {interval} from OANDA: {added} new bars")
+    return added
+
+
+async def top_up(
+    store: HistoryStore,
+    symbol: str,
+    interval: str,
+    source: str = "binance",
+    default_start: Any = None,
+    adapter=None,
+) -> int:
+    """
+    Fetch bars newer than the last stored one (or from `default_start` for an empty store,
+    else 30 days back). Returns bars added.
+    """
+    last = store.last_timestamp(symbol, interval)
+    if last is not None:
+        start_ms = last + INTERVAL_MS[interval]
+    elif default_start is not None:
+        start_ms = to_ms(default_start)
+    else:
+        start_ms = _now_ms() - 30 * INTERVAL_MS["1d"]
+
+    if source == "binance":
+        return await download_binance(store, symbol, interval, start_ms, adapter=adapter)
+    if source == "oanda":
+        return await download_oanda(store, symbol, interval, start_ms, adapter=adapter)
+    raise ValueError(f"Unknown history source '{source}' (expected 'binance' or 'oanda')")
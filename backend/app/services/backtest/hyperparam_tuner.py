@@ -1,8 +1,22 @@
 # backend/app/services/backtest/hyperparam_tuner.py
+import csv
 import itertools
-from typing import Dict, Any, Callable, List
+import json
+import math
+import os
+import random
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from backend.app.core.logger import logger
 from backend.app.services.backtest.backtester import Backtester
 
+LEADERBOARD_METRICS = ["sharpe", "total_return", "max_drawdown", "final_equity", "trades"]
+
 def grid_search(prices, strategy_factory: Callable[[Dict[str,Any]], Callable], param_grid: Dict[str, List[Any]], metric: str = "sharpe", initial_cash: float = 10000.0) -> Dict[str, Any]:
     """
     - strategy_factory(params) -> function(symbol, price_history) that returns decision dict
@@ -24,3 +38,345 @@ def grid_search(prices, strategy_factory: Callable[[Dict[str,Any]], Callable], p
             best_result = res
             best_params = params
     return {"best_params": best_params, "best_score": best_score, "best_result": best_result}
+
+
+# ----------------------------------------------------------------------
+# Parallel grid search
+# ----------------------------------------------------------------------
+
+# Per-worker state, set once by _init_worker (price arrays are memory-mapped, not pickled per task)
+_worker: Dict[str, Any] = {}
+
+
+def _params_key(params: Dict[str, Any]) -> str:
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def _init_worker(
+    data_path: str, strategy_factory: Callable, mode: str, fee_pct: float, symbol: str, initial_cash: float
+) -> None:
+    arrays = np.load(data_path, mmap_mode="r")
+    closes, adv = arrays[0], arrays[1]
+    prices = [{"close": float(c), "adv": float(a)} for c, a in zip(closes, adv)] if mode == "loop" else []
+    bt = Backtester(prices, fee_pct=fee_pct, symbol=symbol)
+    bt._arrays = (closes, adv)
+    _worker.update(bt=bt, factory=strategy_factory, mode=mode, initial_cash=initial_cash)
+
+
+def _evaluate(
+    bt: Backtester, strategy_factory: Callable, mode: str, params: Dict[str, Any], initial_cash: float
+) -> Dict[str, Any]:
+    if mode == "vectorized":
+        closes, _ = bt.price_arrays()
+        entries, exits = strategy_factory(params)(np.asarray(closes))
+        return bt.run_vectorized(entries, exits, initial_cash=initial_cash)
+    return bt.run(strategy_factory(params), initial_cash=initial_cash)
+
+
+def _summarise(result: Dict[str, Any]) -> Dict[str, Any]:
+    summary = {m: result.get(m, 0.0) for m in LEADERBOARD_METRICS if m != "trades"}
+    summary["trades"] = sum(1 for t in result.get("trades", []) if t.get("type") != "buy")
+    return summary
+
+
+def _run_chunk(chunk: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+    rows = []
+    for key, params in chunk:
+        try:
+            result = _evaluate(_worker["bt"], _worker["factory"], _worker["mode"], params, _worker["initial_cash"])
+            summary = _summarise(result)
+        except Exception as e:
+            summary = {m: float("nan") for m in LEADERBOARD_METRICS}
+            summary["error"] = str(e)
+        rows.append((key, params, summary))
+    return rows
+
+
+def _read_leaderboard(path: Path) -> List[Dict[str, str]]:
+    if not path.exists():
+        return []
+    with open(path, newline="") as f:
+        # A row cut short by an interrupted run is missing its trailing columns (None)
+        return [row for row in csv.DictReader(f) if row.get("error") is not None]
+
+
+def parallel_grid_search(
+    prices: List[Dict[str, Any]],
+    strategy_factory: Callable[[Dict[str, Any]], Callable],
+    param_grid: Dict[str, List[Any]],
+    leaderboard_path: str,
+    metric: str = "sharpe",
+    initial_cash: float = 10000.0,
+    mode: str = "loop",
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    fee_pct: float = 0.002,
+    symbol: str = "SYM",
+) -> Dict[str, Any]:
+    """
+    Grid search across a process pool, streaming every result to a CSV leaderboard.
+
+    - strategy_factory must be picklable (a module-level function):
+      mode="loop":       factory(params) -> strategy_fn(symbol, price_history) for Backtester.run
+      mode="vectorized": factory(params) -> fn(closes: np.ndarray) -> (entries, exits) for run_vectorized
+    - closes/ADV are written once to a .npy file and memory-mapped by every worker
+    - combinations are sent in chunks (default: ~4 chunks per worker) to amortise IPC
+    - resumable: combinations already in the leaderboard (matched on their params) are skipped
+
+    Returns best params/score over the whole leaderboard (including earlier runs) and the
+    full backtest result for the best combination.
+    """
+    if mode not in ("loop", "vectorized"):
+        raise ValueError(f"Unknown mode '{mode}' (expected 'loop' or 'vectorized')")
+    if metric not in LEADERBOARD_METRICS:
+        raise ValueError(f"Unknown metric '{metric}' (expected one of {LEADERBOARD_METRICS})")
+
+    keys = list(param_grid.keys())
+    path = Path(leaderboard_path)
+    done: Set[str] = {row["params"] for row in _read_leaderboard(path)}
+    pending = [
+        (key, params)
+        for params in (dict(zip(keys, combo)) for combo in itertools.product(*(param_grid[k] for k in keys)))
+        if (key := _params_key(params)) not in done
+    ]
+    workers = workers or os.cpu_count() or 1
+    chunksize = chunksize or max(1, math.ceil(len(pending) / (workers * 4)))
+    logger.info(
+        f"Grid search: {len(pending)} combinations to run, {len(done)} already in {path.name} "
+        f"({workers} workers, chunks of {chunksize})"
+    )
+
+    bt = Backtester(prices, fee_pct=fee_pct, symbol=symbol)
+    if pending:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fieldnames = keys + ["params"] + LEADERBOARD_METRICS + ["error"]
+        write_header = not path.exists() or path.stat().st_size == 0
+        if not write_header:
+            with open(path, "rb") as existing:
+                existing.seek(-1, os.SEEK_END)
+                if existing.read(1) != b"\n":
+                    with open(path, "a") as repair:
+                        repair.write("\n")  # terminate a row cut short by an interrupted run
+        chunks = [pending[i:i + chunksize] for i in range(0, len(pending), chunksize)]
+
+        with tempfile.TemporaryDirectory(prefix="vyra_tuner_") as tmp, open(path, "a", newline="") as f:
+            data_path = os.path.join(tmp, "prices.npy")
+            np.save(data_path, np.vstack(bt.price_arrays()))
+
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+            if write_header:
+                writer.writeheader()
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(data_path, strategy_factory, mode, fee_pct, symbol, initial_cash),
+            ) as pool:
+                futures = [pool.submit(_run_chunk, chunk) for chunk in chunks]
+                completed = 0
+                for future in as_completed(futures):
+                    for key, params, summary in future.result():
+                        writer.writerow({**params, "params": key, **summary})
+                    f.flush()
+                    completed += 1
+                    if completed % max(1, len(chunks) // 10) == 0:
+                        logger.info(f"Grid search progress: {completed}/{len(chunks)} chunks")
+
+    best_score, best_params = float("-inf"), None
+    for row in _read_leaderboard(path):
+        try:
+            score = float(row[metric])
+            if not math.isnan(score) and score > best_score:
+                best_score, best_params = score, json.loads(row["params"])
+        except (KeyError, TypeError, ValueError):
+            continue  # e.g. a row cut short by an interrupted run
+
+    best_result = _evaluate(bt, strategy_factory, mode, best_params, initial_cash) if best_params is not None else None
+    return {
+        "best_params": best_params,
+        "best_score": best_score,
+        "best_result": best_result,
+        "evaluated": len(pending),
+        "skipped": len(done),
+        "leaderboard_path": str(path),
+    }
+
+
+# ----------------------------------------------------------------------
+# Adaptive search (successive halving / Hyperband)
+# ----------------------------------------------------------------------
+
+def _profit_factor(result: Dict[str, Any]) -> float:
+    pnls = [t["pnl"] for t in result.get("trades", []) if "pnl" in t]
+    gross_win = sum(p for p in pnls if p > 0)
+    gross_loss = -sum(p for p in pnls if p < 0)
+    if gross_loss > 0:
+        return gross_win / gross_loss
+    return math.inf if gross_win > 0 else 0.0
+
+
+# Objectives are "higher is better"; drawdown is negated
+OBJECTIVES: Dict[str, Callable[[Dict[str, Any]], float]] = {
+    "sharpe": lambda r: r.get("sharpe", 0.0),
+    "total_return": lambda r: r.get("total_return", 0.0),
+    "max_drawdown": lambda r: -r.get("max_drawdown", 0.0),
+    "profit_factor": _profit_factor,
+}
+
+
+def sample_params(param_space: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+    """
+    Draw one configuration.
+    - list (or any non-pair iterable): categorical choice
+    - (low, high) tuple of ints: uniform integer in [low, high]
+    - (low, high) tuple with a float: uniform float in [low, high]
+    """
+    params = {}
+    for name, space in param_space.items():
+        if isinstance(space, tuple) and len(space) == 2:
+            low, high = space
+            if isinstance(low, int) and isinstance(high, int):
+                params[name] = rng.randint(low, high)
+            else:
+                params[name] = rng.uniform(float(low), float(high))
+        else:
+            params[name] = rng.choice(list(space))
+    return params
+
+
+def successive_halving(
+    prices: List[Dict[str, Any]],
+    strategy_factory: Callable[[Dict[str, Any]], Callable],
+    param_space: Dict[str, Any],
+    objective: Any = "sharpe",
+    n_configs: int = 27,
+    eta: int = 3,
+    min_bars: Optional[int] = None,
+    seed: int = 0,
+    initial_cash: float = 10000.0,
+    mode: str = "loop",
+    fee_pct: float = 0.002,
+    configs: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Successive halving over backtest length.
+
+    n_configs random configurations are backtested on the most recent `min_bars` bars; the
+    best 1/eta are promoted to a window eta times longer, and so on until the survivors run
+    on the full history. Same seed -> same configurations and same answer.
+
+    Args:
+        param_space: name -> list of choices or (low, high) range (see sample_params)
+        objective: key of OBJECTIVES or callable(result) -> float (higher is better)
+        min_bars: first-rung window (default: full length / eta^(rungs-1), at least 100 bars)
+        configs: explicit configurations to start from (skips sampling; used by hyperband)
+
+    Returns best params/score on the full history plus the per-rung history and
+    `bars_evaluated`, the total backtested bars (the compute budget actually used).
+    """
+    score_fn = OBJECTIVES[objective] if isinstance(objective, str) else objective
+    rng = random.Random(seed)
+    n_bars = len(prices)
+
+    if configs is None:
+        configs, seen = [], set()
+        for _ in range(n_configs * 20):  # bounded retries when the space is small
+            params = sample_params(param_space, rng)
+            key = _params_key(params)
+            if key not in seen:
+                seen.add(key)
+                configs.append(params)
+            if len(configs) == n_configs:
+                break
+
+    rungs, remaining = 1, len(configs)
+    while remaining > 1:
+        remaining //= eta
+        rungs += 1
+    budget = min_bars or max(100, n_bars // eta ** (rungs - 1))
+    survivors = configs
+    history: List[Dict[str, Any]] = []
+    bars_evaluated = 0
+    scored: List[Tuple[float, Dict[str, Any], Dict[str, Any]]] = []
+
+    while survivors:
+        window = min(n_bars, budget)
+        bt = Backtester(prices[-window:], fee_pct=fee_pct)
+        scored = []
+        for params in survivors:
+            try:
+                result = _evaluate(bt, strategy_factory, mode, params, initial_cash)
+                score = float(score_fn(result))
+            except Exception as e:
+                logger.debug(f"Successive halving: {params} failed on {window} bars: {e}")
+                result, score = None, float("-inf")
+            if math.isnan(score):
+                score = float("-inf")
+            scored.append((score, params, result))
+            history.append({"bars": window, "params": params, "score": score})
+            bars_evaluated += window
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        if window >= n_bars:
+            break
+        survivors = [params for _, params, _ in scored[: max(1, len(scored) // eta)]]
+        # The last survivor always gets a full-history run
+        budget = n_bars if len(survivors) == 1 else budget * eta
+
+    if not scored:
+        return {
+            "best_params": None,
+            "best_score": float("-inf"),
+            "best_result": None,
+            "history": history,
+            "bars_evaluated": 0,
+        }
+
+    best_score, best_params, best_result = scored[0]
+    return {
+        "best_params": best_params,
+        "best_score": best_score,
+        "best_result": best_result,
+        "history": history,
+        "bars_evaluated": bars_evaluated,
+    }
+
+
+def hyperband(
+    prices: List[Dict[str, Any]],
+    strategy_factory: Callable[[Dict[str, Any]], Callable],
+    param_space: Dict[str, Any],
+    objective: Any = "sharpe",
+    eta: int = 3,
+    min_bars: int = 200,
+    seed: int = 0,
+    **kwargs,
+) -> Dict[str, Any]:
+    """
+    Hyperband: several successive-halving brackets trading off number of configurations
+    against first-rung window length, so a bad min_bars guess cannot sink the search.
+    Brackets use seeds seed, seed+1, ... and are compared on the full history.
+    """
+    n_bars = len(prices)
+    s_max = max(0, int(math.floor(math.log(max(n_bars / min_bars, 1), eta))))
+    best: Dict[str, Any] = {"best_params": None, "best_score": float("-inf"), "best_result": None}
+    history: List[Dict[str, Any]] = []
+    bars_evaluated = 0
+
+    for s in range(s_max, -1, -1):
+        n_configs = int(math.ceil((s_max + 1) / (s + 1) * eta ** s))
+        bracket = successive_halving(
+            prices, strategy_factory, param_space, objective=objective, n_configs=n_configs, eta=eta,
+            min_bars=max(min_bars, n_bars // eta ** s), seed=seed + (s_max - s), **kwargs,
+        )
+        history.extend({**h, "bracket": s} for h in bracket["history"])
+        bars_evaluated += bracket["bars_evaluated"]
+        if bracket["best_score"] > best["best_score"]:
+            best = bracket
+
+    return {
+        "best_params": best["best_params"],
+        "best_score": best["best_score"],
+        "best_result": best["best_result"],
+        "history": history,
+        "bars_evaluated": bars_evaluated,
+    }
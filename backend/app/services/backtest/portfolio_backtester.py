@@ -0,0 +1,554 @@
+# backend/app/services/backtest/portfolio_backtester.py
+"""
+Multi-asset portfolio backtester on a shared clock.
+
+All symbols trade out of one cash ledger. Entries are sized with the live risk module:
+- risk_manager.position_sizing: notional = equity * risk_pct / stop distance (capped at 10% of equity),
+  with the stop distance estimated from recent true range at the entry bar
+- risk_manager.risk_parity_allocator: tilts sizes between entries on the same bar by confidence
+- risk_manager.kelly_fraction: scales sizes by each symbol's running Kelly edge once it has a trade record
+- risk_manager.DrawdownProtection: latched kill switch on portfolio drawdown; optionally flattens
+  the book, then reduces (or halts) new entries
+- correlated exposure limit: symbols whose recent returns correlate above a threshold share one
+  exposure budget (fraction of equity)
+
+Long-only with entry/exit signal arrays, like Backtester.run_vectorized. Inputs are
+[n_bars, n_symbols] arrays (memory-mapped arrays work). Per-bar output state lives in
+preallocated [n_bars] arrays and per-symbol state in [n_symbols] arrays, so memory is bounded
+by the inputs. Stretches of bars without signals are evaluated in vectorized blocks; only
+signal bars, stop hits and the kill-switch bar are stepped one at a time.
+"""
+
+import math
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from backend.app.core.logger import logger
+from backend.app.services.backtest.event_backtester import to_epoch
+from backend.app.services.risk_manager import (
+    DrawdownProtection,
+    kelly_fraction,
+    position_sizing,
+    risk_parity_allocator,
+)
+from backend.app.services.slippage import apply_slippage
+
+
+def align_candles(candles: Dict[str, Sequence[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Put per-symbol candle lists on one clock (the union of their timestamps).
+
+    Missing bars are forward-filled (open/high/low = previous close, zero volume) and
+    marked not tradable; bars before a symbol's first candle are back-filled with its
+    first close and also not tradable.
+
+    Returns {"symbols", "timestamps", "opens", "highs", "lows", "closes", "adv", "tradable"}
+    with [n_bars, n_symbols] arrays.
+    """
+    symbols = list(candles)
+    epochs = {s: np.array([to_epoch(c["timestamp"]) for c in candles[s]], dtype=np.float64) for s in symbols}
+    timestamps = np.unique(np.concatenate([e for e in epochs.values()])) if symbols else np.empty(0)
+    n, m = len(timestamps), len(symbols)
+
+    closes = np.full((n, m), np.nan)
+    opens, highs, lows = closes.copy(), closes.copy(), closes.copy()
+    volume = np.zeros((n, m))
+    tradable = np.zeros((n, m), dtype=bool)
+
+    for j, symbol in enumerate(symbols):
+        rows = np.searchsorted(timestamps, epochs[symbol])
+        series = candles[symbol]
+        close = np.array([float(c["close"]) for c in series])
+        closes[rows, j] = close
+        opens[rows, j] = [float(c.get("open") or c["close"]) for c in series]
+        highs[rows, j] = [float(c.get("high") or c["close"]) for c in series]
+        lows[rows, j] = [float(c.get("low") or c["close"]) for c in series]
+        volume[rows, j] = [float(c.get("volume") or 0.0) for c in series]
+        tradable[rows, j] = True
+
+    # Forward-fill closes, then back-fill the leading gap; missing bars are flat at the close
+    valid = ~np.isnan(closes)
+    idx = np.where(valid, np.arange(n)[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    closes = np.take_along_axis(closes, idx, axis=0)
+    if n:
+        first = np.argmax(valid, axis=0)
+        lead = np.arange(n)[:, None] < first[None, :]
+        closes = np.where(lead, closes[first, np.arange(m)][None, :], closes)
+    for arr in (opens, highs, lows):
+        np.copyto(arr, closes, where=np.isnan(arr))
+
+    dollar_volume = closes * volume
+    return {
+        "symbols": symbols,
+        "timestamps": timestamps,
+        "opens": opens,
+        "highs": highs,
+        "lows": lows,
+        "closes": closes,
+        "adv": np.where(dollar_volume > 0, dollar_volume, 1.0),
+        "tradable": tradable,
+    }
+
+
+class PortfolioBacktester:
+    """
+    Usage:
+        data = align_candles({"BTCUSDT": btc, "ETHUSDT": eth})
+        bt = PortfolioBacktester(data["closes"], symbols=data["symbols"], highs=data["highs"],
+                                 lows=data["lows"], opens=data["opens"], adv=data["adv"],
+                                 tradable=data["tradable"], timestamps=data["timestamps"])
+        result = bt.run(entries, exits)          # bool arrays shaped like closes
+        result["equity_curve"], result["metrics"], result["per_symbol"]
+    """
+
+    def __init__(
+        self,
+        closes: np.ndarray,
+        symbols: Optional[List[str]] = None,
+        highs: Optional[np.ndarray] = None,
+        lows: Optional[np.ndarray] = None,
+        opens: Optional[np.ndarray] = None,
+        adv: Optional[np.ndarray] = None,
+        tradable: Optional[np.ndarray] = None,
+        timestamps: Optional[np.ndarray] = None,
+        slippage_apply: Callable = apply_slippage,
+        fee_pct: float = 0.002,
+        risk_pct: float = 0.02,
+        stop_atr_mult: float = 2.0,
+        atr_window: int = 14,
+        min_stop_pct: float = 0.005,
+        use_kelly: bool = True,
+        kelly_min_trades: int = 20,
+        kelly_target: float = 0.25,
+        max_correlated_exposure: float = 0.3,
+        correlation_threshold: float = 0.7,
+        correlation_window: int = 100,
+        max_gross_exposure: float = 1.0,
+        min_notional: float = 10.0,
+        drawdown_protection: Optional[DrawdownProtection] = None,
+        flatten_on_kill: bool = True,
+        halt_on_kill: bool = False,
+        block_bars: int = 65536,
+    ):
+        """
+        Args:
+            closes: [n_bars, n_symbols] close prices on a shared clock (finite everywhere)
+            symbols: Column names (default SYM0..)
+            highs/lows: Used for stop-loss checks and true range (default: closes)
+            opens: Gap fills - a stop gapped through fills at the open (default: the stop price)
+            adv: Liquidity proxy for the slippage model (default 1.0)
+            tradable: False where a symbol has no real bar; entries there are ignored
+            timestamps: [n_bars] epoch seconds for trade records (default: bar index)
+            risk_pct: Fraction of equity risked per trade (position_sizing)
+            stop_atr_mult: Stop distance in average true ranges; min_stop_pct is the floor
+            use_kelly: Scale sizes by min(1, kelly_fraction / kelly_target) after kelly_min_trades
+                       closed trades on that symbol; a symbol with no edge stops trading
+            max_correlated_exposure: Max market value (fraction of equity) across the entry symbol
+                       and held symbols whose returns correlate >= correlation_threshold over
+                       the last correlation_window bars
+            max_gross_exposure: Max total market value as a fraction of equity
+            drawdown_protection: Kill switch settings (max_drawdown_pct, reduction_factor)
+            flatten_on_kill: Close every position on the bar the kill switch fires
+            halt_on_kill: Block new entries once the kill switch is active (else sizes are
+                       reduced by the protection's reduction_factor)
+            block_bars: Max bars evaluated per vectorized block between signal bars
+        """
+        self.closes = closes
+        self.n_bars, self.n_symbols = closes.shape
+        self.symbols = list(symbols) if symbols is not None else [f"SYM{j}" for j in range(self.n_symbols)]
+        if len(self.symbols) != self.n_symbols:
+            raise ValueError("symbols must have one name per closes column")
+        self.highs = highs if highs is not None else closes
+        self.lows = lows if lows is not None else closes
+        self.opens = opens
+        self.adv = adv
+        self.tradable = tradable
+        self.timestamps = timestamps
+        self.slippage_apply = slippage_apply
+        self.fee_pct = fee_pct
+        self.risk_pct = risk_pct
+        self.stop_atr_mult = stop_atr_mult
+        self.atr_window = atr_window
+        self.min_stop_pct = min_stop_pct
+        self.use_kelly = use_kelly
+        self.kelly_min_trades = kelly_min_trades
+        self.kelly_target = kelly_target
+        self.max_correlated_exposure = max_correlated_exposure
+        self.correlation_threshold = correlation_threshold
+        self.correlation_window = correlation_window
+        self.max_gross_exposure = max_gross_exposure
+        self.min_notional = min_notional
+        self.protection = drawdown_protection or DrawdownProtection()
+        self.flatten_on_kill = flatten_on_kill
+        self.halt_on_kill = halt_on_kill
+        self.block_bars = max(1, block_bars)
+
+    @classmethod
+    def from_candles(cls, candles: Dict[str, Sequence[Dict[str, Any]]], **kwargs) -> "PortfolioBacktester":
+        data = align_candles(candles)
+        return cls(
+            data["closes"], symbols=data["symbols"], highs=data["highs"], lows=data["lows"],
+            opens=data["opens"], adv=data["adv"], tradable=data["tradable"],
+            timestamps=data["timestamps"], **kwargs,
+        )
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def run(
+        self,
+        entries: np.ndarray,
+        exits: np.ndarray,
+        confidence: Optional[np.ndarray] = None,
+        initial_cash: float = 10000.0,
+    ) -> Dict[str, Any]:
+        """
+        Simulate the portfolio.
+
+        Args:
+            entries/exits: [n_bars, n_symbols] bool signals (entry wins when both are set)
+            confidence: Optional [n_bars, n_symbols] signal confidence in [0, 1] for risk parity
+                        and for ordering same-bar entries (default 0.5 everywhere)
+            initial_cash: Starting cash
+
+        Returns:
+            {"initial_cash", "final_equity", "equity_curve", "cash_curve", "gross_exposure",
+             "trades", "metrics", "per_symbol", "skipped", "kill_switch_bar"}
+        """
+        shape = (self.n_bars, self.n_symbols)
+        if entries.shape != shape or exits.shape != shape:
+            raise ValueError(f"entries/exits must have shape {shape}")
+        if confidence is not None and confidence.shape != shape:
+            raise ValueError(f"confidence must have shape {shape}")
+
+        n, m = shape
+        self._entries, self._exits, self._confidence = entries, exits, confidence
+        self._cash = float(initial_cash)
+        self._peak = float(initial_cash)
+        self._qty = np.zeros(m)
+        self._entry_price = np.zeros(m)
+        self._entry_notional = np.zeros(m)
+        self._entry_fee = np.zeros(m)
+        self._entry_bar = np.full(m, -1, dtype=np.int64)
+        self._stop = np.zeros(m)
+        self._wins = np.zeros(m, dtype=np.int64)
+        self._losses = np.zeros(m, dtype=np.int64)
+        self._win_sum = np.zeros(m)
+        self._loss_sum = np.zeros(m)
+        self._pnl = np.zeros(m)
+        self._trades: List[Dict[str, Any]] = []
+        self._skipped: Dict[str, int] = {"cash": 0, "correlation": 0, "exposure": 0, "size": 0, "kill_switch": 0}
+        self._kill_bar: Optional[int] = None
+        if self.protection.kill_switch_active:
+            self.protection.reset_kill_switch()
+
+        self._equity = np.empty(n)
+        self._cash_curve = np.empty(n)
+        self._gross = np.empty(n)
+
+        signal_bars = self._signal_bars()
+        k = 0
+        t = 0
+        while t < n:
+            while k < len(signal_bars) and signal_bars[k] < t:
+                k += 1
+            quiet_end = int(signal_bars[k]) if k < len(signal_bars) else n
+            if t < quiet_end:
+                t = self._quiet_block(t, min(quiet_end, t + self.block_bars))
+            else:
+                self._step(t)
+                t += 1
+
+        if n:
+            for j in np.flatnonzero(self._qty > 0):
+                self._close(int(j), n - 1, float(self.closes[n - 1, j]), "end_of_data")
+            self._equity[n - 1] = self._cash
+            self._cash_curve[n - 1] = self._cash
+            self._gross[n - 1] = 0.0
+
+        return {
+            "initial_cash": initial_cash,
+            "final_equity": float(self._equity[-1]) if n else initial_cash,
+            "equity_curve": self._equity,
+            "cash_curve": self._cash_curve,
+            "gross_exposure": self._gross,
+            "trades": self._trades,
+            "metrics": self._metrics(self._equity, initial_cash),
+            "per_symbol": self._per_symbol(),
+            "skipped": dict(self._skipped),
+            "kill_switch_bar": self._kill_bar,
+        }
+
+    # ------------------------------------------------------------------
+    # Bar processing
+    # ------------------------------------------------------------------
+
+    def _signal_bars(self) -> np.ndarray:
+        """Indices of bars with any entry/exit signal, scanned in blocks (inputs may be memory-mapped)."""
+        parts = []
+        for start in range(0, self.n_bars, self.block_bars):
+            stop = min(self.n_bars, start + self.block_bars)
+            rows = np.asarray(self._entries[start:stop]).any(axis=1) | np.asarray(self._exits[start:stop]).any(axis=1)
+            parts.append(np.flatnonzero(rows) + start)
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def _quiet_block(self, start: int, stop: int) -> int:
+        """
+        Bars [start, stop) have no signals, so holdings only change on a stop hit or the
+        kill switch. Mark to market in one shot up to the first such event, step that bar
+        individually and return the next bar to process.
+        """
+        held = np.flatnonzero(self._qty > 0)
+        closes = np.asarray(self.closes[start:stop])
+        values = closes[:, held] @ self._qty[held] if len(held) else np.zeros(stop - start)
+        equity = self._cash + values
+        event = stop - start
+
+        if len(held):
+            hits = np.asarray(self.lows[start:stop])[:, held] <= self._stop[held]
+            rows = np.flatnonzero(hits.any(axis=1))
+            if len(rows):
+                event = int(rows[0])
+        if not self.protection.kill_switch_active:
+            peak = np.maximum(np.maximum.accumulate(equity[:event]), self._peak) if event else np.empty(0)
+            breach = np.flatnonzero((peak - equity[:event]) / peak > self.protection.max_drawdown_pct)
+            if len(breach):
+                event = int(breach[0])
+
+        self._equity[start:start + event] = equity[:event]
+        self._cash_curve[start:start + event] = self._cash
+        self._gross[start:start + event] = values[:event]
+        if event:
+            self._peak = max(self._peak, float(equity[:event].max()))
+        if event < stop - start:
+            self._step(start + event)
+            return start + event + 1
+        return stop
+
+    def _step(self, t: int) -> None:
+        """One bar: stops, exit signals, kill switch, then entries; records equity at the close."""
+        closes = np.asarray(self.closes[t], dtype=np.float64)
+
+        held = np.flatnonzero(self._qty > 0)
+        if len(held):
+            lows = np.asarray(self.lows[t])
+            for j in held[lows[held] <= self._stop[held]]:
+                price = self._stop[j]
+                if self.opens is not None:
+                    price = min(price, float(self.opens[t, j]))
+                self._close(int(j), t, price, "stop_loss")
+
+            entries_row = np.asarray(self._entries[t])
+            exits_row = np.asarray(self._exits[t])
+            for j in np.flatnonzero(exits_row & ~entries_row & (self._qty > 0)):
+                self._close(int(j), t, float(closes[j]), "exit_signal")
+
+        equity = self._cash + float(self._qty @ closes)
+        self._peak = max(self._peak, equity)
+        if not self.protection.kill_switch_active and self._peak > 0:
+            drawdown = (self._peak - equity) / self._peak
+            if drawdown > self.protection.max_drawdown_pct:
+                self.protection.kill_switch_active = True
+                self._kill_bar = t
+                logger.warning(f"Portfolio backtest kill switch at bar {t}: drawdown {drawdown:.2%}")
+                if self.flatten_on_kill:
+                    for j in np.flatnonzero(self._qty > 0):
+                        self._close(int(j), t, float(closes[j]), "kill_switch")
+                    equity = self._cash
+
+        self._enter(t, closes, equity)
+
+        values = self._qty @ closes
+        self._equity[t] = self._cash + values
+        self._cash_curve[t] = self._cash
+        self._gross[t] = values
+
+    def _enter(self, t: int, closes: np.ndarray, equity: float) -> None:
+        candidates = np.asarray(self._entries[t]) & (self._qty == 0)
+        if self.tradable is not None:
+            candidates &= np.asarray(self.tradable[t])
+        candidates = np.flatnonzero(candidates)
+        if not len(candidates):
+            return
+        if self.protection.kill_switch_active and self.halt_on_kill:
+            self._skipped["kill_switch"] += len(candidates)
+            return
+
+        if self._confidence is not None:
+            conf = np.asarray(self._confidence[t])[candidates]
+        else:
+            conf = np.full(len(candidates), 0.5)
+        order = np.argsort(-conf, kind="stable")
+        candidates, conf = candidates[order], conf[order]
+
+        # Risk parity among same-bar entries, rescaled so equal confidences leave sizes unchanged
+        allocations = risk_parity_allocator(
+            [{"strategy": self.symbols[j], "confidence": float(c)} for j, c in zip(candidates, conf)]
+        )
+        allocations = self.protection.apply_drawdown_protection(allocations)
+        tilt = len(allocations)
+
+        for j in candidates:
+            j = int(j)
+            price = float(closes[j])
+            stop_pct = self._stop_pct(t, j, price)
+            notional = position_sizing(equity, self.risk_pct, stop_pct) * allocations.get(self.symbols[j], 0.0) * tilt
+            notional *= self._kelly_multiplier(j)
+            if notional < self.min_notional:
+                self._skipped["size"] += 1
+                continue
+
+            gross = float(self._qty @ closes)
+            gross_room = self.max_gross_exposure * equity - gross
+            if gross_room < self.min_notional:
+                self._skipped["exposure"] += 1
+                continue
+            notional = min(notional, gross_room)
+
+            correlated_room = self.max_correlated_exposure * equity - self._correlated_exposure(t, j, closes)
+            if correlated_room < self.min_notional:
+                self._skipped["correlation"] += 1
+                continue
+            notional = min(notional, correlated_room)
+
+            adv = float(self.adv[t, j]) if self.adv is not None else 1.0
+            fill = self.slippage_apply("buy", price, notional, adv)
+            cost = notional / price * fill + notional * self.fee_pct
+            if cost > self._cash - 1e-8:
+                notional = (self._cash - 1e-8) / (fill / price + self.fee_pct)
+                if notional < self.min_notional:
+                    self._skipped["cash"] += 1
+                    continue
+                fill = self.slippage_apply("buy", price, notional, adv)
+                cost = notional / price * fill + notional * self.fee_pct
+                if cost > self._cash - 1e-8:
+                    self._skipped["cash"] += 1
+                    continue
+
+            qty = notional / price
+            fee = notional * self.fee_pct
+            self._cash -= cost
+            self._qty[j] = qty
+            self._entry_price[j] = fill
+            self._entry_notional[j] = qty * fill
+            self._entry_fee[j] = fee
+            self._entry_bar[j] = t
+            self._stop[j] = fill * (1.0 - stop_pct)
+            self._trades.append({
+                "type": "buy", "symbol": self.symbols[j], "time": self._time(t), "bar": t,
+                "price": fill, "qty": qty, "notional": qty * fill, "fee": fee, "stop": self._stop[j],
+            })
+
+    def _close(self, j: int, t: int, price: float, reason: str) -> None:
+        qty = self._qty[j]
+        adv = float(self.adv[t, j]) if self.adv is not None else 1.0
+        fill = self.slippage_apply("sell", price, self._entry_notional[j], adv)
+        fee = qty * fill * self.fee_pct
+        proceeds = qty * fill - fee
+        pnl = proceeds - self._entry_notional[j] - self._entry_fee[j]
+        self._cash += proceeds
+        self._qty[j] = 0.0
+        self._stop[j] = 0.0
+        self._pnl[j] += pnl
+        if pnl > 0:
+            self._wins[j] += 1
+            self._win_sum[j] += pnl
+        else:
+            self._losses[j] += 1
+            self._loss_sum[j] -= pnl
+        self._trades.append({
+            "type": "sell", "symbol": self.symbols[j], "time": self._time(t), "bar": t, "price": fill,
+            "qty": qty, "notional": qty * fill, "fee": fee, "pnl": pnl, "reason": reason,
+            "bars_held": t - int(self._entry_bar[j]),
+        })
+
+    # ------------------------------------------------------------------
+    # Risk helpers
+    # ------------------------------------------------------------------
+
+    def _stop_pct(self, t: int, j: int, price: float) -> float:
+        """Stop distance as a fraction of price: stop_atr_mult average true ranges, floored at min_stop_pct."""
+        start = max(0, t - self.atr_window)
+        if t - start < 1 or price <= 0:
+            return max(self.min_stop_pct, 0.0)
+        highs = np.asarray(self.highs[start + 1:t + 1, j])
+        lows = np.asarray(self.lows[start + 1:t + 1, j])
+        prev_close = np.asarray(self.closes[start:t, j])
+        true_range = np.maximum(highs, prev_close) - np.minimum(lows, prev_close)
+        return max(self.min_stop_pct, self.stop_atr_mult * float(true_range.mean()) / price)
+
+    def _kelly_multiplier(self, j: int) -> float:
+        if not self.use_kelly:
+            return 1.0
+        trades = self._wins[j] + self._losses[j]
+        if trades < self.kelly_min_trades:
+            return 1.0
+        if self._losses[j] == 0:
+            return 1.0
+        if self._wins[j] == 0:
+            return 0.0
+        win_loss_ratio = (self._win_sum[j] / self._wins[j]) / max(self._loss_sum[j] / self._losses[j], 1e-12)
+        return min(1.0, kelly_fraction(self._wins[j] / trades, win_loss_ratio) / self.kelly_target)
+
+    def _correlated_exposure(self, t: int, j: int, closes: np.ndarray) -> float:
+        """Market value of held symbols whose recent returns correlate with symbol j above the threshold."""
+        held = np.flatnonzero(self._qty > 0)
+        if not len(held):
+            return 0.0
+        start = max(0, t - self.correlation_window)
+        if t - start < 2:
+            return 0.0
+        window = np.asarray(self.closes[start:t + 1])[:, np.concatenate(([j], held))]
+        returns = np.diff(window, axis=0) / window[:-1]
+        std = returns.std(axis=0)
+        if std[0] == 0:
+            return 0.0
+        centered = returns - returns.mean(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = (centered[:, 1:] * centered[:, :1]).mean(axis=0) / (std[1:] * std[0])
+        correlated = held[np.nan_to_num(corr) >= self.correlation_threshold]
+        return float(self._qty[correlated] @ closes[correlated])
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def _time(self, t: int) -> float:
+        return float(self.timestamps[t]) if self.timestamps is not None else float(t)
+
+    @staticmethod
+    def _metrics(equity_curve: np.ndarray, initial_cash: float) -> Dict[str, float]:
+        """Same definitions as Backtester: per-bar returns, Sharpe annualised with sqrt(252)."""
+        if len(equity_curve) < 2:
+            return {"total_return": 0.0, "sharpe": 0.0, "max_drawdown": 0.0}
+        prev, cur = equity_curve[:-1], equity_curve[1:]
+        returns = np.where(prev > 0, (cur - prev) / np.where(prev > 0, prev, 1.0), 0.0)
+        std = float(returns.std())
+        sharpe = float(returns.mean()) / std * math.sqrt(252) if std > 0 else 0.0
+
+        max_dd, peak = 0.0, -math.inf
+        for start in range(0, len(equity_curve), 1 << 16):
+            block = equity_curve[start:start + (1 << 16)]
+            block_peak = np.maximum(np.maximum.accumulate(block), peak)
+            drawdown = np.where(block_peak > 0, (block_peak - block) / np.where(block_peak > 0, block_peak, 1.0), 0.0)
+            max_dd = max(max_dd, float(np.max(drawdown)))
+            peak = float(block_peak[-1])
+        return {
+            "total_return": (float(equity_curve[-1]) - initial_cash) / initial_cash,
+            "sharpe": sharpe,
+            "max_drawdown": max_dd,
+        }
+
+    def _per_symbol(self) -> Dict[str, Dict[str, float]]:
+        stats = {}
+        for j, symbol in enumerate(self.symbols):
+            trades = int(self._wins[j] + self._losses[j])
+            stats[symbol] = {
+                "trades": trades,
+                "win_rate": float(self._wins[j]) / trades if trades else 0.0,
+                "pnl": float(self._pnl[j]),
+            }
+        return stats
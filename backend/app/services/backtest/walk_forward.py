@@ -0,0 +1,306 @@
+# backend/app/services/backtest/walk_forward.py
+"""
+Walk-forward harness with cached feature matrices.
+
+- FeatureCache computes causal indicator columns per (symbol, interval) once and stores
+  them as .npy (+ JSON sidecar with columns and a data fingerprint); later runs memory-map
+  them instead of recomputing
+- walk_forward_splits() yields rolling (or anchored) train/test windows
+- run_walk_forward() tunes each strategy on every train window, scores the chosen params
+  on the following test window, across strategies x symbols in a process pool
+- suggest_strategy_weights() maps out-of-sample Sharpe onto the SignalGenerator weight scale
+
+Strategies are vectorized: factory(params) -> fn(features) -> (entries, exits) over the
+full history. Features are causal, so signals are computed once per params and sliced per
+window without look-ahead.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.app.core.logger import logger
+from backend.app.services.backtest.backtester import Backtester
+from backend.app.services.backtest.hyperparam_tuner import OBJECTIVES
+
+FEATURE_VERSION = 1  # bump when feature definitions change to invalidate caches
+
+
+def compute_features(candles: Sequence[Dict[str, Any]]) -> Tuple[List[str], np.ndarray]:
+    """Causal feature columns for one symbol. Returns (column names, float64 array [n_features, n_bars])."""
+    close = np.fromiter((float(c["close"]) for c in candles), dtype=np.float64, count=len(candles))
+    high = np.fromiter((float(c.get("high") or c["close"]) for c in candles), dtype=np.float64, count=len(candles))
+    low = np.fromiter((float(c.get("low") or c["close"]) for c in candles), dtype=np.float64, count=len(candles))
+    volume = np.fromiter((float(c.get("volume") or 0.0) for c in candles), dtype=np.float64, count=len(candles))
+
+    s_close = pd.Series(close)
+    prev_close = s_close.shift(1)
+    returns = s_close.pct_change().fillna(0.0)
+
+    delta = s_close.diff()
+    avg_gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    avg_loss = (-delta.clip(upper=0)).ewm(alpha=1 / 14, adjust=False).mean()
+    rsi = 100 - 100 / (1 + avg_gain / avg_loss.replace(0.0, np.nan))
+
+    true_range = pd.concat(
+        [pd.Series(high - low), (pd.Series(high) - prev_close).abs(), (pd.Series(low) - prev_close).abs()], axis=1
+    ).max(axis=1)
+    ema_12 = s_close.ewm(span=12, adjust=False).mean()
+    ema_26 = s_close.ewm(span=26, adjust=False).mean()
+    macd = ema_12 - ema_26
+    pv = pd.Series(close * volume)
+
+    columns = {
+        "close": close,
+        "high": high,
+        "low": low,
+        "volume": volume,
+        "returns": returns.to_numpy(),
+        "sma_10": s_close.rolling(10).mean().to_numpy(),
+        "sma_20": s_close.rolling(20).mean().to_numpy(),
+        "sma_50": s_close.rolling(50).mean().to_numpy(),
+        "ema_12": ema_12.to_numpy(),
+        "ema_26": ema_26.to_numpy(),
+        "macd": macd.to_numpy(),
+        "macd_signal": macd.ewm(span=9, adjust=False).mean().to_numpy(),
+        "rsi_14": rsi.fillna(50.0).to_numpy(),
+        "atr_14": true_range.ewm(alpha=1 / 14, adjust=False).mean().to_numpy(),
+        "volatility_20": returns.rolling(20).std(ddof=0).to_numpy(),
+        "vwap_20": (pv.rolling(20).sum() / pd.Series(volume).rolling(20).sum().replace(0.0, np.nan)).to_numpy(),
+    }
+    names = list(columns)
+    return names, np.vstack([np.asarray(columns[n], dtype=np.float64) for n in names])
+
+
+class FeatureMatrix:
+    """Column access over a [n_features, n_bars] (possibly memory-mapped) array."""
+
+    def __init__(self, columns: List[str], data: np.ndarray):
+        self.columns = columns
+        self.data = data
+        self._index = {name: i for i, name in enumerate(columns)}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.data[self._index[name]]
+
+    def __len__(self) -> int:
+        return self.data.shape[1]
+
+
+class FeatureCache:
+    """
+    On-disk cache of feature matrices keyed by (symbol, interval).
+
+    A cached matrix is reused only when the sidecar fingerprint (bar count, first/last
+    timestamp, hash of the closes, FEATURE_VERSION) matches the candles passed in.
+    Writes are atomic (temp file + os.replace).
+    """
+
+    def __init__(self, cache_dir: str = "data/feature_cache"):
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(candles: Sequence[Dict[str, Any]]) -> str:
+        digest = hashlib.sha1()
+        digest.update(np.fromiter((float(c["close"]) for c in candles), dtype=np.float64, count=len(candles)).tobytes())
+        first = candles[0].get("timestamp") if candles else None
+        last = candles[-1].get("timestamp") if candles else None
+        return f"v{FEATURE_VERSION}:{len(candles)}:{first}:{last}:{digest.hexdigest()}"
+
+    def _paths(self, symbol: str, interval: str) -> Tuple[Path, Path]:
+        stem = f"{symbol}_{interval}".replace("/", "-")
+        return self.cache_dir / f"{stem}.npy", self.cache_dir / f"{stem}.json"
+
+    def load(self, symbol: str, interval: str) -> FeatureMatrix:
+        """Memory-map an existing cache entry without re-validating it (workers after get() in the parent)."""
+        data_path, meta_path = self._paths(symbol, interval)
+        meta = json.loads(meta_path.read_text())
+        return FeatureMatrix(meta["columns"], np.load(data_path, mmap_mode="r"))
+
+    def get(self, symbol: str, interval: str, candles: Sequence[Dict[str, Any]]) -> FeatureMatrix:
+        data_path, meta_path = self._paths(symbol, interval)
+        fingerprint = self.fingerprint(candles)
+        if data_path.exists() and meta_path.exists():
+            try:
+                meta = json.loads(meta_path.read_text())
+                if meta.get("fingerprint") == fingerprint:
+                    self.hits += 1
+                    return FeatureMatrix(meta["columns"], np.load(data_path, mmap_mode="r"))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable feature cache for {symbol} {interval}: {e}")
+
+        self.misses += 1
+        columns, data = compute_features(candles)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_data = data_path.with_suffix(".npy.tmp")
+        with open(tmp_data, "wb") as f:
+            np.save(f, data)
+        os.replace(tmp_data, data_path)
+        tmp_meta = meta_path.with_suffix(".json.tmp")
+        tmp_meta.write_text(json.dumps({"fingerprint": fingerprint, "columns": columns}))
+        os.replace(tmp_meta, meta_path)
+        return FeatureMatrix(columns, np.load(data_path, mmap_mode="r"))
+
+
+def walk_forward_splits(
+    n_bars: int, train_bars: int, test_bars: int, step: Optional[int] = None, anchored: bool = False
+) -> Iterator[Tuple[slice, slice]]:
+    """
+    Consecutive (train, test) windows. Rolling by default (fixed-length train window);
+    anchored=True grows the train window from bar 0. step defaults to test_bars, so test
+    windows tile the history without overlap.
+    """
+    step = step or test_bars
+    start = 0
+    while start + train_bars + test_bars <= n_bars:
+        train_start = 0 if anchored else start
+        yield slice(train_start, start + train_bars), slice(start + train_bars, start + train_bars + test_bars)
+        start += step
+
+
+@dataclass
+class WalkForwardStrategy:
+    """A vectorized strategy to validate: factory(params)(features) -> (entries, exits)."""
+
+    name: str
+    factory: Callable[[Dict[str, Any]], Callable[[FeatureMatrix], Tuple[np.ndarray, np.ndarray]]]
+    param_grid: Dict[str, List[Any]]
+
+
+def _window_backtester(features: FeatureMatrix, window: slice, fee_pct: float) -> Backtester:
+    bt = Backtester([], fee_pct=fee_pct)
+    adv = np.array(features["volume"][window], dtype=np.float64)
+    adv[adv == 0.0] = 1.0
+    bt._arrays = (np.asarray(features["close"][window]), adv)
+    return bt
+
+
+def _walk_forward_one(task: Tuple) -> Dict[str, Any]:
+    """Tune on each train window and score on the next test window for one (strategy, symbol)."""
+    (strategy, symbol, interval, cache_dir, train_bars, test_bars, step, anchored,
+     objective, fee_pct, initial_cash) = task
+    score_fn = OBJECTIVES[objective] if isinstance(objective, str) else objective
+    features = FeatureCache(cache_dir).load(symbol, interval)
+
+    # Signals over the full history, once per parameter set
+    keys = list(strategy.param_grid)
+    grid = [dict(zip(keys, combo)) for combo in itertools.product(*(strategy.param_grid[k] for k in keys))]
+    signals = [strategy.factory(params)(features) for params in grid]
+
+    folds = []
+    for train, test in walk_forward_splits(len(features), train_bars, test_bars, step, anchored):
+        bt_train = _window_backtester(features, train, fee_pct)
+        best_i, best_score = 0, float("-inf")
+        for i, (entries, exits) in enumerate(signals):
+            score = score_fn(bt_train.run_vectorized(entries[train], exits[train], initial_cash=initial_cash))
+            if score > best_score:
+                best_i, best_score = i, score
+
+        entries, exits = signals[best_i]
+        backtester = _window_backtester(features, test, fee_pct)
+        result = backtester.run_vectorized(entries[test], exits[test], initial_cash=initial_cash)
+        folds.append({
+            "train": (train.start, train.stop),
+            "test": (test.start, test.stop),
+            "params": grid[best_i],
+            "train_score": best_score,
+            "test_score": score_fn(result),
+            "sharpe": result["sharpe"],
+            "total_return": result["total_return"],
+            "max_drawdown": result["max_drawdown"],
+            "trades": sum(1 for t in result["trades"] if t["type"] != "buy"),
+        })
+    return {"strategy": strategy.name, "symbol": symbol, "folds": folds}
+
+
+def run_walk_forward(
+    candles: Dict[str, Sequence[Dict[str, Any]]],
+    strategies: List[WalkForwardStrategy],
+    interval: str = "1m",
+    train_bars: int = 5000,
+    test_bars: int = 1000,
+    step: Optional[int] = None,
+    anchored: bool = False,
+    objective: str = "sharpe",
+    cache_dir: str = "data/feature_cache",
+    workers: int = 1,
+    fee_pct: float = 0.002,
+    initial_cash: float = 10000.0,
+) -> Dict[str, Any]:
+    """
+    Walk-forward validation of every strategy on every symbol.
+
+    Returns {"strategies": {name: out-of-sample summary}, "runs": [per (strategy, symbol) folds]}.
+    The summary averages test-window metrics across all folds and symbols, and counts
+    how often a positive train score carried over to a positive test score.
+    workers > 1 spreads (strategy, symbol) pairs over a process pool (factories must be picklable).
+    """
+    # Build/validate the feature cache once in this process; workers only memory-map it
+    cache = FeatureCache(cache_dir)
+    for symbol, series in candles.items():
+        cache.get(symbol, interval, series)
+    logger.info(f"Feature cache: {cache.hits} hit(s), {cache.misses} computed ({cache_dir})")
+
+    tasks = [
+        (strategy, symbol, interval, cache_dir, train_bars, test_bars, step, anchored, objective, fee_pct, initial_cash)
+        for strategy in strategies
+        for symbol in candles
+    ]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            runs = list(pool.map(_walk_forward_one, tasks))
+    else:
+        runs = [_walk_forward_one(task) for task in tasks]
+
+    summary: Dict[str, Dict[str, Any]] = {}
+    for strategy in strategies:
+        folds = [f for run in runs if run["strategy"] == strategy.name for f in run["folds"]]
+        if not folds:
+            summary[strategy.name] = {"folds": 0}
+            continue
+        positive_train = [f for f in folds if f["train_score"] > 0]
+        summary[strategy.name] = {
+            "folds": len(folds),
+            "oos_sharpe": float(np.mean([f["sharpe"] for f in folds])),
+            "oos_return": float(np.mean([f["total_return"] for f in folds])),
+            "oos_max_drawdown": float(np.max([f["max_drawdown"] for f in folds])),
+            "oos_trades": int(sum(f["trades"] for f in folds)),
+            "oos_hit_rate": float(np.mean([f["total_return"] > 0 for f in folds])),
+            "consistency": (
+                sum(1 for f in positive_train if f["test_score"] > 0) / len(positive_train) if positive_train else 0.0
+            ),
+        }
+        oos_sharpe = summary[strategy.name]["oos_sharpe"]
+        logger.info(f"Walk-forward {strategy.name}: OOS Sharpe {oos_sharpe:.2f} over {len(folds)} folds")
+
+    return {"strategies": summary, "runs": runs}
+
+
+def suggest_strategy_weights(
+    summary: Dict[str, Dict[str, Any]], min_weight: float = 0.5, max_weight: float = 3.0
+) -> Dict[str, float]:
+    """
+    Map out-of-sample Sharpe onto the SignalGenerator.strategy_weights scale.
+
+    Strategies with no out-of-sample trades or a non-positive OOS Sharpe get min_weight;
+    the rest scale linearly up to max_weight for the best OOS Sharpe.
+    """
+    sharpes = {name: s.get("oos_sharpe", 0.0) if s.get("oos_trades") else 0.0 for name, s in summary.items()}
+    best = max([v for v in sharpes.values() if v > 0], default=0.0)
+    weights = {}
+    for name, sharpe in sharpes.items():
+        if sharpe <= 0 or best <= 0:
+            weights[name] = min_weight
+        else:
+            weights[name] = round(min_weight + (max_weight - min_weight) * sharpe / best, 2)
+    return weights
@@ -0,0 +1,322 @@
+"""
+Signal cooldown store.
+- Tracks (strategy, symbol, action) -> cooldown expiry for duplicate-signal suppression
+- Time-bucketed expiry: keys are grouped into fixed-width buckets ordered by a heap,
+  so expired keys are evicted a whole bucket at a time (amortised O(1) per key)
+- Bounded memory: once max_entries is reached the soonest-expiring keys are dropped
+- Pluggable persistence so cooldowns survive restarts/redeploys (SQLite or Postgres);
+  the SQL backend writes from a background thread so mark() never blocks the event loop
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from backend.app.core.logger import logger
+
+CooldownKey = Tuple[str, str, str]  # (strategy, symbol, action)
+
+
+class CooldownBackend:
+    """Persistence interface for cooldown stores. Times are UTC epoch seconds."""
+
+    def load(self, namespace: str, now: float) -> Iterable[Tuple[CooldownKey, float, float]]:
+        """Return (key, marked_at, expires_at) for every unexpired cooldown in a namespace."""
+        raise NotImplementedError
+
+    def save(self, namespace: str, key: CooldownKey, marked_at: float, expires_at: float) -> None:
+        """Insert or replace one cooldown."""
+        raise NotImplementedError
+
+    def purge(self, namespace: str, now: float) -> None:
+        """Delete expired cooldowns."""
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Wait until every save() so far is written."""
+
+
+class SQLCooldownBackend(CooldownBackend):
+    """
+    Cooldown persistence in a `signal_cooldowns` table via SQLAlchemy Core.
+    Works with SQLite and Postgres URLs; async driver suffixes are stripped
+    because cooldown writes are rare and tiny. save() hands the write to a single
+    background thread (in order); flush() waits for it.
+    """
+
+    def __init__(self, database_url: str, background: bool = True):
+        from sqlalchemy import Column, Float, MetaData, String, Table, create_engine
+        from sqlalchemy.engine import make_url
+
+        url = database_url.replace("+aiosqlite", "").replace("+asyncpg", "")
+        sqlite_path = make_url(url).database if url.startswith("sqlite") else None
+        if sqlite_path and sqlite_path != ":memory:":
+            Path(sqlite_path).parent.mkdir(parents=True, exist_ok=True)
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cooldown-writer") if background else None
+        self.engine = create_engine(url, future=True)
+        self.metadata = MetaData()
+        self.table = Table(
+            "signal_cooldowns",
+            self.metadata,
+            Column("namespace", String(64), primary_key=True),
+            Column("strategy", String(64), primary_key=True),
+            Column("symbol", String(32), primary_key=True),
+            Column("action", String(16), primary_key=True),
+            Column("marked_at", Float, nullable=False),
+            Column("expires_at", Float, nullable=False, index=True),
+        )
+        self.metadata.create_all(self.engine)
+
+    def load(self, namespace: str, now: float) -> Iterable[Tuple[CooldownKey, float, float]]:
+        from sqlalchemy import select
+
+        t = self.table
+        stmt = select(t.c.strategy, t.c.symbol, t.c.action, t.c.marked_at, t.c.expires_at).where(
+            t.c.namespace == namespace, t.c.expires_at > now
+        )
+        with self.engine.connect() as conn:
+            return [((r.strategy, r.symbol, r.action), r.marked_at, r.expires_at) for r in conn.execute(stmt)]
+
+    def save(self, namespace: str, key: CooldownKey, marked_at: float, expires_at: float) -> None:
+        if self._writer is None:
+            self._save(namespace, key, marked_at, expires_at)
+        else:
+            self._writer.submit(self._save_logged, namespace, key, marked_at, expires_at)
+
+    def flush(self) -> None:
+        if self._writer is not None:
+            self._writer.submit(lambda: None).result()
+
+    def _save_logged(self, namespace: str, key: CooldownKey, marked_at: float, expires_at: float) -> None:
+        try:
+            self._save(namespace, key, marked_at, expires_at)
+        except Exception as exc:
+            logger.warning(f"Could not persist cooldown {key} ({namespace}): {exc}")
+
+    def _save(self, namespace: str, key: CooldownKey, marked_at: float, expires_at: float) -> None:
+        t = self.table
+        strategy, symbol, action = key
+        with self.engine.begin() as conn:
+            conn.execute(
+                t.delete().where(
+                    t.c.namespace == namespace, t.c.strategy == strategy, t.c.symbol == symbol, t.c.action == action
+                )
+            )
+            conn.execute(
+                t.insert().values(
+                    namespace=namespace, strategy=strategy, symbol=symbol, action=action,
+                    marked_at=marked_at, expires_at=expires_at,
+                )
+            )
+
+    def purge(self, namespace: str, now: float) -> None:
+        t = self.table
+        with self.engine.begin() as conn:
+            conn.execute(t.delete().where(t.c.namespace == namespace, t.c.expires_at <= now))
+
+
+class CooldownStore:
+    """
+    Expiring dedup index for signal cooldowns.
+
+    Each key maps to (marked_at, expires_at). Keys are also placed in the time
+    bucket floor(expires_at / bucket_seconds); bucket ids live in a min-heap, so
+    eviction only ever touches buckets that have fully expired.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl_seconds: float,
+        bucket_seconds: float = 60.0,
+        max_entries: int = 50_000,
+        backend: Optional[CooldownBackend] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.bucket_seconds = bucket_seconds
+        self.max_entries = max_entries
+        self.backend = backend
+        self.clock = clock  # epoch seconds; backtests swap in the simulated bar clock
+
+        self._entries: Dict[CooldownKey, Tuple[float, float]] = {}
+        self._buckets: Dict[int, Set[CooldownKey]] = {}
+        self._bucket_heap: List[int] = []
+
+        if backend is not None:
+            self.load_from_backend()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def mark(self, key: CooldownKey, ttl_seconds: Optional[float] = None, now: Optional[float] = None) -> None:
+        """Start (or restart) the cooldown for a key."""
+        now = self.clock() if now is None else now
+        expires_at = now + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        self._insert(key, now, expires_at)
+
+        if self.backend is not None:
+            try:
+                self.backend.save(self.namespace, key, now, expires_at)
+            except Exception as exc:
+                logger.warning(f"Could not persist cooldown {key} ({self.namespace}): {exc}")
+
+    def is_active(self, key: CooldownKey, now: Optional[float] = None) -> bool:
+        """True if the key is still inside its cooldown window."""
+        return self.remaining(key, now) > 0.0
+
+    def remaining(self, key: CooldownKey, now: Optional[float] = None) -> float:
+        """Seconds left in the key's cooldown (0.0 if none)."""
+        now = self.clock() if now is None else now
+        self._evict_expired(now)
+        entry = self._entries.get(key)
+        if entry is None:
+            return 0.0
+        return max(0.0, entry[1] - now)
+
+    def last_marked(self, key: CooldownKey) -> Optional[datetime]:
+        """UTC time the key was last marked, if it is still tracked."""
+        entry = self._entries.get(key)
+        return datetime.utcfromtimestamp(entry[0]) if entry else None
+
+    def items(self, now: Optional[float] = None) -> Dict[CooldownKey, datetime]:
+        """Active cooldowns as key -> marked_at (naive UTC)."""
+        self._evict_expired(self.clock() if now is None else now)
+        return {key: datetime.utcfromtimestamp(marked) for key, (marked, _) in self._entries.items()}
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._buckets.clear()
+        self._bucket_heap.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def entries(self, now: Optional[float] = None) -> List[Tuple[CooldownKey, float, float]]:
+        """(key, marked_at, expires_at) for every active cooldown (state snapshots)."""
+        now = self.clock() if now is None else now
+        self._evict_expired(now)
+        return [(key, marked, expires) for key, (marked, expires) in self._entries.items() if expires > now]
+
+    def merge(self, rows: Iterable[Tuple[CooldownKey, float, float]], now: Optional[float] = None) -> int:
+        """Add unexpired (key, marked_at, expires_at) rows, keeping the later expiry. Returns the number added."""
+        now = self.clock() if now is None else now
+        added = 0
+        for key, marked_at, expires_at in rows:
+            key = tuple(key)
+            current = self._entries.get(key)
+            if expires_at > now and (current is None or current[1] < expires_at):
+                self._insert(key, marked_at, expires_at)
+                added += 1
+        return added
+
+    def load_from_backend(self, now: Optional[float] = None) -> int:
+        """Load unexpired cooldowns from the persistence backend. Returns the number loaded."""
+        if self.backend is None:
+            return 0
+        now = self.clock() if now is None else now
+        try:
+            self.backend.purge(self.namespace, now)
+            rows = list(self.backend.load(self.namespace, now))
+        except Exception as exc:
+            logger.warning(f"Could not load persisted cooldowns ({self.namespace}): {exc}")
+            return 0
+        self.merge(rows, now)
+        if rows:
+            logger.info(f"Restored {len(rows)} signal cooldowns ({self.namespace})")
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _bucket_id(self, expires_at: float) -> int:
+        return int(math.floor(expires_at / self.bucket_seconds))
+
+    def _insert(self, key: CooldownKey, marked_at: float, expires_at: float) -> None:
+        self._entries[key] = (marked_at, expires_at)
+        bucket_id = self._bucket_id(expires_at)
+        bucket = self._buckets.get(bucket_id)
+        if bucket is None:
+            bucket = self._buckets[bucket_id] = set()
+            heapq.heappush(self._bucket_heap, bucket_id)
+        bucket.add(key)
+
+        if len(self._entries) > self.max_entries:
+            self._evict_overflow()
+
+    def _evict_expired(self, now: float) -> None:
+        """Drop every bucket whose whole time range has passed."""
+        current_bucket = self._bucket_id(now)
+        while self._bucket_heap and self._bucket_heap[0] < current_bucket:
+            self._drop_bucket(heapq.heappop(self._bucket_heap), expired_before=now)
+
+    def _evict_overflow(self) -> None:
+        """Drop the soonest-expiring keys until the store is back under max_entries."""
+        while len(self._entries) > self.max_entries and self._bucket_heap:
+            bucket_id = self._bucket_heap[0]
+            bucket = self._buckets.get(bucket_id, set())
+            while bucket and len(self._entries) > self.max_entries:
+                key = bucket.pop()
+                entry = self._entries.get(key)
+                if entry is not None and self._bucket_id(entry[1]) == bucket_id:
+                    del self._entries[key]
+            if not bucket:
+                heapq.heappop(self._bucket_heap)
+                self._buckets.pop(bucket_id, None)
+
+    def _drop_bucket(self, bucket_id: int, expired_before: float) -> None:
+        for key in self._buckets.pop(bucket_id, ()):
+            entry = self._entries.get(key)
+            # A key re-marked since it entered this bucket lives in a later bucket now
+            if entry is not None and entry[1] <= expired_before and self._bucket_id(entry[1]) == bucket_id:
+                del self._entries[key]
+
+
+# ----------------------------------------------------------------------
+# Shared stores
+# ----------------------------------------------------------------------
+
+_stores: Dict[str, CooldownStore] = {}
+_backend: Optional[CooldownBackend] = None
+
+
+def get_cooldown_store(namespace: str, ttl_seconds: float = 6 * 3600, **kwargs) -> CooldownStore:
+    """Get or create the shared cooldown store for a namespace."""
+    store = _stores.get(namespace)
+    if store is None:
+        store = _stores[namespace] = CooldownStore(namespace, ttl_seconds, backend=_backend, **kwargs)
+    return store
+
+
+def set_cooldown_backend(backend: Optional[CooldownBackend]) -> None:
+    """Attach a persistence backend to every shared store (existing and future) and restore state."""
+    global _backend
+    _backend = backend
+    for store in _stores.values():
+        store.backend = backend
+        store.load_from_backend()
+
+
+def flush_cooldown_backend() -> None:
+    """Wait for pending cooldown writes of the shared backend (shutdown)."""
+    if _backend is not None:
+        try:
+            _backend.flush()
+        except Exception as exc:
+            logger.warning(f"Could not flush persisted cooldowns: {exc}")
+
+
+def reset_cooldown_stores() -> None:
+    """Forget all shared stores and the backend (used by tests)."""
+    global _backend
+    _stores.clear()
+    _backend = None
@@ -17,13 +17,25 @@ class BinanceMarketDataAdapter:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
 
-    async def get_klines(self, symbol: str, interval: str = "1m", limit: int = 500) -> List[Dict[str, Any]]:
+    async def get_klines(
+        self,
+        symbol: str,
+        interval: str = "1m",
+        limit: int = 500,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Returns list of candles: [{open_time, open, high, low, close, volume, close_time, ...}, ...]
         symbol: e.g., "BTCUSDT"
+        start_time/end_time: optional open-time bounds in epoch ms (Binance allows limit up to 1000)
         """
         url = f"{self.base_url}/klines"
         params = {"symbol": symbol.upper(), "interval": interval, "limit": limit}
+        if start_time is not None:
+            params["startTime"] = int(start_time)
+        if end_time is not None:
+            params["endTime"] = int(end_time)
         async with httpx.AsyncClient(timeout=self.timeout) as client:
             r = await client.get(url, params=params)
             r.raise_for_status()
@@ -61,12 +73,21 @@ class OandaMarketDataAdapter:
         self.account_id = getattr(settings, "OANDA_ACCOUNT_ID", None)
         self.base_url = getattr(settings, "OANDA_API_BASE", "https://api-fxpractice.oanda.com")
 
-    async def get_candles(self, instrument: str, granularity: str = "M1", count: int = 200) -> List[Dict[str, Any]]:
+    async def get_candles(
+        self,
+        instrument: str,
+        granularity: str = "M1",
+        count: int = 200,
+        from_time: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """from_time: optional RFC3339 start; OANDA returns up to `count` (max 5000) candles from there."""
         if not self.token or not self.account_id:
             raise RuntimeError("OANDA_API_TOKEN or OANDA_ACCOUNT_ID not configured")
         url = f"{self.base_url}/v3/instruments/{instrument}/candles"
         headers = {"Authorization": f"Bearer {self.token}"}
         params = {"granularity": granularity, "count": count, "price": "M"}
+        if from_time is not None:
+            params["from"] = from_time
         async with httpx.AsyncClient(timeout=20) as client:
             r = await client.get(url, headers=headers, params=params)
             r.raise_for_status()
@@ -79,7 +100,8 @@ class OandaMarketDataAdapter:
                 "high": float(c["mid"]["h"]),
                 "low": float(c["mid"]["l"]),
                 "close": float(c["mid"]["c"]),
-                "volume": int(c.get("volume", 0))
+                "volume": int(c.get("volume", 0)),
+                "complete": bool(c.get("complete", True)),
             })
         return out
 
@@ -6,24 +6,14 @@ without requiring user accounts or API keys where possible.
 
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
+from importlib.util import find_spec
 import re
 from collections import defaultdict
 
-import requests
-from bs4 import BeautifulSoup
-
-# Try importing optional dependencies
-try:
-    import praw  # Reddit API
-    REDDIT_AVAILABLE = True
-except ImportError:
-    REDDIT_AVAILABLE = False
-
-try:
-    from tradingview_ta import TA_Handler
-    TRADINGVIEW_AVAILABLE = True
-except ImportError:
-    TRADINGVIEW_AVAILABLE = False
+# Optional dependencies: only probed here, imported on first use (praw alone pulls in
+# ~0.3s of update_checker/requests at start-up and is not used until Reddit is wired up)
+REDDIT_AVAILABLE = find_spec("praw") is not None
+TRADINGVIEW_AVAILABLE = find_spec("tradingview_ta") is not None
 
 
 class ExternalSignalAggregator:
@@ -49,6 +39,8 @@ class ExternalSignalAggregator:
             return signals
         
         try:
+            from tradingview_ta import TA_Handler
+            
             # Convert symbol format (BTCUSDT -> BTCUSDT for crypto)
             tv_symbol = symbol.replace("USDT", "").replace("USD", "")
             
@@ -1,5 +1,10 @@
 # backend/app/services/slippage.py
-from typing import Dict
+from typing import Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+ArrayLike = Union[float, np.ndarray]
+
 
 def compute_slippage_pct(size_notional: float, avg_daily_volume: float, base_slippage: float = 0.0005) -> float:
     """
@@ -28,3 +33,93 @@ def apply_slippage(side: str, price: float, size_notional: float, avg_daily_volu
         return price * (1.0 + pct)
     else:
         return price * (1.0 - pct)
+
+
+# ----------------------------------------------------------------------
+# Array versions (vectorized engines, Monte Carlo cost stress tests)
+# ----------------------------------------------------------------------
+
+def side_sign(side) -> np.ndarray:
+    """
+    +1 for buys, -1 for sells.
+    Accepts "buy"/"sell" strings (any case, scalar or array) or numbers (> 0 is a buy);
+    like apply_slippage, anything that is not a buy is treated as a sell.
+    """
+    side = np.asarray(side)
+    if side.dtype.kind in "USO":
+        return np.where(np.char.lower(side.astype(str)) == "buy", 1.0, -1.0)
+    return np.where(side > 0, 1.0, -1.0)
+
+
+def compute_slippage_pct_array(
+    size_notional: ArrayLike,
+    avg_daily_volume: ArrayLike,
+    base_slippage: ArrayLike = 0.0005,
+    k: float = 0.005,
+    volatility: Optional[ArrayLike] = None,
+    impact_coef: Optional[float] = None,
+    spread_vol_mult: float = 0.0,
+) -> np.ndarray:
+    """
+    Array version of compute_slippage_pct (inputs broadcast against each other).
+
+    With only size, ADV and base_slippage it is the scalar formula element-wise:
+    base + k * sqrt(size / adv), and base alone where adv <= 0. Optional terms:
+    - impact_coef: replace the k term with the square-root impact law
+      impact_coef * volatility * sqrt(size / adv) (cost scales with the asset's volatility;
+      needs `volatility`, the return std over the ADV horizon, e.g. daily)
+    - spread_vol_mult: add a half-spread of spread_vol_mult * volatility (quotes widen in
+      volatile markets); applied to every fill, including adv <= 0
+    """
+    size = np.asarray(size_notional, dtype=np.float64)
+    adv = np.asarray(avg_daily_volume, dtype=np.float64)
+    if (impact_coef is not None or spread_vol_mult) and volatility is None:
+        raise ValueError("volatility is required for impact_coef / spread_vol_mult")
+
+    liquid = adv > 0
+    ratio = np.divide(size, adv, out=np.zeros(np.broadcast(size, adv).shape), where=liquid)
+    root = np.sqrt(np.maximum(ratio, 0.0))
+    if impact_coef is None:
+        impact = k * root
+    else:
+        impact = impact_coef * np.asarray(volatility, dtype=np.float64) * root
+    pct = np.asarray(base_slippage, dtype=np.float64) + np.where(liquid, impact, 0.0)
+    if spread_vol_mult:
+        pct = pct + spread_vol_mult * np.asarray(volatility, dtype=np.float64)
+    return pct
+
+
+def apply_slippage_array(side, price: ArrayLike, size_notional: ArrayLike, avg_daily_volume: ArrayLike,
+                         **model) -> np.ndarray:
+    """
+    Array version of apply_slippage: price * (1 + pct) for buys, price * (1 - pct) for sells.
+    `model` takes the optional compute_slippage_pct_array terms.
+    """
+    pct = compute_slippage_pct_array(size_notional, avg_daily_volume, **model)
+    return np.asarray(price, dtype=np.float64) * (1.0 + side_sign(side) * pct)
+
+
+def fill_costs_array(side, price: ArrayLike, size_notional: ArrayLike, avg_daily_volume: ArrayLike,
+                     fee_pct: float = 0.002, **model) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fill prices and fees for a batch of orders of `size_notional` at reference `price`.
+    Quantity is size_notional / price; the fee is fee_pct of the filled notional (qty * fill).
+    """
+    price = np.asarray(price, dtype=np.float64)
+    fill = apply_slippage_array(side, price, size_notional, avg_daily_volume, **model)
+    qty = np.divide(np.asarray(size_notional, dtype=np.float64), price,
+                    out=np.zeros(np.broadcast(size_notional, price).shape), where=price > 0)
+    return fill, qty * fill * fee_pct
+
+
+def make_slippage_apply(volatility: Optional[float] = None, **model) -> Callable[[str, float, float, float], float]:
+    """
+    Scalar (side, price, size_notional, adv) -> fill price callable for the backtesters'
+    `slippage_apply` hook, backed by the array model with a fixed volatility.
+    """
+    params: Dict = dict(model, volatility=volatility)
+
+    def slippage_apply(side: str, price: float, size_notional: float, avg_daily_volume: float) -> float:
+        return float(apply_slippage_array(side, price, size_notional, avg_daily_volume, **params))
+
+    return slippage_apply
@@ -3,6 +3,8 @@ Optional WebSocket connector for Binance real-time data.
 - Connects to Binance WebSocket trades stream for configured symbols
 - Writes trade messages to ephemeral in-memory buffer
 - Periodically flushes top-of-book snapshots into orderbook_snapshots
+- Builds 1m OHLCV candles from the trades; closed candles can be stored as price ticks
+  and are passed to candle listeners (event-driven signal generator)
 - Reconnects with exponential backoff
 """
 
@@ -13,18 +15,55 @@ import json
 import time
 from collections import defaultdict, deque
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any, Deque
+from typing import Callable, Dict, List, Optional, Any, Deque
 
 import websockets
 from websockets.exceptions import ConnectionClosed, WebSocketException
 
 from backend.app.core.config import settings
 from backend.app.core.logger import logger
-from backend.app.db.models import OrderbookSnapshot, DataSource
+from backend.app.db.models import OrderbookSnapshot, DataSource, PriceTick
 from backend.app.db.session import get_session
 from sqlmodel import select
 
 
+class TradeCandleAggregator:
+    """
+    Fixed-interval OHLCV candles per symbol from a trade stream. A candle closes when the
+    first trade of a later interval arrives (add_trade() then returns it); trades older
+    than the forming candle are ignored.
+    """
+    
+    def __init__(self, interval_seconds: int = 60):
+        self.interval_ms = interval_seconds * 1000
+        self.forming: Dict[str, Dict[str, Any]] = {}
+    
+    def add_trade(self, trade: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Add a parsed trade; returns the candle it closed, if any."""
+        trade_ms = trade.get("timestamp") or 0
+        if not trade_ms:
+            return None
+        symbol, price, quantity = trade["symbol"], trade["price"], trade.get("quantity", 0.0)
+        start_ms = trade_ms - trade_ms % self.interval_ms
+        bar = self.forming.get(symbol)
+        if bar is not None and start_ms == bar["start_ms"]:
+            bar["high"] = max(bar["high"], price)
+            bar["low"] = min(bar["low"], price)
+            bar["close"] = price
+            bar["volume"] += quantity
+            bar["trades"] += 1
+            return None
+        if bar is not None and start_ms < bar["start_ms"]:
+            return None
+        self.forming[symbol] = {
+            "symbol": symbol, "start_ms": start_ms, "open": price, "high": price, "low": price,
+            "close": price, "volume": quantity, "trades": 1,
+        }
+        if bar is None:
+            return None
+        return dict(bar, timestamp=datetime.fromtimestamp(bar["start_ms"] / 1000, tz=timezone.utc).replace(tzinfo=None))
+
+
 class BinanceWebSocketCollector:
     """WebSocket collector for Binance real-time trade data."""
     
@@ -34,7 +73,9 @@ class BinanceWebSocketCollector:
         buffer_size: int = 1000,
         flush_interval: int = 30,  # seconds
         max_reconnect_attempts: int = 10,
-        base_reconnect_delay: float = 1.0
+        base_reconnect_delay: float = 1.0,
+        candle_interval: int = 60,  # seconds
+        persist_candles: bool = False,
     ):
         self.symbols = symbols or getattr(settings, "CRYPTO_SYMBOLS", ["BTCUSDT", "ETHUSDT"])
         self.buffer_size = buffer_size
@@ -46,6 +87,16 @@ class BinanceWebSocketCollector:
         self.trade_buffers: Dict[str, Deque[Dict[str, Any]]] = defaultdict(lambda: deque(maxlen=buffer_size))
         self.orderbook_snapshots: Dict[str, Dict[str, Any]] = {}
         
+        # Callbacks notified with every parsed trade (e.g. live price cache)
+        self.trade_listeners: List[Callable[[Dict[str, Any]], None]] = []
+        
+        # Candles built from the trades; closed ones go to the candle listeners, after being
+        # stored as price ticks when persist_candles is set
+        self.candles = TradeCandleAggregator(candle_interval)
+        self.candle_listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self.persist_candles = persist_candles
+        self._source_id: Optional[str] = None
+        
         # Connection state
         self.websocket: Optional[websockets.WebSocketServerProtocol] = None
         self.is_running = False
@@ -149,6 +200,16 @@ class BinanceWebSocketCollector:
             logger.error(f"Error parsing trade message: {exc}")
             return None
     
+    def add_trade_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Register a callback that receives every parsed trade message."""
+        if listener not in self.trade_listeners:
+            self.trade_listeners.append(listener)
+    
+    def add_candle_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Register a callback that receives every closed candle."""
+        if listener not in self.candle_listeners:
+            self.candle_listeners.append(listener)
+    
     async def process_trade_message(self, trade_data: Dict[str, Any]):
         """Process and buffer trade message."""
         symbol = trade_data["symbol"]
@@ -156,6 +217,16 @@ class BinanceWebSocketCollector:
         # Add to trade buffer
         self.trade_buffers[symbol].append(trade_data)
         
+        for listener in self.trade_listeners:
+            try:
+                listener(trade_data)
+            except Exception as exc:
+                logger.debug(f"Trade listener error for {symbol}: {exc}")
+        
+        closed = self.candles.add_trade(trade_data)
+        if closed is not None:
+            await self.close_candle(closed)
+        
         # Update orderbook snapshot (simplified - using last trade as reference)
         self.orderbook_snapshots[symbol] = {
             "symbol": symbol,
@@ -166,6 +237,38 @@ class BinanceWebSocketCollector:
             "is_buyer_maker": trade_data["is_buyer_maker"]
         }
     
+    async def close_candle(self, candle: Dict[str, Any]) -> None:
+        """Store a closed candle as a price tick (persist_candles) and pass it to the candle listeners."""
+        if self.persist_candles:
+            try:
+                if self._source_id is None:
+                    self._source_id = await self.get_data_source_id()
+                async for session in get_session():
+                    session.add(PriceTick(
+                        source_id=self._source_id,
+                        symbol=candle["symbol"],
+                        market="crypto",
+                        price=candle["close"],
+                        open=candle["open"],
+                        high=candle["high"],
+                        low=candle["low"],
+                        volume=candle["volume"],
+                        ts=candle["timestamp"],
+                        received_at=datetime.utcnow(),
+                        extra={"interval_ms": self.candles.interval_ms, "trades": candle["trades"], "stream": "trade"},
+                    ))
+                    await session.commit()
+                    break
+            except Exception as exc:
+                logger.warning(f"Could not store {candle['symbol']} candle: {exc}")
+                return
+        
+        for listener in self.candle_listeners:
+            try:
+                listener(candle)
+            except Exception as exc:
+                logger.debug(f"Candle listener error for {candle['symbol']}: {exc}")
+    
     async def flush_orderbook_snapshots(self):
         """Flush orderbook snapshots to database."""
         if not self.orderbook_snapshots:
@@ -343,6 +446,13 @@ async def stop_binance_collector():
         await _collector.stop()
 
 
+def get_running_collector() -> Optional[BinanceWebSocketCollector]:
+    """Return the global collector if it has been started, otherwise None."""
+    if _collector and _collector.is_running:
+        return _collector
+    return None
+
+
 def get_collector_stats() -> Dict[str, Any]:
     """Get statistics from the Binance collector."""
     global _collector
@@ -1,57 +1,51 @@
 """
 Trading Strategies Module
 Exports all strategy classes for easy importing.
+
+The classes are resolved on first attribute access (PEP 562), so importing one strategy
+module - which imports this package first - no longer imports every strategy and its
+dependencies. See registry.py for the name -> class entry points.
 """
 
-# INSTITUTIONAL-LEVEL STRATEGIES (Highest Priority)
-from backend.app.strategies.vwap_strategy import VWAPStrategy
-from backend.app.strategies.support_resistance import SupportResistanceStrategy
-from backend.app.strategies.order_blocks import OrderBlocksStrategy
-from backend.app.strategies.fair_value_gaps import FairValueGapsStrategy
-from backend.app.strategies.market_structure import MarketStructureStrategy
-from backend.app.strategies.volume_profile import VolumeProfileStrategy
-from backend.app.strategies.liquidity_zones import LiquidityZonesStrategy
-
-# TECHNICAL INDICATOR STRATEGIES
-from backend.app.strategies.rsi_macd_momentum import RSI_MACD_MomentumStrategy
-from backend.app.strategies.volume_breakout import VolumeBreakoutStrategy
-from backend.app.strategies.trend_following import TrendFollowingStrategy
-from backend.app.strategies.mean_reversion import MeanReversionStrategy
-from backend.app.strategies.momentum import MomentumStrategy
-from backend.app.strategies.breakout import BreakoutStrategy
-from backend.app.strategies.volatility_breakout import VolatilityBreakoutStrategy
-
-# SENTIMENT/SOCIAL STRATEGIES
-from backend.app.strategies.sentiment import SentimentStrategy
-from backend.app.strategies.sentiment_filter import SentimentFilterStrategy
-from backend.app.strategies.social_copy import SocialCopyStrategy
-from backend.app.strategies.arbitrage import ArbitrageStrategy
-
-# Base class
-from backend.app.strategies.base import StrategyBase
-
-__all__ = [
-    # Institutional-level
-    "VWAPStrategy",
-    "SupportResistanceStrategy",
-    "OrderBlocksStrategy",
-    "FairValueGapsStrategy",
-    "MarketStructureStrategy",
-    "VolumeProfileStrategy",
-    "LiquidityZonesStrategy",
-    # Technical indicators
-    "RSI_MACD_MomentumStrategy",
-    "VolumeBreakoutStrategy",
-    "TrendFollowingStrategy",
-    "MeanReversionStrategy",
-    "MomentumStrategy",
-    "BreakoutStrategy",
-    "VolatilityBreakoutStrategy",
-    # Sentiment/Social
-    "SentimentStrategy",
-    "SentimentFilterStrategy",
-    "SocialCopyStrategy",
-    "ArbitrageStrategy",
-    # Base
-    "StrategyBase",
-]
+from importlib import import_module
+
+_EXPORTS = {
+    # INSTITUTIONAL-LEVEL STRATEGIES (Highest Priority)
+    "VWAPStrategy": "backend.app.strategies.vwap_strategy",
+    "SupportResistanceStrategy": "backend.app.strategies.support_resistance",
+    "OrderBlocksStrategy": "backend.app.strategies.order_blocks",
+    "FairValueGapsStrategy": "backend.app.strategies.fair_value_gaps",
+    "MarketStructureStrategy": "backend.app.strategies.market_structure",
+    "VolumeProfileStrategy": "backend.app.strategies.volume_profile",
+    "LiquidityZonesStrategy": "backend.app.strategies.liquidity_zones",
+    # TECHNICAL INDICATOR STRATEGIES
+    "RSI_MACD_MomentumStrategy": "backend.app.strategies.rsi_macd_momentum",
+    "VolumeBreakoutStrategy": "backend.app.strategies.volume_breakout",
+    "TrendFollowingStrategy": "backend.app.strategies.trend_following",
+    "MeanReversionStrategy": "backend.app.strategies.mean_reversion",
+    "MomentumStrategy": "backend.app.strategies.momentum",
+    "BreakoutStrategy": "backend.app.strategies.breakout",
+    "VolatilityBreakoutStrategy": "backend.app.strategies.volatility_breakout",
+    # SENTIMENT/SOCIAL STRATEGIES
+    "SentimentStrategy": "backend.app.strategies.sentiment",
+    "SentimentFilterStrategy": "backend.app.strategies.sentiment_filter",
+    "SocialCopyStrategy": "backend.app.strategies.social_copy",
+    "ArbitrageStrategy": "backend.app.strategies.arbitrage",
+    # Base class
+    "StrategyBase": "backend.app.strategies.base",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,9 +1,11 @@
 # backend/app/strategies/base.py
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import deque
 import logging
 
+from backend.app.services.cooldown_store import CooldownStore, get_cooldown_store
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,38 +21,102 @@ class StrategyBase:
     """
 
     name: str = "base"
+    cooldown_namespace: str = "strategies"  # Shared cooldown store for all strategies
+    # Per-symbol warm state saved in state snapshots (services/state_snapshot.py). Subclasses
+    # add their incremental caches; bump state_version when their layout changes so older
+    # snapshots restore the price history only and the caches are rebuilt from it.
+    state_attributes: Tuple[str, ...] = ("price_history",)
+    state_version: int = 1
+    # How SignalGenerator runs check_for_signal (services/strategy_executor.py): "inline" on the
+    # event loop, "thread" in a thread pool, or "process" in a process pool with the symbol's
+    # state handed over and back. eval_timeout: seconds of evaluation per cycle before the
+    # strategy is skipped for the rest of it (None = STRATEGY_TIMEOUT_SECONDS). Both can be
+    # overridden in config.json strategy_sensitivity.<name> ("execution", "timeout_seconds").
+    execution_policy: str = "inline"
+    eval_timeout: Optional[float] = None
     
     def __init__(self):
         """Initialize strategy with price history tracking."""
         # Store price history (candles with OHLCV data)
         self.price_history: Dict[str, deque] = {}  # symbol -> deque of candles
-        self.last_signal_time: Dict[tuple, datetime] = {}  # (strategy, symbol, action) -> timestamp
         self.min_signal_gap = 6 * 3600  # 6 hours between same signals (in seconds)
         self.min_history_required = 50  # Minimum candles needed before signaling
+        # (strategy, symbol, action) cooldowns - expiring, bounded, optionally persisted
+        self.cooldowns: CooldownStore = get_cooldown_store(self.cooldown_namespace, ttl_seconds=self.min_signal_gap)
     
     def update_data(self, symbol: str, new_candle: Dict[str, Any]) -> None:
         """
         Called every time new market data arrives.
         
+        A candle whose timestamp is not newer than the last one in the history - an earlier
+        or an EQUAL timestamp - is dropped: the signal generator re-feeds its whole 24h tick
+        window every cycle, and keeping the candle objects already held lets the incremental
+        caches (history_shift) continue instead of rebuilding. A second tick with the same
+        timestamp is therefore ignored; the multi-timeframe strategies merge such ticks into
+        their bars before this (CandleStream). Candles without a timestamp are always added.
+        
         Args:
             symbol: Asset symbol
             new_candle: Dict with keys: timestamp, open, high, low, close, volume
         """
-        if symbol not in self.price_history:
-            self.price_history[symbol] = deque(maxlen=200)
+        history = self.price_history.get(symbol)
+        if history is None:
+            history = self.price_history[symbol] = deque(maxlen=200)
+        
+        timestamp = new_candle.get('timestamp')
+        if history and timestamp is not None and timestamp <= history[-1]['timestamp']:
+            return
         
-        # Ensure candle has required fields
-        candle = {
-            'timestamp': new_candle.get('timestamp', datetime.utcnow()),
+        history.append(self.make_candle(new_candle))
+
+    @staticmethod
+    def make_candle(new_candle: Dict[str, Any]) -> Dict[str, Any]:
+        """The candle with every required field (timestamp defaults to now, OHLC to the close)."""
+        return {
+            'timestamp': new_candle.get('timestamp') or datetime.utcnow(),
             'open': new_candle.get('open', new_candle.get('close', 0.0)),
             'high': new_candle.get('high', new_candle.get('close', 0.0)),
             'low': new_candle.get('low', new_candle.get('close', 0.0)),
             'close': new_candle.get('close', 0.0),
             'volume': new_candle.get('volume', 0.0),
         }
-        
-        self.price_history[symbol].append(candle)
-    
+
+    def drop_symbol(self, symbol: str) -> None:
+        """
+        Forget the symbol: its price history and every other symbol-keyed state dict
+        (incremental caches, multi-timeframe bars, ...). Cooldowns are shared and kept.
+        """
+        for value in vars(self).values():
+            if isinstance(value, dict) and symbol in value:
+                del value[symbol]
+
+    def export_state(self) -> Dict[str, Any]:
+        """The state_attributes this strategy has, by name (pickled together, so shared candles stay shared)."""
+        attributes = vars(self)
+        return {name: attributes[name] for name in self.state_attributes if name in attributes}
+
+    def import_state(self, state: Dict[str, Any], version: int) -> List[str]:
+        """
+        Restore state from export_state(); a snapshot of another state_version only
+        restores the base attributes. Returns the restored attribute names.
+        """
+        names = self.state_attributes if version == self.state_version else StrategyBase.state_attributes
+        restored = [name for name in names if name in state]
+        for name in restored:
+            setattr(self, name, state[name])
+        return restored
+
+    def export_symbol_state(self, symbol: str) -> Dict[str, Any]:
+        """One symbol's entries of the state_attributes (handed to a process pool worker and back)."""
+        attributes = vars(self)
+        return {name: attributes[name][symbol] for name in self.state_attributes
+                if name in attributes and symbol in attributes[name]}
+
+    def import_symbol_state(self, symbol: str, state: Dict[str, Any]) -> None:
+        """Replace one symbol's state with an export_symbol_state() result."""
+        for name, value in state.items():
+            getattr(self, name)[symbol] = value
+
     def _is_duplicate(self, symbol: str, action: str) -> bool:
         """
         Check if we've sent this signal recently.
@@ -62,23 +128,11 @@ class StrategyBase:
         Returns:
             True if duplicate (should skip), False if new
         """
-        signal_key = (self.name, symbol, action)
-        
-        if signal_key not in self.last_signal_time:
-            return False
-        
-        last_time = self.last_signal_time[signal_key]
-        time_since = (datetime.utcnow() - last_time).total_seconds()
-        
-        if time_since < self.min_signal_gap:
-            return True
-        
-        return False
+        return self.cooldowns.is_active((self.name, symbol, action))
     
     def _mark_signal_sent(self, symbol: str, action: str) -> None:
         """Mark that a signal was sent for this symbol/action."""
-        signal_key = (self.name, symbol, action)
-        self.last_signal_time[signal_key] = datetime.utcnow()
+        self.cooldowns.mark((self.name, symbol, action), ttl_seconds=self.min_signal_gap)
     
     def check_for_signal(self, symbol: str) -> Optional[Dict[str, Any]]:
         """
@@ -237,3 +291,23 @@ class StrategyBase:
             }
         
         return {"signal": "hold", "score": 0.0, "confidence": 0.0, "reason": "no_pattern"}
+
+
+def history_shift(cached: List[Dict[str, Any]], history: List[Dict[str, Any]]) -> Optional[Tuple[int, int]]:
+    """
+    (appended, dropped) when `history` is `cached` with candles appended at the end and the
+    oldest ones dropped from the front (the bounded price_history deque), matched by candle
+    identity (StrategyBase.update_data keeps the candles it already holds when they are
+    re-fed); None when it is not such a continuation. Used by strategies that keep
+    incremental per-symbol state between hook calls.
+    """
+    if not cached or not history:
+        return None
+    last = cached[-1]
+    for p in range(len(history) - 1, -1, -1):
+        if history[p] is last:
+            dropped = len(cached) - (p + 1)
+            if dropped < 0 or history[0] is not cached[dropped]:
+                return None
+            return len(history) - 1 - p, dropped
+    return None
@@ -13,8 +13,11 @@ FVG Pattern:
 - Bullish FVG: Candle 1 high < Candle 3 low (gap up)
 - Bearish FVG: Candle 1 low > Candle 3 high (gap down)
 """
-from typing import List, Dict, Any, Optional
-from backend.app.strategies.base import StrategyBase
+from bisect import bisect_left, bisect_right
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from backend.app.strategies.base import StrategyBase, history_shift
 
 
 class FairValueGapsStrategy(StrategyBase):
@@ -22,11 +25,13 @@ class FairValueGapsStrategy(StrategyBase):
     Fair Value Gaps strategy - trades price imbalances that get filled.
     """
     name = "fair_value_gaps"
+    state_attributes = StrategyBase.state_attributes + ("_fvg_trackers",)
     
     def __init__(self):
         super().__init__()
         self.min_history_required = 30
         self.fill_threshold = 0.003  # 0.3% from gap to count as filled
+        self._fvg_trackers: Dict[str, "_TrackerState"] = {}  # symbol -> incremental gap tracker
     
     def _find_fair_value_gaps(self, history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -36,44 +41,50 @@ class FairValueGapsStrategy(StrategyBase):
         if len(history) < 3:
             return []
         
-        fvgs = []
-        
-        # Scan for 3-candle patterns
-        for i in range(len(history) - 2):
-            candle1 = history[i]
-            candle2 = history[i + 1]
-            candle3 = history[i + 2]
-            
-            high1 = candle1.get('high', 0.0)
-            low1 = candle1.get('low', 0.0)
-            high2 = candle2.get('high', 0.0)
-            low2 = candle2.get('low', 0.0)
-            high3 = candle3.get('high', 0.0)
-            low3 = candle3.get('low', 0.0)
-            
-            # Bullish FVG: Candle 1 high < Candle 3 low (gap up)
-            if high1 < low3:
-                fvg = {
-                    'type': 'bullish',
-                    'high': high3,  # Top of gap
-                    'low': high1,   # Bottom of gap
-                    'candle_index': i + 1,
-                    'filled': False,
-                }
-                fvgs.append(fvg)
-            
-            # Bearish FVG: Candle 1 low > Candle 3 high (gap down)
-            elif low1 > high3:
-                fvg = {
-                    'type': 'bearish',
-                    'high': low1,   # Top of gap
-                    'low': high3,   # Bottom of gap
-                    'candle_index': i + 1,
-                    'filled': False,
-                }
-                fvgs.append(fvg)
+        tracker = FairValueGapTracker(self._check_fvg_rejection)
+        for candle in history:
+            tracker.update(candle)
+        return tracker.window_gaps(0)
+    
+    def _fair_value_gaps(self, symbol: str, history: List[Dict[str, Any]], last: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Gaps of the symbol's current history (oldest first, optionally only the `last` ones),
+        from its incremental tracker. Same gaps as _find_fair_value_gaps(history); candles that
+        arrived since the previous call are fed to the tracker, anything else rebuilds it.
+        """
+        if len(history) < 3:
+            self._fvg_trackers.pop(symbol, None)
+            return []
         
-        return fvgs
+        state = self._fvg_trackers.get(symbol)
+        shift = history_shift(state.candles, history) if state is not None else None
+        if shift is None:
+            tracker = FairValueGapTracker(self._check_fvg_rejection)
+            new_candles = history
+        else:
+            tracker = state.tracker
+            new_candles = history[len(history) - shift[0]:]
+        for candle in new_candles:
+            tracker.update(candle)
+        base = tracker.count - len(history)
+        tracker.evict_before(base)
+        self._fvg_trackers[symbol] = _TrackerState(history, tracker)
+        return tracker.window_gaps(base, last)
+    
+    def open_gaps(self, symbol: str) -> List[Dict[str, Any]]:
+        """Unfilled gaps for the symbol, sorted by price (diagnostics / frontend overlays)."""
+        state = self._fvg_trackers.get(symbol)
+        if state is None:
+            return []
+        base = state.tracker.count - len(state.candles)
+        return state.tracker.open_gaps(base)
+    
+    def _get_diagnostic_info(self, symbol: str) -> str:
+        gaps = self.open_gaps(symbol)
+        if not gaps:
+            return "no open FVGs"
+        bullish = sum(1 for gap in gaps if gap['type'] == 'bullish')
+        return f"{len(gaps)} open FVGs ({bullish} bullish, {len(gaps) - bullish} bearish)"
     
     def _check_fvg_fill(self, current_price: float, fvg: Dict[str, Any]) -> bool:
         """Check if FVG has been filled (price entered the gap)."""
@@ -128,7 +139,7 @@ class FairValueGapsStrategy(StrategyBase):
         if len(history) < self.min_history_required:
             return False
         
-        fvgs = self._find_fair_value_gaps(history)
+        fvgs = self._fair_value_gaps(symbol, history, last=5)
         if not fvgs:
             return False
         
@@ -156,7 +167,7 @@ class FairValueGapsStrategy(StrategyBase):
         if len(history) < self.min_history_required:
             return False
         
-        fvgs = self._find_fair_value_gaps(history)
+        fvgs = self._fair_value_gaps(symbol, history, last=5)
         if not fvgs:
             return False
         
@@ -179,7 +190,7 @@ class FairValueGapsStrategy(StrategyBase):
         if len(history) < self.min_history_required:
             return None
         
-        fvgs = self._find_fair_value_gaps(history)
+        fvgs = self._fair_value_gaps(symbol, history, last=5)
         if not fvgs:
             return None
         
@@ -211,7 +222,7 @@ class FairValueGapsStrategy(StrategyBase):
         if action is None:
             return None
         
-        fvgs = self._find_fair_value_gaps(history)
+        fvgs = self._fair_value_gaps(symbol, history, last=5)
         current_candle = history[-1]
         entry = current_candle.get('close', 0.0)
         
@@ -259,3 +270,108 @@ class FairValueGapsStrategy(StrategyBase):
             "strategy": self.name,
         }
 
+
+class FairValueGapTracker:
+    """
+    Incremental FVG state for one symbol, fed one candle at a time.
+    
+    - A new gap is detected from the latest three candles only
+    - Open gaps are kept sorted by the price that fills them: bullish gaps (below price) by
+      their top, bearish gaps (above price) by their bottom. A candle fills every bullish gap
+      whose top is >= its low and every bearish gap whose bottom is <= its high, so each
+      candle bisects once per side and pops exactly the gaps it fills
+    - A fill records the candle index and whether that candle rejected from the gap
+    - Recent gaps (filled or not) back the strategy hooks; indices are absolute candle counts
+    """
+    
+    def __init__(self, rejection_check: Callable[[Dict[str, Any], Dict[str, Any]], bool]):
+        self.rejection_check = rejection_check
+        self.count = 0  # candles seen
+        self._window: Deque[Tuple[float, float]] = deque(maxlen=3)  # (high, low) of the last 3 candles
+        self.recent: Deque[Dict[str, Any]] = deque()  # all gaps in detection order
+        self._bull_keys: List[float] = []
+        self._bull: List[Dict[str, Any]] = []
+        self._bear_keys: List[float] = []
+        self._bear: List[Dict[str, Any]] = []
+    
+    def update(self, candle: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Process the next candle; returns the gap it completed, if any."""
+        index = self.count
+        high = candle.get('high', 0.0)
+        low = candle.get('low', 0.0)
+        self._fill(candle, index, high, low)
+        self._window.append((high, low))
+        self.count += 1
+        if len(self._window) < 3:
+            return None
+        
+        high1, low1 = self._window[0]
+        high3, low3 = self._window[2]
+        if high1 < low3:
+            gap = {'type': 'bullish', 'high': high3, 'low': high1}
+        elif low1 > high3:
+            gap = {'type': 'bearish', 'high': low1, 'low': high3}
+        else:
+            return None
+        gap.update({'index': index - 1, 'created_at': candle.get('timestamp'),
+                    'filled': False, 'filled_index': None, 'rejected': False})
+        self.recent.append(gap)
+        if gap['type'] == 'bullish':
+            pos = bisect_right(self._bull_keys, gap['high'])
+            self._bull_keys.insert(pos, gap['high'])
+            self._bull.insert(pos, gap)
+        else:
+            pos = bisect_right(self._bear_keys, gap['low'])
+            self._bear_keys.insert(pos, gap['low'])
+            self._bear.insert(pos, gap)
+        return gap
+    
+    def _fill(self, candle: Dict[str, Any], index: int, high: float, low: float) -> None:
+        pos = bisect_left(self._bull_keys, low)
+        filled = self._bull[pos:]
+        del self._bull_keys[pos:], self._bull[pos:]
+        pos = bisect_right(self._bear_keys, high)
+        filled += self._bear[:pos]
+        del self._bear_keys[:pos], self._bear[:pos]
+        for gap in filled:
+            gap['filled'] = True
+            gap['filled_index'] = index
+            gap['rejected'] = bool(self.rejection_check(candle, gap))
+    
+    def evict_before(self, index: int) -> None:
+        """Drop gaps whose first candle is older than `index` (left the history window)."""
+        while self.recent and self.recent[0]['index'] - 1 < index:
+            gap = self.recent.popleft()
+            if gap['filled']:
+                continue
+            keys, gaps = (self._bull_keys, self._bull) if gap['type'] == 'bullish' else (self._bear_keys, self._bear)
+            for pos in range(len(gaps)):
+                if gaps[pos] is gap:
+                    del keys[pos], gaps[pos]
+                    break
+    
+    def window_gaps(self, base: int, last: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Gaps as strategy dicts, candle_index relative to the window starting at `base`."""
+        if last is None or last >= len(self.recent):
+            gaps = list(self.recent)
+        else:
+            gaps = [self.recent[i] for i in range(len(self.recent) - last, len(self.recent))]
+        return [{'type': g['type'], 'high': g['high'], 'low': g['low'],
+                 'candle_index': g['index'] - base, 'filled': g['filled']} for g in gaps]
+    
+    def open_gaps(self, base: int = 0) -> List[Dict[str, Any]]:
+        """Unfilled gaps sorted by bottom price, JSON-ready."""
+        gaps = sorted(self._bull + self._bear, key=lambda g: g['low'])
+        return [{
+            'type': g['type'],
+            'high': g['high'],
+            'low': g['low'],
+            'candle_index': g['index'] - base,
+            'created_at': g['created_at'].isoformat() if hasattr(g['created_at'], 'isoformat') else g['created_at'],
+            'age_bars': self.count - 1 - g['index'],
+        } for g in gaps]
+
+
+class _TrackerState(NamedTuple):
+    candles: List[Dict[str, Any]]
+    tracker: FairValueGapTracker
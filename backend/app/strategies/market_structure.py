@@ -15,8 +15,12 @@ Market Structure:
 - BOS: Break above previous high (uptrend) or below previous low (downtrend)
 - CHoCH: Break of structure that reverses trend
 """
-from typing import List, Dict, Any, Optional
-from backend.app.strategies.base import StrategyBase
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from backend.app.strategies.base import StrategyBase, history_shift
 
 
 class MarketStructureStrategy(StrategyBase):
@@ -24,11 +28,13 @@ class MarketStructureStrategy(StrategyBase):
     Market Structure strategy - trades based on BOS/CHoCH.
     """
     name = "market_structure"
+    state_attributes = StrategyBase.state_attributes + ("_swing_state",)
     
     def __init__(self):
         super().__init__()
         self.min_history_required = 50
         self.structure_lookback = 20  # Look back 20 candles for structure
+        self._swing_state: Dict[str, "_SwingState"] = {}  # symbol -> incremental swing points
     
     def _identify_structure_swing_points(self, history: List[Dict[str, Any]]) -> Dict[str, List[float]]:
         """
@@ -39,34 +45,54 @@ class MarketStructureStrategy(StrategyBase):
         if len(history) < self.structure_lookback * 2:
             return {"highs": [], "lows": []}
         
-        swing_highs = []
-        swing_lows = []
-        
-        for i in range(self.structure_lookback, len(history) - self.structure_lookback):
-            high = history[i].get('high', 0.0)
-            low = history[i].get('low', 0.0)
-            
-            # Check if swing high
-            is_swing_high = True
-            for j in range(i - self.structure_lookback, i + self.structure_lookback + 1):
-                if j != i and history[j].get('high', 0.0) >= high:
-                    is_swing_high = False
-                    break
-            
-            if is_swing_high:
-                swing_highs.append({"price": high, "index": i})
-            
-            # Check if swing low
-            is_swing_low = True
-            for j in range(i - self.structure_lookback, i + self.structure_lookback + 1):
-                if j != i and history[j].get('low', 0.0) <= low:
-                    is_swing_low = False
-                    break
-            
-            if is_swing_low:
-                swing_lows.append({"price": low, "index": i})
+        highs, lows = _candle_arrays(history)
+        k = self.structure_lookback
+        high_idx = _strict_extrema(highs, k, k, len(history) - k, upper=True)
+        low_idx = _strict_extrema(lows, k, k, len(history) - k, upper=False)
+        return _swing_lists(highs, lows, high_idx, low_idx)
+    
+    def _swing_points(self, symbol: str, history: List[Dict[str, Any]]) -> Dict[str, List[float]]:
+        """
+        Swing points for the symbol's current history, kept incrementally.
+        Same result as _identify_structure_swing_points(history), but a history that only
+        gained candles at the end (and lost some at the front of the deque) re-evaluates
+        just the positions whose ±structure_lookback window was incomplete before.
+        """
+        k = self.structure_lookback
+        if len(history) < k * 2:
+            self._swing_state.pop(symbol, None)
+            return {"highs": [], "lows": []}
         
-        return {"highs": swing_highs, "lows": swing_lows}
+        state = self._swing_state.get(symbol)
+        appended = dropped = -1
+        if state is not None:
+            if history[-1] is state.candles[-1] and len(history) == len(state.candles):
+                return state.swings
+            shift = history_shift(state.candles, history)
+            # Reuse only if enough of the cached window survives the front eviction
+            if shift is not None and len(state.candles) - shift[1] - k > k:
+                appended, dropped = shift
+        
+        if appended < 0:
+            # First call or not a continuation of the cached history: full recompute
+            highs, lows = _candle_arrays(history)
+            high_idx = _strict_extrema(highs, k, k, len(history) - k, upper=True)
+            low_idx = _strict_extrema(lows, k, k, len(history) - k, upper=False)
+        else:
+            new_highs, new_lows = _candle_arrays(history[len(history) - appended:])
+            highs = np.concatenate((state.highs[dropped:], new_highs))
+            lows = np.concatenate((state.lows[dropped:], new_lows))
+            # Positions below `start` were final in the cached state (complete window, same values)
+            start = max(k, len(state.candles) - dropped - k)
+            stop = len(history) - k
+            high_idx = np.concatenate((_kept(state.high_idx, dropped, k, start),
+                                       _strict_extrema(highs, k, start, stop, upper=True)))
+            low_idx = np.concatenate((_kept(state.low_idx, dropped, k, start),
+                                      _strict_extrema(lows, k, start, stop, upper=False)))
+        
+        swings = _swing_lists(highs, lows, high_idx, low_idx)
+        self._swing_state[symbol] = _SwingState(history, highs, lows, high_idx, low_idx, swings)
+        return swings
     
     def _determine_trend(self, swing_highs: List[Dict[str, Any]], swing_lows: List[Dict[str, Any]]) -> str:
         """
@@ -157,7 +183,7 @@ class MarketStructureStrategy(StrategyBase):
         if len(history) < self.min_history_required:
             return False
         
-        swings = self._identify_structure_swing_points(history)
+        swings = self._swing_points(symbol, history)
         if not swings["highs"] or not swings["lows"]:
             return False
         
@@ -176,7 +202,7 @@ class MarketStructureStrategy(StrategyBase):
         if len(history) < self.min_history_required:
             return False
         
-        swings = self._identify_structure_swing_points(history)
+        swings = self._swing_points(symbol, history)
         if not swings["highs"] or not swings["lows"]:
             return False
         
@@ -197,7 +223,7 @@ class MarketStructureStrategy(StrategyBase):
         if len(history) < self.min_history_required:
             return None
         
-        swings = self._identify_structure_swing_points(history)
+        swings = self._swing_points(symbol, history)
         if not swings["highs"] or not swings["lows"]:
             return None
         
@@ -230,7 +256,7 @@ class MarketStructureStrategy(StrategyBase):
         if action is None:
             return None
         
-        swings = self._identify_structure_swing_points(history)
+        swings = self._swing_points(symbol, history)
         trend = self._determine_trend(swings["highs"], swings["lows"])
         entry = history[-1].get('close', 0.0)
         
@@ -276,3 +302,54 @@ class MarketStructureStrategy(StrategyBase):
             "strategy": self.name,
         }
 
+
+class _SwingState(NamedTuple):
+    """Cached swing points for one symbol (positions are indices into `candles`)."""
+    candles: List[Dict[str, Any]]
+    highs: np.ndarray
+    lows: np.ndarray
+    high_idx: np.ndarray
+    low_idx: np.ndarray
+    swings: Dict[str, List[Dict[str, Any]]]
+
+
+def _candle_arrays(candles: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    highs = np.fromiter((c.get('high', 0.0) for c in candles), dtype=np.float64, count=len(candles))
+    lows = np.fromiter((c.get('low', 0.0) for c in candles), dtype=np.float64, count=len(candles))
+    return highs, lows
+
+
+def _strict_extrema(values: np.ndarray, k: int, start: int, stop: int, upper: bool) -> np.ndarray:
+    """
+    Positions i in [start, stop) whose value is strictly above (upper) or below every other
+    value in values[i-k:i+k+1]. Requires k <= start and stop + k <= len(values).
+    """
+    if stop <= start:
+        return np.empty(0, dtype=np.intp)
+    m = stop - start
+    segment = values[start - k:stop + k]
+    if k == 0:
+        return np.arange(start, stop)
+    # windows[j] = segment[j:j+k]: left neighbours of i are windows[i-start], right ones windows[i-start+k+1]
+    windows = sliding_window_view(segment, k)
+    if upper:
+        extreme = windows.max(axis=1)
+        mask = segment[k:k + m] > np.maximum(extreme[:m], extreme[k + 1:k + 1 + m])
+    else:
+        extreme = windows.min(axis=1)
+        mask = segment[k:k + m] < np.minimum(extreme[:m], extreme[k + 1:k + 1 + m])
+    return np.flatnonzero(mask) + start
+
+
+def _kept(idx: np.ndarray, dropped: int, k: int, start: int) -> np.ndarray:
+    """Cached swing positions shifted by `dropped`, keeping those with a full window below `start`."""
+    shifted = idx - dropped
+    return shifted[(shifted >= k) & (shifted < start)]
+
+
+def _swing_lists(highs: np.ndarray, lows: np.ndarray, high_idx: np.ndarray,
+                 low_idx: np.ndarray) -> Dict[str, List[Dict[str, Any]]]:
+    return {
+        "highs": [{"price": float(highs[i]), "index": int(i)} for i in high_idx],
+        "lows": [{"price": float(lows[i]), "index": int(i)} for i in low_idx],
+    }
@@ -13,9 +13,13 @@ Order Block = Last opposite candle before strong move
 - Bullish OB: Last bearish candle before strong bullish move
 - Bearish OB: Last bullish candle before strong bearish move
 """
-from typing import List, Dict, Any, Optional
+import math
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple
 from statistics import mean
-from backend.app.strategies.base import StrategyBase
+
+import numpy as np
+
+from backend.app.strategies.base import StrategyBase, history_shift
 
 
 class OrderBlocksStrategy(StrategyBase):
@@ -23,6 +27,7 @@ class OrderBlocksStrategy(StrategyBase):
     Order Blocks strategy - identifies institutional order placement zones.
     """
     name = "order_blocks"
+    state_attributes = StrategyBase.state_attributes + ("_block_state",)
     
     def __init__(self):
         super().__init__()
@@ -30,6 +35,7 @@ class OrderBlocksStrategy(StrategyBase):
         self.move_threshold = 0.02  # 2% move to qualify as "strong move"
         self.lookback_period = 20  # Look back 20 candles for order blocks
         self.return_threshold = 0.005  # 0.5% from block to count as return
+        self._block_state: Dict[str, "_BlockState"] = {}  # symbol -> incremental strong moves / blocks
     
     def _is_bullish_candle(self, candle: Dict[str, Any]) -> bool:
         """Check if candle is bullish (close > open)."""
@@ -47,54 +53,77 @@ class OrderBlocksStrategy(StrategyBase):
         if len(history) < self.lookback_period + 5:
             return {"bullish_blocks": [], "bearish_blocks": []}
         
-        bullish_blocks = []
-        bearish_blocks = []
+        opens, highs, lows, closes = _ohlc_arrays(history)
+        events = self._strong_move_events(opens, closes, self.lookback_period, len(history) - 3)
+        return _dedupe_blocks(events, highs, lows, closes)
+    
+    def _order_blocks(self, symbol: str, history: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Order blocks for the symbol's current history, maintained incrementally.
+        Same result as _find_order_blocks(history). Strong moves are kept per symbol: a new
+        candle adds at most the move that now has its 3-bar forward close, and moves whose
+        start leaves the lookback window are evicted. Only the (short) duplicate filter is
+        replayed, since evicting an early block can admit a later one it had suppressed.
+        """
+        if len(history) < self.lookback_period + 5:
+            self._block_state.pop(symbol, None)
+            return {"bullish_blocks": [], "bearish_blocks": []}
         
-        # Scan for strong moves and find order blocks
-        for i in range(self.lookback_period, len(history) - 3):
-            # Check for strong bullish move (next 3 candles)
-            if i + 3 < len(history):
-                start_price = history[i].get('close', 0.0)
-                end_price = history[i + 3].get('close', 0.0)
-                
-                if start_price > 0:
-                    move_pct = (end_price - start_price) / start_price
-                    
-                    # Strong bullish move
-                    if move_pct >= self.move_threshold:
-                        # Find last bearish candle before this move (order block)
-                        for j in range(max(0, i - self.lookback_period), i):
-                            if self._is_bearish_candle(history[j]):
-                                block = {
-                                    'high': history[j].get('high', 0.0),
-                                    'low': history[j].get('low', 0.0),
-                                    'candle_index': j,
-                                    'price': history[j].get('close', 0.0),
-                                }
-                                # Avoid duplicates
-                                if not any(abs(b['price'] - block['price']) / block['price'] < 0.01 
-                                          for b in bullish_blocks):
-                                    bullish_blocks.append(block)
-                                break
-                    
-                    # Strong bearish move
-                    elif move_pct <= -self.move_threshold:
-                        # Find last bullish candle before this move (order block)
-                        for j in range(max(0, i - self.lookback_period), i):
-                            if self._is_bullish_candle(history[j]):
-                                block = {
-                                    'high': history[j].get('high', 0.0),
-                                    'low': history[j].get('low', 0.0),
-                                    'candle_index': j,
-                                    'price': history[j].get('close', 0.0),
-                                }
-                                # Avoid duplicates
-                                if not any(abs(b['price'] - block['price']) / block['price'] < 0.01 
-                                          for b in bearish_blocks):
-                                    bearish_blocks.append(block)
-                                break
+        state = self._block_state.get(symbol)
+        shift = history_shift(state.candles, history) if state is not None else None
+        if shift == (0, 0):
+            return state.blocks
+        
+        if shift is None:
+            opens, highs, lows, closes = _ohlc_arrays(history)
+            events = self._strong_move_events(opens, closes, self.lookback_period, len(history) - 3)
+        else:
+            appended, dropped = shift
+            new = _ohlc_arrays(history[len(history) - appended:])
+            opens, highs, lows, closes = (np.concatenate((old[dropped:], add))
+                                          for old, add in zip(state.arrays, new))
+            # Moves up to the cached stop were final; evict those whose start left the window
+            moves, block_idx, sides = state.events
+            moves, block_idx = moves - dropped, block_idx - dropped
+            keep = moves >= self.lookback_period
+            start = max(self.lookback_period, len(state.candles) - dropped - 3)
+            added = self._strong_move_events(opens, closes, start, len(history) - 3)
+            events = tuple(np.concatenate((column[keep], extra))
+                           for column, extra in zip((moves, block_idx, sides), added))
+        
+        blocks = _dedupe_blocks(events, highs, lows, closes)
+        self._block_state[symbol] = _BlockState(history, (opens, highs, lows, closes), events, blocks)
+        return blocks
+    
+    def _strong_move_events(self, opens: np.ndarray, closes: np.ndarray, start: int,
+                            stop: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Strong 3-bar moves starting at i in [start, stop) and their order-block candle:
+        (move index, block index, side) with side +1 bullish / -1 bearish. The block candle is
+        the first opposite candle in [i - lookback_period, i), as in the original scan.
+        Requires start >= lookback_period and stop + 3 <= len(closes).
+        """
+        if stop <= start:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty, empty
+        lookback = self.lookback_period
+        idx = np.arange(start, stop)
+        base = closes[start:stop]
+        valid = base > 0
+        move = np.divide(closes[start + 3:stop + 3] - base, base, out=np.zeros(len(base)), where=valid)
+        bullish_move = valid & (move >= self.move_threshold)
+        bearish_move = valid & ~bullish_move & (move <= -self.move_threshold)
+        
+        # First bearish (bullish) candle at or after each position of the segment [start - lookback, stop)
+        seg_opens = opens[start - lookback:stop]
+        seg_closes = closes[start - lookback:stop]
+        first_bear = _next_true(seg_closes < seg_opens) + (start - lookback)
+        first_bull = _next_true(seg_closes > seg_opens) + (start - lookback)
+        block = np.where(bullish_move, first_bear[:stop - start], first_bull[:stop - start])
         
-        return {"bullish_blocks": bullish_blocks, "bearish_blocks": bearish_blocks}
+        found = (bullish_move | bearish_move) & (block < idx)
+        side = np.where(bullish_move, 1, -1)
+        return idx[found], block[found], side[found]
     
     def _check_price_return_to_block(self, current_price: float, blocks: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """Check if current price has returned to any order block."""
@@ -154,7 +183,7 @@ class OrderBlocksStrategy(StrategyBase):
         if len(history) < self.min_history_required:
             return False
         
-        blocks = self._find_order_blocks(history)
+        blocks = self._order_blocks(symbol, history)
         current_price = history[-1].get('close', 0.0)
         
         # Check if price is near any block
@@ -177,7 +206,7 @@ class OrderBlocksStrategy(StrategyBase):
         if len(history) < self.min_history_required:
             return False
         
-        blocks = self._find_order_blocks(history)
+        blocks = self._order_blocks(symbol, history)
         current_candle = history[-1]
         current_price = current_candle.get('close', 0.0)
         
@@ -202,7 +231,7 @@ class OrderBlocksStrategy(StrategyBase):
         if len(history) < self.min_history_required:
             return None
         
-        blocks = self._find_order_blocks(history)
+        blocks = self._order_blocks(symbol, history)
         current_candle = history[-1]
         current_price = current_candle.get('close', 0.0)
         
@@ -233,7 +262,7 @@ class OrderBlocksStrategy(StrategyBase):
         if action is None:
             return None
         
-        blocks = self._find_order_blocks(history)
+        blocks = self._order_blocks(symbol, history)
         current_candle = history[-1]
         current_price = current_candle.get('close', 0.0)
         
@@ -288,3 +317,56 @@ class OrderBlocksStrategy(StrategyBase):
             "strategy": self.name,
         }
 
+
+# Duplicate filter: a block is dropped if an earlier one on the same side is within 1% of its price
+DUPLICATE_PCT = 0.01
+_LOG_BUCKET = math.log(1.0 + DUPLICATE_PCT)
+
+
+class _BlockState(NamedTuple):
+    """Cached order-block inputs for one symbol (indices are positions in `candles`)."""
+    candles: List[Dict[str, Any]]
+    arrays: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]  # open, high, low, close
+    events: Tuple[np.ndarray, np.ndarray, np.ndarray]  # move index, block index, side
+    blocks: Dict[str, List[Dict[str, Any]]]
+
+
+def _ohlc_arrays(candles: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    n = len(candles)
+    closes = np.fromiter((c.get('close', 0.0) for c in candles), dtype=np.float64, count=n)
+    opens = np.fromiter((c.get('open', c.get('close', 0.0)) for c in candles), dtype=np.float64, count=n)
+    highs = np.fromiter((c.get('high', 0.0) for c in candles), dtype=np.float64, count=n)
+    lows = np.fromiter((c.get('low', 0.0) for c in candles), dtype=np.float64, count=n)
+    return opens, highs, lows, closes
+
+
+def _next_true(mask: np.ndarray) -> np.ndarray:
+    """For each position, the index of the first True at or after it (len(mask) if none)."""
+    n = len(mask)
+    idx = np.where(mask, np.arange(n), n)
+    return np.minimum.accumulate(idx[::-1])[::-1]
+
+
+def _dedupe_blocks(events: Tuple[np.ndarray, np.ndarray, np.ndarray], highs: np.ndarray,
+                   lows: np.ndarray, closes: np.ndarray) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Build the block lists in move order, skipping a block within 1% of an earlier block on
+    the same side. Earlier block prices are bucketed on a log scale so each check only looks
+    at the neighbouring buckets instead of every block found so far.
+    """
+    found = {1: [], -1: []}
+    buckets = {1: {}, -1: {}}
+    for j, side in zip(events[1].tolist(), events[2].tolist()):
+        price = float(closes[j])
+        existing = found[side]
+        if 0 < price < math.inf:
+            key = math.floor(math.log(price) / _LOG_BUCKET)
+            near = buckets[side]
+            if any(abs(b - price) / price < DUPLICATE_PCT
+                   for k in range(key - 2, key + 3) for b in near.get(k, ())):
+                continue
+            near.setdefault(key, []).append(price)
+        elif any(abs(b['price'] - price) / price < DUPLICATE_PCT for b in existing):
+            continue
+        existing.append({'high': float(highs[j]), 'low': float(lows[j]), 'candle_index': j, 'price': price})
+    return {"bullish_blocks": found[1], "bearish_blocks": found[-1]}
@@ -0,0 +1,87 @@
+"""
+Strategy registry: strategy name -> "module:Class" entry point, imported on first use.
+
+Nothing here imports a strategy module; create_strategies() imports and instantiates only
+the strategies it is asked for, so disabled strategies (and their dependencies, e.g. the
+external signal scrapers behind social_copy) never load. The signal generator enables the
+names listed under "strategies" in config.json, or DEFAULT_STRATEGIES when there is none.
+"""
+
+from importlib import import_module
+from typing import Dict, Iterable, List, Optional, Type
+
+from backend.app.strategies.base import StrategyBase
+
+# Registry order is evaluation order, whatever order config.json lists the names in
+STRATEGY_ENTRY_POINTS: Dict[str, str] = {
+    # INSTITUTIONAL-LEVEL STRATEGIES (Highest Priority)
+    # VWAP - institutional traders' PRIMARY tool
+    "vwap": "backend.app.strategies.vwap_strategy:VWAPStrategy",
+    # Pivot-based S/R with order flow
+    "support_resistance": "backend.app.strategies.support_resistance:SupportResistanceStrategy",
+    # Smart money order placement zones
+    "order_blocks": "backend.app.strategies.order_blocks:OrderBlocksStrategy",
+    # Price imbalances (90%+ fill rate)
+    "fair_value_gaps": "backend.app.strategies.fair_value_gaps:FairValueGapsStrategy",
+    # BOS/CHoCH - eliminates 60% of losses
+    "market_structure": "backend.app.strategies.market_structure:MarketStructureStrategy",
+    # Price Volume Nodes (PVN)
+    "volume_profile": "backend.app.strategies.volume_profile:VolumeProfileStrategy",
+    # Stop loss clusters (institutional hunts)
+    "liquidity_zones": "backend.app.strategies.liquidity_zones:LiquidityZonesStrategy",
+    # TECHNICAL INDICATOR STRATEGIES
+    # Professional RSI+MACD
+    "rsi_macd_momentum": "backend.app.strategies.rsi_macd_momentum:RSI_MACD_MomentumStrategy",
+    # Professional Volume Breakout
+    "volume_breakout": "backend.app.strategies.volume_breakout:VolumeBreakoutStrategy",
+    "trend_following": "backend.app.strategies.trend_following:TrendFollowingStrategy",
+    "mean_reversion": "backend.app.strategies.mean_reversion:MeanReversionStrategy",
+    "momentum": "backend.app.strategies.momentum:MomentumStrategy",
+    "breakout": "backend.app.strategies.breakout:BreakoutStrategy",
+    "volatility_breakout": "backend.app.strategies.volatility_breakout:VolatilityBreakoutStrategy",
+    # SENTIMENT/SOCIAL STRATEGIES
+    "sentiment": "backend.app.strategies.sentiment:SentimentStrategy",
+    "sentiment_filter": "backend.app.strategies.sentiment_filter:SentimentFilterStrategy",
+    "social_copy": "backend.app.strategies.social_copy:SocialCopyStrategy",
+    "arbitrage": "backend.app.strategies.arbitrage:ArbitrageStrategy",
+}
+
+# Arbitrage is registered but off by default: it needs millisecond execution, and its
+# opportunities are gone long before a 1-minute polling cycle comes round
+DEFAULT_STRATEGIES: List[str] = [name for name in STRATEGY_ENTRY_POINTS if name != "arbitrage"]
+
+
+def register_strategy(name: str, target: str) -> None:
+    """Add (or replace) an entry point, e.g. register_strategy("my_edge", "my_pkg.edge:EdgeStrategy")."""
+    module_name, _, class_name = target.partition(":")
+    if not module_name or not class_name:
+        raise ValueError(f"Strategy entry point must look like 'package.module:Class', got {target!r}")
+    STRATEGY_ENTRY_POINTS[name] = target
+
+
+def resolve_names(names: Optional[Iterable[str]] = None) -> List[str]:
+    """Validated strategy names in registry order (DEFAULT_STRATEGIES when `names` is None)."""
+    if names is None:
+        return list(DEFAULT_STRATEGIES)
+    wanted = set(names)
+    unknown = sorted(wanted - STRATEGY_ENTRY_POINTS.keys())
+    if unknown:
+        raise ValueError(
+            f"Unknown strategies {', '.join(unknown)} (registered: {', '.join(STRATEGY_ENTRY_POINTS)})"
+        )
+    return [name for name in STRATEGY_ENTRY_POINTS if name in wanted]
+
+
+def load_strategy_class(name: str) -> Type[StrategyBase]:
+    """Import the module behind `name` and return its strategy class."""
+    try:
+        target = STRATEGY_ENTRY_POINTS[name]
+    except KeyError:
+        raise ValueError(f"Unknown strategy {name!r} (registered: {', '.join(STRATEGY_ENTRY_POINTS)})") from None
+    module_name, _, class_name = target.partition(":")
+    return getattr(import_module(module_name), class_name)
+
+
+def create_strategies(names: Optional[Iterable[str]] = None) -> Dict[str, StrategyBase]:
+    """Instantiate the named strategies (default constructor arguments), in registry order."""
+    return {name: load_strategy_class(name)() for name in resolve_names(names)}
@@ -0,0 +1,297 @@
+"""
+Incrementally maintained multi-timeframe bars and streaming indicators.
+
+Replaces the per-cycle DataFrame path (ticks -> DataFrame -> resample -> ewm/rolling) of the
+multi-timeframe strategies:
+- TimeframeBars: fixed-interval OHLCV bars built candle by candle, the same bars as
+  df.resample(interval).agg(first/max/min/last/sum).dropna() (bins start at midnight, the
+  last bar is the one still forming)
+- StreamingEMA / StreamingADX / StreamingATR: indicator state committed on every closed bar;
+  the value at the forming bar is computed on top of it without committing, so a new candle
+  costs O(1) and reading the indicators again without one costs nothing
+- CandleStream: the set of timeframes of one symbol, fed from the StrategyBase candle feed
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+
+def bin_start(timestamp: datetime, minutes: int) -> datetime:
+    """Start of the `minutes` bar containing `timestamp` (bars aligned on midnight)."""
+    midnight = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    interval = timedelta(minutes=minutes)
+    return midnight + ((timestamp - midnight) // interval) * interval
+
+
+class RollingMean:
+    """
+    Mean of the last `period` values with a running sum, like Series.rolling(period).mean()
+    (None until `period` values were seen). The sum is rebuilt every RESYNC_EVERY pushes so
+    add/subtract rounding cannot build up.
+    """
+
+    RESYNC_EVERY = 1000
+
+    def __init__(self, period: int):
+        self.period = period
+        self._values: Deque[float] = deque(maxlen=period)
+        self._sum = 0.0
+        self._pushes = 0
+
+    def push(self, value: float) -> None:
+        if len(self._values) == self.period:
+            self._sum -= self._values[0]
+        self._values.append(value)
+        self._sum += value
+        self._pushes += 1
+        if self._pushes >= self.RESYNC_EVERY:
+            self._sum = math.fsum(self._values)
+            self._pushes = 0
+
+    @property
+    def value(self) -> Optional[float]:
+        if len(self._values) < self.period:
+            return None
+        return self._sum / self.period
+
+    def peek(self, value: float) -> Optional[float]:
+        """Mean if `value` were pushed next (nothing is committed)."""
+        if len(self._values) + 1 < self.period:
+            return None
+        total = self._sum - self._values[0] if len(self._values) == self.period else self._sum
+        return (total + value) / self.period
+
+
+class StreamingEMA:
+    """EMA of bar closes, Series.ewm(span=period, adjust=False).mean() one bar at a time."""
+
+    def __init__(self, period: int):
+        self.alpha = 2.0 / (period + 1.0)
+        self.value: Optional[float] = None  # at the last closed bar
+
+    def _next(self, close: float) -> float:
+        if self.value is None:
+            return close
+        return (1.0 - self.alpha) * self.value + self.alpha * close
+
+    def update(self, bar: Dict[str, Any]) -> None:
+        self.value = self._next(bar['close'])
+
+    def peek(self, bar: Dict[str, Any]) -> float:
+        return self._next(bar['close'])
+
+
+def true_range(bar: Dict[str, Any], prev: Optional[Dict[str, Any]]) -> float:
+    if prev is None:
+        return bar['high'] - bar['low']
+    return max(bar['high'] - bar['low'], abs(bar['high'] - prev['close']), abs(bar['low'] - prev['close']))
+
+
+class StreamingATR:
+    """Average True Range: rolling mean of the true range (first bar: high - low)."""
+
+    def __init__(self, period: int):
+        self._tr = RollingMean(period)
+        self._prev: Optional[Dict[str, Any]] = None
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._tr.value
+
+    def update(self, bar: Dict[str, Any]) -> None:
+        self._tr.push(true_range(bar, self._prev))
+        self._prev = bar
+
+    def peek(self, bar: Dict[str, Any]) -> Optional[float]:
+        return self._tr.peek(true_range(bar, self._prev))
+
+
+class StreamingADX:
+    """
+    ADX with rolling-mean smoothing (TrendFollowingStrategy.calculate_adx): TR and +/-DM are
+    averaged over `period` bars, DX over the following `period`. None until 2 * period - 1
+    bars were seen.
+    """
+
+    def __init__(self, period: int):
+        self._tr = RollingMean(period)
+        self._dm_plus = RollingMean(period)
+        self._dm_minus = RollingMean(period)
+        self._dx = RollingMean(period)
+        self._prev: Optional[Dict[str, Any]] = None
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._dx.value
+
+    def _components(self, bar: Dict[str, Any]) -> Tuple[float, float, float]:
+        prev = self._prev
+        if prev is None:
+            return bar['high'] - bar['low'], 0.0, 0.0
+        up = bar['high'] - prev['high']
+        down = prev['low'] - bar['low']
+        dm_plus = max(up, 0.0) if up > down else 0.0
+        dm_minus = max(down, 0.0) if down > up else 0.0
+        return true_range(bar, prev), dm_plus, dm_minus
+
+    @staticmethod
+    def _dx_value(tr: Optional[float], dm_plus: Optional[float], dm_minus: Optional[float]) -> Optional[float]:
+        if tr is None:
+            return None
+        tr = tr if tr != 0 else 1.0  # division by zero protection, as in the DataFrame version
+        di_plus = 100 * (dm_plus / tr)
+        di_minus = 100 * (dm_minus / tr)
+        denominator = di_plus + di_minus
+        return 100 * abs(di_plus - di_minus) / (denominator if denominator != 0 else 1.0)
+
+    def update(self, bar: Dict[str, Any]) -> None:
+        tr, dm_plus, dm_minus = self._components(bar)
+        self._tr.push(tr)
+        self._dm_plus.push(dm_plus)
+        self._dm_minus.push(dm_minus)
+        dx = self._dx_value(self._tr.value, self._dm_plus.value, self._dm_minus.value)
+        if dx is not None:
+            self._dx.push(dx)
+        self._prev = bar
+
+    def peek(self, bar: Dict[str, Any]) -> Optional[float]:
+        tr, dm_plus, dm_minus = self._components(bar)
+        dx = self._dx_value(self._tr.peek(tr), self._dm_plus.peek(dm_plus), self._dm_minus.peek(dm_minus))
+        if dx is None:
+            return None
+        return self._dx.peek(dx)
+
+
+class TimeframeBars:
+    """
+    OHLCV bars of one interval, built from candles arriving in time order.
+
+    `closed` holds the finished bars (only those starting within `window` of the forming
+    bar are kept), `forming` the bar the latest candle fell into. Indicators passed in
+    `indicators` are updated with every bar as it closes; read them at the forming bar with
+    `latest(name)` and at the last closed bar with `previous(name)`.
+    """
+
+    def __init__(self, minutes: int, window: Optional[timedelta] = None, indicators: Optional[Dict[str, Any]] = None):
+        self.minutes = minutes
+        self.window = window
+        self.indicators: Dict[str, Any] = indicators or {}
+        self.closed: Deque[Dict[str, Any]] = deque()
+        self.forming: Optional[Dict[str, Any]] = None
+        self._end: Optional[datetime] = None  # end of the forming bar
+        self._last: Optional[datetime] = None  # latest candle time in the forming bar (sets its close)
+        self._latest: Dict[str, Any] = {}  # indicator values at the forming bar, until it changes
+
+    def __len__(self) -> int:
+        return len(self.closed) + (self.forming is not None)
+
+    def add(self, candle: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Add a candle; returns the bar it closed, if any. A candle inside the forming bar is
+        merged into it (a late one does not move the close); one after it starts a new bar.
+        """
+        timestamp = candle['timestamp']
+        self._latest = {}
+        bar = self.forming
+        if bar is not None and bar['timestamp'] <= timestamp < self._end:
+            bar['high'] = max(bar['high'], candle['high'])
+            bar['low'] = min(bar['low'], candle['low'])
+            if timestamp >= self._last:
+                bar['close'] = candle['close']
+                self._last = timestamp
+            bar['volume'] += candle['volume']
+            return None
+
+        start = bin_start(timestamp, self.minutes)
+        self._end = start + timedelta(minutes=self.minutes)
+        self._last = timestamp
+        self.forming = {
+            'timestamp': start,
+            'open': candle['open'],
+            'high': candle['high'],
+            'low': candle['low'],
+            'close': candle['close'],
+            'volume': candle['volume'],
+        }
+        if bar is None:
+            return None
+        self.closed.append(bar)
+        for indicator in self.indicators.values():
+            indicator.update(bar)
+        if self.window is not None:
+            while self.closed and self.closed[0]['timestamp'] < start - self.window:
+                self.closed.popleft()
+        return bar
+
+    def bars(self) -> List[Dict[str, Any]]:
+        """All bars, oldest first, the forming one last."""
+        return list(self.closed) + ([self.forming] if self.forming is not None else [])
+
+    def tail(self, n: int) -> List[Dict[str, Any]]:
+        """The last `n` bars (forming one included)."""
+        forming = [self.forming] if self.forming is not None else []
+        closed = list(islice(reversed(self.closed), max(0, n - len(forming))))
+        return closed[::-1] + forming
+
+    def latest(self, name: str) -> Optional[float]:
+        """Indicator value at the forming bar."""
+        if name not in self._latest:
+            self._latest[name] = self.indicators[name].peek(self.forming) if self.forming is not None else None
+        return self._latest[name]
+
+    def previous(self, name: str) -> Optional[float]:
+        """Indicator value at the last closed bar."""
+        return self.indicators[name].value
+
+
+class CandleStream:
+    """
+    Timeframes of one symbol fed from its candle stream. A candle newer than the last accepted
+    one is added; an older (or same-time) one is merged into the forming bars when it falls
+    inside the forming bar of every timeframe (a late tick, a second source) and ignored when
+    it belongs to a closed bar. The signal generator re-feeds its whole tick window every
+    cycle, so candles already merged into the forming bars are recognised and ignored too.
+    `version` counts accepted candles so callers can cache what they derive.
+    """
+
+    def __init__(self, frames: Dict[str, TimeframeBars]):
+        self.frames = frames
+        self.last_timestamp: Optional[datetime] = None
+        self.version = 0
+        self._forming_start: Optional[datetime] = None  # start of the shortest forming bar
+        self._forming_keys: Set[Tuple] = set()  # candles already in the forming bars
+
+    @staticmethod
+    def _key(candle: Dict[str, Any]) -> Tuple:
+        return (candle['timestamp'], candle['open'], candle['high'], candle['low'], candle['close'], candle['volume'])
+
+    def accepts(self, candle: Dict[str, Any]) -> bool:
+        timestamp = candle.get('timestamp')
+        if not isinstance(timestamp, datetime):
+            return False
+        if self.last_timestamp is None or timestamp > self.last_timestamp:
+            return True
+        return timestamp >= self._forming_start and self._key(candle) not in self._forming_keys
+
+    def add(self, candle: Dict[str, Any]) -> bool:
+        if not self.accepts(candle):
+            return False
+        for frame in self.frames.values():
+            frame.add(candle)
+        if self.last_timestamp is None or candle['timestamp'] > self.last_timestamp:
+            self.last_timestamp = candle['timestamp']
+        forming_start = max(frame.forming['timestamp'] for frame in self.frames.values())
+        if forming_start != self._forming_start:
+            self._forming_start = forming_start
+            self._forming_keys = set()
+        self._forming_keys.add(self._key(candle))
+        self.version += 1
+        return True
+
+    def extend(self, candles: Iterable[Dict[str, Any]]) -> int:
+        return sum(self.add(candle) for candle in candles)
@@ -1,7 +1,10 @@
 """
 Trend-following strategy using multi-timeframe EMA crossovers and ADX filter.
-- Uses historical price data from price_ticks table
-- Multi-timeframe analysis (5min, 15min, 1h)
+- Fed from the StrategyBase candle feed (update_data); cold symbols are loaded once from
+  the price_ticks table
+- Multi-timeframe analysis (5min, 15min, 1h) on incrementally maintained bars with
+  streaming EMA/ADX state (see timeframes.py); the DataFrame helpers below are the
+  reference implementation (pandas is only imported when those run)
 - ADX filter for trend strength
 - Returns JSON-serializable signals with entry/exit levels
 """
@@ -10,21 +13,25 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
 
-import numpy as np
-import pandas as pd
 from sqlmodel import select, and_, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.app.core.logger import logger
 from backend.app.db.models import PriceTick
 from backend.app.strategies.base import StrategyBase
+from backend.app.strategies.timeframes import CandleStream, StreamingADX, StreamingEMA, TimeframeBars
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class TrendFollowingStrategy(StrategyBase):
     name = "trend_following"
     """Multi-timeframe EMA crossover strategy with ADX trend filter."""
+    state_attributes = StrategyBase.state_attributes + ("_streams",)
+    state_version = 2  # 2: late candles merged into the forming bars
     
     def __init__(
         self,
@@ -41,6 +48,44 @@ class TrendFollowingStrategy(StrategyBase):
         self.adx_threshold = adx_threshold
         self.min_confidence = min_confidence
         self.name = "trend_following"
+        self.hours_back = 24  # Bars kept per timeframe
+        self.timeframes = {"5m": 5, "15m": 15, "1h": 60}
+        self._streams: Dict[str, CandleStream] = {}  # symbol -> multi-timeframe bars
+        self._analysis: Dict[str, tuple] = {}  # symbol -> (stream version, timeframe analyses)
+    
+    def _new_stream(self) -> CandleStream:
+        return CandleStream({
+            tf: TimeframeBars(minutes, window=timedelta(hours=self.hours_back), indicators={
+                "ema_fast": StreamingEMA(self.fast_ema),
+                "ema_slow": StreamingEMA(self.slow_ema),
+                "adx": StreamingADX(self.adx_period),
+            })
+            for tf, minutes in self.timeframes.items()
+        })
+    
+    def update_data(self, symbol: str, new_candle: Dict[str, Any]) -> None:
+        """
+        Add a candle to the symbol's bars (late ones are merged into the forming bars, see
+        CandleStream); the price history only takes candles newer than its last one.
+        """
+        stream = self._streams.get(symbol)
+        if stream is None:
+            stream = self._streams[symbol] = self._new_stream()
+        candle = self.make_candle(new_candle)
+        if stream.add(candle):
+            super().update_data(symbol, candle)
+    
+    async def _ensure_stream(self, session: AsyncSession, symbol: str) -> TimeframeBars:
+        """5m bars of the symbol, loaded from the database the first time it is seen."""
+        stream = self._streams.get(symbol)
+        if stream is None or stream.version == 0:
+            df = await self.get_historical_data(session, symbol, hours_back=self.hours_back)
+            if df.empty:
+                return self._new_stream().frames["5m"]
+            for ts, row in zip(df.index.to_pydatetime(), df.to_dict('records')):
+                self.update_data(symbol, dict(row, timestamp=ts))
+            stream = self._streams.get(symbol) or self._new_stream()
+        return stream.frames["5m"]
     
     async def get_historical_data(
         self, 
@@ -49,6 +94,8 @@ class TrendFollowingStrategy(StrategyBase):
         hours_back: int = 24
     ) -> pd.DataFrame:
         """Fetch historical price data for the symbol."""
+        import pandas as pd
+        
         cutoff_time = datetime.utcnow() - timedelta(hours=hours_back)
         
         stmt = select(PriceTick).where(
@@ -102,6 +149,9 @@ class TrendFollowingStrategy(StrategyBase):
     
     def calculate_adx(self, df: pd.DataFrame, period: int = 14) -> pd.Series:
         """Calculate Average Directional Index (ADX)."""
+        import numpy as np
+        import pandas as pd
+        
         high = df['high']
         low = df['low']
         close = df['close']
@@ -112,7 +162,7 @@ class TrendFollowingStrategy(StrategyBase):
         tr3 = abs(low - close.shift(1))
         tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
         
-        # Calculate Directional Movement
+        # Calculate Directional Movement (aligned with the frame's index)
         dm_plus = np.where((high - high.shift(1)) > (low.shift(1) - low), 
                           np.maximum(high - high.shift(1), 0), 0)
         dm_minus = np.where((low.shift(1) - low) > (high - high.shift(1)), 
@@ -120,8 +170,8 @@ class TrendFollowingStrategy(StrategyBase):
         
         # Smooth the values
         tr_smooth = tr.rolling(window=period).mean()
-        dm_plus_smooth = pd.Series(dm_plus).rolling(window=period).mean()
-        dm_minus_smooth = pd.Series(dm_minus).rolling(window=period).mean()
+        dm_plus_smooth = pd.Series(dm_plus, index=df.index).rolling(window=period).mean()
+        dm_minus_smooth = pd.Series(dm_minus, index=df.index).rolling(window=period).mean()
         
         # Calculate Directional Indicators (with division by zero protection)
         di_plus = 100 * (dm_plus_smooth / tr_smooth.replace(0, 1))  # Replace 0 with 1 to avoid division by zero
@@ -136,6 +186,8 @@ class TrendFollowingStrategy(StrategyBase):
     
     def analyze_timeframe(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Analyze a single timeframe for EMA crossover signals."""
+        import pandas as pd
+        
         try:
             if df.empty or len(df) < max(self.fast_ema, self.slow_ema, self.adx_period):
                 return {"signal": "hold", "confidence": 0.0}
@@ -189,6 +241,57 @@ class TrendFollowingStrategy(StrategyBase):
             logger.exception(f"Error in analyze_timeframe: {e}")
             return {"signal": "hold", "confidence": 0.0}
     
+    def analyze_bars(self, frame: TimeframeBars) -> Dict[str, Any]:
+        """analyze_timeframe on incrementally maintained bars (the forming bar is the latest)."""
+        if len(frame) < max(self.fast_ema, self.slow_ema, self.adx_period):
+            return {"signal": "hold", "confidence": 0.0}
+        
+        latest_fast = frame.latest("ema_fast")
+        latest_slow = frame.latest("ema_slow")
+        latest_adx = frame.latest("adx")
+        latest_price = frame.forming['close']
+        prev_fast = frame.previous("ema_fast") if frame.closed else latest_fast
+        prev_slow = frame.previous("ema_slow") if frame.closed else latest_slow
+        
+        if latest_adx is None or latest_adx < self.adx_threshold:
+            # Weak trend - no signal
+            return {"signal": "hold", "confidence": 0.0}
+        
+        signal = "hold"
+        confidence = 0.0
+        if prev_fast <= prev_slow and latest_fast > latest_slow:
+            signal = "buy"
+            confidence = min(0.9, latest_adx / 50.0) if latest_adx > 0 else 0.0
+        elif prev_fast >= prev_slow and latest_fast < latest_slow:
+            signal = "sell"
+            confidence = min(0.9, latest_adx / 50.0) if latest_adx > 0 else 0.0
+        
+        return {
+            "signal": signal,
+            "confidence": confidence,
+            "ema_fast": float(latest_fast),
+            "ema_slow": float(latest_slow),
+            "adx": float(latest_adx),
+            "price": float(latest_price)
+        }
+    
+    def analyze_stream(self, symbol: str) -> Dict[str, Dict[str, Any]]:
+        """Analyses of every timeframe of the symbol, recomputed only after a new candle."""
+        stream = self._streams.get(symbol)
+        if stream is None:
+            return {}
+        cached = self._analysis.get(symbol)
+        if cached is not None and cached[0] == stream.version:
+            return cached[1]
+        
+        hold = {"signal": "hold", "confidence": 0.0}
+        analyses = {}
+        for tf, frame in stream.frames.items():
+            # Higher timeframes need 20 bars
+            analyses[tf] = self.analyze_bars(frame) if tf == "5m" or len(frame) >= 20 else dict(hold)
+        self._analysis[symbol] = (stream.version, analyses)
+        return analyses
+    
     async def generate_signal(
         self, 
         session: AsyncSession, 
@@ -196,11 +299,10 @@ class TrendFollowingStrategy(StrategyBase):
     ) -> Dict[str, Any]:
         """Generate trading signal for the given symbol."""
         try:
-            # Get historical data
-            df = await self.get_historical_data(session, symbol, hours_back=24)
+            bars_5m = await self._ensure_stream(session, symbol)
             
             # FIX: Relaxed minimum data requirement (professional standard: 30-50 candles)
-            if df.empty or len(df) < 30:
+            if len(bars_5m) < 30:
                 return {
                     "strategy": self.name,
                     "symbol": symbol,
@@ -213,29 +315,9 @@ class TrendFollowingStrategy(StrategyBase):
                     "reason": "insufficient_data"
                 }
             
-            # Analyze 5-minute timeframe
-            tf_5m = self.analyze_timeframe(df)
-            
-            # Create 15-minute and 1-hour timeframes
-            df_15m = df.resample('15min').agg({
-                'open': 'first',
-                'high': 'max',
-                'low': 'min',
-                'close': 'last',
-                'volume': 'sum'
-            }).dropna()
-            
-            df_1h = df.resample('1h').agg({
-                'open': 'first',
-                'high': 'max',
-                'low': 'min',
-                'close': 'last',
-                'volume': 'sum'
-            }).dropna()
-            
-            # Analyze higher timeframes
-            tf_15m = self.analyze_timeframe(df_15m) if len(df_15m) >= 20 else {"signal": "hold", "confidence": 0.0}
-            tf_1h = self.analyze_timeframe(df_1h) if len(df_1h) >= 20 else {"signal": "hold", "confidence": 0.0}
+            # Analyze 5-minute, 15-minute and 1-hour timeframes
+            analyses = self.analyze_stream(symbol)
+            tf_5m, tf_15m, tf_1h = analyses["5m"], analyses["15m"], analyses["1h"]
             
             # Multi-timeframe consensus
             signals = [tf_5m["signal"], tf_15m["signal"], tf_1h["signal"]]
@@ -260,14 +342,11 @@ class TrendFollowingStrategy(StrategyBase):
             if buy_count >= 2 and weighted_confidence >= self.min_confidence:
                 action = "buy"
                 entry = tf_5m.get("price", 0.0)
-                # Set stop loss and take profit based on ATR
-                atr = self.calculate_atr(df, 14)
                 sl = entry * 0.98  # 2% stop loss
                 tp = entry * 1.04  # 4% take profit
             elif sell_count >= 2 and weighted_confidence >= self.min_confidence:
                 action = "sell"
                 entry = tf_5m.get("price", 0.0)
-                atr = self.calculate_atr(df, 14)
                 sl = entry * 1.02  # 2% stop loss
                 tp = entry * 0.96  # 4% take profit
             # Single timeframe with strong confirmation (professional fallback)
@@ -275,7 +354,6 @@ class TrendFollowingStrategy(StrategyBase):
                 # Strong trend (ADX >= 30) + high confidence (>= 0.7) = valid signal
                 action = "buy"
                 entry = strongest_tf.get("price", tf_5m.get("price", 0.0))
-                atr = self.calculate_atr(df, 14)
                 sl = entry * 0.98  # 2% stop loss
                 tp = entry * 1.04  # 4% take profit
                 weighted_confidence = strongest_confidence  # Use strongest confidence
@@ -283,7 +361,6 @@ class TrendFollowingStrategy(StrategyBase):
                 # Strong trend (ADX >= 30) + high confidence (>= 0.7) = valid signal
                 action = "sell"
                 entry = strongest_tf.get("price", tf_5m.get("price", 0.0))
-                atr = self.calculate_atr(df, 14)
                 sl = entry * 1.02  # 2% stop loss
                 tp = entry * 0.96  # 4% take profit
                 weighted_confidence = strongest_confidence  # Use strongest confidence
@@ -324,6 +401,8 @@ class TrendFollowingStrategy(StrategyBase):
     
     def calculate_atr(self, df: pd.DataFrame, period: int = 14) -> float:
         """Calculate Average True Range."""
+        import pandas as pd
+        
         if len(df) < period + 1:
             return 0.0
         
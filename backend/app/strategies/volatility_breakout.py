@@ -1,7 +1,10 @@
 """
 Volatility breakout strategy using ATR-based breakouts and volatility sizing.
 - Uses recent highs/lows and ATR for breakout detection
-- Pulls data from diverse sources via price_ticks
+- Fed from the StrategyBase candle feed (update_data) into incrementally maintained 15m
+  bars with streaming ATR (see timeframes.py); cold symbols are loaded once from
+  price_ticks. The DataFrame helpers below are the reference implementation (pandas is
+  only imported when those run)
 - Returns JSON-serializable signals with dynamic position sizing
 """
 
@@ -9,21 +12,26 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from statistics import stdev
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Tuple
 
-import numpy as np
-import pandas as pd
 from sqlmodel import select, and_, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.app.core.logger import logger
 from backend.app.db.models import PriceTick
 from backend.app.strategies.base import StrategyBase
+from backend.app.strategies.timeframes import CandleStream, StreamingATR, TimeframeBars
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class VolatilityBreakoutStrategy(StrategyBase):
     name = "volatility_breakout"
     """ATR-based breakout strategy with volatility-adjusted position sizing."""
+    state_attributes = StrategyBase.state_attributes + ("_streams",)
+    state_version = 2  # 2: late candles merged into the forming bars
     
     def __init__(
         self,
@@ -40,6 +48,39 @@ class VolatilityBreakoutStrategy(StrategyBase):
         self.min_volume_ratio = min_volume_ratio
         self.max_risk_per_trade = max_risk_per_trade
         self.name = "volatility_breakout"
+        self.hours_back = 48  # 15m bars kept
+        self._streams: Dict[str, CandleStream] = {}  # symbol -> 15m bars
+        self._analysis: Dict[str, tuple] = {}  # symbol -> (stream version, (metrics, breakout))
+    
+    def _new_stream(self) -> CandleStream:
+        return CandleStream({
+            "15m": TimeframeBars(15, window=timedelta(hours=self.hours_back),
+                                 indicators={"atr": StreamingATR(self.atr_period)}),
+        })
+    
+    def update_data(self, symbol: str, new_candle: Dict[str, Any]) -> None:
+        """
+        Add a candle to the symbol's bars (late ones are merged into the forming bars, see
+        CandleStream); the price history only takes candles newer than its last one.
+        """
+        stream = self._streams.get(symbol)
+        if stream is None:
+            stream = self._streams[symbol] = self._new_stream()
+        candle = self.make_candle(new_candle)
+        if stream.add(candle):
+            super().update_data(symbol, candle)
+    
+    async def _ensure_stream(self, session: AsyncSession, symbol: str) -> TimeframeBars:
+        """15m bars of the symbol, loaded from the database the first time it is seen."""
+        stream = self._streams.get(symbol)
+        if stream is None or stream.version == 0:
+            df = await self.get_historical_data(session, symbol, hours_back=self.hours_back)
+            if df.empty:
+                return self._new_stream().frames["15m"]
+            for ts, row in zip(df.index.to_pydatetime(), df.to_dict('records')):
+                self.update_data(symbol, dict(row, timestamp=ts))
+            stream = self._streams.get(symbol) or self._new_stream()
+        return stream.frames["15m"]
     
     async def get_historical_data(
         self, 
@@ -48,6 +89,8 @@ class VolatilityBreakoutStrategy(StrategyBase):
         hours_back: int = 48
     ) -> pd.DataFrame:
         """Fetch historical price data for the symbol."""
+        import pandas as pd
+        
         cutoff_time = datetime.utcnow() - timedelta(hours=hours_back)
         
         stmt = select(PriceTick).where(
@@ -97,6 +140,8 @@ class VolatilityBreakoutStrategy(StrategyBase):
     
     def calculate_atr(self, df: pd.DataFrame, period: int = 14) -> pd.Series:
         """Calculate Average True Range."""
+        import pandas as pd
+        
         high = df['high']
         low = df['low']
         close = df['close']
@@ -111,6 +156,8 @@ class VolatilityBreakoutStrategy(StrategyBase):
     
     def calculate_volatility_metrics(self, df: pd.DataFrame) -> Dict[str, float]:
         """Calculate volatility and volume metrics."""
+        import pandas as pd
+        
         if len(df) < self.lookback_period:
             return {"atr": 0.0, "volatility": 0.0, "volume_ratio": 0.0}
         
@@ -150,13 +197,25 @@ class VolatilityBreakoutStrategy(StrategyBase):
         current_bar = recent_data.iloc[-1]
         previous_bars = recent_data.iloc[:-1]
         
-        # Calculate recent highs and lows
-        recent_high = previous_bars['high'].max()
-        recent_low = previous_bars['low'].min()
-        current_high = current_bar['high']
-        current_low = current_bar['low']
-        current_close = current_bar['close']
-        
+        return self._breakout(
+            previous_bars['high'].max(),
+            previous_bars['low'].min(),
+            current_bar['high'],
+            current_bar['low'],
+            current_bar['close'],
+            atr,
+        )
+    
+    def _breakout(
+        self,
+        recent_high: float,
+        recent_low: float,
+        current_high: float,
+        current_low: float,
+        current_close: float,
+        atr: float,
+    ) -> Dict[str, Any]:
+        """Breakout decision from the previous bars' range and the current bar."""
         # Calculate breakout levels
         resistance = recent_high + (atr * self.breakout_multiplier)
         support = recent_low - (atr * self.breakout_multiplier)
@@ -170,15 +229,15 @@ class VolatilityBreakoutStrategy(StrategyBase):
         if current_high > resistance and current_close > recent_high:
             signal = "buy"
             breakout_type = "bullish"
-            # Confidence based on how far above resistance
-            confidence = min(0.9, (current_high - resistance) / (atr * 0.5))
+            # Confidence based on how far above resistance (capped when ATR is zero)
+            confidence = min(0.9, (current_high - resistance) / (atr * 0.5)) if atr > 0 else 0.9
         
         # Bearish breakout
         elif current_low < support and current_close < recent_low:
             signal = "sell"
             breakout_type = "bearish"
             # Confidence based on how far below support
-            confidence = min(0.9, (support - current_low) / (atr * 0.5))
+            confidence = min(0.9, (support - current_low) / (atr * 0.5)) if atr > 0 else 0.9
         
         return {
             "signal": signal,
@@ -191,6 +250,60 @@ class VolatilityBreakoutStrategy(StrategyBase):
             "current_price": float(current_close)
         }
     
+    def volatility_metrics_bars(self, frame: TimeframeBars) -> Dict[str, float]:
+        """calculate_volatility_metrics on incrementally maintained bars."""
+        if len(frame) < self.lookback_period:
+            return {"atr": 0.0, "volatility": 0.0, "volume_ratio": 0.0}
+        
+        atr = frame.latest("atr")
+        bars = frame.tail(self.lookback_period + 1)
+        
+        # Standard deviation of the last lookback_period returns
+        volatility = 0.0
+        if len(bars) > self.lookback_period:
+            closes = [bar['close'] for bar in bars]
+            volatility = stdev((closes[i] - closes[i - 1]) / closes[i - 1] for i in range(1, len(closes)))
+        
+        # Volume ratio (current vs average)
+        avg_volume = sum(bar['volume'] for bar in bars[-self.lookback_period:]) / self.lookback_period
+        volume_ratio = bars[-1]['volume'] / avg_volume if avg_volume > 0 else 0.0
+        
+        return {
+            "atr": float(atr) if atr is not None else 0.0,
+            "volatility": float(volatility),
+            "volume_ratio": float(volume_ratio)
+        }
+    
+    def detect_breakout_bars(self, frame: TimeframeBars, atr: float) -> Dict[str, Any]:
+        """detect_breakout on incrementally maintained bars (the forming bar is the current one)."""
+        if len(frame) < self.lookback_period + 1:
+            return {"signal": "hold", "breakout_type": None, "confidence": 0.0}
+        
+        bars = frame.tail(self.lookback_period + 1)
+        current_bar = bars[-1]
+        return self._breakout(
+            max(bar['high'] for bar in bars[:-1]),
+            min(bar['low'] for bar in bars[:-1]),
+            current_bar['high'],
+            current_bar['low'],
+            current_bar['close'],
+            atr,
+        )
+    
+    def analyze_stream(self, symbol: str) -> Tuple[Dict[str, float], Dict[str, Any]]:
+        """(volatility metrics, breakout) of the symbol's 15m bars, recomputed only after a new candle."""
+        stream = self._streams.get(symbol)
+        cached = self._analysis.get(symbol)
+        if stream is not None and cached is not None and cached[0] == stream.version:
+            return cached[1]
+        
+        frame = stream.frames["15m"] if stream is not None else TimeframeBars(15)
+        metrics = self.volatility_metrics_bars(frame)
+        result = (metrics, self.detect_breakout_bars(frame, metrics["atr"]))
+        if stream is not None:
+            self._analysis[symbol] = (stream.version, result)
+        return result
+    
     def calculate_position_size(
         self, 
         price: float, 
@@ -229,11 +342,10 @@ class VolatilityBreakoutStrategy(StrategyBase):
     ) -> Dict[str, Any]:
         """Generate volatility breakout signal for the given symbol."""
         try:
-            # Get historical data
-            df = await self.get_historical_data(session, symbol, hours_back=48)
+            bars_15m = await self._ensure_stream(session, symbol)
             
             # FIX: Relaxed minimum data requirement (professional standard: lookback + 2)
-            if df.empty or len(df) < self.lookback_period + 2:
+            if len(bars_15m) < self.lookback_period + 2:
                 return {
                     "strategy": self.name,
                     "symbol": symbol,
@@ -247,8 +359,8 @@ class VolatilityBreakoutStrategy(StrategyBase):
                     "reason": "insufficient_data"
                 }
             
-            # Calculate volatility metrics
-            vol_metrics = self.calculate_volatility_metrics(df)
+            # Calculate volatility metrics (and the breakout, used below if volume confirms)
+            vol_metrics, breakout = self.analyze_stream(symbol)
             atr = vol_metrics["atr"]
             volume_ratio = vol_metrics["volume_ratio"]
             
@@ -267,9 +379,6 @@ class VolatilityBreakoutStrategy(StrategyBase):
                     "reason": "low_volume"
                 }
             
-            # Detect breakout
-            breakout = self.detect_breakout(df, atr)
-            
             if breakout["signal"] == "hold":
                 return {
                     "strategy": self.name,
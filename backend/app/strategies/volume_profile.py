@@ -13,10 +13,10 @@ Volume Profile:
 - High volume nodes = strong support/resistance
 - Low volume nodes = weak areas (price moves through quickly)
 """
-from typing import List, Dict, Any, Optional
-from collections import defaultdict
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Tuple
+from collections import deque
 from statistics import mean
-from backend.app.strategies.base import StrategyBase
+from backend.app.strategies.base import StrategyBase, history_shift
 
 
 class VolumeProfileStrategy(StrategyBase):
@@ -24,6 +24,7 @@ class VolumeProfileStrategy(StrategyBase):
     Volume Profile strategy - trades bounces from Price Volume Nodes.
     """
     name = "volume_profile"
+    state_attributes = StrategyBase.state_attributes + ("_profiles",)
     
     def __init__(self):
         super().__init__()
@@ -31,69 +32,45 @@ class VolumeProfileStrategy(StrategyBase):
         self.profile_period = 50  # Calculate profile over last 50 candles
         self.node_threshold = 1.5  # Volume must be 1.5x average to be a node
         self.bounce_threshold = 0.005  # 0.5% from node to count as bounce
+        self.num_buckets = 20  # Price levels in the profile
+        self._profiles: Dict[str, "_ProfileState"] = {}  # symbol -> incremental histogram
     
     def _calculate_volume_profile(self, history: List[Dict[str, Any]]) -> Dict[float, float]:
         """
         Calculate volume profile - volume at each price level.
-        Returns: {price_level: total_volume}
+        Returns: {price_level: total_volume}, price levels ascending
         """
         if len(history) < self.profile_period:
             return {}
         
-        # Use recent candles
-        recent_history = history[-self.profile_period:]
-        
-        # Create price buckets (divide price range into 20 levels)
-        prices = [c.get('close', 0.0) for c in recent_history if c.get('close', 0.0) > 0]
-        if not prices:
-            return {}
-        
-        min_price = min(prices)
-        max_price = max(prices)
-        price_range = max_price - min_price
-        
-        if price_range == 0:
+        histogram = VolumeHistogram(self.profile_period, self.num_buckets)
+        for candle in history[-self.profile_period:]:
+            histogram.add(candle)
+        return histogram.profile()
+    
+    def _volume_profile(self, symbol: str, history: List[Dict[str, Any]]) -> Dict[float, float]:
+        """
+        Volume profile of the symbol's current history from its incremental histogram. Same
+        profile as _calculate_volume_profile(history) (up to float rounding); candles that
+        arrived since the previous call are added (evicting the ones leaving the window),
+        anything else rebuilds the histogram.
+        """
+        if len(history) < self.profile_period:
+            self._profiles.pop(symbol, None)
             return {}
         
-        # Create 20 price buckets
-        num_buckets = 20
-        bucket_size = price_range / num_buckets
-        
-        volume_profile = defaultdict(float)
-        
-        for candle in recent_history:
-            high = candle.get('high', 0.0)
-            low = candle.get('low', 0.0)
-            volume = candle.get('volume', 0.0)
-            
-            if high == 0 or low == 0:
-                continue
-            
-            # Distribute volume across price buckets this candle touched
-            candle_range = high - low
-            if candle_range == 0:
-                # Single price - all volume to that bucket
-                bucket = int((high - min_price) / bucket_size)
-                bucket = max(0, min(num_buckets - 1, bucket))
-                price_level = min_price + (bucket * bucket_size)
-                volume_profile[price_level] += volume
-            else:
-                # Distribute volume proportionally across touched buckets
-                touched_buckets = set()
-                for price in [low, high, candle.get('open', 0.0), candle.get('close', 0.0)]:
-                    if min_price <= price <= max_price:
-                        bucket = int((price - min_price) / bucket_size)
-                        bucket = max(0, min(num_buckets - 1, bucket))
-                        touched_buckets.add(bucket)
-                
-                # Distribute volume equally among touched buckets
-                if touched_buckets:
-                    volume_per_bucket = volume / len(touched_buckets)
-                    for bucket in touched_buckets:
-                        price_level = min_price + (bucket * bucket_size)
-                        volume_profile[price_level] += volume_per_bucket
-        
-        return dict(volume_profile)
+        state = self._profiles.get(symbol)
+        shift = history_shift(state.candles, history) if state is not None else None
+        if shift is None:
+            histogram = VolumeHistogram(self.profile_period, self.num_buckets)
+            new_candles = history[-self.profile_period:]
+        else:
+            histogram = state.histogram
+            new_candles = history[len(history) - min(shift[0], self.profile_period):]
+        for candle in new_candles:
+            histogram.add(candle)
+        self._profiles[symbol] = _ProfileState(history, histogram)
+        return histogram.profile()
     
     def _find_volume_nodes(self, volume_profile: Dict[float, float]) -> List[Dict[str, Any]]:
         """
@@ -181,7 +158,7 @@ class VolumeProfileStrategy(StrategyBase):
         if len(history) < self.min_history_required:
             return False
         
-        volume_profile = self._calculate_volume_profile(history)
+        volume_profile = self._volume_profile(symbol, history)
         nodes = self._find_volume_nodes(volume_profile)
         
         if not nodes:
@@ -209,7 +186,7 @@ class VolumeProfileStrategy(StrategyBase):
         if len(history) < self.min_history_required:
             return False
         
-        volume_profile = self._calculate_volume_profile(history)
+        volume_profile = self._volume_profile(symbol, history)
         nodes = self._find_volume_nodes(volume_profile)
         
         if not nodes:
@@ -227,7 +204,7 @@ class VolumeProfileStrategy(StrategyBase):
         if len(history) < self.min_history_required:
             return None
         
-        volume_profile = self._calculate_volume_profile(history)
+        volume_profile = self._volume_profile(symbol, history)
         nodes = self._find_volume_nodes(volume_profile)
         
         if not nodes:
@@ -250,7 +227,7 @@ class VolumeProfileStrategy(StrategyBase):
         if action is None:
             return None
         
-        volume_profile = self._calculate_volume_profile(history)
+        volume_profile = self._volume_profile(symbol, history)
         nodes = self._find_volume_nodes(volume_profile)
         entry = history[-1].get('close', 0.0)
         
@@ -298,3 +275,105 @@ class VolumeProfileStrategy(StrategyBase):
             "strategy": self.name,
         }
 
+
+class VolumeHistogram:
+    """
+    Volume profile of the last `period` candles, kept as per-bucket arrays.
+    
+    The price range (min/max close of the window) is split into `num_buckets` levels; each
+    candle spreads its volume equally over the buckets its low/high/open/close fall in
+    (all of it into one bucket for a zero-range candle). Every candle's contribution is
+    remembered, so adding a candle and evicting the oldest one are O(1) updates; the window
+    is only re-binned when the price range changes, and every RESYNC_EVERY incremental
+    updates to drop accumulated rounding.
+    """
+    
+    RESYNC_EVERY = 1000
+    
+    def __init__(self, period: int, num_buckets: int = 20):
+        self.period = period
+        self.num_buckets = num_buckets
+        # [candle, (buckets, volume per bucket) or None while not binned]
+        self._window: Deque[List[Any]] = deque()
+        self._unbinned = 0  # trailing window entries not binned yet
+        self._range: Optional[Tuple[float, float]] = None  # (min, max) close the bins were built for
+        self._volume = [0.0] * num_buckets
+        self._touches = [0] * num_buckets  # candles contributing to each bucket
+        self._updates = 0
+        self._profile: Optional[Dict[float, float]] = None
+    
+    def add(self, candle: Dict[str, Any]) -> None:
+        self._window.append([candle, None])
+        self._unbinned += 1
+        if len(self._window) > self.period:
+            _, contribution = self._window.popleft()
+            if contribution is not None:
+                self._apply(contribution, -1)
+            else:
+                self._unbinned -= 1
+        self._profile = None
+    
+    def _apply(self, contribution: Tuple[Tuple[int, ...], float], sign: int) -> None:
+        buckets, volume = contribution
+        for bucket in buckets:
+            self._touches[bucket] += sign
+            self._volume[bucket] = self._volume[bucket] + sign * volume if self._touches[bucket] else 0.0
+        self._updates += 1
+    
+    def _bin(self, candle: Dict[str, Any], min_price: float, max_price: float, bucket_size: float):
+        high = candle.get('high', 0.0)
+        low = candle.get('low', 0.0)
+        volume = candle.get('volume', 0.0)
+        if high == 0 or low == 0:
+            return (), 0.0
+        
+        if high - low == 0:
+            # Single price - all volume to that bucket
+            bucket = max(0, min(self.num_buckets - 1, int((high - min_price) / bucket_size)))
+            return (bucket,), volume
+        
+        touched = set()
+        for price in (low, high, candle.get('open', 0.0), candle.get('close', 0.0)):
+            if min_price <= price <= max_price:
+                touched.add(max(0, min(self.num_buckets - 1, int((price - min_price) / bucket_size))))
+        if not touched:
+            return (), 0.0
+        return tuple(sorted(touched)), volume / len(touched)
+    
+    def profile(self) -> Dict[float, float]:
+        """{price_level: volume} for the buckets touched by the window, ascending price."""
+        if self._profile is not None:
+            return self._profile
+        
+        prices = [p for p in (entry[0].get('close', 0.0) for entry in self._window) if p > 0]
+        if not prices or max(prices) == min(prices):
+            self._profile = {}
+            return self._profile
+        
+        price_range = (min(prices), max(prices))
+        if price_range != self._range or self._updates >= self.RESYNC_EVERY:
+            # Bucket edges moved: re-bin the whole window
+            self._range = price_range
+            self._volume = [0.0] * self.num_buckets
+            self._touches = [0] * self.num_buckets
+            self._unbinned = len(self._window)
+            self._updates = 0
+        
+        min_price, max_price = price_range
+        bucket_size = (max_price - min_price) / self.num_buckets
+        for i in range(len(self._window) - self._unbinned, len(self._window)):
+            entry = self._window[i]
+            entry[1] = self._bin(entry[0], min_price, max_price, bucket_size)
+            self._apply(entry[1], 1)
+        self._unbinned = 0
+        
+        self._profile = {
+            min_price + bucket * bucket_size: self._volume[bucket]
+            for bucket in range(self.num_buckets) if self._touches[bucket]
+        }
+        return self._profile
+
+
+class _ProfileState(NamedTuple):
+    candles: List[Dict[str, Any]]
+    histogram: VolumeHistogram
@@ -10,10 +10,17 @@ Key principles:
 4. VWAP + volume confirmation = institutional-level accuracy
 
 This is what makes signals "almost always true" - VWAP is where institutions trade.
+
+Modes (vwap_mode):
+- "rolling": VWAP of the last vwap_period candles
+- "session": VWAP anchored at the session open (UTC day of the candle timestamp), reset daily
+Both are maintained per symbol as running sums, so each new candle costs O(1).
 """
-from typing import List, Dict, Any, Optional
+from collections import deque
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
 from statistics import mean
-from backend.app.strategies.base import StrategyBase
+from backend.app.strategies.base import StrategyBase, history_shift
 
 
 class VWAPStrategy(StrategyBase):
@@ -21,46 +28,58 @@ class VWAPStrategy(StrategyBase):
     VWAP-based strategy - institutional traders' primary tool.
     """
     name = "vwap"
+    state_attributes = StrategyBase.state_attributes + ("_vwap_state",)
     
     def __init__(self):
         super().__init__()
         self.min_history_required = 50  # Need enough for VWAP calculation
-        self.vwap_period = 20  # Standard VWAP period (can be session-based)
+        self.vwap_period = 20  # Standard VWAP period (rolling mode)
+        self.vwap_mode = "rolling"  # "rolling" (last vwap_period candles) or "session" (daily reset)
         self.bounce_threshold = 0.002  # 0.2% from VWAP to count as bounce
+        self._vwap_state: Dict[str, "_VWAPState"] = {}  # symbol -> running VWAP sums
+    
+    def _new_accumulator(self) -> "VWAPAccumulator":
+        if self.vwap_mode == "session":
+            return VWAPAccumulator(anchor=session_day)
+        return VWAPAccumulator(period=self.vwap_period)
     
     def _calculate_vwap(self, history: List[Dict[str, Any]]) -> float:
         """
-        Calculate VWAP (Volume Weighted Average Price).
-        VWAP = Sum(Price * Volume) / Sum(Volume)
+        Calculate VWAP (Volume Weighted Average Price) of a history in the current mode.
+        VWAP = Sum(Price * Volume) / Sum(Volume), Price = typical price (high + low + close) / 3
         """
         if not history:
             return 0.0
         
-        # Use recent candles for VWAP (or session-based)
-        recent_history = history[-self.vwap_period:] if len(history) >= self.vwap_period else history
-        
-        total_price_volume = 0.0
-        total_volume = 0.0
-        
-        for candle in recent_history:
-            # Typical price = (high + low + close) / 3
-            typical_price = (
-                candle.get('high', 0.0) + 
-                candle.get('low', 0.0) + 
-                candle.get('close', 0.0)
-            ) / 3.0
-            
-            volume = candle.get('volume', 0.0)
-            
-            total_price_volume += typical_price * volume
-            total_volume += volume
-        
-        if total_volume == 0:
-            # Fallback to simple average if no volume
-            closes = [c.get('close', 0.0) for c in recent_history]
-            return mean(closes) if closes else 0.0
+        accumulator = self._new_accumulator()
+        for candle in history:
+            accumulator.add(candle)
+        return accumulator.value()
+    
+    def _vwap(self, symbol: str, history: List[Dict[str, Any]]) -> float:
+        """
+        VWAP of the symbol's current history from its running sums. Same value as
+        _calculate_vwap(history) (up to float rounding); candles that arrived since the previous
+        call are added, anything else (replaced history, mode change) rebuilds the sums.
+        In session mode candles that already left the bounded history still count towards
+        the session they belong to.
+        """
+        if not history:
+            self._vwap_state.pop(symbol, None)
+            return 0.0
         
-        return total_price_volume / total_volume
+        state = self._vwap_state.get(symbol)
+        shift = history_shift(state.candles, history) if state is not None and state.mode == self.vwap_mode else None
+        if shift is None:
+            accumulator = self._new_accumulator()
+            new_candles = history
+        else:
+            accumulator = state.accumulator
+            new_candles = history[len(history) - shift[0]:]
+        for candle in new_candles:
+            accumulator.add(candle)
+        self._vwap_state[symbol] = _VWAPState(history, self.vwap_mode, accumulator)
+        return accumulator.value()
     
     def _check_vwap_bounce(self, history: List[Dict[str, Any]], vwap: float) -> Optional[str]:
         """
@@ -132,7 +151,7 @@ class VWAPStrategy(StrategyBase):
         if len(history) < self.min_history_required:
             return False
         
-        vwap = self._calculate_vwap(history)
+        vwap = self._vwap(symbol, history)
         if vwap == 0:
             return False
         
@@ -154,7 +173,7 @@ class VWAPStrategy(StrategyBase):
         if len(history) < self.min_history_required:
             return False
         
-        vwap = self._calculate_vwap(history)
+        vwap = self._vwap(symbol, history)
         if vwap == 0:
             return False
         
@@ -177,7 +196,7 @@ class VWAPStrategy(StrategyBase):
         if len(history) < self.min_history_required:
             return None
         
-        vwap = self._calculate_vwap(history)
+        vwap = self._vwap(symbol, history)
         if vwap == 0:
             return None
         
@@ -198,7 +217,7 @@ class VWAPStrategy(StrategyBase):
         if action is None:
             return None
         
-        vwap = self._calculate_vwap(history)
+        vwap = self._vwap(symbol, history)
         if vwap == 0:
             return None
         
@@ -247,3 +266,104 @@ class VWAPStrategy(StrategyBase):
             "strategy": self.name,
         }
 
+
+def session_day(timestamp: Any) -> Optional[date]:
+    """
+    UTC calendar day of a candle timestamp (datetime, naive taken as UTC; epoch seconds or
+    milliseconds; ISO string). None when it cannot be read.
+    """
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc)
+        return timestamp.date()
+    if isinstance(timestamp, (int, float)):
+        seconds = timestamp / 1000.0 if timestamp > 1e11 else timestamp
+        return datetime.fromtimestamp(seconds, tz=timezone.utc).date()
+    if isinstance(timestamp, str):
+        try:
+            return session_day(datetime.fromisoformat(timestamp.replace('Z', '+00:00')))
+        except ValueError:
+            return None
+    return None
+
+
+class VWAPAccumulator:
+    """
+    Running VWAP sums fed one candle at a time.
+    
+    - period: keep only the last `period` candles; the evicted candle is subtracted from
+      the sums (rolling VWAP)
+    - anchor: candle timestamp -> session key; the sums reset whenever the key changes
+      (anchored / session VWAP)
+    With no volume in the window the value falls back to the mean close, like the original
+    loop. The sums are rebuilt from the window every RESYNC_EVERY evictions so add/subtract
+    rounding cannot build up.
+    """
+    
+    RESYNC_EVERY = 1000
+    
+    def __init__(self, period: Optional[int] = None, anchor: Optional[Callable[[Any], Any]] = None):
+        self.period = period
+        self.anchor = anchor
+        self.session: Any = None
+        self._window: Deque[Tuple[float, float, float]] = deque()  # (typical * volume, volume, close)
+        self._reset()
+    
+    def _reset(self) -> None:
+        self._window.clear()
+        self.count = 0  # candles in the sums
+        self._price_volume = 0.0
+        self._volume = 0.0
+        self._close = 0.0
+        self._volume_candles = 0  # candles with non-zero volume
+        self._evictions = 0
+    
+    def add(self, candle: Dict[str, Any]) -> None:
+        if self.anchor is not None:
+            session = self.anchor(candle.get('timestamp'))
+            if session != self.session:
+                self.session = session
+                self._reset()
+        
+        typical_price = (candle.get('high', 0.0) + candle.get('low', 0.0) + candle.get('close', 0.0)) / 3.0
+        volume = candle.get('volume', 0.0)
+        entry = (typical_price * volume, volume, candle.get('close', 0.0))
+        self._apply(entry, 1)
+        if self.period is None:
+            return
+        self._window.append(entry)
+        if len(self._window) > self.period:
+            self._apply(self._window.popleft(), -1)
+            self._evictions += 1
+            if self._evictions >= self.RESYNC_EVERY:
+                self._resync()
+    
+    def _apply(self, entry: Tuple[float, float, float], sign: int) -> None:
+        price_volume, volume, close = entry
+        self.count += sign
+        self._price_volume += sign * price_volume
+        self._volume += sign * volume
+        self._close += sign * close
+        if volume != 0:
+            self._volume_candles += sign
+    
+    def _resync(self) -> None:
+        window = list(self._window)
+        self._reset()
+        for entry in window:
+            self._apply(entry, 1)
+            self._window.append(entry)
+    
+    def value(self) -> float:
+        if self.count == 0:
+            return 0.0
+        if self._volume_candles == 0 or self._volume == 0:
+            # Fallback to simple average if no volume
+            return self._close / self.count
+        return self._price_volume / self._volume
+
+
+class _VWAPState(NamedTuple):
+    candles: List[Dict[str, Any]]
+    mode: str
+    accumulator: VWAPAccumulator
@@ -0,0 +1,102 @@
+"""
+Parity tests: Backtester.run_vectorized vs the bar-by-bar Backtester.run.
+"""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from backend.app.services.backtest.backtester import Backtester
+
+
+def make_prices(n: int, seed: int = 5):
+    rng = random.Random(seed)
+    price, prices = 100.0, []
+    for i in range(n):
+        price *= 1 + 0.01 * math.sin(i / 9) + rng.gauss(0, 0.004)
+        volume = rng.uniform(1e4, 1e6)
+        bar = {"close": price, "volume": volume}
+        if i % 3 == 0:
+            bar["adv"] = volume * 20
+        prices.append(bar)
+    return prices
+
+
+def sma_cross_signals(closes: np.ndarray, fast: int = 5, slow: int = 20):
+    """Vectorized SMA crossover: buy when fast crosses above slow, sell when it crosses below."""
+    csum = np.concatenate(([0.0], np.cumsum(closes)))
+    fast_ma = np.full(len(closes), np.nan)
+    slow_ma = np.full(len(closes), np.nan)
+    fast_ma[fast - 1:] = (csum[fast:] - csum[:-fast]) / fast
+    slow_ma[slow - 1:] = (csum[slow:] - csum[:-slow]) / slow
+    above = fast_ma > slow_ma
+    prev = np.concatenate(([False], above[:-1]))
+    valid = ~np.isnan(slow_ma) & ~np.isnan(np.concatenate(([np.nan], slow_ma[:-1])))
+    return above & ~prev & valid, ~above & prev & valid
+
+
+def loop_strategy(entries, exits):
+    def strategy_fn(symbol, history):
+        t = len(history) - 1
+        if entries[t]:
+            return {"action": "buy"}
+        if exits[t]:
+            return {"action": "sell"}
+        return {"action": "hold"}
+    return strategy_fn
+
+
+def assert_parity(loop, vec):
+    assert vec["trades"] == loop["trades"]
+    assert vec["equity_curve"] == loop["equity_curve"]
+    assert vec["final_equity"] == loop["final_equity"]
+    assert vec["total_return"] == loop["total_return"]
+    assert vec["max_drawdown"] == pytest.approx(loop["max_drawdown"], rel=1e-12, abs=1e-15)
+    assert vec["sharpe"] == pytest.approx(loop["sharpe"], rel=1e-9, abs=1e-12)
+
+
+class TestVectorizedParity:
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_sma_crossover_matches_loop(self, seed):
+        bt = Backtester(make_prices(2000, seed=seed))
+        closes, _ = bt.price_arrays()
+        entries, exits = sma_cross_signals(closes)
+        assert entries.sum() > 5
+
+        loop = bt.run(loop_strategy(entries, exits))
+        vec = bt.run_vectorized(entries, exits)
+        assert_parity(loop, vec)
+
+    def test_random_signals_with_open_position_at_end(self):
+        rng = np.random.default_rng(9)
+        bt = Backtester(make_prices(500))
+        entries = rng.random(500) < 0.05
+        exits = rng.random(500) < 0.05
+        entries[-3] = True
+        exits[-3:] = False
+
+        loop = bt.run(loop_strategy(entries, exits))
+        vec = bt.run_vectorized(entries, exits)
+        assert loop["trades"][-1]["type"] == "sell_end"
+        assert_parity(loop, vec)
+
+    def test_unaffordable_entries_fall_back_to_loop(self):
+        bt = Backtester(make_prices(300), fee_pct=0.01)
+        closes, _ = bt.price_arrays()
+        entries, exits = sma_cross_signals(closes)
+
+        loop = bt.run(loop_strategy(entries, exits), risk_max_pct=1.0)
+        vec = bt.run_vectorized(entries, exits, risk_max_pct=1.0)
+        assert_parity(loop, vec)
+
+    def test_no_signals(self):
+        bt = Backtester(make_prices(50))
+        flat = np.zeros(50, dtype=bool)
+        assert_parity(bt.run(loop_strategy(flat, flat)), bt.run_vectorized(flat, flat))
+
+    def test_shape_mismatch_rejected(self):
+        bt = Backtester(make_prices(10))
+        with pytest.raises(ValueError):
+            bt.run_vectorized(np.zeros(9, dtype=bool), np.zeros(10, dtype=bool))
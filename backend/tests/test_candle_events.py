@@ -0,0 +1,155 @@
+"""
+Tests for event-driven evaluation: candle trigger coalescing, 1m candles from the Binance
+trade stream, and the signal generator evaluating only triggered symbols.
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from backend.app.services.ws_binance import BinanceWebSocketCollector, TradeCandleAggregator
+from services.candle_events import CandleEventBus
+
+ROOT_DIR = str(Path(__file__).resolve().parents[2])
+MINUTE_MS = 60_000
+T0 = 1_700_000_040_000  # a minute boundary
+
+
+def trade(symbol, price, ms, quantity=1.0):
+    return {"symbol": symbol, "price": price, "quantity": quantity, "timestamp": ms, "is_buyer_maker": False}
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class TestCandleEventBus:
+    def test_triggers_are_coalesced_per_symbol(self):
+        async def scenario():
+            bus = CandleEventBus(coalesce_seconds=0.05)
+            assert bus.publish("BTCUSDT") and bus.publish("ETHUSDT")
+            assert not bus.publish("BTCUSDT", source="websocket")
+            first = await bus.next_batch()
+            empty = await bus.next_batch(timeout=0.05)
+            return bus, first, empty
+
+        bus, first, empty = run(scenario())
+        assert list(first) == ["BTCUSDT", "ETHUSDT"] and empty == {}
+        assert bus.published == 3 and bus.coalesced == 1 and len(bus) == 0
+
+    def test_burst_during_the_coalescing_window_lands_in_one_batch(self):
+        async def scenario():
+            bus = CandleEventBus(coalesce_seconds=0.1)
+
+            async def burst():
+                for symbol in ("BTCUSDT", "ETHUSDT", "BTCUSDT", "SOLUSDT"):
+                    bus.publish(symbol)
+                    await asyncio.sleep(0.01)
+
+            task = asyncio.create_task(burst())
+            start = time.monotonic()
+            batch = await bus.next_batch(timeout=1.0)
+            await task
+            return batch, start
+
+        batch, start = run(scenario())
+        assert list(batch) == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+        assert all(published >= start for published in batch.values())
+
+
+class TestTradeCandleAggregator:
+    def test_candle_closes_on_the_first_trade_of_the_next_minute(self):
+        candles = TradeCandleAggregator(60)
+        assert candles.add_trade(trade("BTCUSDT", 100.0, T0 + 1_000, 2.0)) is None
+        assert candles.add_trade(trade("BTCUSDT", 103.0, T0 + 20_000)) is None
+        assert candles.add_trade(trade("ETHUSDT", 10.0, T0 + 30_000)) is None
+        assert candles.add_trade(trade("BTCUSDT", 99.0, T0 + 59_999, 0.5)) is None
+
+        closed = candles.add_trade(trade("BTCUSDT", 101.0, T0 + MINUTE_MS + 5))
+        assert closed["symbol"] == "BTCUSDT" and closed["timestamp"] == datetime.utcfromtimestamp(T0 / 1000)
+        assert (closed["open"], closed["high"], closed["low"], closed["close"]) == (100.0, 103.0, 99.0, 99.0)
+        assert closed["volume"] == 3.5 and closed["trades"] == 3
+
+        assert candles.add_trade(trade("BTCUSDT", 50.0, T0 + 10)) is None  # late trade of a closed candle
+        assert candles.forming["BTCUSDT"]["low"] == 101.0
+        assert candles.add_trade(trade("BTCUSDT", 101.0, 0)) is None
+
+    def test_collector_passes_closed_candles_to_listeners(self):
+        collector = BinanceWebSocketCollector(["BTCUSDT"])
+        received = []
+        collector.add_candle_listener(received.append)
+
+        async def feed():
+            for i, ms in enumerate((T0, T0 + 30_000, T0 + MINUTE_MS, T0 + 2 * MINUTE_MS)):
+                await collector.process_trade_message(trade("BTCUSDT", 100.0 + i, ms))
+
+        run(feed())
+        assert [c["close"] for c in received] == [101.0, 102.0]
+
+
+class TestEventDrivenGenerator:
+    def test_only_triggered_symbols_are_evaluated(self, monkeypatch):
+        if ROOT_DIR not in sys.path:
+            sys.path.insert(0, ROOT_DIR)
+        import signal_generator as sg
+        from services.pipeline_replay import StubAIFilter, StubLivePrices, StubSignalLogger, StubTelegram, _patched
+
+        class FakeCollector:
+            symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+            persist_candles = False
+
+            def add_candle_listener(self, listener):
+                self.listener = listener
+
+        collector = FakeCollector()
+
+        async def fake_start(symbols):
+            return collector
+
+        monkeypatch.setattr("backend.app.services.ws_binance.start_binance_collector", fake_start)
+        module_patch = {
+            "AIFilter": lambda **kw: StubAIFilter(),
+            "TelegramNotifier": lambda **kw: StubTelegram(),
+            "SignalLogger": StubSignalLogger,
+            "LivePriceCache": lambda **kw: StubLivePrices(),
+        }
+        config_patch = {"COOLDOWN_DB_URL": None, "STATE_SNAPSHOT_PATH": "", "POLLING_INTERVAL": 3600,
+                        "EVENT_COALESCE_SECONDS": 0.02, "EVENT_WS_CANDLES": True,
+                        "ASSETS": ["BTCUSDT", "ETHUSDT", "SOLUSDT"], "CRYPTO_SYMBOLS": ["BTCUSDT", "ETHUSDT", "SOLUSDT"]}
+        evaluated = []
+
+        async def scenario(generator):
+            async def collect():
+                generator.last_collected_symbols = {"BTCUSDT", "bitcoin"}
+                return True
+
+            async def run_strategies(symbol):
+                evaluated.append(symbol)
+                return []
+
+            generator.collect_market_data = collect
+            generator.run_strategies = run_strategies
+            task = asyncio.create_task(generator.run_event_driven())
+            await asyncio.sleep(0.2)
+            collector.listener({"symbol": "ETHUSDT"})
+            collector.listener({"symbol": "XRPUSDT"})  # not monitored
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        with _patched(sg, module_patch), _patched(sg.config, config_patch):
+            generator = sg.SignalGenerator(strategy_names=["vwap"])
+            generator.grace_period_active = False
+            run(scenario(generator))
+
+        assert evaluated == ["BTCUSDT", "ETHUSDT"]  # SOLUSDT never changed, so it is never evaluated
+        assert collector.persist_candles
@@ -0,0 +1,123 @@
+"""
+Unit tests for the expiring signal cooldown store.
+"""
+
+import pytest
+
+from backend.app.services.cooldown_store import (
+    CooldownStore,
+    SQLCooldownBackend,
+    get_cooldown_store,
+    reset_cooldown_stores,
+    set_cooldown_backend,
+)
+from backend.app.strategies.momentum import MomentumStrategy
+
+KEY = ("vwap", "BTCUSDT", "buy")
+
+
+@pytest.fixture(autouse=True)
+def fresh_stores():
+    reset_cooldown_stores()
+    yield
+    reset_cooldown_stores()
+
+
+class TestCooldownStore:
+    def test_cooldown_expires(self):
+        store = CooldownStore("test", ttl_seconds=3600, bucket_seconds=60)
+        store.mark(KEY, now=1_000.0)
+
+        assert store.is_active(KEY, now=1_000.0 + 3599)
+        assert store.remaining(KEY, now=1_000.0 + 1800) == pytest.approx(1800)
+        assert not store.is_active(KEY, now=1_000.0 + 3600)
+
+    def test_expired_buckets_are_evicted(self):
+        store = CooldownStore("test", ttl_seconds=60, bucket_seconds=10)
+        for i in range(100):
+            store.mark(("s", f"SYM{i}", "buy"), now=1_000.0 + i)
+        assert len(store) == 100
+
+        store.is_active(KEY, now=1_000.0 + 60 + 50)
+        assert 0 < len(store) < 100
+
+        store.is_active(KEY, now=10_000.0)
+        assert len(store) == 0
+
+    def test_remark_moves_key_to_later_bucket(self):
+        store = CooldownStore("test", ttl_seconds=60, bucket_seconds=10)
+        store.mark(KEY, now=1_000.0)
+        store.mark(KEY, now=1_050.0)
+
+        # The original bucket expires, but the re-marked key must survive
+        assert store.is_active(KEY, now=1_100.0)
+        assert not store.is_active(KEY, now=1_111.0)
+
+    def test_memory_is_bounded(self):
+        store = CooldownStore("test", ttl_seconds=3600, bucket_seconds=1, max_entries=50)
+        for i in range(200):
+            store.mark(("s", f"SYM{i}", "buy"), now=1_000.0 + i)
+
+        assert len(store) == 50
+        # Soonest-expiring keys are dropped first
+        assert store.is_active(("s", "SYM199", "buy"), now=1_200.0)
+        assert not store.is_active(("s", "SYM0", "buy"), now=1_200.0)
+
+    def test_cooldowns_survive_restart(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'cooldowns.db'}"
+        before = CooldownStore("signal_generator", ttl_seconds=3600, backend=SQLCooldownBackend(url))
+        before.mark(KEY)
+        before.backend.flush()
+
+        after = CooldownStore("signal_generator", ttl_seconds=3600, backend=SQLCooldownBackend(url))
+        assert after.is_active(KEY)
+        assert after.last_marked(KEY) is not None
+
+        other_namespace = CooldownStore("strategies", ttl_seconds=3600, backend=SQLCooldownBackend(url))
+        assert not other_namespace.is_active(KEY)
+
+    def test_entries_merge_into_another_store(self):
+        before = CooldownStore("test", ttl_seconds=3600)
+        before.mark(KEY, now=1_000.0)
+        before.mark(("s", "ETHUSDT", "sell"), ttl_seconds=10, now=1_000.0)
+        rows = before.entries(now=1_005.0)
+        assert sorted(rows) == sorted([(KEY, 1_000.0, 4_600.0), (("s", "ETHUSDT", "sell"), 1_000.0, 1_010.0)])
+
+        after = CooldownStore("test", ttl_seconds=3600)
+        after.mark(KEY, now=2_000.0)  # later expiry wins
+        assert after.merge(rows, now=1_020.0) == 0  # KEY is newer here, ETHUSDT expired
+        assert after.remaining(KEY, now=2_000.0) == pytest.approx(3600)
+        assert CooldownStore("test", ttl_seconds=3600).merge(rows, now=1_005.0) == 2
+
+
+class TestStrategyCooldowns:
+    def test_strategies_share_the_store(self):
+        first = MomentumStrategy()
+        second = MomentumStrategy()
+
+        first._mark_signal_sent("BTCUSDT", "buy")
+
+        assert second._is_duplicate("BTCUSDT", "buy")
+        assert not second._is_duplicate("BTCUSDT", "sell")
+        assert second.cooldowns.last_marked((first.name, "BTCUSDT", "buy")) is not None
+        assert get_cooldown_store("strategies") is first.cooldowns
+
+    def test_backend_attached_after_strategy_creation(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'cooldowns.db'}"
+        CooldownStore("strategies", ttl_seconds=3600, backend=SQLCooldownBackend(url, background=False)).mark(
+            ("momentum", "ETHUSDT", "sell")
+        )
+
+        strategy = MomentumStrategy()
+        assert not strategy._is_duplicate("ETHUSDT", "sell")
+
+        set_cooldown_backend(SQLCooldownBackend(url))
+        assert strategy._is_duplicate("ETHUSDT", "sell")
+
+    def test_sqlite_directory_is_created(self, tmp_path):
+        path = tmp_path / "state" / "cooldowns.db"
+        store = CooldownStore("strategies", ttl_seconds=3600, backend=SQLCooldownBackend(f"sqlite:///{path}"))
+        store.mark(KEY)
+        store.backend.flush()
+        assert path.exists()
+        assert CooldownStore("strategies", ttl_seconds=3600, backend=SQLCooldownBackend(f"sqlite:///{path}")).is_active(KEY)
@@ -0,0 +1,62 @@
+"""
+Tests for the opt-in SignalGenerator cycle profiler.
+"""
+
+import time
+
+import pytest
+
+from services.cycle_profiler import CycleProfiler
+
+
+def _busy_wait(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _run_cycle(profiler: CycleProfiler, seconds: float):
+    profiler.start_cycle()
+    start = time.perf_counter()
+    _busy_wait(seconds)
+    return profiler.finish_cycle(time.perf_counter() - start)
+
+
+class TestCycleProfiler:
+    def test_disabled_is_noop(self, tmp_path):
+        profiler = CycleProfiler(enabled=False, every_n=1, output_dir=str(tmp_path))
+        assert _run_cycle(profiler, 0.01) is None
+        assert profiler.cycle == 0
+        assert list(tmp_path.iterdir()) == []
+
+    def test_every_nth_cycle_writes_collapsed_stacks(self, tmp_path):
+        profiler = CycleProfiler(
+            enabled=True, every_n=2, threshold_seconds=0, output_dir=str(tmp_path), sample_interval=0.001
+        )
+        assert _run_cycle(profiler, 0.01) is None
+        path = _run_cycle(profiler, 0.1)
+
+        assert path is not None and path.suffix == ".collapsed"
+        lines = path.read_text().splitlines()
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert any("_busy_wait" in line for line in lines)
+
+    def test_threshold_keeps_only_slow_cycles(self, tmp_path):
+        profiler = CycleProfiler(
+            enabled=True, every_n=0, threshold_seconds=0.05, output_dir=str(tmp_path), sample_interval=0.001
+        )
+        assert _run_cycle(profiler, 0.001) is None
+        assert _run_cycle(profiler, 0.08) is not None
+        assert len(list(tmp_path.iterdir())) == 1
+
+    def test_cprofile_mode_writes_prof(self, tmp_path):
+        profiler = CycleProfiler(enabled=True, every_n=1, mode="cprofile", output_dir=str(tmp_path))
+        path = _run_cycle(profiler, 0.01)
+        assert path is not None and path.suffix == ".prof"
+        assert path.stat().st_size > 0
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError):
+            CycleProfiler(enabled=True, mode="perf")
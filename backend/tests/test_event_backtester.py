@@ -0,0 +1,186 @@
+"""
+Tests for the event-driven backtester (StrategyBase replay + SL/TP/expiry fills).
+"""
+
+import math
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app.services.backtest.event_backtester import EventBacktester
+from backend.app.strategies.base import StrategyBase
+from backend.app.strategies.momentum import MomentumStrategy
+from backend.app.strategies.trend_following import TrendFollowingStrategy
+from backend.app.strategies.vwap_strategy import VWAPStrategy
+
+START = datetime(2024, 1, 1)
+
+
+def no_slippage(side, price, size_notional, adv):
+    return price
+
+
+def make_candles(closes, highs=None, lows=None, step_minutes=1):
+    candles = []
+    for i, close in enumerate(closes):
+        candles.append({
+            "timestamp": START + timedelta(minutes=i * step_minutes),
+            "open": close,
+            "high": highs[i] if highs else close,
+            "low": lows[i] if lows else close,
+            "close": close,
+            "volume": 10.0,
+        })
+    return candles
+
+
+class ScriptedStrategy(StrategyBase):
+    """Emits a signal on pre-set bar numbers with fixed SL/TP distances."""
+
+    name = "scripted"
+
+    def __init__(self, signal_bars, action="buy", sl_pct=0.01, tp_pct=0.02):
+        super().__init__()
+        self.min_history_required = 0
+        self.signal_bars = set(signal_bars)
+        self.action = action
+        self.sl_pct = sl_pct
+        self.tp_pct = tp_pct
+        self.bar = -1
+
+    def update_data(self, symbol, new_candle):
+        self.bar += 1
+        super().update_data(symbol, new_candle)
+
+    def _confirm_completion(self, symbol):
+        return self.bar in self.signal_bars
+
+    def _get_action_from_pattern(self, symbol):
+        return self.action
+
+    def _build_signal(self, symbol, action):
+        entry = self.price_history[symbol][-1]["close"]
+        direction = 1 if action == "buy" else -1
+        return {
+            "action": action,
+            "entry": entry,
+            "stop_loss": entry * (1 - direction * self.sl_pct),
+            "take_profit": entry * (1 + direction * self.tp_pct),
+            "confidence": 0.7,
+        }
+
+
+def run(strategy, candles, **kwargs):
+    bt = EventBacktester({"scripted": strategy}, slippage_apply=no_slippage, fee_pct=0.0, **kwargs)
+    result = bt.run({"TESTUSDT": candles})
+    return result, result["trades"]["scripted"]
+
+
+class TestExits:
+    def test_take_profit(self):
+        closes = [100.0] * 30
+        highs = list(closes)
+        highs[20] = 102.5
+        result, trades = run(ScriptedStrategy([15]), make_candles(closes, highs=highs),
+                             duration_minutes={"scripted": 60})
+
+        assert len(trades) == 1
+        trade = trades[0]
+        assert trade["exit_reason"] == "take_profit"
+        assert trade["exit_price"] == pytest.approx(102.0)
+        assert trade["pnl"] == pytest.approx(trade["qty"] * 2.0)
+        assert trade["bars_held"] == 5
+        assert result["metrics"]["scripted"]["win_rate"] == 1.0
+
+    def test_stop_loss_wins_when_both_touched(self):
+        closes = [100.0] * 30
+        highs, lows = list(closes), list(closes)
+        highs[18], lows[18] = 103.0, 98.0
+        _, trades = run(ScriptedStrategy([15]), make_candles(closes, highs=highs, lows=lows),
+                        duration_minutes={"scripted": 60})
+
+        assert trades[0]["exit_reason"] == "stop_loss"
+        assert trades[0]["exit_price"] == pytest.approx(99.0)
+
+    def test_short_gap_through_stop_fills_at_open(self):
+        closes = [100.0] * 16 + [105.0] * 4
+        _, trades = run(ScriptedStrategy([15], action="sell"), make_candles(closes), duration_minutes={"scripted": 60})
+
+        assert trades[0]["exit_reason"] == "stop_loss"
+        assert trades[0]["exit_price"] == pytest.approx(105.0)
+        assert trades[0]["pnl"] < 0
+
+    def test_expiry_closes_at_open(self):
+        closes = [100.0 + i * 0.01 for i in range(40)]
+        _, trades = run(ScriptedStrategy([15]), make_candles(closes), duration_minutes={"scripted": 5})
+
+        assert trades[0]["exit_reason"] == "expiry"
+        assert trades[0]["exit_time"] - trades[0]["entry_time"] == 300
+        assert trades[0]["exit_price"] == pytest.approx(closes[20])
+
+    def test_open_position_closed_at_end_of_data(self):
+        _, trades = run(ScriptedStrategy([15]), make_candles([100.0] * 20), duration_minutes={"scripted": 600})
+        assert trades[0]["exit_reason"] == "end_of_data"
+
+
+class TestCooldownClock:
+    def test_cooldown_follows_simulated_time(self):
+        # 10-minute bars: bars 15 and 21 are 1h apart (inside the 6h cooldown), bar 60 is 7.5h later
+        candles = make_candles([100.0] * 80, step_minutes=10)
+        result, trades = run(ScriptedStrategy([15, 21, 60]), candles, duration_minutes={"scripted": 20})
+
+        assert result["signals"]["scripted"] == 2
+        assert len(trades) == 2
+
+    def test_signal_skipped_while_position_open(self):
+        candles = make_candles([100.0] * 40, step_minutes=1)
+        strategy = ScriptedStrategy([15, 17])
+        strategy.min_signal_gap = 60  # shorter than the trade so the second signal fires
+        result, trades = run(strategy, candles, duration_minutes={"scripted": 10})
+
+        assert result["signals"]["scripted"] == 2
+        assert result["skipped_signals"]["scripted"] == 1
+        assert len(trades) == 1
+
+
+class TestProductionStrategies:
+    def test_replays_real_strategies_on_multiple_symbols(self, tmp_path):
+        rng = random.Random(3)
+        candles = {}
+        for symbol, base in (("BTCUSDT", 40000.0), ("ETHUSDT", 2500.0)):
+            price, series = base, []
+            for i in range(600):
+                price *= 1 + 0.002 * math.sin(i / 15) + rng.gauss(0, 0.001)
+                series.append({
+                    "timestamp": START + timedelta(minutes=i),
+                    "open": price, "high": price * 1.001, "low": price * 0.999,
+                    "close": price, "volume": rng.uniform(5, 50),
+                })
+            candles[symbol] = series
+
+        bt = EventBacktester({"momentum": MomentumStrategy(), "vwap": VWAPStrategy()})
+        result = bt.run(candles)
+
+        assert result["bars"] == 1200
+        assert set(result["metrics"]) == {"momentum", "vwap"}
+        for name, trades in result["trades"].items():
+            assert result["metrics"][name]["trades"] == len(trades)
+            for trade in trades:
+                assert trade["exit_reason"] in ("stop_loss", "take_profit", "expiry", "end_of_data")
+
+        paths = EventBacktester.write_trade_logs(result, str(tmp_path))
+        assert sorted(p.name for p in paths) == ["momentum_trades.csv", "vwap_trades.csv"]
+
+    def test_rerun_starts_from_cold_strategies(self):
+        candles = [dict(c, high=c["close"] * 1.001, low=c["close"] * 0.999)
+                   for c in make_candles([100.0 + math.sin(i / 20) for i in range(600)])]
+        strategy = TrendFollowingStrategy()
+        bt = EventBacktester({"trend_following": strategy})
+
+        first = bt.run({"BTCUSDT": candles})
+        history = list(strategy.price_history["BTCUSDT"])
+        second = bt.run({"BTCUSDT": candles})
+
+        assert len(history) == 200 and list(strategy.price_history["BTCUSDT"]) == history
+        assert second["trades"] == first["trades"] and second["signals"] == first["signals"]
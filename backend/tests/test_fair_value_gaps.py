@@ -0,0 +1,115 @@
+"""
+Tests for FairValueGapsStrategy's incremental gap tracker (parity with the full rescan, fill state).
+"""
+
+import random
+from collections import deque
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app.strategies.fair_value_gaps import FairValueGapsStrategy, FairValueGapTracker
+
+KEYS = ("type", "high", "low", "candle_index")
+
+
+def reference_gaps(history):
+    """The original full rescan (without the always-False 'filled' field)."""
+    gaps = []
+    for i in range(len(history) - 2):
+        high1, low1 = history[i].get("high", 0.0), history[i].get("low", 0.0)
+        high3, low3 = history[i + 2].get("high", 0.0), history[i + 2].get("low", 0.0)
+        if high1 < low3:
+            gaps.append({"type": "bullish", "high": high3, "low": high1, "candle_index": i + 1})
+        elif low1 > high3:
+            gaps.append({"type": "bearish", "high": low1, "low": high3, "candle_index": i + 1})
+    return gaps
+
+
+def strip(gaps):
+    return [{key: gap[key] for key in KEYS} for gap in gaps]
+
+
+def recorded_candles(n, seed=4, vol=0.01):
+    rng = random.Random(seed)
+    price = 100.0
+    candles = []
+    for t in range(n):
+        close = price * (1.0 + rng.gauss(0.0, vol))
+        candles.append({
+            "timestamp": datetime(2024, 1, 1) + timedelta(minutes=t),
+            "open": price,
+            "high": max(price, close) * (1.0 + abs(rng.gauss(0.0, vol / 4))),
+            "low": min(price, close) * (1.0 - abs(rng.gauss(0.0, vol / 4))),
+            "close": close,
+            "volume": 1.0,
+        })
+        price = close
+    return candles
+
+
+class TestGapParity:
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_full_scan_matches_reference(self, seed):
+        history = recorded_candles(800, seed=seed)
+        gaps = FairValueGapsStrategy()._find_fair_value_gaps(history)
+        assert len(gaps) > 20
+        assert strip(gaps) == reference_gaps(history)
+
+    @pytest.mark.parametrize("maxlen", [200, 500])
+    def test_incremental_matches_reference_while_streaming(self, maxlen):
+        strategy = FairValueGapsStrategy()
+        symbol = "BTCUSDT"
+        strategy.price_history[symbol] = deque(maxlen=maxlen)
+        for t, candle in enumerate(recorded_candles(1000, seed=7)):
+            strategy.update_data(symbol, candle)
+            if t % 4 == 1:
+                continue  # several candles arrive between hook calls
+            history = list(strategy.price_history[symbol])
+            assert strip(strategy._fair_value_gaps(symbol, history)) == reference_gaps(history)
+            assert strip(strategy._fair_value_gaps(symbol, history, last=5)) == reference_gaps(history)[-5:]
+
+    def test_hooks_agree_with_reference_gaps(self):
+        strategy = FairValueGapsStrategy()
+        reference = FairValueGapsStrategy()
+        reference._fair_value_gaps = lambda symbol, history, last=None: reference_gaps(history)[-(last or 0):]
+        for candle in recorded_candles(500, seed=9):
+            for s in (strategy, reference):
+                s.update_data("SOLUSDT", candle)
+            assert strategy._detect_pattern("SOLUSDT") == reference._detect_pattern("SOLUSDT")
+            assert strategy._confirm_completion("SOLUSDT") == reference._confirm_completion("SOLUSDT")
+            assert strategy._get_action_from_pattern("SOLUSDT") == reference._get_action_from_pattern("SOLUSDT")
+
+
+class TestFillState:
+    def _candle(self, high, low, open_=None, close=None):
+        return {"high": high, "low": low, "open": open_ if open_ is not None else low,
+                "close": close if close is not None else high, "timestamp": datetime(2024, 1, 1)}
+
+    def test_gap_fill_and_rejection(self):
+        strategy = FairValueGapsStrategy()
+        tracker = FairValueGapTracker(strategy._check_fvg_rejection)
+        tracker.update(self._candle(100.0, 99.0))
+        tracker.update(self._candle(104.0, 100.5))
+        gap = tracker.update(self._candle(103.0, 102.0))  # bullish gap: candle 1 high -> candle 3 high
+        assert gap["type"] == "bullish" and (gap["low"], gap["high"]) == (100.0, 103.0)
+        assert [g["type"] for g in tracker.open_gaps()] == ["bullish"]
+
+        tracker.update(self._candle(108.0, 104.0))  # stays above the gap
+        assert not gap["filled"]
+        # Wick into the gap, close back above it with a long lower wick
+        tracker.update(self._candle(106.0, 101.0, open_=104.0, close=105.0))
+        assert gap["filled"] and gap["filled_index"] == 4 and gap["rejected"]
+        assert tracker.open_gaps() == []
+
+    def test_open_gaps_sorted_and_evicted(self):
+        strategy = FairValueGapsStrategy()
+        history = recorded_candles(400, seed=2)
+        strategy.update_data("ETHUSDT", history[0])
+        for candle in history[1:]:
+            strategy.update_data("ETHUSDT", candle)
+            strategy._confirm_completion("ETHUSDT")
+        gaps = strategy.open_gaps("ETHUSDT")
+        assert gaps and [g["low"] for g in gaps] == sorted(g["low"] for g in gaps)
+        assert all(0 <= g["candle_index"] < 200 for g in gaps)
+        assert "open FVGs" in strategy._get_diagnostic_info("ETHUSDT")
@@ -0,0 +1,140 @@
+"""
+Tests for the partitioned OHLCV history store and the kline pager.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from backend.app.services.backtest.history_store import (
+    COLUMNS,
+    INTERVAL_MS,
+    HistoryStore,
+    download_binance,
+    to_ms,
+    top_up,
+)
+
+MINUTE = INTERVAL_MS["1m"]
+JAN_1 = to_ms(datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+
+def make_bars(start_ms: int, n: int, step: int = MINUTE, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.001, n)))
+    ts = start_ms + step * np.arange(n, dtype=np.float64)
+    return np.vstack([ts, close, close * 1.001, close * 0.999, close, rng.uniform(1, 10, n)])
+
+
+class FakeBinance:
+    """Serves klines from an in-memory array with the REST adapter's paging semantics."""
+
+    def __init__(self, bars: np.ndarray):
+        self.bars = bars
+        self.calls = 0
+
+    async def get_klines(self, symbol, interval="1m", limit=500, start_time=None, end_time=None):
+        self.calls += 1
+        ts = self.bars[0]
+        mask = (ts >= (start_time or 0)) & (ts <= (end_time if end_time is not None else np.inf))
+        page = self.bars[:, mask][:, :limit]
+        return [
+            {"open_time": int(t), "open": o, "high": h, "low": lo, "close": c, "volume": v,
+             "close_time": int(t) + MINUTE - 1}
+            for t, o, h, lo, c, v in page.T.tolist()
+        ]
+
+
+class TestStore:
+    def test_partitions_by_month_and_round_trips(self, tmp_path):
+        store = HistoryStore(str(tmp_path))
+        bars = make_bars(JAN_1, 60 * 24 * 45)  # spills into February
+        assert store.write("BTCUSDT", "1m", bars) == bars.shape[1]
+
+        assert [p.stem for p in store.partitions("BTCUSDT", "1m")] == ["2024-01", "2024-02"]
+        loaded = store.load("BTCUSDT", "1m")
+        for i, name in enumerate(COLUMNS):
+            np.testing.assert_array_equal(loaded[name], bars[i])
+
+    def test_range_inside_one_month_is_memory_mapped(self, tmp_path):
+        store = HistoryStore(str(tmp_path))
+        store.write("BTCUSDT", "1m", make_bars(JAN_1, 60 * 24 * 45))
+
+        window = store.load("BTCUSDT", "1m", start="2024-01-10", end="2024-01-11")
+        assert isinstance(window["close"].base, np.memmap) or isinstance(window["close"], np.memmap)
+        assert len(window["close"]) == 60 * 24
+        assert window["timestamp"][0] == to_ms("2024-01-10T00:00:00")
+
+        spanning = store.load("BTCUSDT", "1m", start="2024-01-31", end="2024-02-02")
+        assert len(spanning["close"]) == 2 * 60 * 24
+
+    def test_overlapping_writes_dedupe_with_new_data_winning(self, tmp_path):
+        store = HistoryStore(str(tmp_path))
+        store.write("BTCUSDT", "1m", make_bars(JAN_1, 100))
+        update = make_bars(JAN_1 + 50 * MINUTE, 100, seed=1)
+        assert store.write("BTCUSDT", "1m", update) == 50
+
+        loaded = store.load("BTCUSDT", "1m")
+        assert len(loaded["close"]) == 150
+        assert np.all(np.diff(loaded["timestamp"]) == MINUTE)
+        np.testing.assert_array_equal(loaded["close"][50:], update[4])
+
+    def test_backtester_and_candles_views(self, tmp_path):
+        store = HistoryStore(str(tmp_path))
+        bars = make_bars(JAN_1, 500)
+        store.write("BTCUSDT", "1m", bars)
+
+        candles = store.load_candles("BTCUSDT", "1m")
+        assert candles[0]["timestamp"] == JAN_1 and candles[-1]["close"] == bars[4, -1]
+
+        closes = bars[4]
+        entries = np.zeros(500, dtype=bool)
+        exits = np.zeros(500, dtype=bool)
+        entries[10], exits[20] = True, True
+        result = store.backtester("BTCUSDT", "1m").run_vectorized(entries, exits)
+        assert [t["time"] for t in result["trades"]] == [10, 20]
+        assert result["trades"][0]["price"] > closes[10]  # slippage applied
+
+
+class TestImport:
+    def test_binance_dump_without_header(self, tmp_path):
+        bars = make_bars(JAN_1, 10)
+        path = tmp_path / "BTCUSDT-1m-2024-01.csv"
+        with open(path, "w") as f:
+            for t, o, h, lo, c, v in bars.T:
+                f.write(f"{int(t)},{o},{h},{lo},{c},{v},{int(t) + MINUTE - 1},0,0,0,0,0\n")
+        store = HistoryStore(str(tmp_path / "store"))
+        assert store.import_csv(str(path), "BTCUSDT", "1m") == 10
+        np.testing.assert_allclose(store.load("BTCUSDT", "1m")["close"], bars[4])
+
+    def test_headered_csv_with_dates(self, tmp_path):
+        path = tmp_path / "eurusd.csv"
+        path.write_text("Date,Open,High,Low,Close\n2024-03-01 00:00:00,1.08,1.09,1.07,1.085\n2024-03-01 01:00:00,1.085,1.09,1.08,1.088\n")
+        store = HistoryStore(str(tmp_path / "store"))
+        assert store.import_csv(str(path), "EUR_USD", "1h") == 2
+        loaded = store.load("EUR_USD", "1h")
+        assert loaded["timestamp"][1] - loaded["timestamp"][0] == INTERVAL_MS["1h"]
+        assert loaded["volume"].tolist() == [0.0, 0.0]
+
+
+class TestDownload:
+    def test_pages_then_tops_up_incrementally(self, tmp_path):
+        store = HistoryStore(str(tmp_path))
+        source = FakeBinance(make_bars(JAN_1, 2500))
+        end = JAN_1 + 2000 * MINUTE
+
+        added = asyncio.run(download_binance(store, "BTCUSDT", "1m", JAN_1, end, adapter=source, pause=0))
+        assert added == 2000
+        assert source.calls == 2  # two full pages reach end_ms, no empty trailing request
+
+        source.calls = 0
+        added = asyncio.run(top_up(store, "BTCUSDT", "1m", adapter=source))
+        assert added == 500
+        assert store.info("BTCUSDT", "1m")["bars"] == 2500
+        assert store.last_timestamp("BTCUSDT", "1m") == JAN_1 + 2499 * MINUTE
+
+    def test_unknown_source_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            asyncio.run(top_up(HistoryStore(str(tmp_path)), "BTCUSDT", "1m", source="kraken", default_start="2024-01-01"))
@@ -0,0 +1,147 @@
+"""
+Tests for the parallel, resumable grid search.
+"""
+
+import csv
+import math
+import random
+
+import numpy as np
+import pytest
+
+from backend.app.services.backtest.hyperparam_tuner import (
+    OBJECTIVES,
+    grid_search,
+    hyperband,
+    parallel_grid_search,
+    successive_halving,
+)
+
+PARAM_GRID = {"fast": [3, 5, 8], "slow": [15, 25], "dip": [0.99, 0.995]}
+
+
+def make_prices(n: int = 400, seed: int = 4):
+    rng = random.Random(seed)
+    price, prices = 100.0, []
+    for i in range(n):
+        price *= 1 + 0.006 * math.sin(i / 11) + rng.gauss(0, 0.003)
+        prices.append({"close": price, "volume": rng.uniform(1e4, 1e5)})
+    return prices
+
+
+def sma_strategy_factory(params):
+    """Module-level (picklable) factory for the loop engine."""
+    fast, slow, dip = params["fast"], params["slow"], params["dip"]
+
+    def strategy_fn(symbol, history):
+        if len(history) < slow:
+            return {"action": "hold"}
+        fast_ma = sum(history[-fast:]) / fast
+        slow_ma = sum(history[-slow:]) / slow
+        if fast_ma > slow_ma and history[-1] > history[-2] * dip:
+            return {"action": "buy"}
+        if fast_ma < slow_ma:
+            return {"action": "sell"}
+        return {"action": "hold"}
+
+    return strategy_fn
+
+
+def vectorized_factory(params):
+    def signals(closes):
+        closes = np.asarray(closes)
+        fast = np.convolve(closes, np.ones(params["fast"]) / params["fast"], mode="full")[: len(closes)]
+        slow = np.convolve(closes, np.ones(params["slow"]) / params["slow"], mode="full")[: len(closes)]
+        warm = np.arange(len(closes)) >= params["slow"]
+        return warm & (fast > slow), warm & (fast < slow)
+
+    return signals
+
+
+def _rows(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+class TestParallelGridSearch:
+    def test_matches_sequential_grid_search(self, tmp_path):
+        prices = make_prices()
+        sequential = grid_search(prices, sma_strategy_factory, PARAM_GRID)
+        parallel = parallel_grid_search(
+            prices, sma_strategy_factory, PARAM_GRID, str(tmp_path / "board.csv"), workers=2, chunksize=3
+        )
+
+        assert parallel["evaluated"] == 12
+        assert parallel["best_params"] == sequential["best_params"]
+        assert parallel["best_score"] == pytest.approx(sequential["best_score"])
+        assert parallel["best_result"]["equity_curve"] == sequential["best_result"]["equity_curve"]
+        assert len(_rows(tmp_path / "board.csv")) == 12
+
+    def test_resume_skips_finished_combinations(self, tmp_path):
+        board = tmp_path / "board.csv"
+        prices = make_prices()
+        parallel_grid_search(prices, sma_strategy_factory, PARAM_GRID, str(board), workers=2)
+
+        # Simulate an interruption: keep 5 rows and cut the 6th short
+        lines = board.read_text().splitlines(keepends=True)
+        board.write_text("".join(lines[:6]) + lines[6][:10])
+
+        resumed = parallel_grid_search(prices, sma_strategy_factory, PARAM_GRID, str(board), workers=2)
+        assert resumed["skipped"] == 5
+        assert resumed["evaluated"] == 7
+        assert len({row["params"] for row in _rows(board) if row.get("sharpe")}) == 12
+
+        again = parallel_grid_search(prices, sma_strategy_factory, PARAM_GRID, str(board), workers=2)
+        assert again["evaluated"] == 0
+        assert again["best_params"] == resumed["best_params"]
+
+    def test_vectorized_mode(self, tmp_path):
+        grid = {"fast": [3, 5], "slow": [20, 30]}
+        result = parallel_grid_search(
+            make_prices(), vectorized_factory, grid, str(tmp_path / "board.csv"), mode="vectorized", workers=2
+        )
+        assert result["evaluated"] == 4
+        assert result["best_params"] in [{"fast": f, "slow": s} for f in (3, 5) for s in (20, 30)]
+        assert result["best_result"]["trades"]
+
+
+class TestAdaptiveSearch:
+    SPACE = {"fast": (2, 12), "slow": [15, 20, 25, 30, 40], "dip": (0.98, 1.0)}
+
+    def test_successive_halving_is_reproducible(self):
+        prices = make_prices(900)
+        first = successive_halving(prices, sma_strategy_factory, self.SPACE, n_configs=27, seed=7)
+        second = successive_halving(prices, sma_strategy_factory, self.SPACE, n_configs=27, seed=7)
+
+        assert first["best_params"] == second["best_params"]
+        assert first["best_score"] == second["best_score"]
+        assert first["history"] == second["history"]
+        # The winner was scored on the full history
+        assert first["history"][-1]["bars"] == len(prices)
+        assert first["best_result"]["equity_curve"]
+
+    def test_uses_fraction_of_grid_compute(self):
+        prices = make_prices(900)
+        grid = {"fast": [2, 4, 6, 8, 10, 12], "slow": [15, 20, 25, 30, 40], "dip": [0.98, 0.99, 1.0]}
+        exhaustive = grid_search(prices, sma_strategy_factory, grid)
+        adaptive = successive_halving(prices, sma_strategy_factory, grid, n_configs=27, seed=1)
+
+        grid_bars = 90 * len(prices)
+        assert adaptive["bars_evaluated"] < grid_bars / 3
+        assert adaptive["best_score"] <= exhaustive["best_score"] + 1e-12
+        assert adaptive["best_score"] > 0
+
+    @pytest.mark.parametrize("objective", ["sharpe", "max_drawdown", "profit_factor"])
+    def test_named_objectives(self, objective):
+        result = successive_halving(
+            make_prices(600), sma_strategy_factory, self.SPACE, objective=objective, n_configs=9
+        )
+        assert result["best_score"] == OBJECTIVES[objective](result["best_result"])
+
+    def test_callable_objective_and_hyperband(self):
+        prices = make_prices(1800)
+        final_equity = lambda result: result["final_equity"]  # noqa: E731
+        result = hyperband(prices, sma_strategy_factory, self.SPACE, objective=final_equity, min_bars=200, seed=3)
+
+        assert {h["bracket"] for h in result["history"]} == {0, 1, 2}
+        assert result["best_score"] == result["best_result"]["final_equity"]
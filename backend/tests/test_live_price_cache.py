@@ -0,0 +1,113 @@
+"""
+Unit tests for the live price cache used by the signal generator.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from services.live_price_cache import LivePriceCache
+
+
+def _binance_transport(calls):
+    """Mock Binance /ticker/price endpoint that records every request."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        symbols = json.loads(request.url.params["symbols"]) if "symbols" in request.url.params else [request.url.params["symbol"]]
+        prices = {"BTCUSDT": "50000.0", "ETHUSDT": "3000.0", "SOLUSDT": "150.0"}
+        if any(s not in prices for s in symbols):
+            return httpx.Response(400, json={"code": -1121, "msg": "Invalid symbol."})
+        rows = [{"symbol": s, "price": prices[s]} for s in symbols]
+        return httpx.Response(200, json=rows if "symbols" in request.url.params else rows[0])
+    return httpx.MockTransport(handler)
+
+
+async def _no_database(symbols):
+    pass
+
+
+@pytest.mark.asyncio
+async def test_refresh_batches_all_symbols_in_one_request():
+    calls = []
+    cache = LivePriceCache(ttl_seconds=60.0)
+    cache._client = httpx.AsyncClient(transport=_binance_transport(calls))
+
+    await cache.refresh(["BTCUSDT", "ETHUSDT", "BTCUSDT", "SOLUSDT"])
+
+    assert len(calls) == 1
+    assert cache.get("BTCUSDT")["price"] == 50000.0
+    assert cache.get("SOLUSDT")["source"] == "binance_live"
+
+    # Within the TTL nothing is re-fetched
+    quote = await cache.get_live_price("ETHUSDT", batch=["BTCUSDT"])
+    assert quote["price"] == 3000.0
+    assert len(calls) == 1
+    await cache.aclose()
+
+
+@pytest.mark.asyncio
+async def test_expired_quote_refreshes_pending_batch():
+    calls = []
+    cache = LivePriceCache(ttl_seconds=0.0)
+    cache._client = httpx.AsyncClient(transport=_binance_transport(calls))
+
+    await cache.get_live_price("BTCUSDT", batch=["ETHUSDT", "SOLUSDT"])
+
+    assert len(calls) == 1
+    assert json.loads(calls[0].url.params["symbols"]) == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    await cache.aclose()
+
+
+@pytest.mark.asyncio
+async def test_rejected_batch_is_retried_per_symbol():
+    calls = []
+    cache = LivePriceCache(ttl_seconds=0.0)
+    cache._client = httpx.AsyncClient(transport=_binance_transport(calls))
+    cache._refresh_database = _no_database
+
+    await cache.refresh(["BTCUSDT", "DELISTEDUSDT", "ETHUSDT"])
+
+    assert len(calls) == 4  # rejected batch + one request per symbol
+    assert cache.get("BTCUSDT")["price"] == 50000.0 and cache.get("ETHUSDT")["price"] == 3000.0
+    assert cache.get("DELISTEDUSDT") is None
+
+    await cache.refresh(["BTCUSDT", "DELISTEDUSDT", "ETHUSDT"])
+    assert len(calls) == 5  # the unknown symbol is left out of the next batch
+    assert json.loads(calls[-1].url.params["symbols"]) == ["BTCUSDT", "ETHUSDT"]
+    await cache.aclose()
+
+
+def test_quote_age_metadata_and_staleness():
+    cache = LivePriceCache(ttl_seconds=5.0, max_quote_age_seconds=300.0)
+    cache.update_quote("EURUSD", 1.08, datetime.utcnow() - timedelta(minutes=10), source="database")
+
+    quote = cache.get("EURUSD")
+    assert quote["source"] == "database"
+    assert quote["age_seconds"] >= 600
+    assert quote["is_stale"] is True
+    assert quote["cache_age_seconds"] < 5.0
+    assert cache.get("GBPUSD") is None
+
+
+def test_websocket_trades_keep_cache_warm():
+    class FakeCollector:
+        def __init__(self):
+            self.listeners = []
+
+        def add_trade_listener(self, listener):
+            self.listeners.append(listener)
+
+    collector = FakeCollector()
+    cache = LivePriceCache()
+    cache.attach_ws_collector(collector)
+    cache.attach_ws_collector(collector)
+    assert len(collector.listeners) == 1
+
+    now_ms = int(datetime.utcnow().timestamp() * 1000)
+    collector.listeners[0]({"symbol": "BTCUSDT", "price": 50100.0, "timestamp": now_ms})
+
+    assert cache.is_fresh("BTCUSDT")
+    assert cache.get("BTCUSDT")["price"] == 50100.0
+    assert cache.get("BTCUSDT")["source"] == "binance_ws"
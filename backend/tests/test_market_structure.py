@@ -0,0 +1,93 @@
+"""
+Parity tests for MarketStructureStrategy's vectorized and incremental swing-point detection.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app.strategies.market_structure import MarketStructureStrategy
+
+
+def reference_swing_points(history, lookback):
+    """The original nested-loop implementation."""
+    if len(history) < lookback * 2:
+        return {"highs": [], "lows": []}
+    swing_highs, swing_lows = [], []
+    for i in range(lookback, len(history) - lookback):
+        high = history[i].get("high", 0.0)
+        low = history[i].get("low", 0.0)
+        if all(history[j].get("high", 0.0) < high for j in range(i - lookback, i + lookback + 1) if j != i):
+            swing_highs.append({"price": high, "index": i})
+        if all(history[j].get("low", 0.0) > low for j in range(i - lookback, i + lookback + 1) if j != i):
+            swing_lows.append({"price": low, "index": i})
+    return {"highs": swing_highs, "lows": swing_lows}
+
+
+def recorded_candles(n, seed=11, tick=0.5):
+    """Random walk rounded to a tick size so equal highs/lows (ties) occur."""
+    rng = random.Random(seed)
+    price = 100.0
+    candles = []
+    for t in range(n):
+        close = price + rng.gauss(0.0, 1.0)
+        candle = {
+            "timestamp": datetime(2024, 1, 1) + timedelta(minutes=t),
+            "open": price,
+            "high": round(max(price, close) + abs(rng.gauss(0.0, 0.5)), 0) if tick else max(price, close),
+            "low": round(min(price, close) - abs(rng.gauss(0.0, 0.5)), 0) if tick else min(price, close),
+            "close": close,
+            "volume": 1.0,
+        }
+        if rng.random() < 0.01:
+            del candle["high"]  # missing keys default to 0.0, like the original .get()
+        candles.append(candle)
+        price = close
+    return candles
+
+
+class TestSwingParity:
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    @pytest.mark.parametrize("lookback", [1, 3, 20])
+    def test_vectorized_matches_reference(self, seed, lookback):
+        strategy = MarketStructureStrategy()
+        strategy.structure_lookback = lookback
+        history = recorded_candles(400, seed=seed)
+        assert strategy._identify_structure_swing_points(history) == reference_swing_points(history, lookback)
+
+    def test_short_history_has_no_swings(self):
+        strategy = MarketStructureStrategy()
+        assert strategy._identify_structure_swing_points(recorded_candles(39)) == {"highs": [], "lows": []}
+
+    @pytest.mark.parametrize("maxlen", [200, 1000])
+    def test_incremental_matches_reference_while_streaming(self, maxlen):
+        strategy = MarketStructureStrategy()
+        symbol = "BTCUSDT"
+        candles = recorded_candles(600, seed=5)
+        for t, candle in enumerate(candles):
+            strategy.update_data(symbol, candle)
+            if maxlen != 200:
+                strategy.price_history[symbol] = type(strategy.price_history[symbol])(
+                    strategy.price_history[symbol], maxlen=maxlen)
+            history = list(strategy.price_history[symbol])
+            # Skip some bars so the cache also has to absorb several new candles at once
+            if t % 7 == 3:
+                continue
+            assert strategy._swing_points(symbol, history) == reference_swing_points(history, 20)
+
+    def test_incremental_recomputes_when_history_is_replaced(self):
+        strategy = MarketStructureStrategy()
+        first, second = recorded_candles(150, seed=1), recorded_candles(150, seed=2)
+        strategy._swing_points("ETHUSDT", first)
+        assert strategy._swing_points("ETHUSDT", second) == reference_swing_points(second, 20)
+
+    def test_hooks_agree_with_reference_swings(self):
+        strategy = MarketStructureStrategy()
+        reference = MarketStructureStrategy()
+        reference._swing_points = lambda symbol, history: reference_swing_points(history, 20)
+        for candle in recorded_candles(500, seed=8, tick=0):
+            for s in (strategy, reference):
+                s.update_data("SOLUSDT", candle)
+            assert strategy._confirm_completion("SOLUSDT") == reference._confirm_completion("SOLUSDT")
+            assert strategy._get_action_from_pattern("SOLUSDT") == reference._get_action_from_pattern("SOLUSDT")
@@ -0,0 +1,52 @@
+"""
+Tests for signal pipeline Prometheus metrics.
+"""
+
+import asyncio
+import time
+
+import pytest
+from prometheus_client import generate_latest
+
+from backend.app.core.monitoring import monitor_event_loop_lag, observe_stage, record_funnel, registry
+
+
+def _sample(name, **labels):
+    return registry.get_sample_value(name, labels) or 0.0
+
+
+class TestPipelineMetrics:
+    def test_observe_stage_records_latency(self):
+        before = _sample("vyra_signal_stage_seconds_count", stage="db_fetch", target="test_source")
+        with observe_stage("db_fetch", "test_source"):
+            pass
+        assert _sample("vyra_signal_stage_seconds_count", stage="db_fetch", target="test_source") == before + 1
+
+    def test_observe_stage_counts_errors(self):
+        with pytest.raises(RuntimeError):
+            with observe_stage("ai_filter", "test_provider"):
+                raise RuntimeError("provider down")
+        assert _sample("vyra_signal_stage_errors_total", stage="ai_filter", target="test_provider") == 1
+        assert _sample("vyra_signal_stage_seconds_count", stage="ai_filter", target="test_provider") == 1
+
+    def test_funnel_counts_per_strategy(self):
+        for step in ("pattern_completed", "pattern_completed", "filter_passed", "ai_approved", "sent"):
+            record_funnel("test_strategy", step)
+        assert _sample("vyra_signal_funnel_total", strategy="test_strategy", step="pattern_completed") == 2
+        assert _sample("vyra_signal_funnel_total", strategy="test_strategy", step="sent") == 1
+        assert b"vyra_signal_funnel_total" in generate_latest(registry)
+
+
+class TestEventLoopLag:
+    def test_blocking_call_shows_up_as_lag(self):
+        async def block_loop():
+            monitor = asyncio.create_task(monitor_event_loop_lag(0.02))
+            await asyncio.sleep(0.05)
+            time.sleep(0.3)  # what a synchronous strategy check does to the loop
+            await asyncio.sleep(0.05)
+            monitor.cancel()
+
+        before = _sample("vyra_event_loop_lag_seconds_sum")
+        asyncio.new_event_loop().run_until_complete(block_loop())
+        assert _sample("vyra_event_loop_lag_seconds_sum") - before >= 0.2
+        assert _sample("vyra_event_loop_lag_seconds_bucket", le="0.25") < _sample("vyra_event_loop_lag_seconds_count")
@@ -0,0 +1,112 @@
+"""
+Parity tests for OrderBlocksStrategy's single-pass and incremental order-block scanner.
+"""
+
+import random
+from collections import deque
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app.strategies.order_blocks import OrderBlocksStrategy
+
+
+def reference_order_blocks(strategy, history):
+    """The original nested-scan implementation."""
+    if len(history) < strategy.lookback_period + 5:
+        return {"bullish_blocks": [], "bearish_blocks": []}
+    bullish_blocks, bearish_blocks = [], []
+    for i in range(strategy.lookback_period, len(history) - 3):
+        start_price = history[i].get("close", 0.0)
+        end_price = history[i + 3].get("close", 0.0)
+        if start_price <= 0:
+            continue
+        move_pct = (end_price - start_price) / start_price
+        if move_pct >= strategy.move_threshold:
+            opposite, blocks = strategy._is_bearish_candle, bullish_blocks
+        elif move_pct <= -strategy.move_threshold:
+            opposite, blocks = strategy._is_bullish_candle, bearish_blocks
+        else:
+            continue
+        for j in range(max(0, i - strategy.lookback_period), i):
+            if opposite(history[j]):
+                block = {
+                    "high": history[j].get("high", 0.0),
+                    "low": history[j].get("low", 0.0),
+                    "candle_index": j,
+                    "price": history[j].get("close", 0.0),
+                }
+                if not any(abs(b["price"] - block["price"]) / block["price"] < 0.01 for b in blocks):
+                    blocks.append(block)
+                break
+    return {"bullish_blocks": bullish_blocks, "bearish_blocks": bearish_blocks}
+
+
+def recorded_candles(n, seed=3, vol=0.012):
+    rng = random.Random(seed)
+    price = 100.0
+    candles = []
+    for t in range(n):
+        close = price * (1.0 + rng.gauss(0.0, vol))
+        candle = {
+            "timestamp": datetime(2024, 1, 1) + timedelta(minutes=t),
+            "open": price,
+            "high": max(price, close) * (1.0 + abs(rng.gauss(0.0, vol / 3))),
+            "low": min(price, close) * (1.0 - abs(rng.gauss(0.0, vol / 3))),
+            "close": close,
+            "volume": 1.0,
+        }
+        if rng.random() < 0.03:
+            candle["open"] = candle["close"]  # doji: neither bullish nor bearish
+        if rng.random() < 0.01:
+            del candle["open"]
+        candles.append(candle)
+        price = close
+    return candles
+
+
+class TestOrderBlockParity:
+    @pytest.mark.parametrize("seed", [1, 2, 3, 4])
+    @pytest.mark.parametrize("n", [20, 25, 200, 1500])
+    def test_single_pass_matches_reference(self, seed, n):
+        strategy = OrderBlocksStrategy()
+        history = recorded_candles(n, seed=seed)
+        result = strategy._find_order_blocks(history)
+        assert result == reference_order_blocks(strategy, history)
+
+    def test_fixture_exercises_duplicate_filter(self):
+        strategy = OrderBlocksStrategy()
+        history = recorded_candles(1500, seed=1)
+        blocks = strategy._find_order_blocks(history)
+        moves = sum(1 for i in range(20, len(history) - 3)
+                    if abs(history[i + 3]["close"] / history[i]["close"] - 1) >= strategy.move_threshold)
+        assert len(blocks["bullish_blocks"]) > 5 and len(blocks["bearish_blocks"]) > 5
+        assert moves > 2 * (len(blocks["bullish_blocks"]) + len(blocks["bearish_blocks"]))
+
+    @pytest.mark.parametrize("maxlen", [200, 600])
+    def test_incremental_matches_reference_while_streaming(self, maxlen):
+        strategy = OrderBlocksStrategy()
+        symbol = "BTCUSDT"
+        strategy.price_history[symbol] = deque(maxlen=maxlen)
+        for t, candle in enumerate(recorded_candles(1200, seed=9)):
+            strategy.update_data(symbol, candle)
+            if t % 5 == 2:
+                continue  # several candles arrive between hook calls
+            history = list(strategy.price_history[symbol])
+            assert strategy._order_blocks(symbol, history) == reference_order_blocks(strategy, history)
+
+    def test_incremental_recomputes_when_history_is_replaced(self):
+        strategy = OrderBlocksStrategy()
+        first, second = recorded_candles(300, seed=1), recorded_candles(300, seed=2)
+        strategy._order_blocks("ETHUSDT", first)
+        assert strategy._order_blocks("ETHUSDT", second) == reference_order_blocks(strategy, second)
+
+    def test_hooks_agree_with_reference_blocks(self):
+        strategy = OrderBlocksStrategy()
+        reference = OrderBlocksStrategy()
+        reference._order_blocks = lambda symbol, history: reference_order_blocks(reference, history)
+        for candle in recorded_candles(600, seed=6):
+            for s in (strategy, reference):
+                s.update_data("SOLUSDT", candle)
+            assert strategy._confirm_completion("SOLUSDT") == reference._confirm_completion("SOLUSDT")
+            assert strategy._get_action_from_pattern("SOLUSDT") == reference._get_action_from_pattern("SOLUSDT")
@@ -0,0 +1,66 @@
+"""
+Smoke tests for the deterministic signal pipeline replay benchmark.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+from services.pipeline_replay import PipelineReplay, ReplayFixture, compare_reports
+
+ROOT_DIR = str(Path(__file__).resolve().parents[2])
+
+
+def _report(cycle_p95: float, stage_p95: float, cps: float):
+    return {
+        "cycles_per_sec": cps,
+        "cycle": {"p95": cycle_p95},
+        "stages": {"strategy_eval": {"p95": stage_p95}},
+        "peak_rss_mb": 100.0,
+    }
+
+
+class TestReplayFixture:
+    def test_synthetic_is_deterministic(self):
+        a = ReplayFixture.synthetic(n_symbols=2, n_bars=50, seed=7)
+        b = ReplayFixture.synthetic(n_symbols=2, n_bars=50, seed=7)
+        assert a.symbols == b.symbols
+
+    def test_save_load_roundtrip(self, tmp_path):
+        fixture = ReplayFixture.synthetic(n_symbols=1, n_bars=20, seed=1)
+        path = tmp_path / "fixture.json"
+        fixture.save(str(path))
+        assert ReplayFixture.load(str(path)).symbols == fixture.symbols
+
+
+class TestPipelineReplay:
+    def test_run_reports_stages_and_restores_module(self, tmp_path):
+        # signal_generator imports the root config/ package, which must win over backend/config.py
+        sys.path.insert(0, ROOT_DIR)
+        import signal_generator as sg
+
+        original_ai_filter = sg.AIFilter
+        fixture = ReplayFixture.synthetic(n_symbols=2, n_bars=140, seed=3)
+        replay = PipelineReplay(
+            fixture, cycles=3, warmup_bars=120, inject_rate=1.0, db_path=str(tmp_path / "replay.db")
+        )
+        report = asyncio.run(replay.run())
+
+        assert sg.AIFilter is original_ai_filter
+        assert report["cycle"]["count"] == 3
+        assert "strategy_eval" in report["stages"]
+        assert report["signals"]["injected"] == 6
+        assert report["signals"]["ai_calls"] > 0
+        assert report["cycles_per_sec"] > 0
+
+
+class TestCompareReports:
+    def test_flags_latency_regression(self):
+        rows = compare_reports(_report(100.0, 10.0, 2.0), _report(130.0, 10.5, 2.0), tolerance=0.10)
+        flagged = {row["metric"] for row in rows if row["regression"]}
+        assert flagged == {"cycle.p95"}
+
+    def test_flags_throughput_drop(self):
+        rows = compare_reports(_report(100.0, 10.0, 2.0), _report(100.0, 10.0, 1.5), tolerance=0.10)
+        flagged = {row["metric"] for row in rows if row["regression"]}
+        assert flagged == {"cycles_per_sec"}
@@ -0,0 +1,145 @@
+"""
+Tests for the multi-asset portfolio backtester.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from backend.app.services.backtest.portfolio_backtester import PortfolioBacktester, align_candles
+from backend.app.services.risk_manager import DrawdownProtection
+
+
+def no_slippage(side, price, size_notional, adv):
+    return price
+
+
+def random_walks(n_bars: int, n_symbols: int, seed: int = 0, vol: float = 0.01):
+    rng = np.random.default_rng(seed)
+    return 100.0 * np.exp(np.cumsum(rng.normal(0, vol, (n_bars, n_symbols)), axis=0))
+
+
+def sma_signals(closes: np.ndarray, fast: int = 5, slow: int = 20):
+    csum = np.vstack([np.zeros(closes.shape[1]), np.cumsum(closes, axis=0)])
+    fast_ma = np.full(closes.shape, -np.inf)
+    slow_ma = np.full(closes.shape, np.inf)
+    fast_ma[fast - 1:] = (csum[fast:] - csum[:-fast]) / fast
+    slow_ma[slow - 1:] = (csum[slow:] - csum[:-slow]) / slow
+    above = fast_ma > slow_ma
+    prev = np.vstack([np.zeros((1, closes.shape[1]), dtype=bool), above[:-1]])
+    return above & ~prev, ~above & prev
+
+
+class TestAccounting:
+    def test_final_equity_is_cash_plus_realised_pnl(self):
+        closes = random_walks(3000, 5, seed=1)
+        entries, exits = sma_signals(closes)
+        bt = PortfolioBacktester(closes, slippage_apply=no_slippage, use_kelly=False, max_correlated_exposure=1.0)
+        result = bt.run(entries, exits)
+
+        pnl = sum(t["pnl"] for t in result["trades"] if t["type"] == "sell")
+        assert result["final_equity"] == pytest.approx(10000.0 + pnl)
+        assert len(result["equity_curve"]) == 3000
+        assert (result["cash_curve"] >= -1e-6).all()
+        assert (result["gross_exposure"] <= result["equity_curve"] + 1e-6).all()
+        buys = sum(1 for t in result["trades"] if t["type"] == "buy")
+        assert buys == sum(s["trades"] for s in result["per_symbol"].values())
+
+    def test_vectorized_blocks_match_bar_by_bar(self):
+        closes = random_walks(2000, 4, seed=2)
+        entries, exits = sma_signals(closes)
+        kwargs = dict(lows=closes * 0.995, highs=closes * 1.005, use_kelly=False)
+        blocked = PortfolioBacktester(closes, block_bars=4096, **kwargs).run(entries, exits)
+        stepped = PortfolioBacktester(closes, block_bars=1, **kwargs).run(entries, exits)
+
+        np.testing.assert_allclose(blocked["equity_curve"], stepped["equity_curve"], rtol=1e-12)
+        assert blocked["trades"] == stepped["trades"]
+
+    def test_memory_mapped_inputs(self, tmp_path):
+        closes = random_walks(1000, 3, seed=3)
+        entries, exits = sma_signals(closes)
+        expected = PortfolioBacktester(closes).run(entries, exits)
+
+        np.save(tmp_path / "closes.npy", closes)
+        mapped = PortfolioBacktester(np.load(tmp_path / "closes.npy", mmap_mode="r")).run(entries, exits)
+        np.testing.assert_array_equal(mapped["equity_curve"], expected["equity_curve"])
+
+
+class TestRiskControls:
+    def test_stop_loss_fills_at_stop(self):
+        closes = np.array([[100.0]] * 20 + [[90.0]] * 5)
+        entries = np.zeros_like(closes, dtype=bool)
+        entries[15, 0] = True
+        bt = PortfolioBacktester(closes, slippage_apply=no_slippage, min_stop_pct=0.02)
+        result = bt.run(entries, np.zeros_like(entries))
+
+        sell = [t for t in result["trades"] if t["type"] == "sell"][0]
+        assert sell["reason"] == "stop_loss"
+        assert sell["bar"] == 20
+        assert sell["price"] == pytest.approx(98.0)
+
+    def test_correlated_symbols_share_one_budget(self):
+        base = random_walks(300, 1, seed=4)
+        closes = np.hstack([base, base * 2.0, random_walks(300, 1, seed=5)])
+        entries = np.zeros_like(closes, dtype=bool)
+        entries[200, :] = True
+        bt = PortfolioBacktester(closes, slippage_apply=no_slippage, fee_pct=0.0, max_correlated_exposure=0.12)
+        result = bt.run(entries, np.zeros_like(entries))
+
+        notionals = {t["symbol"]: t["notional"] for t in result["trades"] if t["type"] == "buy"}
+        assert notionals["SYM0"] + notionals.get("SYM1", 0.0) == pytest.approx(1200.0)
+        assert notionals["SYM2"] == pytest.approx(1000.0)  # uncorrelated: full 10% position
+
+    def test_shared_cash_limits_entries(self):
+        closes = random_walks(100, 20, seed=6, vol=0.0001)
+        entries = np.zeros_like(closes, dtype=bool)
+        entries[50, :] = True
+        bt = PortfolioBacktester(closes, slippage_apply=no_slippage, max_correlated_exposure=1.0, max_gross_exposure=1.0)
+        result = bt.run(entries, np.zeros_like(entries))
+
+        assert sum(result["skipped"].values()) > 0
+        assert result["cash_curve"][50] >= 0.0
+
+    def test_kill_switch_flattens_and_halts(self):
+        closes = np.vstack([np.full((30, 3), 100.0), np.linspace(100.0, 60.0, 20)[:, None].repeat(3, axis=1), np.full((30, 3), 60.0)])
+        entries = np.zeros_like(closes, dtype=bool)
+        entries[[25, 60], :] = True
+        bt = PortfolioBacktester(
+            closes, slippage_apply=no_slippage, min_stop_pct=0.9, max_correlated_exposure=1.0,
+            drawdown_protection=DrawdownProtection(max_drawdown_pct=0.01), halt_on_kill=True,
+        )
+        result = bt.run(entries, np.zeros_like(entries))
+
+        assert result["kill_switch_bar"] is not None
+        reasons = [t["reason"] for t in result["trades"] if t["type"] == "sell"]
+        assert reasons == ["kill_switch"] * 3
+        assert result["skipped"]["kill_switch"] == 3
+        assert bt.protection.kill_switch_active
+
+    def test_kelly_stops_a_losing_symbol(self):
+        n = 400
+        closes = np.full((n, 1), 100.0)
+        closes[1::2] = 99.0  # buy at 100, exit at 99: every trade loses
+        entries = np.zeros_like(closes, dtype=bool)
+        exits = np.zeros_like(closes, dtype=bool)
+        entries[0::2] = True
+        exits[1::2] = True
+        bt = PortfolioBacktester(closes, slippage_apply=no_slippage, kelly_min_trades=10, min_stop_pct=0.5,
+                                 drawdown_protection=DrawdownProtection(max_drawdown_pct=1.0))
+        result = bt.run(entries, exits)
+
+        assert result["per_symbol"]["SYM0"]["trades"] == 10
+        assert result["skipped"]["size"] > 0
+
+
+def test_align_candles_forward_fills_gaps():
+    start = datetime(2024, 1, 1)
+    a = [{"timestamp": start + timedelta(minutes=i), "close": 100.0 + i, "volume": 1.0} for i in range(5)]
+    b = [{"timestamp": start + timedelta(minutes=i), "close": 50.0 + i, "volume": 1.0} for i in (1, 3)]
+    data = align_candles({"AAA": a, "BBB": b})
+
+    assert data["symbols"] == ["AAA", "BBB"]
+    np.testing.assert_array_equal(data["closes"][:, 1], [51.0, 51.0, 51.0, 53.0, 53.0])
+    np.testing.assert_array_equal(data["tradable"][:, 1], [False, True, False, True, False])
+    assert data["tradable"][:, 0].all()
@@ -0,0 +1,180 @@
+"""
+Tests for the process-sharded signal generator: consistent hashing, worker-owned state,
+resharding and per-worker lag (real spawn workers running a test engine, no database).
+"""
+
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from services.shard_coordinator import HashRing, ShardCoordinator
+
+ROOT_DIR = str(Path(__file__).resolve().parents[2])
+ECHO_ENGINE = "backend.tests.test_shard_coordinator:EchoEngine"
+
+
+class EchoEngine:
+    """One signal per owned symbol per cycle, numbered by how often this process saw the symbol."""
+
+    def __init__(self, worker_id):
+        self.worker_id = worker_id
+        self.seen = Counter()
+
+    async def evaluate(self, symbols):
+        signals = []
+        for symbol in symbols:
+            if symbol.startswith("SLOW"):
+                await asyncio.sleep(1.5)
+            self.seen[symbol] += 1
+            signals.append({"symbol": symbol, "strategy": self.worker_id, "action": "buy",
+                            "count": self.seen[symbol], "pid": os.getpid()})
+        return signals
+
+    def drop(self, symbols):
+        for symbol in symbols:
+            self.seen.pop(symbol, None)
+
+
+def symbols(n, prefix="SYM"):
+    return [f"{prefix}{i:03d}USDT" for i in range(n)]
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class TestHashRing:
+    def test_assignment_is_stable_and_balanced(self):
+        keys = symbols(400)
+        ring = HashRing(ShardCoordinator.worker_ids(4))
+        assignment = ring.assign(keys)
+        assert assignment == HashRing(ShardCoordinator.worker_ids(4)).assign(keys)
+        assert sorted(k for owned in assignment.values() for k in owned) == sorted(keys)
+        assert all(50 <= len(owned) <= 150 for owned in assignment.values())
+
+    def test_adding_a_worker_only_moves_keys_to_it(self):
+        keys = symbols(400)
+        before = HashRing(ShardCoordinator.worker_ids(4))
+        after = HashRing(ShardCoordinator.worker_ids(5))
+        moved = [k for k in keys if before.owner(k) != after.owner(k)]
+        assert {after.owner(k) for k in moved} == {"shard-4"}
+        assert len(moved) < len(keys) * 0.35  # ~1/5 expected, not a full reshuffle
+
+    def test_empty_ring(self):
+        with pytest.raises(ValueError):
+            HashRing([]).owner("BTCUSDT")
+
+
+class TestShardCoordinator:
+    def test_workers_own_their_symbols_state(self):
+        keys = symbols(12)
+        with ShardCoordinator(3, engine=ECHO_ENGINE, cycle_timeout=60) as shards:
+            shards.start(keys)
+            first = run(shards.run_cycle(keys))
+            second = run(shards.run_cycle(keys))
+            owner = {s: worker for worker, owned in shards.assignment.items() for s in owned}
+            lag = shards.lag_report()
+
+        for signals, count in ((first, 1), (second, 2)):
+            assert [s["symbol"] for s in signals] == keys  # one per symbol, in asset order
+            assert all(s["count"] == count for s in signals)
+            assert all(s["strategy"] == owner[s["symbol"]] for s in signals)
+        assert len({s["pid"] for s in second}) == 3 and os.getpid() not in {s["pid"] for s in second}
+        assert set(lag) == {"shard-0", "shard-1", "shard-2"}
+        assert all(row["last_cycle"] == 2 and row["cycles_behind"] == 0 for row in lag.values())
+        assert sum(row["symbols"] for row in lag.values()) == 12
+        assert all(row["round_trip_seconds"] >= row["eval_seconds"] >= 0 for row in lag.values())
+
+    def test_reshard_moves_only_affected_symbols(self):
+        keys = symbols(20)
+        with ShardCoordinator(2, engine=ECHO_ENGINE, cycle_timeout=60) as shards:
+            shards.start(keys)
+            run(shards.run_cycle(keys))
+            before = shards.assignment
+
+            changes = shards.reshard(keys[2:] + ["NEWUSDT"], workers=3)
+            signals = {s["symbol"]: s for s in run(shards.run_cycle(keys[2:] + ["NEWUSDT"]))}
+
+            # An asset-list change alone is picked up by run_cycle
+            grown = keys[2:] + ["NEWUSDT", "LATEUSDT"]
+            assert {s["symbol"] for s in run(shards.run_cycle(grown))} == set(grown)
+
+        assert changes["removed"] == keys[:2] and changes["added"] == ["NEWUSDT"]
+        assert set(changes["moved"]) and all(s in keys for s in changes["moved"])
+        assert set(signals) == set(keys[2:]) | {"NEWUSDT"}
+        for symbol, signal in signals.items():
+            expected = 1 if symbol in changes["moved"] or symbol == "NEWUSDT" else 2
+            assert signal["count"] == expected, symbol  # moved symbols start cold on the new owner
+        assert all(signals[s]["strategy"] == "shard-2" for s in changes["moved"])
+        assert set(before) == {"shard-0", "shard-1"}
+
+    def test_slow_worker_is_reported_and_merged_late(self):
+        keys = ["SLOWUSDT"] + symbols(7)
+        with ShardCoordinator(2, engine=ECHO_ENGINE, cycle_timeout=8) as shards:
+            shards.start(keys)
+            run(shards.run_cycle(keys))  # spawn + warm-up
+            slow = next(w for w, owned in shards.assignment.items() if "SLOWUSDT" in owned)
+            shards.cycle_timeout = 0.5
+            first = run(shards.run_cycle(keys))
+            assert "SLOWUSDT" not in {s["symbol"] for s in first}
+            second = run(shards.run_cycle(keys))
+            behind = shards.lag_report()[slow]["cycles_behind"]
+            time.sleep(2.0)
+            shards.cycle_timeout = 8
+            third = run(shards.run_cycle(keys))
+
+        assert behind == 1  # still busy with the previous cycle, not sent another one
+        assert "SLOWUSDT" not in {s["symbol"] for s in second}
+        late = [s for s in third if s["symbol"] == "SLOWUSDT"]
+        assert [s["count"] for s in late] in ([2], [2, 3])  # late result arrives with the next cycle
+
+
+class TestShardedSignalGenerator:
+    def test_signals_are_counted_by_the_coordinator(self):
+        sys.path.insert(0, ROOT_DIR)
+        import signal_generator as sg
+        from services.pipeline_replay import StubAIFilter, StubLivePrices, StubSignalLogger, StubTelegram, _patched
+
+        module_patch = {
+            "AIFilter": lambda **kw: StubAIFilter(),
+            "TelegramNotifier": lambda **kw: StubTelegram(),
+            "SignalLogger": StubSignalLogger,
+            "LivePriceCache": lambda **kw: StubLivePrices(),
+        }
+        with _patched(sg, module_patch), _patched(sg.config, {"COOLDOWN_DB_URL": None}):
+            generator = sg.ShardedSignalGenerator(2, engine=ECHO_ENGINE)
+        try:
+            assert generator.strategies == {}
+            keys = symbols(6)
+            signals = run(generator.evaluate_symbols(keys))
+        finally:
+            generator.shards.stop()
+        assert [s["symbol"] for s in signals] == keys
+        assert generator.stats["total_signals"] == 6
+        assert sum(generator.stats["by_strategy"].values()) == 6
+
+
+class TestDropSymbol:
+    def test_strategy_forgets_all_symbol_state(self):
+        from backend.app.strategies.vwap_strategy import VWAPStrategy
+
+        strategy = VWAPStrategy()
+        for t in range(60):
+            for symbol in ("BTCUSDT", "ETHUSDT"):
+                strategy.update_data(symbol, {"timestamp": datetime(2024, 1, 1) + timedelta(minutes=t),
+                                              "open": 100.0, "high": 101.0, "low": 99.0,
+                                              "close": 100.0 + t % 3, "volume": 5.0})
+        strategy._vwap("BTCUSDT", list(strategy.price_history["BTCUSDT"]))
+        strategy.drop_symbol("BTCUSDT")
+        assert "BTCUSDT" not in strategy.price_history and "BTCUSDT" not in strategy._vwap_state
+        assert "ETHUSDT" in strategy.price_history
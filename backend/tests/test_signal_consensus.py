@@ -0,0 +1,109 @@
+"""
+Parity tests for the per-cycle consensus index used by the signal generator.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+from services.signal_consensus import ConsensusIndex
+
+ROOT_DIR = str(Path(__file__).resolve().parents[2])
+
+STRATEGY_WEIGHTS = {
+    "vwap": 3.0,
+    "order_blocks": 2.7,
+    "market_structure": 2.5,
+    "rsi_macd_momentum": 1.5,
+    "momentum": 1.1,
+    "sentiment": 0.7,
+}
+
+
+def _synthetic_signals(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "EURUSD", "GBPUSD"]
+    strategies = list(STRATEGY_WEIGHTS) + ["unknown_strategy"]
+    return [
+        {
+            "strategy": rng.choice(strategies),
+            "symbol": rng.choice(symbols),
+            "action": rng.choice(["buy", "sell"]),
+            "confidence": round(rng.uniform(0.2, 0.95), 3),
+        }
+        for _ in range(n)
+    ]
+
+
+def _legacy_consensus(all_signals, signal, min_confidence):
+    """The original O(n) per-signal scan from SignalGenerator._calculate_reliability."""
+    confidence = signal.get("confidence", 0.0)
+    agreeing = [
+        s for s in all_signals
+        if s.get("symbol") == signal.get("symbol")
+        and s.get("action") == signal.get("action")
+        and s.get("confidence", 0.0) >= min_confidence
+    ]
+    weighted = 0.0
+    for s in agreeing:
+        weighted += s.get("confidence", 0.0) * STRATEGY_WEIGHTS.get(s.get("strategy", "unknown"), 1.0)
+    weighted += confidence * STRATEGY_WEIGHTS.get(signal.get("strategy"), 1.0)
+    max_conf = max([s.get("confidence", 0.0) for s in agreeing] + [confidence])
+    avg_conf = sum([s.get("confidence", 0.0) for s in agreeing]) / len(agreeing) if agreeing else confidence
+    return len(agreeing), weighted, max_conf, avg_conf
+
+
+@pytest.mark.unit
+def test_consensus_index_matches_legacy_scan():
+    signals = _synthetic_signals(500)
+    index = ConsensusIndex(signals, STRATEGY_WEIGHTS, min_confidence=0.45)
+
+    for signal in signals:
+        count, weighted, max_conf, avg_conf = _legacy_consensus(signals, signal, 0.45)
+        group = index.lookup(signal["symbol"], signal["action"])
+        confidence = signal["confidence"]
+
+        assert group.count == count
+        assert group.weighted_sum + confidence * STRATEGY_WEIGHTS.get(signal["strategy"], 1.0) == weighted
+        assert (max(group.max_confidence, confidence) if group.count else confidence) == max_conf
+        assert (group.avg_confidence if group.count else confidence) == avg_conf
+
+
+@pytest.mark.unit
+def test_reliability_output_parity():
+    # signal_generator imports the root config/ package, which must win over backend/config.py
+    sys.path.insert(0, ROOT_DIR)
+    from signal_generator import SignalGenerator
+
+    generator = SignalGenerator.__new__(SignalGenerator)
+    generator.strategy_weights = STRATEGY_WEIGHTS
+    generator.min_reliable_confidence = 0.55
+    generator.min_consensus_strategies = 2
+    generator.consensus_min_confidence = 0.45
+    generator.weighted_consensus_threshold = 2.0
+
+    signals = _synthetic_signals(300, seed=11)
+    index = generator._build_consensus_index(signals)
+
+    for signal in signals:
+        indexed = generator._calculate_reliability(signals, signal, index)
+        rebuilt = generator._calculate_reliability(signals, signal)
+        count, weighted, max_conf, avg_conf = _legacy_consensus(signals, signal, 0.45)
+
+        assert indexed == rebuilt
+        assert indexed["consensus_count"] == count
+        assert indexed["weighted_consensus_score"] == weighted
+        assert indexed["max_confidence"] == max_conf
+        assert indexed["avg_confidence"] == avg_conf
+
+
+@pytest.mark.unit
+def test_empty_group_lookup():
+    index = ConsensusIndex([], STRATEGY_WEIGHTS, min_confidence=0.45)
+    group = index.lookup("BTCUSDT", "buy")
+    assert group.count == 0
+    assert group.weighted_sum == 0.0
+    assert group.strategies == set()
+    assert len(index) == 0
@@ -0,0 +1,71 @@
+"""
+Tests for the slippage model: array versions against the scalar API, optional impact terms.
+"""
+
+import numpy as np
+import pytest
+
+from backend.app.services.slippage import (
+    apply_slippage,
+    apply_slippage_array,
+    compute_slippage_pct,
+    compute_slippage_pct_array,
+    fill_costs_array,
+    make_slippage_apply,
+    side_sign,
+)
+
+
+def _orders(n: int = 500, seed: int = 5):
+    rng = np.random.default_rng(seed)
+    side = rng.choice(np.array(["buy", "sell", "BUY", "Sell"]), size=n)
+    price = rng.uniform(0.5, 50_000.0, size=n)
+    notional = rng.uniform(10.0, 1e6, size=n)
+    adv = rng.uniform(-1e5, 1e8, size=n)  # includes adv <= 0 (base slippage only)
+    return side, price, notional, adv
+
+
+class TestArrayParity:
+    def test_pct_matches_scalar(self):
+        _, _, notional, adv = _orders()
+        expected = [compute_slippage_pct(s, a) for s, a in zip(notional, adv)]
+        np.testing.assert_allclose(compute_slippage_pct_array(notional, adv), expected, rtol=1e-12)
+
+    def test_fill_prices_match_scalar(self):
+        side, price, notional, adv = _orders()
+        expected = [apply_slippage(str(s), p, q, a) for s, p, q, a in zip(side, price, notional, adv)]
+        np.testing.assert_allclose(apply_slippage_array(side, price, notional, adv), expected, rtol=1e-12)
+
+    def test_numeric_sides_and_broadcasting(self):
+        assert side_sign(["buy", "sell", "Buy"]).tolist() == [1.0, -1.0, 1.0]
+        assert side_sign(np.array([1, -1, 0])).tolist() == [1.0, -1.0, -1.0]
+        fills = apply_slippage_array(1, 100.0, np.array([1e3, 1e4, 1e5]), 1e7)
+        assert fills.shape == (3,) and np.all(np.diff(fills) > 0)
+
+
+class TestImpactTerms:
+    def test_square_root_law_scales_with_volatility(self):
+        size, adv = np.array([1e4, 4e4]), 1e6
+        pct = compute_slippage_pct_array(size, adv, base_slippage=0.0, volatility=0.02, impact_coef=1.0)
+        np.testing.assert_allclose(pct, [0.002, 0.004])
+        double_vol = compute_slippage_pct_array(size, adv, base_slippage=0.0, volatility=0.04, impact_coef=1.0)
+        np.testing.assert_allclose(double_vol, 2 * pct)
+
+    def test_spread_term_applies_even_without_liquidity(self):
+        pct = compute_slippage_pct_array([1e4, 1e4], [1e6, 0.0], volatility=np.array([0.01, 0.03]),
+                                         spread_vol_mult=0.1)
+        np.testing.assert_allclose(pct, [0.0005 + 0.005 * 0.1 + 0.001, 0.0005 + 0.003])
+
+    def test_optional_terms_need_volatility(self):
+        with pytest.raises(ValueError):
+            compute_slippage_pct_array(1e4, 1e6, impact_coef=1.0)
+
+    def test_fees_and_scalar_adapter(self):
+        fill, fee = fill_costs_array(["buy", "sell"], 100.0, 1_000.0, 0.0, fee_pct=0.001)
+        np.testing.assert_allclose(fill, [100.05, 99.95])
+        np.testing.assert_allclose(fee, [10 * 100.05 * 0.001, 10 * 99.95 * 0.001])
+
+        slippage_apply = make_slippage_apply()
+        assert slippage_apply("buy", 100.0, 5e4, 1e7) == pytest.approx(apply_slippage("buy", 100.0, 5e4, 1e7))
+        wide = make_slippage_apply(volatility=0.05, spread_vol_mult=0.2)
+        assert wide("sell", 100.0, 5e4, 1e7) < slippage_apply("sell", 100.0, 5e4, 1e7)
@@ -0,0 +1,146 @@
+"""
+Tests for strategy warm-state snapshots: round trip, versioning, corrupt files and the
+signal generator's restore (shortened grace period).
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from backend.app.services.cooldown_store import CooldownStore, reset_cooldown_stores
+from backend.app.strategies.base import history_shift
+from backend.app.strategies.order_blocks import OrderBlocksStrategy
+from backend.app.strategies.trend_following import TrendFollowingStrategy
+from backend.app.strategies.vwap_strategy import VWAPStrategy
+from services import state_snapshot
+
+ROOT_DIR = str(Path(__file__).resolve().parents[2])
+SYMBOLS = ("BTCUSDT", "ETHUSDT")
+
+
+@pytest.fixture(autouse=True)
+def fresh_stores():
+    reset_cooldown_stores()
+    yield
+    reset_cooldown_stores()
+
+
+def candle(t, base=100.0):
+    close = base + (t % 17) - (t % 5) * 0.7
+    return {"timestamp": datetime(2024, 1, 1) + timedelta(minutes=5 * t), "open": close - 0.3,
+            "high": close + 1.0, "low": close - 1.0, "close": close, "volume": 10.0 + t % 7}
+
+
+def strategies():
+    return {"vwap": VWAPStrategy(), "order_blocks": OrderBlocksStrategy(), "trend_following": TrendFollowingStrategy()}
+
+
+def feed(strats, start, stop):
+    for t in range(start, stop):
+        for i, symbol in enumerate(SYMBOLS):
+            for strategy in strats.values():
+                strategy.update_data(symbol, candle(t, 100.0 * (i + 1)))
+    for symbol in SYMBOLS:
+        history = list(strats["vwap"].price_history[symbol])
+        strats["vwap"]._vwap(symbol, history)
+        strats["order_blocks"]._find_order_blocks(list(strats["order_blocks"].price_history[symbol]))
+
+
+class TestSnapshotRoundTrip:
+    def test_restored_strategies_continue_incrementally(self, tmp_path):
+        path = tmp_path / "state" / "strategy_state.snap"
+        original = strategies()
+        feed(original, 0, 250)
+        store = CooldownStore("strategies", ttl_seconds=3600)
+        store.mark(("vwap", "BTCUSDT", "buy"))
+
+        size = state_snapshot.write(path, state_snapshot.capture(original, [store]))
+        assert size == path.stat().st_size and list(path.parent.iterdir()) == [path]
+
+        snapshot = state_snapshot.read(path)
+        assert snapshot.age() < 60
+        restored, restored_store = strategies(), CooldownStore("strategies", ttl_seconds=3600)
+        result = state_snapshot.restore(snapshot, restored, [restored_store])
+
+        assert result["vwap"] == ["price_history", "_vwap_state"]
+        assert result["trend_following"] == ["price_history", "_streams"]
+        assert restored_store.is_active(("vwap", "BTCUSDT", "buy"))
+        for symbol in SYMBOLS:
+            history = list(restored["vwap"].price_history[symbol])
+            assert history == list(original["vwap"].price_history[symbol])
+            # Cached candles are the restored history's own objects, so the cache is reused
+            assert history_shift(restored["vwap"]._vwap_state[symbol].candles, history) == (0, 0)
+
+        feed(original, 250, 260)
+        feed(restored, 250, 260)
+        for symbol in SYMBOLS:
+            history = list(restored["vwap"].price_history[symbol])
+            expected_history = list(original["vwap"].price_history[symbol])
+            assert restored["vwap"]._vwap(symbol, history) == original["vwap"]._vwap(symbol, expected_history)
+            frames = restored["trend_following"]._streams[symbol].frames
+            expected = original["trend_following"]._streams[symbol].frames
+            assert [frames[tf].latest("ema_fast") for tf in frames] == \
+                [expected[tf].latest("ema_fast") for tf in expected]
+
+    def test_changed_state_version_restores_price_history_only(self, tmp_path, monkeypatch):
+        path = tmp_path / "strategy_state.snap"
+        original = strategies()
+        feed(original, 0, 80)
+        state_snapshot.write(path, state_snapshot.capture(original))
+
+        monkeypatch.setattr(VWAPStrategy, "state_version", VWAPStrategy.state_version + 1)
+        restored = strategies()
+        result = state_snapshot.restore(state_snapshot.read(path), restored)
+        assert result["vwap"] == ["price_history"] and restored["vwap"]._vwap_state == {}
+        assert result["order_blocks"] == ["price_history", "_block_state"]
+
+    def test_unusable_files_are_ignored(self, tmp_path):
+        assert state_snapshot.read(tmp_path / "missing.snap") is None
+        path = tmp_path / "strategy_state.snap"
+        state_snapshot.write(path, state_snapshot.capture(strategies()))
+        data = path.read_bytes()
+        path.write_bytes(data[:-8])
+        assert state_snapshot.read(path) is None
+        path.write_bytes(b"XXXX" + data[4:])
+        assert state_snapshot.read(path) is None
+        path.write_bytes(data[:5])
+        assert state_snapshot.read(path) is None
+
+
+class TestSignalGeneratorRestore:
+    def test_restore_shortens_grace_period(self, tmp_path):
+        if ROOT_DIR not in sys.path:
+            sys.path.insert(0, ROOT_DIR)
+        import signal_generator as sg
+        from services.pipeline_replay import StubAIFilter, StubLivePrices, StubSignalLogger, StubTelegram, _patched
+
+        module_patch = {
+            "AIFilter": lambda **kw: StubAIFilter(),
+            "TelegramNotifier": lambda **kw: StubTelegram(),
+            "SignalLogger": StubSignalLogger,
+            "LivePriceCache": lambda **kw: StubLivePrices(),
+        }
+        config_patch = {"COOLDOWN_DB_URL": None, "STATE_SNAPSHOT_PATH": str(tmp_path / "strategy_state.snap")}
+        with _patched(sg, module_patch), _patched(sg.config, config_patch):
+            before = sg.SignalGenerator(strategy_names=["vwap", "order_blocks"])
+            feed(before.strategies, 0, 80)
+            before.cooldowns.mark(("vwap", "BTCUSDT", "buy"))
+            asyncio.run(before.save_state_snapshot())
+            reset_cooldown_stores()
+
+            after = sg.SignalGenerator(strategy_names=["vwap", "order_blocks"])
+            assert after.restore_state_snapshot()
+            assert after.startup_grace_minutes < 1
+            assert after.cooldowns.is_active(("vwap", "BTCUSDT", "buy"))
+            restored_history = after.strategies["vwap"].price_history["ETHUSDT"]
+            assert list(restored_history) == list(before.strategies["vwap"].price_history["ETHUSDT"])
+
+            stale = time.time() - (sg.config.STATE_SNAPSHOT_MAX_AGE_HOURS * 3600 + 60)
+            path = Path(config_patch["STATE_SNAPSHOT_PATH"])
+            state_snapshot.write(path, state_snapshot.capture(before.strategies, now=stale))
+            cold = sg.SignalGenerator(strategy_names=["vwap"])
+            assert not cold.restore_state_snapshot() and cold.startup_grace_minutes == 10
@@ -0,0 +1,86 @@
+"""
+Tests for the StrategyBase candle feed: re-fed and equal-timestamp candles are dropped, so
+the signal generator's per-cycle re-feed keeps the incremental caches warm.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import signal_generator as sg
+from backend.app.services.cooldown_store import reset_cooldown_stores
+from backend.app.strategies.momentum import MomentumStrategy
+from services.pipeline_replay import StubAIFilter, StubLivePrices, StubSignalLogger, StubTelegram
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture(autouse=True)
+def fresh_stores():
+    reset_cooldown_stores()
+    yield
+    reset_cooldown_stores()
+
+
+def candle(i, close=100.0):
+    return {"timestamp": START + timedelta(minutes=i), "open": close, "high": close + 1.0,
+            "low": close - 1.0, "close": close + (i % 7) * 0.1, "volume": 10.0 + i % 5}
+
+
+def tick(c):
+    return SimpleNamespace(ts=c["timestamp"], open=c["open"], high=c["high"], low=c["low"],
+                           price=c["close"], volume=c["volume"])
+
+
+class TestUpdateData:
+    def test_candles_not_newer_than_the_last_are_dropped(self):
+        strategy = MomentumStrategy()
+        for i in range(5):
+            strategy.update_data("BTCUSDT", candle(i))
+        held = list(strategy.price_history["BTCUSDT"])
+
+        strategy.update_data("BTCUSDT", candle(2))  # earlier
+        strategy.update_data("BTCUSDT", candle(4, close=90.0))  # equal timestamp, other values
+        assert list(strategy.price_history["BTCUSDT"]) == held
+
+        strategy.update_data("BTCUSDT", {"close": 101.0})  # no timestamp: stamped now, added
+        assert len(strategy.price_history["BTCUSDT"]) == 6
+
+
+class TestGeneratorFeed:
+    def test_refed_tick_window_keeps_incremental_caches(self, monkeypatch):
+        monkeypatch.setattr(sg, "AIFilter", lambda **kw: StubAIFilter())
+        monkeypatch.setattr(sg, "TelegramNotifier", lambda **kw: StubTelegram())
+        monkeypatch.setattr(sg, "SignalLogger", StubSignalLogger)
+        monkeypatch.setattr(sg, "LivePriceCache", lambda **kw: StubLivePrices())
+        monkeypatch.setattr(sg.config, "COOLDOWN_DB_URL", None)
+        monkeypatch.setattr(sg.config, "STATE_SNAPSHOT_PATH", "")
+
+        ticks = [tick(candle(i)) for i in range(400)]
+        window = {"ticks": ticks[:300]}
+
+        class Session:
+            async def exec(self, _stmt):
+                return SimpleNamespace(all=lambda: list(window["ticks"]))
+
+        async def get_session():
+            yield Session()
+
+        monkeypatch.setattr(sg, "get_session", get_session)
+        generator = sg.SignalGenerator(strategy_names=["vwap"])
+        strategy = generator.strategies["vwap"]
+
+        asyncio.run(generator.update_strategies_with_data("BTCUSDT"))
+        strategy._vwap("BTCUSDT", list(strategy.price_history["BTCUSDT"]))
+        accumulator = strategy._vwap_state["BTCUSDT"].accumulator
+
+        asyncio.run(generator.update_strategies_with_data("BTCUSDT"))  # same window again
+        window["ticks"] = ticks[10:310]  # the window moved on by ten ticks
+        asyncio.run(generator.update_strategies_with_data("BTCUSDT"))
+        history = list(strategy.price_history["BTCUSDT"])
+        strategy._vwap("BTCUSDT", history)
+
+        assert strategy._vwap_state["BTCUSDT"].accumulator is accumulator  # continued, not rebuilt
+        assert [c["timestamp"] for c in history] == [t.ts for t in ticks[110:310]]
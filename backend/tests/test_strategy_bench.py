@@ -0,0 +1,75 @@
+"""
+Tests for the per-strategy micro-benchmark suite (scaling detection, hook discovery).
+"""
+
+from backend.app.strategies.base import StrategyBase
+from backend.app.strategies.volatility_breakout import VolatilityBreakoutStrategy
+from backend.app.strategies.vwap_strategy import VWAPStrategy
+from services.strategy_bench import (
+    RegisteredStrategy,
+    run_suite,
+    scaling_exponents,
+    summarize_scaling,
+    synthetic_candles,
+)
+
+
+class QuadraticStrategy(StrategyBase):
+    """Pattern hook that rescans the whole prefix for every bar (O(n^2))."""
+
+    name = "quadratic"
+
+    def _detect_pattern(self, symbol):
+        return False
+
+    def _confirm_completion(self, symbol):
+        closes = [c["close"] for c in self.price_history[symbol]]
+        return sum(max(closes[: i + 1]) for i in range(len(closes))) < 0
+
+    def _get_action_from_pattern(self, symbol):
+        return None
+
+
+def _rows(strategy, hook, sizes, cost):
+    return [{"strategy": strategy, "hook": hook, "regime": "trending", "size": n, "ms": cost(n)} for n in sizes]
+
+
+class TestScaling:
+    def test_exponents_match_power_laws(self):
+        sizes = [100, 1000, 10000]
+        assert [round(s, 6) for s in scaling_exponents(sizes, [n * 1e-6 for n in sizes])] == [1.0, 1.0]
+        assert [round(s, 6) for s in scaling_exponents(sizes, [n * n * 1e-9 for n in sizes])] == [2.0, 2.0]
+
+    def test_flags_quadratic_but_not_linear_or_tiny(self):
+        sizes = [60, 200, 1000, 5000]
+        rows = (
+            _rows("lin", "check_for_signal", sizes, lambda n: n * 1e-3)
+            + _rows("quad", "check_for_signal", sizes, lambda n: n * n * 1e-4)
+            + _rows("tiny", "check_for_signal", sizes, lambda n: n * n * 1e-12)
+        )
+        flags = {row["strategy"]: row["superlinear"] for row in summarize_scaling(rows, sizes)}
+        assert flags == {"lin": False, "quad": True, "tiny": False}
+
+
+class TestSuite:
+    def test_synthetic_regimes_are_seeded(self):
+        for regime in ("trending", "ranging", "volatile"):
+            a = synthetic_candles(regime, 50, seed=3)
+            assert a == synthetic_candles(regime, 50, seed=3)
+            assert len(a) == 50 and all(c["low"] <= c["close"] <= c["high"] for c in a)
+
+    def test_times_pattern_and_frame_hooks_and_flags_quadratic(self):
+        strategies = [
+            RegisteredStrategy(VWAPStrategy(), {"signal_generator": "vwap"}),
+            RegisteredStrategy(VolatilityBreakoutStrategy(), {"signal_generator": "volatility_breakout"}),
+            RegisteredStrategy(QuadraticStrategy(), {"signal_generator": "quadratic"}),
+        ]
+        report = run_suite(strategies, sizes=[100, 400, 1600], regimes=["trending"], min_time=0.002,
+                           min_flag_ms=0.01)
+
+        hooks = {(row["strategy"], row["hook"]) for row in report["rows"]}
+        assert {("vwap", "check_for_signal"), ("vwap", "_confirm_completion"), ("vwap", "run")} <= hooks
+        assert {("volatility_breakout", "generate_signal"), ("volatility_breakout", "detect_breakout")} <= hooks
+        flagged = {(row["strategy"], row["hook"]) for row in report["scaling"] if row["superlinear"]}
+        assert ("quadratic", "_confirm_completion") in flagged
+        assert not any(name == "vwap" for name, _ in flagged)
@@ -0,0 +1,171 @@
+"""
+Tests for strategy execution policies (inline / thread / process pool with state handoff)
+and the per-strategy cycle time budget.
+"""
+
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from backend.app.services.cooldown_store import reset_cooldown_stores
+from backend.app.strategies.base import StrategyBase
+from services.strategy_executor import StrategyExecutor
+
+
+class SleepyStrategy(StrategyBase):
+    """check_for_signal takes `delay` seconds."""
+
+    name = "sleepy"
+
+    def __init__(self, delay=0.0):
+        super().__init__()
+        self.delay = delay
+        self.checked = []
+
+    def check_for_signal(self, symbol):
+        time.sleep(self.delay)
+        self.checked.append(symbol)
+        return {"symbol": symbol, "action": "buy"}
+
+
+class CountingStrategy(StrategyBase):
+    """Counts checks per symbol in its warm state; signals once per cooldown."""
+
+    name = "counting"
+    state_attributes = StrategyBase.state_attributes + ("counts",)
+
+    def __init__(self):
+        super().__init__()
+        self.counts = {}
+
+    def check_for_signal(self, symbol):
+        self.counts[symbol] = self.counts.get(symbol, 0) + 1
+        if self._is_duplicate(symbol, "buy"):
+            return None
+        return {"symbol": symbol, "action": "buy", "count": self.counts[symbol], "pid": os.getpid()}
+
+
+@pytest.fixture(autouse=True)
+def fresh_stores():
+    reset_cooldown_stores()
+    yield
+    reset_cooldown_stores()
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class TestFromConfig:
+    def test_class_defaults_and_config_overrides(self):
+        class Divergence(SleepyStrategy):
+            execution_policy = "thread"
+            eval_timeout = 5.0
+
+        strategies = {"a": SleepyStrategy(), "b": Divergence(), "c": SleepyStrategy()}
+        config = SimpleNamespace(STRATEGY_TIMEOUT_SECONDS=30.0,
+                                 STRATEGY_SETTINGS={"c": {"execution": "process", "timeout_seconds": 0}})
+        executor = StrategyExecutor.from_config(config, strategies)
+        assert executor.policies == {"a": "inline", "b": "thread", "c": "process"}
+        assert executor.budgets == {"a": 30.0, "b": 5.0, "c": None}
+
+    def test_unknown_policy(self):
+        config = SimpleNamespace(STRATEGY_SETTINGS={"a": {"execution": "gpu"}})
+        with pytest.raises(ValueError, match="gpu"):
+            StrategyExecutor.from_config(config, {"a": SleepyStrategy()})
+
+
+class TestBudget:
+    def test_inline_strategy_is_skipped_once_its_budget_is_spent(self):
+        strategy = SleepyStrategy(delay=0.15)
+        executor = StrategyExecutor({"sleepy": "inline"}, {"sleepy": 0.25})
+
+        async def cycle():
+            executor.begin_cycle()
+            results = [await executor.check("sleepy", strategy, s) for s in ("A", "B", "C", "D")]
+            return results, executor.end_cycle()
+
+        results, report = run(cycle())
+        assert strategy.checked == ["A", "B"] and results[2:] == [None, None]
+        assert report["sleepy"]["skipped"] == 2 and report["sleepy"]["spent_seconds"] >= 0.25
+
+        strategy.delay = 0.0
+        _, report = run(cycle())  # a new cycle has a fresh budget
+        assert strategy.checked[-4:] == ["A", "B", "C", "D"] and report == {}
+
+    def test_thread_check_is_abandoned_and_keeps_the_loop_responsive(self):
+        strategy = SleepyStrategy(delay=0.6)
+        executor = StrategyExecutor({"sleepy": "thread"}, {"sleepy": 0.2})
+
+        async def cycle():
+            ticks = []
+
+            async def ticker():
+                while True:
+                    ticks.append(time.perf_counter())
+                    await asyncio.sleep(0.02)
+
+            task = asyncio.create_task(ticker())
+            executor.begin_cycle()
+            start = time.perf_counter()
+            first = await executor.check("sleepy", strategy, "A")
+            waited = time.perf_counter() - start
+            second = await executor.check("sleepy", strategy, "B")
+            task.cancel()
+            return first, second, waited, len(ticks), executor.end_cycle()
+
+        try:
+            first, second, waited, ticks, report = run(cycle())
+            assert first is None and second is None and waited < 0.5
+            assert ticks >= 5  # the loop kept running while the check was in the thread
+            assert report["sleepy"]["timed_out"] == "A" and report["sleepy"]["still_running"]
+            assert executor.busy("sleepy")
+            time.sleep(0.6)
+            assert not executor.busy("sleepy") and strategy.checked == ["A"]
+        finally:
+            executor.close()
+
+
+    def test_cancelled_async_call_runs_recovery(self):
+        executor = StrategyExecutor({"slow": "inline"}, {"slow": 0.05})
+        recovered = []
+
+        async def generate_signal():
+            await asyncio.sleep(1.0)
+            return {"action": "buy"}
+
+        async def rollback():
+            recovered.append(True)
+
+        async def cycle():
+            executor.begin_cycle()
+            result = await executor.call("slow", "BTCUSDT", generate_signal, on_timeout=rollback)
+            return result, executor.end_cycle()
+
+        result, report = run(cycle())
+        assert result is None and recovered == [True]
+        assert report["slow"]["timed_out"] == "BTCUSDT"
+
+
+class TestProcessPolicy:
+    def test_symbol_state_and_cooldowns_are_handed_over(self):
+        strategy = CountingStrategy()
+        strategy.counts["OTHER"] = 7
+        executor = StrategyExecutor({"counting": "process"}, {"counting": None}, process_workers=1)
+        try:
+            first = run(executor.check("counting", strategy, "BTCUSDT"))
+            second = run(executor.check("counting", strategy, "BTCUSDT"))
+        finally:
+            executor.close()
+
+        assert first["count"] == 1 and first["pid"] != os.getpid()
+        assert second is None  # the worker saw the cooldown the parent marked after the first signal
+        assert strategy.counts == {"BTCUSDT": 2, "OTHER": 7}
+        assert strategy._is_duplicate("BTCUSDT", "buy")
@@ -0,0 +1,132 @@
+"""
+Tests for the lazy strategy registry, the config.json strategy list and start-up import attribution.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from backend.app.strategies import registry
+from backend.app.strategies.base import StrategyBase
+from config.settings import SignalGeneratorConfig
+from services.import_profile import parse_importtime, summarize
+
+ROOT_DIR = str(Path(__file__).resolve().parents[2])
+
+
+def run_isolated(code):
+    """Run `code` in a fresh interpreter (sys.modules of this one already has everything)."""
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR, capture_output=True, text=True, timeout=120)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+class TestRegistry:
+    def test_defaults_cover_the_generator_strategies(self):
+        assert registry.resolve_names() == registry.DEFAULT_STRATEGIES
+        assert "arbitrage" in registry.STRATEGY_ENTRY_POINTS and "arbitrage" not in registry.DEFAULT_STRATEGIES
+        assert len(registry.DEFAULT_STRATEGIES) == 17
+
+    def test_names_come_back_in_registry_order(self):
+        assert registry.resolve_names(["momentum", "vwap", "trend_following"]) == ["vwap", "trend_following", "momentum"]
+
+    def test_unknown_names_are_rejected(self):
+        with pytest.raises(ValueError, match="momentun"):
+            registry.resolve_names(["vwap", "momentun"])
+        with pytest.raises(ValueError):
+            registry.load_strategy_class("nope")
+
+    def test_every_entry_point_resolves_to_a_strategy(self):
+        for name in registry.STRATEGY_ENTRY_POINTS:
+            assert issubclass(registry.load_strategy_class(name), StrategyBase), name
+
+    def test_register_strategy(self, monkeypatch):
+        monkeypatch.setattr(registry, "STRATEGY_ENTRY_POINTS", dict(registry.STRATEGY_ENTRY_POINTS))
+        registry.register_strategy("momentum_copy", "backend.app.strategies.momentum:MomentumStrategy")
+        strategies = registry.create_strategies(["momentum_copy"])
+        assert type(strategies["momentum_copy"]).__name__ == "MomentumStrategy"
+        with pytest.raises(ValueError):
+            registry.register_strategy("broken", "backend.app.strategies.momentum")
+
+    def test_only_enabled_strategies_are_imported(self):
+        loaded = run_isolated(
+            "import json, sys\n"
+            "from backend.app.strategies.registry import create_strategies\n"
+            "strategies = create_strategies(['vwap', 'order_blocks'])\n"
+            "print(json.dumps(sorted(m for m in sys.modules if m.startswith('backend.app.strategies.')"
+            " or m in ('pandas', 'praw', 'backend.app.services.external_signals'))))"
+        )
+        assert "backend.app.strategies.vwap_strategy" in loaded
+        assert "backend.app.strategies.order_blocks" in loaded
+        assert "backend.app.strategies.social_copy" not in loaded
+        assert "backend.app.strategies.trend_following" not in loaded
+        assert "backend.app.services.external_signals" not in loaded
+        assert "pandas" not in loaded
+
+
+class TestLazyPackage:
+    def test_exports_resolve_on_access(self):
+        import backend.app.strategies as strategies
+
+        assert strategies.MomentumStrategy is registry.load_strategy_class("momentum")
+        assert set(strategies.__all__) >= {"StrategyBase", "VWAPStrategy", "ArbitrageStrategy"}
+        with pytest.raises(AttributeError):
+            strategies.NoSuchStrategy
+
+    def test_importing_one_strategy_does_not_import_the_rest(self):
+        loaded = run_isolated(
+            "import json, sys\n"
+            "from backend.app.strategies.trend_following import TrendFollowingStrategy\n"
+            "TrendFollowingStrategy()\n"
+            "print(json.dumps(sorted(m for m in sys.modules if m.startswith('backend.app.strategies.') or m == 'pandas')))"
+        )
+        assert "backend.app.strategies.social_copy" not in loaded
+        assert "backend.app.strategies.vwap_strategy" not in loaded
+        assert "pandas" not in loaded  # only the DataFrame reference path needs it
+
+
+class TestConfig:
+    def test_strategy_list_is_read_from_config_json(self, tmp_path, monkeypatch):
+        (tmp_path / "config.json").write_text(json.dumps({"strategies": ["vwap", "momentum"]}))
+        monkeypatch.chdir(tmp_path)
+        assert SignalGeneratorConfig().ENABLED_STRATEGIES == ["vwap", "momentum"]
+
+    def test_missing_list_means_registry_defaults(self, tmp_path, monkeypatch):
+        (tmp_path / "config.json").write_text(json.dumps({"assets": ["BTCUSDT"]}))
+        monkeypatch.chdir(tmp_path)
+        assert SignalGeneratorConfig().ENABLED_STRATEGIES is None
+
+    def test_generator_loads_a_single_module_tree(self):
+        loaded = run_isolated(
+            "import json, sys\n"
+            "import signal_generator\n"
+            "print(json.dumps(sorted(m for m in sys.modules if m == 'app' or m.startswith('app.'))))"
+        )
+        assert loaded == []  # everything through backend.app.*, nothing executed twice
+
+
+class TestImportProfile:
+    STDERR = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     json.decoder\n"
+        "import time:       300 |        420 |   json\n"
+        "some other warning\n"
+        "import time:      1000 |       1000 |   pandas.core\n"
+        "import time:       500 |       1920 | signal_generator\n"
+    )
+
+    def test_parse_importtime(self):
+        records = parse_importtime(self.STDERR)
+        assert [r.module for r in records] == ["json.decoder", "json", "pandas.core", "signal_generator"]
+        assert [r.depth for r in records] == [2, 1, 1, 0]
+        assert records[-1].cumulative_us == 1920
+
+    def test_summarize_attributes_self_time_to_packages(self):
+        summary = summarize(parse_importtime(self.STDERR))
+        assert summary["import_seconds"] == pytest.approx(0.00192)
+        assert summary["slowest"][0]["module"] == "signal_generator"
+        assert summary["packages"][0] == {"package": "pandas", "self_ms": 1.0}
+        assert {row["package"]: row["self_ms"] for row in summary["packages"]}["json"] == pytest.approx(0.42)
@@ -0,0 +1,227 @@
+"""
+Parity tests for the incrementally maintained multi-timeframe bars and streaming indicators
+against the pandas path of TrendFollowingStrategy / VolatilityBreakoutStrategy.
+"""
+
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from backend.app.strategies.timeframes import (
+    CandleStream,
+    StreamingADX,
+    StreamingATR,
+    StreamingEMA,
+    TimeframeBars,
+)
+from backend.app.strategies.trend_following import TrendFollowingStrategy
+from backend.app.strategies.volatility_breakout import VolatilityBreakoutStrategy
+
+AGG = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+
+
+def recorded_ticks(n, seed=3, vol=0.003, trend=0.0):
+    """About one tick a minute with irregular seconds, skipped minutes and an overnight gap."""
+    rng = random.Random(seed)
+    price = 100.0
+    ts = datetime(2024, 1, 1, 0, 0, 17)
+    ticks = []
+    for t in range(n):
+        ts += timedelta(seconds=rng.choice([20, 45, 60, 60, 60, 130]))
+        if t == n // 2:
+            ts += timedelta(hours=3)  # empty bins are dropped, like dropna()
+        close = price * (1.0 + trend + rng.gauss(0.0, vol))
+        ticks.append({
+            "timestamp": ts,
+            "open": price,
+            "high": max(price, close) * (1.0 + abs(rng.gauss(0.0, vol / 2))),
+            "low": min(price, close) * (1.0 - abs(rng.gauss(0.0, vol / 2))),
+            "close": close,
+            "volume": rng.uniform(1.0, 100.0),
+        })
+        price = close
+    return ticks
+
+
+def resample(ticks, rule):
+    return pd.DataFrame(ticks).set_index("timestamp").resample(rule).agg(AGG).dropna()
+
+
+def frame_of(bars):
+    return pd.DataFrame(bars).set_index("timestamp")
+
+
+def assert_close(result, expected):
+    assert result.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, float):
+            assert result[key] == pytest.approx(value, rel=1e-9, abs=1e-12), key
+        else:
+            assert result[key] == value, key
+
+
+class TestBars:
+    @pytest.mark.parametrize("minutes, rule", [(5, "5min"), (15, "15min"), (60, "1h")])
+    def test_bars_match_resample(self, minutes, rule):
+        ticks = recorded_ticks(2000)
+        bars = TimeframeBars(minutes)
+        for tick in ticks:
+            bars.add(tick)
+        expected = resample(ticks, rule)
+        result = frame_of(bars.bars())
+        pd.testing.assert_index_equal(result.index, expected.index, check_names=False)
+        for column in AGG:
+            assert result[column].tolist() == pytest.approx(expected[column].tolist(), rel=1e-12)
+        assert bars.tail(3) == bars.bars()[-3:]
+
+    def test_window_bounds_closed_bars(self):
+        bars = TimeframeBars(5, window=timedelta(hours=2))
+        for tick in recorded_ticks(1500):
+            bars.add(tick)
+        assert bars.forming["timestamp"] - bars.closed[0]["timestamp"] <= timedelta(hours=2)
+        assert len(bars) <= 2 * 12 + 2
+
+    def test_stream_ignores_replayed_candles(self):
+        stream = CandleStream({"5m": TimeframeBars(5)})
+        ticks = recorded_ticks(300)
+        assert stream.extend(ticks) == 300
+        bars = stream.frames["5m"].bars()
+        assert stream.extend(ticks) == 0  # the signal generator re-feeds its whole window
+        assert stream.version == 300 and stream.frames["5m"].bars() == bars
+
+    def test_late_and_same_time_candles_merge_into_the_forming_bar(self):
+        stream = CandleStream({"1m": TimeframeBars(1), "5m": TimeframeBars(5)})
+
+        def tick(seconds, price, volume=1.0):
+            return {"timestamp": datetime(2024, 1, 1) + timedelta(seconds=seconds),
+                    "open": price, "high": price, "low": price, "close": price, "volume": volume}
+
+        stream.extend([tick(10, 100.0), tick(70, 101.0), tick(90, 102.0)])
+        assert stream.add(tick(90, 99.0, 2.0))  # same time, second source
+        assert stream.add(tick(65, 105.0))  # late, inside the forming bars
+        assert not stream.add(tick(30, 90.0))  # belongs to the closed 00:00 1m bar
+        assert not stream.add(tick(65, 105.0))  # replayed
+        one, five = stream.frames["1m"].forming, stream.frames["5m"].forming
+        assert (one["open"], one["high"], one["low"], one["close"], one["volume"]) == (101.0, 105.0, 99.0, 99.0, 5.0)
+        assert (five["high"], five["low"], five["close"], five["volume"]) == (105.0, 99.0, 99.0, 6.0)
+        assert stream.version == 5 and stream.last_timestamp == tick(90, 0.0)["timestamp"]
+
+
+class TestIndicators:
+    def test_streaming_indicators_match_pandas(self):
+        trend = TrendFollowingStrategy()
+        breakout = VolatilityBreakoutStrategy()
+        ticks = recorded_ticks(3000, seed=5)
+        bars = TimeframeBars(5, indicators={
+            "ema": StreamingEMA(12), "adx": StreamingADX(14), "atr": StreamingATR(14)})
+        for t, tick in enumerate(ticks):
+            bars.add(tick)
+            if t % 97 and t != len(ticks) - 1:
+                continue
+            df = frame_of(bars.bars())
+            ema = trend.calculate_ema(df["close"], 12)
+            adx = trend.calculate_adx(df, 14)
+            atr = breakout.calculate_atr(df, 14)
+            assert bars.latest("ema") == pytest.approx(ema.iloc[-1], rel=1e-12)
+            if len(df) > 1:
+                assert bars.previous("ema") == pytest.approx(ema.iloc[-2], rel=1e-12)
+            for name, series in (("adx", adx), ("atr", atr)):
+                if pd.isna(series.iloc[-1]):
+                    assert bars.latest(name) is None
+                else:
+                    assert bars.latest(name) == pytest.approx(series.iloc[-1], rel=1e-9)
+
+    def test_adx_is_aligned_with_the_frame_index(self):
+        df = resample(recorded_ticks(1000), "5min")
+        adx = TrendFollowingStrategy().calculate_adx(df, 14)
+        assert len(adx) == len(df) and adx.index.equals(df.index)
+        assert adx.iloc[-1] >= 0
+
+
+class TestStrategies:
+    def test_trend_following_stream_matches_dataframe_path(self):
+        strategy = TrendFollowingStrategy(fast_ema=5, slow_ema=10, adx_threshold=15.0)
+        ticks = recorded_ticks(2400, seed=11, vol=0.004)
+        seen = set()
+        for t, tick in enumerate(ticks):
+            strategy.update_data("BTCUSDT", tick)
+            if t % 41:
+                continue
+            analyses = strategy.analyze_stream("BTCUSDT")
+            df_5m = resample(ticks[:t + 1], "5min")
+            assert_close(analyses["5m"], strategy.analyze_timeframe(df_5m))
+            for tf, rule in (("15m", "15min"), ("1h", "1h")):
+                df = df_5m.resample(rule).agg(AGG).dropna()
+                expected = strategy.analyze_timeframe(df) if len(df) >= 20 else {"signal": "hold", "confidence": 0.0}
+                assert_close(analyses[tf], expected)
+            seen.update(a["signal"] for a in analyses.values())
+        assert {"buy", "sell"} & seen  # the ADX filter lets crossovers through
+
+    def test_volatility_breakout_stream_matches_dataframe_path(self):
+        strategy = VolatilityBreakoutStrategy(breakout_multiplier=0.5)
+        ticks = recorded_ticks(3000, seed=2, vol=0.004)
+        seen = set()
+        for t, tick in enumerate(ticks):
+            strategy.update_data("ETHUSDT", tick)
+            if t % 23:
+                continue
+            metrics, breakout = strategy.analyze_stream("ETHUSDT")
+            df = resample(ticks[:t + 1], "15min")
+            expected_metrics = strategy.calculate_volatility_metrics(df)
+            assert_close(metrics, expected_metrics)
+            assert_close(breakout, strategy.detect_breakout(df, expected_metrics["atr"]))
+            seen.add(breakout["signal"])
+        assert {"buy", "sell"} & seen
+
+    def test_generate_signal_reads_stream_without_database(self):
+        strategy = TrendFollowingStrategy()
+
+        async def no_database(*_args, **_kwargs):
+            raise AssertionError("fed symbols must not hit the database")
+
+        strategy.get_historical_data = no_database
+        for tick in recorded_ticks(600):
+            strategy.update_data("SOLUSDT", tick)
+        loop = asyncio.new_event_loop()
+        try:
+            signal = loop.run_until_complete(strategy.generate_signal(None, "SOLUSDT"))
+            assert signal["action"] in ("buy", "sell", "hold") and "reason" not in signal
+            analyses = strategy.analyze_stream("SOLUSDT")
+            assert strategy.analyze_stream("SOLUSDT") is analyses  # no new candle: cached
+        finally:
+            loop.close()
+
+    def test_cold_symbol_is_seeded_from_historical_data(self):
+        strategy = VolatilityBreakoutStrategy()
+        frame = resample(recorded_ticks(2000, seed=4), "5min")
+
+        async def historical_data(*_args, **_kwargs):
+            return frame
+
+        strategy.get_historical_data = historical_data
+        loop = asyncio.new_event_loop()
+        try:
+            signal = loop.run_until_complete(strategy.generate_signal(None, "BTCUSDT"))
+        finally:
+            loop.close()
+        assert signal.get("reason") != "insufficient_data"
+        bars = strategy._streams["BTCUSDT"].frames["15m"]
+        assert len(bars) == len(frame.resample("15min").agg(AGG).dropna())
+
+    @pytest.mark.parametrize("strategy_class", [TrendFollowingStrategy, VolatilityBreakoutStrategy])
+    def test_symbol_without_ticks_has_insufficient_data(self, strategy_class):
+        strategy = strategy_class()
+
+        async def historical_data(*_args, **_kwargs):
+            return pd.DataFrame()
+
+        strategy.get_historical_data = historical_data
+        loop = asyncio.new_event_loop()
+        try:
+            signal = loop.run_until_complete(strategy.generate_signal(None, "BTCUSDT"))
+        finally:
+            loop.close()
+        assert signal["action"] == "hold" and signal["reason"] == "insufficient_data"
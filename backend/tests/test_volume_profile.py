@@ -0,0 +1,117 @@
+"""
+Parity tests for VolumeProfileStrategy's incremental, array-backed volume histogram.
+"""
+
+import random
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app.strategies.volume_profile import VolumeHistogram, VolumeProfileStrategy
+
+
+def reference_profile(history, period=50, num_buckets=20):
+    """The original dict-based rebuild."""
+    if len(history) < period:
+        return {}
+    recent = history[-period:]
+    prices = [c.get("close", 0.0) for c in recent if c.get("close", 0.0) > 0]
+    if not prices:
+        return {}
+    min_price, max_price = min(prices), max(prices)
+    if max_price == min_price:
+        return {}
+    bucket_size = (max_price - min_price) / num_buckets
+    profile = defaultdict(float)
+    for candle in recent:
+        high, low, volume = candle.get("high", 0.0), candle.get("low", 0.0), candle.get("volume", 0.0)
+        if high == 0 or low == 0:
+            continue
+        if high - low == 0:
+            bucket = max(0, min(num_buckets - 1, int((high - min_price) / bucket_size)))
+            profile[min_price + bucket * bucket_size] += volume
+            continue
+        touched = set()
+        for price in [low, high, candle.get("open", 0.0), candle.get("close", 0.0)]:
+            if min_price <= price <= max_price:
+                touched.add(max(0, min(num_buckets - 1, int((price - min_price) / bucket_size))))
+        for bucket in touched:
+            profile[min_price + bucket * bucket_size] += volume / len(touched)
+    return dict(profile)
+
+
+def assert_same_profile(profile, expected):
+    assert list(profile) == sorted(profile)
+    assert set(profile) == set(expected)  # identical float price levels
+    for level, volume in expected.items():
+        assert profile[level] == pytest.approx(volume, rel=1e-9, abs=1e-9)
+
+
+def recorded_candles(n, seed=6, vol=0.006):
+    rng = random.Random(seed)
+    price = 100.0
+    candles = []
+    for t in range(n):
+        close = price * (1.0 + rng.gauss(0.0, vol))
+        candle = {
+            "timestamp": datetime(2024, 1, 1) + timedelta(minutes=t),
+            "open": price,
+            "high": max(price, close) * (1.0 + abs(rng.gauss(0.0, vol / 2))),
+            "low": min(price, close) * (1.0 - abs(rng.gauss(0.0, vol / 2))),
+            "close": close,
+            "volume": rng.choice([0.0, 1.0, 3.0, rng.uniform(1.0, 1e4)]),
+        }
+        if rng.random() < 0.03:
+            candle["high"] = candle["low"] = candle["open"] = candle["close"]  # zero-range candle
+        if rng.random() < 0.01:
+            candle["low"] = 0.0  # skipped like the original
+        candles.append(candle)
+        price = close
+    return candles
+
+
+class TestProfileParity:
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_full_build_matches_reference(self, seed):
+        history = recorded_candles(200, seed=seed)
+        strategy = VolumeProfileStrategy()
+        assert_same_profile(strategy._calculate_volume_profile(history), reference_profile(history))
+        assert strategy._calculate_volume_profile(history[:49]) == {}
+
+    @pytest.mark.parametrize("maxlen", [200, 60])
+    def test_incremental_matches_reference_while_streaming(self, maxlen):
+        strategy = VolumeProfileStrategy()
+        symbol = "BTCUSDT"
+        strategy.price_history[symbol] = deque(maxlen=maxlen)
+        for t, candle in enumerate(recorded_candles(3000, seed=4)):
+            strategy.update_data(symbol, candle)
+            if t % 5 == 3:
+                continue  # several candles arrive between hook calls
+            history = list(strategy.price_history[symbol])
+            assert_same_profile(strategy._volume_profile(symbol, history), reference_profile(history))
+
+    def test_rebins_only_when_range_changes(self):
+        histogram = VolumeHistogram(50)
+        candles = recorded_candles(400, seed=2)
+        rebins = 0
+        for candle in candles:
+            histogram.add(candle)
+            before = histogram._range
+            histogram.profile()
+            rebins += histogram._range != before
+        assert 0 < rebins < len(candles) // 3
+
+    def test_replaced_history_rebuilds(self):
+        strategy = VolumeProfileStrategy()
+        first, second = recorded_candles(120, seed=1), recorded_candles(120, seed=2)
+        strategy._volume_profile("ETHUSDT", first)
+        assert_same_profile(strategy._volume_profile("ETHUSDT", second), reference_profile(second))
+
+    def test_signals_are_built_from_cached_profile(self):
+        strategy = VolumeProfileStrategy()
+        for candle in recorded_candles(1500, seed=3):
+            strategy.update_data("SOLUSDT", candle)
+            if strategy._confirm_completion("SOLUSDT"):
+                signal = strategy._build_signal("SOLUSDT")
+                assert signal["action"] in ("buy", "sell")
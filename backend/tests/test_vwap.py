@@ -0,0 +1,117 @@
+"""
+Tests for VWAPStrategy's running-sum VWAP (parity with the original loop) and session mode.
+"""
+
+import random
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from statistics import mean
+
+import pytest
+
+from backend.app.strategies.vwap_strategy import VWAPAccumulator, VWAPStrategy, session_day
+
+
+def reference_vwap(history, period=20):
+    """The original loop over the last `period` candles."""
+    if not history:
+        return 0.0
+    recent = history[-period:]
+    total_price_volume = sum((c.get("high", 0.0) + c.get("low", 0.0) + c.get("close", 0.0)) / 3.0
+                             * c.get("volume", 0.0) for c in recent)
+    total_volume = sum(c.get("volume", 0.0) for c in recent)
+    if total_volume == 0:
+        return mean(c.get("close", 0.0) for c in recent)
+    return total_price_volume / total_volume
+
+
+def recorded_candles(n, seed=5, vol=0.004, minutes=1):
+    rng = random.Random(seed)
+    price = 100.0
+    candles = []
+    for t in range(n):
+        close = price * (1.0 + rng.gauss(0.0, vol))
+        candles.append({
+            "timestamp": datetime(2024, 1, 1) + timedelta(minutes=minutes * t),
+            "open": price,
+            "high": max(price, close) * (1.0 + abs(rng.gauss(0.0, vol / 2))),
+            "low": min(price, close) * (1.0 - abs(rng.gauss(0.0, vol / 2))),
+            "close": close,
+            "volume": 0.0 if rng.random() < 0.1 else rng.uniform(1.0, 1e4),
+        })
+        price = close
+    return candles
+
+
+class TestRollingParity:
+    def test_incremental_matches_reference_while_streaming(self):
+        strategy = VWAPStrategy()
+        symbol = "BTCUSDT"
+        for t, candle in enumerate(recorded_candles(3000)):
+            strategy.update_data(symbol, candle)
+            if t % 6 == 4:
+                continue  # several candles arrive between hook calls
+            history = list(strategy.price_history[symbol])
+            assert strategy._vwap(symbol, history) == pytest.approx(reference_vwap(history), rel=1e-12)
+
+    def test_zero_volume_window_falls_back_to_mean_close(self):
+        candles = [dict(c, volume=0.0) for c in recorded_candles(30)]
+        assert VWAPStrategy()._calculate_vwap(candles) == pytest.approx(mean(c["close"] for c in candles[-20:]))
+
+    def test_replaced_history_rebuilds_sums(self):
+        strategy = VWAPStrategy()
+        first, second = recorded_candles(100, seed=1), recorded_candles(100, seed=2)
+        strategy._vwap("ETHUSDT", first)
+        assert strategy._vwap("ETHUSDT", second) == pytest.approx(reference_vwap(second), rel=1e-12)
+
+    def test_hooks_agree_with_reference_vwap(self):
+        strategy = VWAPStrategy()
+        reference = VWAPStrategy()
+        reference._vwap = lambda symbol, history: reference_vwap(history)
+        for candle in recorded_candles(800, seed=8):
+            for s in (strategy, reference):
+                s.update_data("SOLUSDT", candle)
+            assert strategy._detect_pattern("SOLUSDT") == reference._detect_pattern("SOLUSDT")
+            assert strategy._confirm_completion("SOLUSDT") == reference._confirm_completion("SOLUSDT")
+            assert strategy._get_action_from_pattern("SOLUSDT") == reference._get_action_from_pattern("SOLUSDT")
+
+
+class TestSessionVWAP:
+    def test_resets_at_utc_day_and_outlives_the_history_window(self):
+        strategy = VWAPStrategy()
+        strategy.vwap_mode = "session"
+        symbol = "BTCUSDT"
+        strategy.price_history[symbol] = deque(maxlen=50)
+        candles = recorded_candles(60 * 30, minutes=2)  # 2.5 days of 2m bars
+        for t, candle in enumerate(candles):
+            strategy.update_data(symbol, candle)
+            if t % 3:
+                continue
+            day = candle["timestamp"].date()
+            session = [c for c in candles[:t + 1] if c["timestamp"].date() == day]
+            expected = reference_vwap(session, period=len(session))
+            assert strategy._vwap(symbol, list(strategy.price_history[symbol])) == pytest.approx(expected, rel=1e-9)
+
+    def test_switching_mode_rebuilds(self):
+        strategy = VWAPStrategy()
+        history = recorded_candles(100)
+        strategy._vwap("ETHUSDT", history)
+        strategy.vwap_mode = "session"
+        assert strategy._vwap("ETHUSDT", history) == pytest.approx(reference_vwap(history, period=100), rel=1e-12)
+
+    def test_session_day_formats(self):
+        day = datetime(2024, 3, 5).date()
+        assert session_day(datetime(2024, 3, 5, 23, 59)) == day
+        assert session_day(datetime(2024, 3, 6, 1, 0, tzinfo=timezone(timedelta(hours=3)))) == day
+        assert session_day(datetime(2024, 3, 5, 12, tzinfo=timezone.utc).timestamp() * 1000) == day
+        assert session_day("2024-03-05T12:00:00Z") == day
+        assert session_day("not a date") is None
+
+    def test_accumulator_resync_keeps_window(self):
+        accumulator = VWAPAccumulator(period=20)
+        accumulator.RESYNC_EVERY = 7
+        candles = recorded_candles(200)
+        for candle in candles:
+            accumulator.add(candle)
+        assert accumulator.count == 20
+        assert accumulator.value() == pytest.approx(reference_vwap(candles), rel=1e-12)
@@ -0,0 +1,127 @@
+"""
+Tests for the walk-forward harness and the on-disk feature cache.
+"""
+
+import math
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from backend.app.services.backtest.walk_forward import (
+    FeatureCache,
+    WalkForwardStrategy,
+    compute_features,
+    run_walk_forward,
+    suggest_strategy_weights,
+    walk_forward_splits,
+)
+
+
+def make_candles(n: int, seed: int, drift: float = 0.0):
+    rng = random.Random(seed)
+    price, candles = 100.0, []
+    start = datetime(2024, 1, 1)
+    for i in range(n):
+        price *= 1 + drift + 0.004 * math.sin(i / 25) + rng.gauss(0, 0.002)
+        candles.append({
+            "timestamp": start + timedelta(minutes=i),
+            "open": price, "high": price * 1.002, "low": price * 0.998,
+            "close": price, "volume": rng.uniform(100, 1000),
+        })
+    return candles
+
+
+def ema_cross_factory(params):
+    def signals(features):
+        fast = features[f"sma_{params['fast']}"]
+        slow = features["sma_50"]
+        above = np.nan_to_num(fast - slow) > 0
+        prev = np.concatenate(([False], above[:-1]))
+        return above & ~prev, ~above & prev
+    return signals
+
+
+def rsi_factory(params):
+    def signals(features):
+        rsi = features["rsi_14"]
+        return rsi < params["oversold"], rsi > params["overbought"]
+    return signals
+
+
+STRATEGIES = [
+    WalkForwardStrategy("sma_cross", ema_cross_factory, {"fast": [10, 20]}),
+    WalkForwardStrategy("rsi_reversion", rsi_factory, {"oversold": [25, 30], "overbought": [70, 75]}),
+]
+
+
+class TestSplits:
+    def test_rolling_windows_tile_history(self):
+        splits = list(walk_forward_splits(1000, train_bars=400, test_bars=200))
+        assert [(tr.start, tr.stop, te.start, te.stop) for tr, te in splits] == [
+            (0, 400, 400, 600), (200, 600, 600, 800), (400, 800, 800, 1000),
+        ]
+
+    def test_anchored_windows_grow(self):
+        splits = list(walk_forward_splits(1000, train_bars=400, test_bars=300, anchored=True))
+        assert [(tr.start, tr.stop) for tr, _ in splits] == [(0, 400), (0, 700)]
+
+
+class TestFeatureCache:
+    def test_cache_hit_is_memory_mapped_and_identical(self, tmp_path):
+        candles = make_candles(500, seed=1)
+        cache = FeatureCache(str(tmp_path))
+        first = cache.get("BTCUSDT", "1m", candles)
+        second = FeatureCache(str(tmp_path)).get("BTCUSDT", "1m", candles)
+
+        assert cache.misses == 1
+        assert isinstance(second.data, np.memmap)
+        np.testing.assert_array_equal(np.asarray(first.data), np.asarray(second.data))
+
+    def test_changed_data_recomputes(self, tmp_path):
+        cache = FeatureCache(str(tmp_path))
+        cache.get("BTCUSDT", "1m", make_candles(500, seed=1))
+        cache.get("BTCUSDT", "1m", make_candles(501, seed=1))
+        cache.get("BTCUSDT", "1m", make_candles(501, seed=1))
+        assert (cache.misses, cache.hits) == (2, 1)
+
+    def test_features_are_causal(self):
+        candles = make_candles(300, seed=2)
+        columns, full = compute_features(candles)
+        _, prefix = compute_features(candles[:200])
+        np.testing.assert_allclose(full[:, :200], prefix, equal_nan=True)
+
+
+class TestWalkForward:
+    def test_out_of_sample_report_and_weights(self, tmp_path):
+        candles = {"AAAUSDT": make_candles(3000, seed=3), "BBBUSDT": make_candles(3000, seed=4, drift=0.0002)}
+        report = run_walk_forward(candles, STRATEGIES, train_bars=1000, test_bars=500, cache_dir=str(tmp_path))
+
+        assert set(report["strategies"]) == {"sma_cross", "rsi_reversion"}
+        for summary in report["strategies"].values():
+            assert summary["folds"] == 2 * 4
+            assert 0.0 <= summary["oos_hit_rate"] <= 1.0
+        for run in report["runs"]:
+            for fold in run["folds"]:
+                assert fold["test"][0] == fold["train"][1]
+
+        weights = suggest_strategy_weights(report["strategies"])
+        assert set(weights) == {"sma_cross", "rsi_reversion"}
+        assert all(0.5 <= w <= 3.0 for w in weights.values())
+
+    def test_parallel_matches_inline(self, tmp_path):
+        candles = {"AAAUSDT": make_candles(2000, seed=5), "BBBUSDT": make_candles(2000, seed=6)}
+        kwargs = dict(train_bars=800, test_bars=400, cache_dir=str(tmp_path))
+        inline = run_walk_forward(candles, STRATEGIES, workers=1, **kwargs)
+        parallel = run_walk_forward(candles, STRATEGIES, workers=2, **kwargs)
+        assert parallel == inline
+
+
+def test_weights_scale_with_sharpe():
+    summary = {
+        "good": {"oos_sharpe": 2.0, "oos_trades": 10},
+        "ok": {"oos_sharpe": 1.0, "oos_trades": 10},
+        "bad": {"oos_sharpe": -0.5, "oos_trades": 10},
+        "idle": {"oos_sharpe": 3.0, "oos_trades": 0},
+    }
+    assert suggest_strategy_weights(summary) == {"good": 3.0, "ok": 1.75, "bad": 0.5, "idle": 0.5}
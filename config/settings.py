@@ -43,9 +43,53 @@ class SignalGeneratorConfig:
         # Polling Configuration
         self.POLLING_INTERVAL: int = int(os.getenv("POLLING_INTERVAL", "60"))  # seconds
         
+        # Signal cooldown persistence (SQLite/Postgres URL, empty string disables)
+        self.COOLDOWN_DB_URL: str = os.getenv("COOLDOWN_DB_URL", "sqlite:///state/signal_cooldowns.db")
+        
+        # Live quote cache TTL in seconds (see services/live_price_cache.py)
+        self.LIVE_PRICE_TTL_SECONDS: float = float(os.getenv("LIVE_PRICE_TTL_SECONDS", "5.0"))
+        
+        # Prometheus /metrics for the standalone process (port 0 disables; bound to localhost
+        # unless METRICS_ADDR says otherwise)
+        self.METRICS_PORT: int = int(os.getenv("METRICS_PORT", "9108"))
+        self.METRICS_ADDR: str = os.getenv("METRICS_ADDR", "127.0.0.1")
+        
+        # Opt-in cycle profiling (writes to logs/profiles/)
+        self.PROFILE_CYCLES: bool = os.getenv("PROFILE_CYCLES", "false").lower() in ("1", "true", "yes")
+        self.PROFILE_EVERY_N: int = int(os.getenv("PROFILE_EVERY_N", "10"))  # 0 = threshold only
+        self.PROFILE_THRESHOLD_SECONDS: float = float(os.getenv("PROFILE_THRESHOLD_SECONDS", "5.0"))  # 0 = every-N only
+        self.PROFILE_MODE: str = os.getenv("PROFILE_MODE", "sample")  # sample, cprofile
+        self.PROFILE_TOP_K: int = int(os.getenv("PROFILE_TOP_K", "15"))
+        
+        # Event-driven evaluation: a symbol is evaluated when a new candle for it closes (collector
+        # poll or Binance WebSocket 1m candle) instead of every symbol every POLLING_INTERVAL
+        self.EVENT_DRIVEN: bool = os.getenv("EVENT_DRIVEN", "false").lower() in ("1", "true", "yes")
+        self.EVENT_COALESCE_SECONDS: float = float(os.getenv("EVENT_COALESCE_SECONDS", "0.25"))
+        self.EVENT_WS_CANDLES: bool = os.getenv("EVENT_WS_CANDLES", "true").lower() in ("1", "true", "yes")
+        
+        # Strategy evaluation in N worker processes, assets partitioned by consistent hashing (0/1 = in-process)
+        self.SHARD_WORKERS: int = int(os.getenv("SHARD_WORKERS", "0"))
+        
+        # Strategy warm-state snapshots restored on restart (empty path disables)
+        self.STATE_SNAPSHOT_PATH: str = os.getenv("STATE_SNAPSHOT_PATH", "state/strategy_state.snap")
+        self.STATE_SNAPSHOT_INTERVAL: int = int(os.getenv("STATE_SNAPSHOT_INTERVAL", "300"))  # seconds
+        self.STATE_SNAPSHOT_MAX_AGE_HOURS: float = float(os.getenv("STATE_SNAPSHOT_MAX_AGE_HOURS", "24"))  # older = start cold
+        
+        # Strategy execution: evaluation seconds per strategy per cycle (0 = unlimited) and the pools
+        # used by strategies whose execution policy is "thread" or "process"
+        self.STRATEGY_TIMEOUT_SECONDS: float = float(os.getenv("STRATEGY_TIMEOUT_SECONDS", "30"))
+        self.STRATEGY_THREAD_WORKERS: int = int(os.getenv("STRATEGY_THREAD_WORKERS", "4"))
+        self.STRATEGY_PROCESS_WORKERS: int = int(os.getenv("STRATEGY_PROCESS_WORKERS", "2"))
+        # Event-loop lag probe interval in seconds (0 disables)
+        self.EVENT_LOOP_LAG_INTERVAL: float = float(os.getenv("EVENT_LOOP_LAG_INTERVAL", "0.5"))
+        
         # Strategy Sensitivity (from config.json)
         self.STRATEGY_SETTINGS: dict = {}
         
+        # Strategies to load (config.json "strategies"); None = the registry defaults.
+        # Strategies not listed are never imported.
+        self.ENABLED_STRATEGIES: Optional[List[str]] = None
+        
         # Load config.json
         self._load_config_json()
     
@@ -85,6 +129,10 @@ class SignalGeneratorConfig:
                 if "strategy_sensitivity" in config_data:
                     self.STRATEGY_SETTINGS = config_data["strategy_sensitivity"]
                 
+                # Load the enabled strategy list
+                if "strategies" in config_data:
+                    self.ENABLED_STRATEGIES = config_data["strategies"]
+                
                 # Override polling interval if specified
                 if "polling_interval" in config_data:
                     self.POLLING_INTERVAL = config_data["polling_interval"]
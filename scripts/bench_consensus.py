@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Synthetic benchmark: consensus lookups over one signal cycle.
+
+Replays N synthetic signals through the legacy per-signal list scan and through
+the per-cycle ConsensusIndex, checks that both produce the same consensus
+numbers and prints timings.
+
+Usage:
+    python scripts/bench_consensus.py --signals 10000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.signal_consensus import ConsensusIndex
+
+STRATEGY_WEIGHTS = {
+    "vwap": 3.0, "liquidity_zones": 2.8, "order_blocks": 2.7, "fair_value_gaps": 2.6,
+    "market_structure": 2.5, "support_resistance": 2.4, "volume_profile": 2.3,
+    "rsi_macd_momentum": 1.5, "volume_breakout": 1.3, "trend_following": 1.2,
+    "momentum": 1.1, "breakout": 1.0, "mean_reversion": 0.9, "volatility_breakout": 0.9,
+    "sentiment": 0.7, "social_copy": 0.6,
+}
+MIN_CONFIDENCE = 0.45
+
+
+def make_signals(n: int, n_symbols: int, seed: int):
+    rng = random.Random(seed)
+    symbols = [f"SYM{i:03d}USDT" for i in range(n_symbols)]
+    strategies = list(STRATEGY_WEIGHTS)
+    return [
+        {
+            "strategy": rng.choice(strategies),
+            "symbol": rng.choice(symbols),
+            "action": rng.choice(["buy", "sell"]),
+            "confidence": rng.uniform(0.2, 0.95),
+        }
+        for _ in range(n)
+    ]
+
+
+def legacy_scan(all_signals, signal):
+    agreeing = [
+        s for s in all_signals
+        if s["symbol"] == signal["symbol"] and s["action"] == signal["action"]
+        and s["confidence"] >= MIN_CONFIDENCE
+    ]
+    weighted = 0.0
+    for s in agreeing:
+        weighted += s["confidence"] * STRATEGY_WEIGHTS.get(s["strategy"], 1.0)
+    return len(agreeing), weighted
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--signals", type=int, default=10_000)
+    parser.add_argument("--symbols", type=int, default=30)
+    parser.add_argument("--legacy-sample", type=int, default=1_000,
+                        help="Time the legacy scan on this many signals and extrapolate (0 = all)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    signals = make_signals(args.signals, args.symbols, args.seed)
+
+    start = time.perf_counter()
+    index = ConsensusIndex(signals, STRATEGY_WEIGHTS, MIN_CONFIDENCE)
+    indexed = [index.lookup(s["symbol"], s["action"]) for s in signals]
+    indexed_seconds = time.perf_counter() - start
+
+    sample = signals if args.legacy_sample <= 0 else signals[:args.legacy_sample]
+    start = time.perf_counter()
+    legacy = [legacy_scan(signals, s) for s in sample]
+    legacy_seconds = (time.perf_counter() - start) * len(signals) / len(sample)
+
+    mismatches = sum(
+        1 for group, (count, weighted) in zip(indexed, legacy)
+        if group.count != count or group.weighted_sum != weighted
+    )
+
+    print(f"signals:            {len(signals)}")
+    print(f"legacy scan:        {legacy_seconds:.3f}s{' (extrapolated)' if len(sample) < len(signals) else ''}")
+    print(f"consensus index:    {indexed_seconds:.4f}s")
+    print(f"speedup:            {legacy_seconds / indexed_seconds:.0f}x")
+    print(f"parity mismatches:  {mismatches}/{len(sample)}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Deterministic end-to-end benchmark of the signal pipeline (no network, no LLM).
+
+Replays a tick fixture through SignalGenerator.run_cycle with a fake collector,
+stub AI filter, stub Telegram and stub live prices, then prints cycles/sec,
+per-stage p50/p95/p99 and peak RSS. Reports can be saved as a baseline and
+later runs compared against it (exit code 1 on a regression).
+
+Usage:
+    python scripts/bench_pipeline.py --symbols 10 --cycles 50 --save-baseline bench/pipeline_baseline.json
+    python scripts/bench_pipeline.py --symbols 10 --cycles 50 --compare bench/pipeline_baseline.json
+    python scripts/bench_pipeline.py --fixture fixtures/replay.json --ai-latency 0.5 --inject-rate 0.2
+    python scripts/bench_pipeline.py --from-history data/history --history-symbols BTCUSDT,ETHUSDT
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.pipeline_replay import PipelineReplay, ReplayFixture, compare_reports, quiet_logs
+
+
+def print_report(report) -> None:
+    meta = report["meta"]
+    print(f"symbols x cycles: {meta['symbols']} x {meta['cycles']} "
+          f"(warmup {meta['warmup_bars']} bars, commit {meta['commit']})")
+    print(f"throughput:       {report['cycles_per_sec']:.2f} cycles/s ({report['wall_seconds']:.2f}s wall)")
+    print(f"signals:          {report['signals']}")
+    print(f"peak RSS:         {report['peak_rss_mb']:.0f} MB")
+    print()
+    print(f"{'stage':28} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'total s':>9}")
+    rows = [("cycle", report["cycle"])] + list(report["stages"].items())
+    for name, stats in rows:
+        print(f"{name:28} {stats['count']:7d} {stats['p50'] * 1e3:9.2f} {stats['p95'] * 1e3:9.2f} "
+              f"{stats['p99'] * 1e3:9.2f} {stats['total']:9.2f}")
+    print()
+    print("slowest strategies (p95):")
+    for name, stats in sorted(report["strategies"].items(), key=lambda kv: kv[1]["p95"], reverse=True)[:8]:
+        print(f"  {name:26} {stats['p95'] * 1e3:9.2f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--cycles", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=300, help="Bars per symbol loaded before the first cycle")
+    parser.add_argument("--bars-per-cycle", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--fixture", help="Load a recorded fixture JSON instead of generating one")
+    parser.add_argument("--save-fixture", help="Write the fixture used to this path")
+    parser.add_argument("--from-history", metavar="ROOT", help="Build the fixture from a HistoryStore root")
+    parser.add_argument("--history-symbols", default="BTCUSDT,ETHUSDT")
+    parser.add_argument("--history-interval", default="1m")
+    parser.add_argument("--ai-latency", type=float, default=0.0, help="Seconds per stub AI call")
+    parser.add_argument("--ai-approve", type=float, default=0.5, help="Share of signals the stub AI approves")
+    parser.add_argument("--telegram-latency", type=float, default=0.0)
+    parser.add_argument("--inject-rate", type=float, default=0.0,
+                        help="Probability per symbol and cycle of a synthetic signal (loads AI/Telegram stages)")
+    parser.add_argument("--save-baseline", help="Write the report JSON here")
+    parser.add_argument("--compare", help="Baseline report JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative slowdown before flagging")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    quiet_logs(args.log_level)
+    bars = args.warmup + args.cycles * args.bars_per_cycle
+    if args.fixture:
+        fixture = ReplayFixture.load(args.fixture)
+    elif args.from_history:
+        fixture = ReplayFixture.from_history(args.from_history, args.history_symbols.split(","),
+                                             args.history_interval, bars)
+    else:
+        fixture = ReplayFixture.synthetic(args.symbols, bars, seed=args.seed)
+    if args.save_fixture:
+        fixture.save(args.save_fixture)
+
+    replay = PipelineReplay(fixture, cycles=args.cycles, warmup_bars=args.warmup, bars_per_cycle=args.bars_per_cycle,
+                            ai_latency=args.ai_latency, ai_approve_ratio=args.ai_approve,
+                            telegram_latency=args.telegram_latency, inject_rate=args.inject_rate, seed=args.seed)
+    report = asyncio.run(replay.run())
+    print_report(report)
+
+    if args.save_baseline:
+        Path(args.save_baseline).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nbaseline written to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare_reports(baseline, report, tolerance=args.tolerance)
+        print(f"\nvs baseline {baseline['meta'].get('commit')} (tolerance {args.tolerance:.0%}):")
+        for row in rows:
+            flag = "REGRESSION" if row["regression"] else ""
+            print(f"  {row['metric']:30} {row['baseline']:12.4f} -> {row['current']:12.4f}  x{row['ratio']:.2f} {flag}")
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
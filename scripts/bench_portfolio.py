@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Synthetic benchmark for PortfolioBacktester.
+
+Writes random-walk closes for N symbols to a memory-mapped .npy file, builds SMA
+crossover signals per symbol and runs the portfolio engine over them. Prints
+runtime, trades and peak RSS (resident memory should stay close to the size of
+the signal arrays, not grow with the number of trades or bars held).
+
+Usage:
+    python scripts/bench_portfolio.py --symbols 20 --bars 500000
+"""
+
+import argparse
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.app.services.backtest.portfolio_backtester import PortfolioBacktester
+from backend.app.services.slippage import apply_slippage
+
+
+def sma_cross(closes: np.ndarray, fast: int, slow: int):
+    csum = np.concatenate(([0.0], np.cumsum(closes)))
+    fast_ma = np.full(len(closes), -np.inf)
+    slow_ma = np.full(len(closes), np.inf)
+    fast_ma[fast - 1:] = (csum[fast:] - csum[:-fast]) / fast
+    slow_ma[slow - 1:] = (csum[slow:] - csum[:-slow]) / slow
+    above = fast_ma > slow_ma
+    prev = np.concatenate(([False], above[:-1]))
+    return above & ~prev, ~above & prev
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--bars", type=int, default=500_000)
+    parser.add_argument("--fast", type=int, default=50)
+    parser.add_argument("--slow", type=int, default=400)
+    parser.add_argument("--adv", type=float, default=5e7, help="Daily dollar volume passed to the slippage model")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "closes.npy"
+        closes = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(args.bars, args.symbols))
+        entries = np.zeros((args.bars, args.symbols), dtype=bool)
+        exits = np.zeros((args.bars, args.symbols), dtype=bool)
+        for j in range(args.symbols):
+            column = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.001, args.bars)))
+            closes[:, j] = column
+            entries[:, j], exits[:, j] = sma_cross(column, args.fast, args.slow)
+        closes.flush()
+        del closes
+
+        closes = np.load(path, mmap_mode="r")
+        slippage = lambda side, price, notional, adv: apply_slippage(side, price, notional, args.adv)  # noqa: E731
+        bt = PortfolioBacktester(closes, slippage_apply=slippage, max_correlated_exposure=1.0)
+        start = time.perf_counter()
+        result = bt.run(entries, exits)
+        seconds = time.perf_counter() - start
+
+    trades = sum(1 for t in result["trades"] if t["type"] == "buy")
+    print(f"symbols x bars: {args.symbols} x {args.bars}")
+    print(f"signal bars:    {int((entries | exits).any(axis=1).sum())}")
+    print(f"trades:         {trades}")
+    print(f"runtime:        {seconds:.2f}s ({args.symbols * args.bars / seconds / 1e6:.1f}M symbol-bars/s)")
+    print(f"final equity:   {result['final_equity']:.2f}")
+    print(f"max drawdown:   {result['metrics']['max_drawdown']:.2%}")
+    print(f"peak RSS:       {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
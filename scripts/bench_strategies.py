@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Per-strategy micro-benchmarks: check_for_signal and each pattern hook for every strategy
+registered in SignalGenerator and AIEnsemble, at several history sizes and on trending,
+ranging and volatile series. Prints the cost curve per hook and flags super-linear growth
+(exit code 1 when any hook is flagged, so it can gate CI).
+
+Usage:
+    python scripts/bench_strategies.py
+    python scripts/bench_strategies.py --sizes 60,200,1000 --strategies rsi_macd_momentum,vwap
+    python scripts/bench_strategies.py --save bench/strategies.json --threshold 1.3
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.pipeline_replay import quiet_logs
+from services.strategy_bench import REGIMES, SIZES, SOURCES, registered_strategies, run_suite
+
+
+def print_report(report) -> None:
+    sizes = report["meta"]["sizes"]
+    header = "".join(f"{n:>10}" for n in sizes)
+    print(f"{'strategy':22} {'hook':26} {'regime':9}{header}  {'slope':>6}")
+    for row in report["scaling"]:
+        regime = row["worst_regime"] or next(iter(row["curve_ms"]), "")
+        curve = row["curve_ms"].get(regime, [])
+        cells = "".join(f"{ms:10.3f}" for ms in curve) + " " * 10 * (len(sizes) - len(curve))
+        flag = "  SUPER-LINEAR" if row["superlinear"] else ""
+        print(f"{row['strategy']:22} {row['hook']:26} {regime:9}{cells}  {row['exponent']:6.2f}{flag}")
+    print("\n(ms per call at each history size; slope = log-log growth over the largest step, worst regime)")
+    for error in report["errors"]:
+        print(f"error: {error['strategy']}.{error['hook']} [{error['regime']}, {error['size']}]: {error['error']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(str(n) for n in SIZES))
+    parser.add_argument("--regimes", default=",".join(REGIMES))
+    parser.add_argument("--sources", default=",".join(SOURCES), help="Strategy registries to benchmark")
+    parser.add_argument("--strategies", help="Comma-separated registry names to restrict to")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--min-time", type=float, default=0.02, help="Seconds of samples per measurement")
+    parser.add_argument("--threshold", type=float, default=1.3, help="Slope above which a hook is flagged")
+    parser.add_argument("--min-flag-ms", type=float, default=0.05,
+                        help="Ignore hooks cheaper than this at the largest size")
+    parser.add_argument("--save", help="Write the full report as JSON")
+    parser.add_argument("--log-level", default="ERROR")
+    args = parser.parse_args()
+
+    quiet_logs(args.log_level)
+    strategies = registered_strategies(args.sources.split(","))
+    report = run_suite(
+        strategies,
+        sizes=[int(n) for n in args.sizes.split(",")],
+        regimes=args.regimes.split(","),
+        seed=args.seed,
+        min_time=args.min_time,
+        superlinear_threshold=args.threshold,
+        min_flag_ms=args.min_flag_ms,
+        only=args.strategies.split(",") if args.strategies else None,
+    )
+    print_report(report)
+
+    if args.save:
+        Path(args.save).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nreport saved to {args.save}")
+
+    return 1 if any(row["superlinear"] for row in report["scaling"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Manage the local backtest history store (data/history by default).
+
+Usage:
+    python scripts/history.py import BTCUSDT 1m dumps/BTCUSDT-1m-2024-*.csv
+    python scripts/history.py top-up BTCUSDT 1m --since 2024-01-01
+    python scripts/history.py top-up EUR_USD 1h --source oanda
+    python scripts/history.py info BTCUSDT 1m
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.app.services.backtest.history_store import HistoryStore, top_up
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", default="data/history")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_import = sub.add_parser("import", help="Import CSV dumps")
+    p_import.add_argument("symbol")
+    p_import.add_argument("interval")
+    p_import.add_argument("files", nargs="+")
+
+    p_top = sub.add_parser("top-up", help="Download bars newer than the last stored one")
+    p_top.add_argument("symbol")
+    p_top.add_argument("interval")
+    p_top.add_argument("--source", choices=("binance", "oanda"), default="binance")
+    p_top.add_argument("--since", help="Start date for an empty store (default: 30 days ago)")
+
+    p_info = sub.add_parser("info", help="Show stored range and time a full load")
+    p_info.add_argument("symbol")
+    p_info.add_argument("interval")
+
+    args = parser.parse_args()
+    store = HistoryStore(args.root)
+
+    if args.command == "import":
+        added = sum(store.import_csv(path, args.symbol, args.interval) for path in args.files)
+        print(f"{added} new bars")
+    elif args.command == "top-up":
+        added = asyncio.run(top_up(store, args.symbol, args.interval, source=args.source, default_start=args.since))
+        print(f"{added} new bars")
+    else:
+        info = store.info(args.symbol, args.interval)
+        start = time.perf_counter()
+        bars = store.load(args.symbol, args.interval)
+        seconds = time.perf_counter() - start
+        for key, value in info.items():
+            print(f"{key + ':':12} {value}")
+        print(f"{'load:':12} {len(bars['close'])} bars in {seconds * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,10 +16,7 @@ import httpx
 import sys
 from pathlib import Path
 
-# Add backend to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
-
-from app.core.logger import logger
+from backend.app.core.logger import logger
 
 # Import market hours utility
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,59 @@
+"""
+Candle Events
+Per-symbol "new closed candle" triggers for the event-driven signal generator.
+
+- Sources publish a symbol when a candle for it closes: the collector polls (symbols that
+  got new ticks) and the Binance WebSocket collector (1m bars built from its trade stream)
+- Coalescing: a symbol published again before it is evaluated is triggered once; after the
+  first trigger next_batch() waits coalesce_seconds so a burst lands in one batch
+- Symbols nobody publishes are never evaluated
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional
+
+from backend.app.core.monitoring import candle_events
+
+
+class CandleEventBus:
+    """Pending symbol triggers, in first-publish order."""
+
+    def __init__(self, coalesce_seconds: float = 0.25):
+        self.coalesce_seconds = coalesce_seconds
+        self._pending: Dict[str, float] = {}  # symbol -> first publish time (monotonic)
+        self._wakeup = asyncio.Event()
+        self.published = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def publish(self, symbol: str, source: str = "collector") -> bool:
+        """Trigger the symbol; False if it was already pending (coalesced). Call from the event loop thread."""
+        self.published += 1
+        if symbol in self._pending:
+            self.coalesced += 1
+            candle_events.labels(source=source, outcome="coalesced").inc()
+            return False
+        self._pending[symbol] = time.monotonic()
+        candle_events.labels(source=source, outcome="triggered").inc()
+        self._wakeup.set()
+        return True
+
+    async def next_batch(self, timeout: Optional[float] = None) -> Dict[str, float]:
+        """
+        Wait for triggers and take them: symbol -> first publish time (time.monotonic()).
+        Empty if `timeout` seconds pass without one.
+        """
+        if not self._pending:
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return {}
+        if self.coalesce_seconds > 0:
+            await asyncio.sleep(self.coalesce_seconds)
+        batch, self._pending = self._pending, {}
+        self._wakeup.clear()
+        return batch
@@ -0,0 +1,199 @@
+"""
+Cycle Profiler
+Opt-in profiling of SignalGenerator cycles.
+
+- Profiles one in every N cycles and/or any cycle slower than a latency threshold
+- "sample" mode (default): a background thread samples the event-loop thread's
+  stack and writes collapsed stacks (flamegraph.pl / speedscope / inferno ready)
+- "cprofile" mode: deterministic cProfile, writes a .prof file (snakeviz / flameprof)
+- Logs the top-K functions by cumulative time for every kept profile
+- When disabled, start_cycle()/finish_cycle() are a single attribute check
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+Stack = Tuple[str, ...]
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Wall-clock sampling profiler for one thread.
+
+    Every `interval` seconds a daemon thread grabs the target thread's current
+    frame from sys._current_frames() and counts the root->leaf stack. Time spent
+    awaiting I/O shows up under the event loop's select() call.
+    """
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = 0.005):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="cycle-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack: List[str] = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                stack.reverse()
+                self.samples[tuple(stack)] += 1
+
+
+def cumulative_from_samples(samples: Counter, interval: float) -> List[Tuple[str, float]]:
+    """Inclusive seconds per function (a function counts once per sample, even if recursive)."""
+    inclusive: Dict[str, int] = Counter()
+    for stack, count in samples.items():
+        for label in set(stack):
+            inclusive[label] += count
+    return sorted(((label, n * interval) for label, n in inclusive.items()), key=lambda x: x[1], reverse=True)
+
+
+class CycleProfiler:
+    """
+    Decides which cycles to profile and writes the results to `output_dir`.
+
+    Usage:
+        profiler.start_cycle()
+        ... run the cycle ...
+        profiler.finish_cycle(elapsed_seconds)
+
+    Threshold mode cannot know a cycle will be slow before it ends, so it profiles
+    every cycle and only keeps slow ones; prefer "sample" mode there (cProfile adds
+    noticeable overhead to every call).
+    """
+
+    MODES = ("sample", "cprofile")
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        every_n: int = 10,
+        threshold_seconds: float = 0.0,
+        mode: str = "sample",
+        top_k: int = 15,
+        output_dir: str = "logs/profiles",
+        sample_interval: float = 0.005,
+    ):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown profile mode '{mode}' (expected one of {self.MODES})")
+        self.every_n = max(0, int(every_n))
+        self.threshold_seconds = max(0.0, float(threshold_seconds))
+        self.enabled = bool(enabled) and (self.every_n > 0 or self.threshold_seconds > 0)
+        self.mode = mode
+        self.top_k = top_k
+        self.output_dir = Path(output_dir)
+        self.sample_interval = sample_interval
+
+        self.cycle = 0
+        self._active = None  # StackSampler or cProfile.Profile for the running cycle
+        self._scheduled = False
+
+    @classmethod
+    def from_config(cls, config) -> "CycleProfiler":
+        return cls(
+            enabled=getattr(config, "PROFILE_CYCLES", False),
+            every_n=getattr(config, "PROFILE_EVERY_N", 10),
+            threshold_seconds=getattr(config, "PROFILE_THRESHOLD_SECONDS", 0.0),
+            mode=getattr(config, "PROFILE_MODE", "sample"),
+            top_k=getattr(config, "PROFILE_TOP_K", 15),
+        )
+
+    def start_cycle(self) -> None:
+        """Begin profiling the current cycle if it is selected (or may turn out slow)."""
+        if not self.enabled:
+            return
+        self.cycle += 1
+        self._scheduled = self.every_n > 0 and self.cycle % self.every_n == 0
+        if not self._scheduled and self.threshold_seconds <= 0:
+            self._active = None
+            return
+
+        if self.mode == "cprofile":
+            self._active = cProfile.Profile()
+            self._active.enable()
+        else:
+            self._active = StackSampler(interval=self.sample_interval)
+            self._active.start()
+
+    def finish_cycle(self, elapsed_seconds: float) -> Optional[Path]:
+        """Stop profiling; write and summarise the profile if the cycle was kept. Returns the output path."""
+        if not self.enabled or self._active is None:
+            return None
+        active, self._active = self._active, None
+
+        if isinstance(active, cProfile.Profile):
+            active.disable()
+        else:
+            active.stop()
+
+        slow = self.threshold_seconds > 0 and elapsed_seconds >= self.threshold_seconds
+        if not (self._scheduled or slow):
+            return None
+
+        if slow:
+            reason = f"slow cycle ({elapsed_seconds:.2f}s >= {self.threshold_seconds:.2f}s)"
+        else:
+            reason = f"every {self.every_n} cycles"
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"cycle_{self.cycle:06d}_{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}"
+
+        try:
+            if isinstance(active, cProfile.Profile):
+                path = self.output_dir / f"{stem}.prof"
+                stats = pstats.Stats(active)
+                stats.dump_stats(str(path))
+                top = self._top_from_pstats(stats)
+            else:
+                path = self.output_dir / f"{stem}.collapsed"
+                self._write_collapsed(active.samples, path)
+                top = cumulative_from_samples(active.samples, active.interval)[: self.top_k]
+        except OSError as e:
+            logger.warning(f"Could not write cycle profile: {e}")
+            return None
+
+        logger.info(f"🔬 Profiled cycle {self.cycle} ({reason}) - {elapsed_seconds:.2f}s -> {path}")
+        for label, seconds in top:
+            logger.info(f"   {seconds:8.3f}s  {label}")
+        return path
+
+    def _top_from_pstats(self, stats: pstats.Stats) -> List[Tuple[str, float]]:
+        rows = []
+        for (filename, lineno, func), (_, _, _, cumtime, _) in stats.stats.items():
+            rows.append((f"{func} ({os.path.basename(filename)}:{lineno})", cumtime))
+        rows.sort(key=lambda x: x[1], reverse=True)
+        return rows[: self.top_k]
+
+    @staticmethod
+    def _write_collapsed(samples: Counter, path: Path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in samples.most_common():
+                f.write(f"{';'.join(stack)} {count}\n")
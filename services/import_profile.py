@@ -0,0 +1,123 @@
+"""
+Import Profile
+Start-up cost attribution for the signal generator and the API (`python -X importtime`, summarized).
+
+- Runs a statement (usually an import plus construction) in a fresh interpreter with
+  -X importtime, so nothing already imported by the caller hides its cost
+- Parses the per-module self/cumulative microseconds the interpreter writes to stderr
+- Reports wall time and peak RSS of the child, the slowest modules by cumulative time
+  (nested imports are charged to the importer) and self time grouped by top-level package
+  (where the time actually goes)
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT_DIR = str(Path(__file__).resolve().parent.parent)
+
+# "import time:       123 |        456 |     package.module" (indentation = nesting depth)
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)\s*$")
+_RESULT_MARKER = "@@import-profile@@"
+
+_CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+exec(compile({statement!r}, "<import-profile>", "exec"))
+seconds = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+print({marker!r} + json.dumps({{"seconds": seconds, "peak_rss_mb": peak_mb, "modules": len(sys.modules)}}))
+"""
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def package(self) -> str:
+        return self.module.split(".")[0]
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """Records of every `import time:` line (other stderr output is ignored)."""
+    records = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append(ImportRecord(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def summarize(records: List[ImportRecord]) -> Dict[str, Any]:
+    by_package: Dict[str, int] = defaultdict(int)
+    for record in records:
+        by_package[record.package] += record.self_us
+    return {
+        "import_seconds": sum(r.self_us for r in records) / 1e6,
+        "modules_imported": len(records),
+        "slowest": [
+            {"module": r.module, "cumulative_ms": r.cumulative_us / 1e3, "self_ms": r.self_us / 1e3}
+            for r in sorted(records, key=lambda r: r.cumulative_us, reverse=True)
+        ],
+        "packages": [
+            {"package": package, "self_ms": us / 1e3}
+            for package, us in sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)
+        ],
+    }
+
+
+def profile_startup(statement: str, cwd: str = ROOT_DIR, env: Optional[Dict[str, str]] = None,
+                    timeout: float = 300.0) -> Dict[str, Any]:
+    """
+    Run `statement` in a child interpreter with -X importtime.
+
+    Returns the summarize() fields plus `seconds` (wall time of the statement), `peak_rss_mb`
+    and `modules` (len(sys.modules) afterwards) as measured inside the child.
+    """
+    child = _CHILD.format(root=ROOT_DIR, statement=statement, marker=_RESULT_MARKER)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", child],
+        cwd=cwd,
+        env={**os.environ, **(env or {})},
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    result = None
+    for line in proc.stdout.splitlines():
+        if line.startswith(_RESULT_MARKER):
+            result = json.loads(line[len(_RESULT_MARKER):])
+    if proc.returncode != 0 or result is None:
+        tail = "\n".join(line for line in proc.stderr.splitlines() if not line.startswith("import time:"))[-2000:]
+        raise RuntimeError(f"import profile of {statement!r} failed (exit {proc.returncode}):\n{tail}")
+    return {"statement": statement, **result, **summarize(parse_importtime(proc.stderr))}
+
+
+def format_report(report: Dict[str, Any], top: int = 25) -> str:
+    lines = [
+        f"statement:  {report['statement']}",
+        f"wall:       {report['seconds']:.3f}s ({report['import_seconds']:.3f}s in imports, "
+        f"{report['modules_imported']} modules imported)",
+        f"peak RSS:   {report['peak_rss_mb']:.0f} MB",
+        "",
+        f"{'cumulative ms':>14} {'self ms':>9}  module",
+    ]
+    for row in report["slowest"][:top]:
+        lines.append(f"{row['cumulative_ms']:14.1f} {row['self_ms']:9.1f}  {row['module']}")
+    lines += ["", f"{'self ms':>14}  top-level package"]
+    for row in report["packages"][:top]:
+        lines.append(f"{row['self_ms']:14.1f}  {row['package']}")
+    return "\n".join(lines)
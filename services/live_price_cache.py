@@ -0,0 +1,265 @@
+"""
+Live Price Cache Service
+Short-TTL live quote cache shared by the signal pipeline.
+
+- Refreshes every symbol with pending signals in ONE batched Binance call; a symbol
+  Binance rejects (HTTP 400 fails the whole batch) is retried alone and then left out
+- Falls back to the latest database tick for forex / non-Binance symbols
+- Can be kept warm by the Binance WebSocket collector when it is running
+- Every quote carries age metadata (age_seconds, cache_age_seconds, is_stale)
+
+The TTL (LIVE_PRICE_TTL_SECONDS) is short: without the WebSocket collector keeping quotes
+warm, the cache de-duplicates lookups within one batch of signals rather than across
+cycles, since the AI filter takes far longer than the TTL per signal.
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterable, List, Optional, Set
+
+import httpx
+
+from backend.app.core.logger import logger
+
+BINANCE_TICKER_URL = "https://api.binance.com/api/v3/ticker/price"
+
+
+class LivePriceCache:
+    """
+    In-memory live quote cache with a short TTL.
+
+    Quotes are stored per symbol as:
+        {price, timestamp, source, fetched_at (monotonic)}
+    and returned with age metadata computed at read time.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 5.0,
+        max_quote_age_seconds: float = 300.0,
+        http_timeout: float = 5.0,
+    ):
+        """
+        Initialize live price cache.
+
+        Args:
+            ttl_seconds: How long a cached quote is served before it is refreshed
+            max_quote_age_seconds: Quotes older than this (market time) are flagged stale
+            http_timeout: Timeout for the batched Binance request
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_quote_age_seconds = max_quote_age_seconds
+        self.http_timeout = http_timeout
+        self._quotes: Dict[str, Dict[str, Any]] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._ws_collector = None
+        self._rejected: Set[str] = set()  # symbols Binance answered HTTP 400 for (unknown/delisted)
+
+    # ------------------------------------------------------------------
+    # Quote storage
+    # ------------------------------------------------------------------
+
+    def update_quote(
+        self,
+        symbol: str,
+        price: float,
+        timestamp: Optional[datetime] = None,
+        source: str = "binance_ws",
+    ) -> None:
+        """
+        Store a fresh quote for a symbol.
+
+        Args:
+            symbol: Asset symbol (e.g. 'BTCUSDT')
+            price: Last traded price
+            timestamp: Market timestamp of the quote (naive UTC); defaults to now
+            source: Where the quote came from (binance_live, binance_ws, database)
+        """
+        if price is None or price <= 0:
+            return
+        if timestamp is not None and timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        self._quotes[symbol] = {
+            "price": float(price),
+            "timestamp": timestamp or datetime.utcnow(),
+            "source": source,
+            "fetched_at": time.monotonic(),
+        }
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached quote for a symbol with age metadata, or None.
+
+        Returns:
+            Dict with price, timestamp, source, age_seconds, cache_age_seconds, is_stale
+        """
+        quote = self._quotes.get(symbol)
+        if not quote:
+            return None
+        age_seconds = max(0.0, (datetime.utcnow() - quote["timestamp"]).total_seconds())
+        return {
+            "price": quote["price"],
+            "timestamp": quote["timestamp"],
+            "source": quote["source"],
+            "age_seconds": age_seconds,
+            "cache_age_seconds": time.monotonic() - quote["fetched_at"],
+            "is_stale": age_seconds > self.max_quote_age_seconds,
+        }
+
+    def is_fresh(self, symbol: str) -> bool:
+        """True if the symbol has a cached quote younger than the TTL."""
+        quote = self._quotes.get(symbol)
+        return bool(quote) and (time.monotonic() - quote["fetched_at"]) < self.ttl_seconds
+
+    # ------------------------------------------------------------------
+    # WebSocket warm-up
+    # ------------------------------------------------------------------
+
+    def attach_ws_collector(self, collector: Any) -> None:
+        """
+        Keep quotes warm from a running BinanceWebSocketCollector.
+        Every trade the collector processes updates the cache.
+        """
+        if collector is None or collector is self._ws_collector:
+            return
+        collector.add_trade_listener(self._on_ws_trade)
+        self._ws_collector = collector
+        logger.info("✅ Live price cache attached to Binance WebSocket collector")
+
+    def _on_ws_trade(self, trade: Dict[str, Any]) -> None:
+        """Trade listener callback for the WebSocket collector."""
+        trade_ms = trade.get("timestamp") or 0
+        ts = (
+            datetime.fromtimestamp(trade_ms / 1000, tz=timezone.utc).replace(tzinfo=None)
+            if trade_ms
+            else None
+        )
+        self.update_quote(trade.get("symbol", ""), trade.get("price", 0.0), ts, source="binance_ws")
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    async def refresh(self, symbols: Iterable[str], force: bool = False) -> None:
+        """
+        Refresh all given symbols whose cached quote is older than the TTL.
+        Binance symbols are fetched in a single batched request; everything else
+        (and anything Binance did not return) comes from one database query.
+
+        Args:
+            symbols: Symbols to refresh
+            force: Refresh even if the cached quote is still within the TTL
+        """
+        pending = sorted({s for s in symbols if s and (force or not self.is_fresh(s))})
+        if not pending:
+            return
+
+        binance_symbols = [s for s in pending if s.endswith("USDT")]
+        if binance_symbols:
+            await self._refresh_binance(binance_symbols)
+
+        missing = [s for s in pending if not self.is_fresh(s)]
+        if missing:
+            await self._refresh_database(missing)
+
+    async def get_live_price(
+        self,
+        symbol: str,
+        batch: Optional[Iterable[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return a live quote for a symbol, refreshing if the cached one has expired.
+
+        Args:
+            symbol: Symbol to price
+            batch: Other symbols to refresh in the same round trip if a refresh is needed
+
+        Returns:
+            Quote dict (see get()) or None if no price is available
+        """
+        if not self.is_fresh(symbol):
+            to_refresh = set(batch or [])
+            to_refresh.add(symbol)
+            await self.refresh(to_refresh)
+        return self.get(symbol)
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.http_timeout)
+        return self._client
+
+    async def _fetch_tickers(self, client: httpx.AsyncClient, symbols: List[str]) -> httpx.Response:
+        if len(symbols) == 1:
+            params = {"symbol": symbols[0]}
+        else:
+            params = {"symbols": json.dumps(symbols, separators=(",", ":"))}
+        return await client.get(BINANCE_TICKER_URL, params=params)
+
+    async def _refresh_binance(self, symbols: List[str]) -> None:
+        """
+        Fetch all Binance symbols with one /ticker/price call. One unknown symbol makes
+        Binance reject the whole batch with HTTP 400, so then every symbol is fetched alone
+        and the rejected ones are left out of later batches (they use the database price).
+        """
+        symbols = [s for s in symbols if s not in self._rejected]
+        if not symbols:
+            return
+        try:
+            client = await self._get_client()
+            batches = [symbols]
+            responses = [await self._fetch_tickers(client, symbols)]
+            if responses[0].status_code == 400 and len(symbols) > 1:
+                logger.warning(f"Binance rejected the batched ticker for {len(symbols)} symbols - retrying one by one")
+                batches = [[s] for s in symbols]
+                responses = await asyncio.gather(*(self._fetch_tickers(client, batch) for batch in batches))
+            rows = []
+            for batch, response in zip(batches, responses):
+                if response.status_code == 400 and len(batch) == 1:
+                    self._rejected.add(batch[0])
+                    logger.warning(f"Binance does not know {batch[0]} - using database prices for it")
+                elif response.status_code != 200:
+                    logger.warning(f"Binance ticker returned HTTP {response.status_code} for {len(batch)} symbols")
+                else:
+                    data = response.json()
+                    rows.extend(data if isinstance(data, list) else [data])
+            now = datetime.utcnow()
+            for row in rows:
+                self.update_quote(row.get("symbol", ""), float(row.get("price", 0.0)), now, source="binance_live")
+            logger.debug(f"Refreshed {len(rows)} live prices from Binance in {len(responses)} request(s)")
+        except Exception as e:
+            logger.warning(f"Could not fetch batched live prices from Binance: {e}")
+
+    async def _refresh_database(self, symbols: List[str]) -> None:
+        """Load the latest database tick for each symbol in a single query."""
+        try:
+            from sqlalchemy import and_, func
+            from sqlmodel import select
+            from backend.app.db.models import PriceTick
+            from backend.app.db.session import get_session
+
+            latest = (
+                select(PriceTick.symbol, func.max(PriceTick.ts).label("max_ts"))
+                .where(PriceTick.symbol.in_(symbols))
+                .group_by(PriceTick.symbol)
+                .subquery()
+            )
+            stmt = select(PriceTick).join(
+                latest,
+                and_(PriceTick.symbol == latest.c.symbol, PriceTick.ts == latest.c.max_ts),
+            )
+
+            async for session in get_session():
+                result = await session.exec(stmt)
+                for tick in result.all():
+                    self.update_quote(tick.symbol, float(tick.price), tick.ts, source="database")
+                break
+        except Exception as e:
+            logger.warning(f"Could not load latest database prices for {symbols}: {e}")
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
@@ -0,0 +1,514 @@
+"""
+Pipeline Replay
+Deterministic end-to-end benchmark harness for SignalGenerator.
+
+- Replays recorded (or seeded synthetic) tick fixtures through a fake collector that
+  writes them into a throwaway SQLite database, so db_fetch and the strategies run
+  against real PriceTick rows
+- Stub AI filter (configurable latency, deterministic approvals), stub Telegram,
+  stub live prices (last replayed close) and an in-memory signal logger - no network
+- Drives run_cycle() for N cycles over M symbols and reports cycles/sec, per-stage
+  p50/p95/p99 (from the same stage timers the Prometheus metrics use) and peak RSS
+- Real pattern completions are rare (a few per day across all assets), so `inject_rate`
+  can add seeded synthetic signals after the strategies run to load the downstream
+  stages (filter, live price, AI, Telegram)
+- Reports are plain JSON so a baseline can be stored and compared across commits
+"""
+
+import asyncio
+import json
+import math
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import zlib
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+ROOT_DIR = str(Path(__file__).resolve().parent.parent)
+
+# Stage percentiles compared by compare_reports() (cycle plus every pipeline stage)
+PERCENTILES = (50, 95, 99)
+
+
+# ----------------------------------------------------------------------
+# Fixtures
+# ----------------------------------------------------------------------
+
+@dataclass
+class ReplayFixture:
+    """Per-symbol OHLCV rows [open, high, low, close, volume] at a fixed bar interval."""
+
+    symbols: Dict[str, List[List[float]]]
+    interval_seconds: int = 60
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def length(self) -> int:
+        return min((len(rows) for rows in self.symbols.values()), default=0)
+
+    @classmethod
+    def synthetic(cls, n_symbols: int, n_bars: int, seed: int = 42, interval_seconds: int = 60) -> "ReplayFixture":
+        """Seeded random walks cycling through trending, ranging and volatile regimes."""
+        rng = random.Random(seed)
+        symbols = {}
+        for i in range(n_symbols):
+            price = rng.uniform(0.5, 50_000.0)
+            rows = []
+            for t in range(n_bars):
+                regime = (t // 120 + i) % 3
+                drift = (0.0008 if i % 2 == 0 else -0.0008) if regime == 0 else 0.0
+                vol = 0.006 if regime == 2 else 0.0015
+                if regime == 1:
+                    drift = 0.002 * math.sin(t / 12.0) * vol * 100
+                close = price * (1.0 + drift + rng.gauss(0.0, vol))
+                high = max(price, close) * (1.0 + abs(rng.gauss(0.0, vol / 2)))
+                low = min(price, close) * (1.0 - abs(rng.gauss(0.0, vol / 2)))
+                rows.append([price, high, low, close, rng.uniform(100.0, 5_000.0)])
+                price = close
+            symbols[f"SYN{i:02d}USDT"] = rows
+        return cls(symbols, interval_seconds, {"source": "synthetic", "seed": seed})
+
+    @classmethod
+    def from_history(cls, root: str, symbols: List[str], interval: str, n_bars: int) -> "ReplayFixture":
+        """Take the newest n_bars of each symbol from a HistoryStore (recorded data)."""
+        from backend.app.services.backtest.history_store import INTERVAL_MS, HistoryStore
+
+        store = HistoryStore(root)
+        rows = {}
+        for symbol in symbols:
+            bars = store.load(symbol, interval)
+            columns = [bars[name][-n_bars:] for name in ("open", "high", "low", "close", "volume")]
+            rows[symbol] = np.vstack(columns).T.tolist()
+        return cls(rows, INTERVAL_MS[interval] // 1000, {"source": f"history:{root}", "interval": interval})
+
+    @classmethod
+    def load(cls, path: str) -> "ReplayFixture":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["symbols"], int(data.get("interval_seconds", 60)), data.get("meta", {}))
+
+    def save(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"interval_seconds": self.interval_seconds, "meta": self.meta, "symbols": self.symbols}, f)
+
+
+# ----------------------------------------------------------------------
+# Stubs
+# ----------------------------------------------------------------------
+
+class StubAIFilter:
+    """AIFilter stand-in: blocks for `latency` seconds (like the synchronous real call) and
+    approves a deterministic `approve_ratio` share of (strategy, symbol, action) keys."""
+
+    def __init__(self, latency: float = 0.0, approve_ratio: float = 0.5, confidence_threshold: float = 6.0, **_):
+        self.provider = "stub"
+        self.model = "stub"
+        self.latency = latency
+        self.approve_ratio = approve_ratio
+        self.confidence_threshold = confidence_threshold
+        self.calls = 0
+
+    def filter_signal(self, signal: Dict[str, Any]) -> Dict[str, Any]:
+        self.calls += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+        key = f"{signal.get('strategy')}|{signal.get('symbol')}|{signal.get('action')}"
+        bucket = zlib.crc32(key.encode()) % 1000 / 1000.0
+        approved = bucket < self.approve_ratio
+        confidence = 7.5 if approved else 3.0
+        return {
+            "approved": approved,
+            "ai_confidence": confidence,
+            "verdict": "APPROVE" if approved else "REJECT",
+            "reasoning": "replay stub",
+            "market_open": True,
+        }
+
+
+class StubTelegram:
+    """TelegramNotifier stand-in that awaits `latency` seconds per message and records it."""
+
+    def __init__(self, latency: float = 0.0, **_):
+        self.bot_token = "stub"
+        self.chat_id = "stub"
+        self.latency = latency
+        self.sent: List[Tuple[str, str, str]] = []
+
+    async def send_signal_notification(self, signal: Dict[str, Any], ai_result: Dict[str, Any]) -> bool:
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        self.sent.append((signal.get("strategy"), signal.get("symbol"), signal.get("action")))
+        return True
+
+    async def send_message(self, text: str, parse_mode: str = "HTML") -> bool:
+        return True
+
+
+class StubSignalLogger:
+    def __init__(self, *_, **__):
+        self.logged = 0
+
+    async def log_signal(self, signal: Dict[str, Any]) -> None:
+        self.logged += 1
+
+    def generate_daily_summary(self) -> Dict[str, Any]:
+        return {}
+
+
+class StubLivePrices:
+    """LivePriceCache stand-in serving the last replayed close of each symbol."""
+
+    def __init__(self, *_, **__):
+        self.prices: Dict[str, Tuple[float, datetime]] = {}
+
+    def attach_ws_collector(self, collector) -> None:
+        pass
+
+    async def refresh(self, symbols) -> None:
+        list(symbols)
+
+    async def get_live_price(self, symbol: str, batch: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        quote = self.prices.get(symbol)
+        if quote is None:
+            return None
+        price, ts = quote
+        return {"price": price, "timestamp": ts, "source": "replay", "age_seconds": 0.0,
+                "cache_age_seconds": 0.0, "is_stale": False}
+
+    async def aclose(self) -> None:
+        pass
+
+
+class _StageRecorder:
+    """Wraps the stage_latency histogram: observations still reach Prometheus and are also kept raw."""
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.samples: Dict[Tuple[str, str], List[float]] = defaultdict(list)
+
+    def labels(self, stage: str, target: str = "all"):
+        return _StageChild(self, self.histogram.labels(stage=stage, target=target), stage, target)
+
+
+class _StageChild:
+    def __init__(self, recorder: _StageRecorder, child, stage: str, target: str):
+        self.recorder, self.child, self.key = recorder, child, (stage, target)
+
+    def observe(self, value: float) -> None:
+        self.child.observe(value)
+        self.recorder.samples[self.key].append(value)
+
+
+# ----------------------------------------------------------------------
+# Harness
+# ----------------------------------------------------------------------
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"count": 0, "mean": 0.0, "total": 0.0, **{f"p{p}": 0.0 for p in PERCENTILES}}
+    arr = np.asarray(values)
+    return {
+        "count": int(len(arr)),
+        "mean": float(arr.mean()),
+        "total": float(arr.sum()),
+        **{f"p{p}": float(np.percentile(arr, p)) for p in PERCENTILES},
+    }
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class PipelineReplay:
+    """
+    Usage:
+        replay = PipelineReplay(ReplayFixture.synthetic(10, 400), cycles=50, warmup_bars=300)
+        report = asyncio.run(replay.run())
+        report["cycles_per_sec"], report["stages"]["strategy_eval"]["p95"]
+    """
+
+    def __init__(
+        self,
+        fixture: ReplayFixture,
+        cycles: int = 50,
+        warmup_bars: int = 300,
+        bars_per_cycle: int = 1,
+        ai_latency: float = 0.0,
+        ai_approve_ratio: float = 0.5,
+        telegram_latency: float = 0.0,
+        inject_rate: float = 0.0,
+        seed: int = 42,
+        db_path: Optional[str] = None,
+    ):
+        needed = warmup_bars + cycles * bars_per_cycle
+        if fixture.length < needed:
+            raise ValueError(f"Fixture has {fixture.length} bars per symbol, "
+                             f"need {needed} (warmup + cycles * bars_per_cycle)")
+        self.fixture = fixture
+        self.cycles = cycles
+        self.warmup_bars = warmup_bars
+        self.bars_per_cycle = bars_per_cycle
+        self.ai_latency = ai_latency
+        self.ai_approve_ratio = ai_approve_ratio
+        self.telegram_latency = telegram_latency
+        self.inject_rate = inject_rate
+        self.seed = seed
+        self.injected = 0
+        self.db_path = db_path
+        self.symbols = list(fixture.symbols)
+
+        # Replayed bars must stay inside the pipeline's 24h lookback window
+        total = needed
+        self.spacing = timedelta(seconds=min(fixture.interval_seconds, 23 * 3600 / max(total, 1)))
+        self._cursor = 0
+        self._anchor: Optional[datetime] = None
+
+    # ------------------------------------------------------------------
+
+    async def run(self) -> Dict[str, Any]:
+        if ROOT_DIR not in sys.path:
+            sys.path.insert(0, ROOT_DIR)
+        import signal_generator as sg
+        from backend.app.core import monitoring
+        from backend.app.services.cooldown_store import CooldownStore
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from sqlalchemy.orm import sessionmaker
+        from sqlmodel.ext.asyncio.session import AsyncSession
+
+        tmp_dir = None
+        db_path = self.db_path
+        if db_path is None:
+            tmp_dir = tempfile.TemporaryDirectory(prefix="pipeline_replay_")
+            db_path = os.path.join(tmp_dir.name, "replay.db")
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", future=True)
+        session_factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        tick_model = sg.PriceTick
+        async with engine.begin() as conn:
+            await conn.run_sync(_create_tick_table, tick_model.__table__)
+
+        async def get_session():
+            async with session_factory() as session:
+                yield session
+
+        live_prices = StubLivePrices()
+        self._anchor = datetime.utcnow() - self.spacing * (self.warmup_bars + self.cycles * self.bars_per_cycle)
+        self._cursor = 0
+
+        async def insert_next(n_bars: int) -> List[Any]:
+            ticks = []
+            for i in range(self._cursor, self._cursor + n_bars):
+                ts = self._anchor + self.spacing * i
+                for symbol, rows in self.fixture.symbols.items():
+                    o, h, lo, c, v = rows[i]
+                    ticks.append(tick_model(symbol=symbol, market="crypto", price=c, open=o, high=h, low=lo,
+                                            volume=v, ts=ts, received_at=ts))
+                    live_prices.prices[symbol] = (c, ts)
+            self._cursor += n_bars
+            async with session_factory() as session:
+                session.add_all(ticks)
+                await session.commit()
+            return ticks
+
+        async def fake_crypto_batch(crypto_symbols, coingecko_ids):
+            return {"replay": await insert_next(self.bars_per_cycle)}
+
+        async def empty_batch(*_args, **_kwargs):
+            return {}
+
+        recorder = _StageRecorder(monitoring.stage_latency)
+        config_patch = {"ASSETS": list(self.symbols), "CRYPTO_SYMBOLS": list(self.symbols),
+                        "FOREX_PAIRS": [], "COINGECKO_IDS": []}
+        module_patch = {
+            "AIFilter": lambda **kw: StubAIFilter(latency=self.ai_latency, approve_ratio=self.ai_approve_ratio,
+                                                  confidence_threshold=kw.get("confidence_threshold", 6.0)),
+            "TelegramNotifier": lambda **kw: StubTelegram(latency=self.telegram_latency),
+            "SignalLogger": StubSignalLogger,
+            "LivePriceCache": lambda **kw: live_prices,
+            "get_session": get_session,
+            "collect_crypto_batch": fake_crypto_batch,
+            "collect_forex_batch": empty_batch,
+            "collect_additional_crypto_forex_batch": empty_batch,
+            "stage_latency": recorder,
+        }
+
+        cycle_times: List[float] = []
+        try:
+            with _patched(sg, module_patch), _patched(sg.config, config_patch), \
+                    _patched(monitoring, {"stage_latency": recorder}):
+                generator = sg.SignalGenerator()
+                generator.grace_period_active = False
+                generator.signal_pacing_seconds = 0.0
+                generator.cooldowns = CooldownStore("pipeline_replay",
+                                                    ttl_seconds=generator.signal_cooldown_hours * 3600)
+                generator.profiler.enabled = False
+                if self.inject_rate > 0:
+                    generator.run_strategies = self._injecting(generator, live_prices)
+
+                await insert_next(self.warmup_bars)
+                recorder.samples.clear()
+
+                started = time.perf_counter()
+                for _ in range(self.cycles):
+                    t0 = time.perf_counter()
+                    await generator.run_cycle()
+                    cycle_times.append(time.perf_counter() - t0)
+                wall = time.perf_counter() - started
+        finally:
+            await engine.dispose()
+            if tmp_dir is not None:
+                tmp_dir.cleanup()
+
+        return self._report(generator, recorder, cycle_times, wall)
+
+    def _injecting(self, generator, live_prices: StubLivePrices):
+        """Wrap run_strategies to append a seeded synthetic signal with probability inject_rate."""
+        original = generator.run_strategies
+        rng = random.Random(self.seed)
+        names = [name for name in generator.strategies if name != "sentiment_filter"]
+        self.injected = 0
+
+        async def run_strategies(symbol: str) -> List[Dict[str, Any]]:
+            signals = await original(symbol)
+            if rng.random() < self.inject_rate and symbol in live_prices.prices:
+                price = live_prices.prices[symbol][0]
+                name = rng.choice(names)
+                action = rng.choice(("buy", "sell"))
+                side = 1 if action == "buy" else -1
+                now = datetime.utcnow()
+                signal = {
+                    "strategy": name, "symbol": symbol, "action": action, "entry": price,
+                    "stop_loss": price * (1 - side * 0.01), "take_profit": price * (1 + side * 0.02),
+                    "confidence": rng.uniform(0.55, 0.9), "timestamp": now.isoformat(),
+                    "signal_generated_at": now, "reference_price": price, "injected": True,
+                }
+                signal.update(generator._calculate_time_limit(name))
+                signals.append(signal)
+                self.injected += 1
+            return signals
+
+        return run_strategies
+
+    def _report(self, generator, recorder: _StageRecorder, cycle_times: List[float], wall: float) -> Dict[str, Any]:
+        by_stage: Dict[str, List[float]] = defaultdict(list)
+        by_strategy: Dict[str, List[float]] = defaultdict(list)
+        for (stage, target), values in recorder.samples.items():
+            by_stage[stage].extend(values)
+            if stage == "strategy_eval":
+                by_strategy[target].extend(values)
+
+        return {
+            "meta": {
+                "created": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+                "commit": _git_commit(),
+                "python": sys.version.split()[0],
+                "fixture": self.fixture.meta,
+                "symbols": len(self.symbols),
+                "cycles": self.cycles,
+                "warmup_bars": self.warmup_bars,
+                "bars_per_cycle": self.bars_per_cycle,
+                "ai_latency": self.ai_latency,
+                "telegram_latency": self.telegram_latency,
+                "inject_rate": self.inject_rate,
+                "seed": self.seed,
+            },
+            "wall_seconds": wall,
+            "cycles_per_sec": self.cycles / wall if wall > 0 else 0.0,
+            "cycle": _percentiles(cycle_times),
+            "stages": {stage: _percentiles(values) for stage, values in sorted(by_stage.items())},
+            "strategies": {name: _percentiles(values) for name, values in sorted(by_strategy.items())},
+            "signals": {
+                "generated": int(generator.stats.get("total_signals", 0)),
+                "injected": self.injected,
+                "ai_calls": generator.ai_filter.calls,
+                "sent": len(generator.telegram.sent),
+            },
+            "peak_rss_mb": _peak_rss_mb(),
+        }
+
+
+def _create_tick_table(conn, table) -> None:
+    """CREATE TABLE plus its indexes, once per index name (the model module is imported under two
+    package paths, so the shared metadata can list the same index twice)."""
+    from sqlalchemy.schema import CreateIndex, CreateTable
+
+    conn.execute(CreateTable(table))
+    created = set()
+    for index in table.indexes:
+        if index.name not in created:
+            conn.execute(CreateIndex(index))
+            created.add(index.name)
+
+
+@contextmanager
+def _patched(target: Any, values: Dict[str, Any]) -> Iterator[None]:
+    missing = object()
+    saved = {name: getattr(target, name, missing) for name in values}
+    for name, value in values.items():
+        setattr(target, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is missing:
+                delattr(target, name)
+            else:
+                setattr(target, name, value)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        import subprocess
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+# ----------------------------------------------------------------------
+# Baselines
+# ----------------------------------------------------------------------
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = 0.10,
+                    metric: str = "p95") -> List[Dict[str, Any]]:
+    """
+    Compare latency percentiles (cycle and every stage) and throughput against a baseline.
+    Returns one row per metric with ratio current/baseline and a `regression` flag when the
+    current value is worse by more than `tolerance` (latency up / throughput down).
+    """
+    rows = []
+
+    def add(name: str, base: float, cur: float, higher_is_better: bool = False) -> None:
+        if base <= 0:
+            return
+        ratio = cur / base
+        worse = (ratio < 1 - tolerance) if higher_is_better else (ratio > 1 + tolerance)
+        rows.append({"metric": name, "baseline": base, "current": cur, "ratio": ratio, "regression": worse})
+
+    add("cycles_per_sec", baseline.get("cycles_per_sec", 0.0), current.get("cycles_per_sec", 0.0),
+        higher_is_better=True)
+    add(f"cycle.{metric}", baseline["cycle"].get(metric, 0.0), current["cycle"].get(metric, 0.0))
+    for stage, stats in baseline.get("stages", {}).items():
+        if stage in current.get("stages", {}):
+            add(f"{stage}.{metric}", stats.get(metric, 0.0), current["stages"][stage].get(metric, 0.0))
+    add("peak_rss_mb", baseline.get("peak_rss_mb", 0.0), current.get("peak_rss_mb", 0.0))
+    return rows
+
+
+def quiet_logs(level: str = "WARNING") -> None:
+    """Replace loguru sinks with a single stderr sink (the pipeline logs every signal at INFO)."""
+    logger.remove()
+    logger.add(sys.stderr, level=level)
@@ -0,0 +1,365 @@
+"""
+Shard Coordinator
+Process-sharded strategy evaluation for the signal generator.
+
+- HashRing: consistent hashing of symbols onto worker ids (virtual nodes), so adding or
+  removing an asset or a worker moves only the symbols that have to move
+- Each worker process owns the strategy state of its symbols and only evaluates them;
+  signals stream back to the coordinator, which keeps consensus, cooldowns, the AI filter
+  and Telegram in one process
+- reshard() on asset-list or worker-count changes: the old owner drops a moved symbol's
+  state, the new owner rebuilds it from the 24h tick window on its next cycle
+- Per-worker lag: queue delay, evaluation time, round trip and cycles behind (a busy worker
+  is not sent another cycle; its late result is merged into the next one)
+- Plain multiprocessing queues (spawn start method), no broker
+
+The work done in a worker is an "engine" loaded from a "module:Class" path, built once per
+process with the worker id:
+    engine.evaluate(symbols) -> awaitable list of signals (feed + evaluate, like one cycle)
+    engine.drop(symbols)     -> forget state of symbols that moved away
+    engine.close()           -> optional
+"""
+
+import asyncio
+import bisect
+import hashlib
+import multiprocessing
+import os
+import pickle
+import queue
+import sys
+import time
+from dataclasses import asdict, dataclass
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from loguru import logger
+
+from backend.app.core.monitoring import shard_worker_behind, shard_worker_lag
+
+DEFAULT_ENGINE = "services.shard_coordinator:SignalGeneratorEngine"
+
+
+def _ring_hash(key: str) -> int:
+    # Not hash(): str hashes are randomized per process
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent-hash ring of nodes, `vnodes` points per node."""
+
+    def __init__(self, nodes: Iterable[str], vnodes: int = 64):
+        self.nodes = sorted(set(nodes))
+        self.vnodes = vnodes
+        points = sorted((_ring_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(vnodes))
+        self._points = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def owner(self, key: str) -> str:
+        if not self._points:
+            raise ValueError("HashRing has no nodes")
+        index = bisect.bisect(self._points, _ring_hash(key)) % len(self._points)
+        return self._owners[index]
+
+    def assign(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        """node -> its keys (every node present, keys in input order)."""
+        assignment: Dict[str, List[str]] = {node: [] for node in self.nodes}
+        for key in keys:
+            assignment[self.owner(key)].append(key)
+        return assignment
+
+
+class SignalGeneratorEngine:
+    """Default worker engine: a SignalGenerator whose strategies only see this worker's symbols."""
+
+    def __init__(self, worker_id: str):
+        # Under spawn the parent's script is re-imported as __mp_main__; reuse it rather than
+        # executing signal_generator a second time in every worker
+        main = sys.modules.get("__mp_main__")
+        if main is not None and Path(getattr(main, "__file__", "") or "").name == "signal_generator.py":
+            sys.modules.setdefault("signal_generator", main)
+        import signal_generator
+
+        self.worker_id = worker_id
+        self.generator = signal_generator.SignalGenerator()
+
+    async def evaluate(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        await self.generator.feed_symbols(symbols)
+        return await self.generator.evaluate_symbols(symbols)
+
+    def drop(self, symbols: List[str]) -> None:
+        self.generator.drop_symbols(symbols)
+
+    def close(self) -> None:
+        pass
+
+
+def _load_engine(path: str):
+    module_name, _, class_name = path.partition(":")
+    return getattr(import_module(module_name), class_name)
+
+
+def _worker_main(worker_id: str, engine_path: str, inbox, outbox) -> None:
+    """Worker process loop: ("assign", symbols) / ("cycle", id, dispatched_at) / ("stop",)."""
+    engine = _load_engine(engine_path)(worker_id)
+    loop = asyncio.new_event_loop()
+    symbols: List[str] = []
+    outbox.put(("ready", worker_id, os.getpid()))
+    try:
+        while True:
+            message = inbox.get()
+            kind = message[0]
+            if kind == "stop":
+                break
+            if kind == "assign":
+                owned = set(message[1])
+                dropped = [symbol for symbol in symbols if symbol not in owned]
+                if dropped:
+                    engine.drop(dropped)
+                symbols = list(message[1])
+            elif kind == "cycle":
+                _, cycle_id, dispatched_at = message
+                started_at = time.time()
+                error = None
+                try:
+                    signals = loop.run_until_complete(engine.evaluate(symbols))
+                except Exception as e:
+                    signals, error = [], f"{type(e).__name__}: {e}"
+                # Pickle here: a Queue pickles in its feeder thread, where a failure is only printed
+                try:
+                    payload = pickle.dumps(signals)
+                except Exception as e:
+                    payload, error = pickle.dumps([]), f"unpicklable signals: {e}"
+                outbox.put(("result", worker_id, cycle_id, payload, {
+                    "dispatched_at": dispatched_at,
+                    "started_at": started_at,
+                    "finished_at": time.time(),
+                    "symbols": len(symbols),
+                    "error": error,
+                }))
+    finally:
+        close = getattr(engine, "close", None)
+        if close is not None:
+            close()
+        loop.close()
+
+
+@dataclass
+class WorkerLag:
+    worker: str
+    symbols: int = 0
+    last_cycle: int = 0  # last cycle the worker reported
+    queue_seconds: float = 0.0  # dispatch -> picked up by the worker
+    eval_seconds: float = 0.0
+    round_trip_seconds: float = 0.0  # dispatch -> result back at the coordinator
+    cycles_behind: int = 0
+    errors: int = 0
+    restarts: int = 0
+
+
+class ShardCoordinator:
+    """
+    Usage:
+        shards = ShardCoordinator(workers=4)
+        shards.start(config.ASSETS)
+        signals = await shards.run_cycle(config.ASSETS)  # reshards if the asset list changed
+        shards.lag_report()
+        shards.stop()
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        engine: str = DEFAULT_ENGINE,
+        vnodes: int = 64,
+        cycle_timeout: float = 120.0,
+        start_method: str = "spawn",
+    ):
+        if workers < 1:
+            raise ValueError("ShardCoordinator needs at least one worker")
+        self.workers = workers
+        self.engine = engine
+        self.vnodes = vnodes
+        self.cycle_timeout = cycle_timeout
+        self._ctx = multiprocessing.get_context(start_method)
+        self._outbox = self._ctx.Queue()
+        self._procs: Dict[str, Any] = {}
+        self._inboxes: Dict[str, Any] = {}
+        self._assignment: Dict[str, List[str]] = {}
+        self._ring: Optional[HashRing] = None
+        self._in_flight: Dict[str, int] = {}  # worker -> cycle it is still evaluating
+        self._cycle = 0
+        self.lag: Dict[str, WorkerLag] = {}
+
+    @staticmethod
+    def worker_ids(workers: int) -> List[str]:
+        return [f"shard-{i}" for i in range(workers)]
+
+    @property
+    def assignment(self) -> Dict[str, List[str]]:
+        return {worker: list(symbols) for worker, symbols in self._assignment.items()}
+
+    def start(self, symbols: Iterable[str]) -> None:
+        self.reshard(symbols)
+
+    def _spawn(self, worker: str) -> None:
+        inbox = self._ctx.Queue()
+        proc = self._ctx.Process(
+            target=_worker_main, args=(worker, self.engine, inbox, self._outbox),
+            name=f"signal-{worker}", daemon=True,
+        )
+        proc.start()
+        self._procs[worker], self._inboxes[worker] = proc, inbox
+        self.lag.setdefault(worker, WorkerLag(worker))
+
+    def _retire(self, worker: str) -> None:
+        self._inboxes.pop(worker).put(("stop",))
+        proc = self._procs.pop(worker)
+        proc.join(timeout=10)
+        if proc.is_alive():
+            proc.terminate()
+        self._in_flight.pop(worker, None)
+        self.lag.pop(worker, None)
+        for gauge in (shard_worker_lag, shard_worker_behind):
+            try:
+                gauge.remove(worker)
+            except KeyError:
+                pass  # never reported
+
+    def reshard(self, symbols: Iterable[str], workers: Optional[int] = None) -> Dict[str, List[str]]:
+        """
+        Assign `symbols` over `workers` (default: unchanged) processes. Returns the symbols
+        that moved between live workers, were added and were removed.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if workers is not None:
+            if workers < 1:
+                raise ValueError("ShardCoordinator needs at least one worker")
+            self.workers = workers
+        old_owner = {symbol: worker for worker, owned in self._assignment.items() for symbol in owned}
+        wanted = self.worker_ids(self.workers)
+        for worker in [w for w in self._procs if w not in wanted]:
+            self._retire(worker)
+        for worker in wanted:
+            if worker not in self._procs:
+                self._spawn(worker)
+
+        self._ring = HashRing(wanted, self.vnodes)
+        self._assignment = self._ring.assign(symbols)
+        for worker, owned in self._assignment.items():
+            self._inboxes[worker].put(("assign", owned))
+            self.lag[worker].symbols = len(owned)
+
+        changes = {
+            "moved": [s for s in symbols if s in old_owner and old_owner[s] != self._ring.owner(s)],
+            "added": [s for s in symbols if s not in old_owner],
+            "removed": [s for s in old_owner if s not in set(symbols)],
+        }
+        logger.info(
+            f"Sharded {len(symbols)} symbols over {self.workers} workers "
+            f"({len(changes['moved'])} moved, {len(changes['added'])} added, {len(changes['removed'])} removed)"
+        )
+        return changes
+
+    def _revive_dead_workers(self) -> None:
+        for worker, proc in list(self._procs.items()):
+            if proc.is_alive():
+                continue
+            logger.warning(f"Shard worker {worker} exited (code {proc.exitcode}) - restarting")
+            self._inboxes.pop(worker)
+            self._procs.pop(worker)
+            self._in_flight.pop(worker, None)
+            self._spawn(worker)
+            self.lag[worker].restarts += 1
+            self._inboxes[worker].put(("assign", self._assignment.get(worker, [])))
+
+    async def run_cycle(self, symbols: Iterable[str]) -> List[Dict[str, Any]]:
+        """Evaluate `symbols` on the workers; returns their signals (late ones included)."""
+        symbols = list(dict.fromkeys(symbols))
+        if self._ring is None or set(symbols) != {s for owned in self._assignment.values() for s in owned}:
+            self.reshard(symbols)
+        self._revive_dead_workers()
+
+        self._cycle += 1
+        cycle = self._cycle
+        for worker, inbox in self._inboxes.items():
+            busy_with = self._in_flight.get(worker)
+            if busy_with is not None:
+                self.lag[worker].cycles_behind = cycle - busy_with
+                shard_worker_behind.labels(worker=worker).set(cycle - busy_with)
+                continue
+            inbox.put(("cycle", cycle, time.time()))
+            self._in_flight[worker] = cycle
+
+        signals: List[Dict[str, Any]] = []
+        deadline = time.monotonic() + self.cycle_timeout
+        while any(busy == cycle for busy in self._in_flight.values()):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                late = sorted(w for w, busy in self._in_flight.items() if busy == cycle)
+                logger.warning(
+                    f"Shard cycle {cycle}: no result from {', '.join(late)} within {self.cycle_timeout:.0f}s"
+                )
+                break
+            try:
+                message = await asyncio.to_thread(self._outbox.get, True, min(remaining, 0.5))
+            except queue.Empty:
+                for worker, busy in list(self._in_flight.items()):
+                    proc = self._procs.get(worker)
+                    if busy == cycle and (proc is None or not proc.is_alive()):
+                        logger.warning(f"Shard worker {worker} died during cycle {cycle}")
+                        self._in_flight.pop(worker)
+                        if worker in self.lag:
+                            self.lag[worker].errors += 1
+                continue
+            signals.extend(self._receive(message))
+
+        # Results that were already waiting (e.g. a late worker that has just finished)
+        while True:
+            try:
+                message = self._outbox.get_nowait()
+            except queue.Empty:
+                break
+            signals.extend(self._receive(message))
+
+        order = {symbol: i for i, symbol in enumerate(symbols)}
+        signals.sort(key=lambda s: order.get(s.get("symbol"), len(order)))
+        return signals
+
+    def _receive(self, message) -> List[Dict[str, Any]]:
+        if message[0] != "result":
+            return []  # "ready"
+        _, worker, cycle_id, payload, meta = message
+        received_at = time.time()
+        if self._in_flight.get(worker) == cycle_id:
+            del self._in_flight[worker]
+        lag = self.lag.get(worker)
+        if lag is None:
+            return []  # retired since
+        lag.last_cycle = cycle_id
+        lag.symbols = meta["symbols"]
+        lag.queue_seconds = meta["started_at"] - meta["dispatched_at"]
+        lag.eval_seconds = meta["finished_at"] - meta["started_at"]
+        lag.round_trip_seconds = received_at - meta["dispatched_at"]
+        lag.cycles_behind = 0
+        shard_worker_lag.labels(worker=worker).set(lag.round_trip_seconds)
+        shard_worker_behind.labels(worker=worker).set(0)
+        if meta["error"]:
+            lag.errors += 1
+            logger.warning(f"Shard worker {worker} cycle {cycle_id} failed: {meta['error']}")
+        return pickle.loads(payload)
+
+    def lag_report(self) -> Dict[str, Dict[str, Any]]:
+        return {worker: asdict(lag) for worker, lag in sorted(self.lag.items())}
+
+    def stop(self) -> None:
+        for worker in list(self._procs):
+            self._retire(worker)
+        self._assignment, self._ring = {}, None
+
+    def __enter__(self) -> "ShardCoordinator":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,79 @@
+"""
+Signal Consensus Index
+Per-cycle index of generated signals grouped by (symbol, action).
+
+Built once per cycle in O(n) so that reliability scoring and the multi-indicator
+filter can look up agreeing strategies in O(1) instead of rescanning every signal.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Any, Iterable, Optional, Set, Tuple
+
+
+@dataclass
+class ConsensusGroup:
+    """Aggregated view of all agreeing signals for one (symbol, action)."""
+
+    count: int = 0
+    weighted_sum: float = 0.0
+    confidence_sum: float = 0.0
+    max_confidence: float = 0.0
+    strategies: Set[str] = field(default_factory=set)
+
+    @property
+    def avg_confidence(self) -> float:
+        return self.confidence_sum / self.count if self.count else 0.0
+
+
+class ConsensusIndex:
+    """
+    Groups signals by (symbol, action) with precomputed weighted sums,
+    max/avg confidence and strategy sets.
+
+    Only signals with confidence >= min_confidence count towards consensus,
+    matching the agreement rule used by SignalGenerator._calculate_reliability.
+    """
+
+    _EMPTY = ConsensusGroup()
+
+    def __init__(
+        self,
+        signals: Iterable[Dict[str, Any]],
+        strategy_weights: Dict[str, float],
+        min_confidence: float = 0.0,
+    ):
+        """
+        Build the index.
+
+        Args:
+            signals: All signals generated this cycle
+            strategy_weights: strategy name -> ensemble weight (unknown strategies weigh 1.0)
+            min_confidence: Minimum confidence for a signal to count as agreeing
+        """
+        self.min_confidence = min_confidence
+        self.groups: Dict[Tuple[Any, Any], ConsensusGroup] = {}
+        self.size = 0
+
+        for signal in signals:
+            self.size += 1
+            confidence = signal.get("confidence", 0.0)
+            if confidence < min_confidence:
+                continue
+            key = (signal.get("symbol"), signal.get("action"))
+            group = self.groups.get(key)
+            if group is None:
+                group = self.groups[key] = ConsensusGroup()
+            strategy = signal.get("strategy", "unknown")
+            group.count += 1
+            group.weighted_sum += confidence * strategy_weights.get(strategy, 1.0)
+            group.confidence_sum += confidence
+            if confidence > group.max_confidence:
+                group.max_confidence = confidence
+            group.strategies.add(strategy)
+
+    def lookup(self, symbol: Optional[str], action: Optional[str]) -> ConsensusGroup:
+        """Return the consensus group for (symbol, action); an empty group if none agree."""
+        return self.groups.get((symbol, action), self._EMPTY)
+
+    def __len__(self) -> int:
+        return self.size
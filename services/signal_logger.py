@@ -8,12 +8,8 @@ from datetime import datetime, date
 from pathlib import Path
 from typing import Dict, Any, List
 from collections import defaultdict
-import sys
 
-# Add backend to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
-
-from app.core.logger import logger
+from backend.app.core.logger import logger
 
 
 class SignalLogger:
@@ -0,0 +1,138 @@
+"""
+Strategy warm-state snapshots.
+
+After a restart every strategy rebuilds its per-symbol state (price history, incremental
+indicator state, multi-timeframe bars, open gaps and order blocks) from the database, and
+the signal generator holds signals back for its startup grace period meanwhile. A snapshot
+saves that state together with the active cooldowns, so a restart continues from the last
+snapshot and the grace period only has to cover the time since it was written.
+
+File layout:
+
+    b"VYSS" | format version (u16) | created_at (f64, epoch seconds) | zlib(pickle(payload))
+
+payload = {"strategies": {name: {"class", "version", "state"}}, "cooldowns": {namespace: rows}}
+
+Files are written to a temporary file next to the target and renamed over it, so a crash
+mid-write leaves the previous snapshot intact. A strategy whose class or state_version
+changed since the snapshot only gets its price history back; its caches are rebuilt.
+Snapshots are pickles: only load files this service wrote.
+"""
+
+import os
+import pickle
+import struct
+import tempfile
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.app.core.logger import logger
+
+MAGIC = b"VYSS"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct(">4sHd")
+
+
+@dataclass
+class Snapshot:
+    """A decoded snapshot file."""
+
+    created_at: float
+    strategies: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    cooldowns: Dict[str, List[Tuple[Any, float, float]]] = field(default_factory=dict)
+
+    def age(self, now: Optional[float] = None) -> float:
+        """Seconds since the snapshot was taken."""
+        return max(0.0, (time.time() if now is None else now) - self.created_at)
+
+
+def capture(strategies: Dict[str, Any], cooldown_stores: Iterable[Any] = (), now: Optional[float] = None) -> bytes:
+    """
+    Pickle the warm state of `strategies` and the active entries of `cooldown_stores`.
+
+    Runs on the caller's thread so the state is consistent; write() does the rest off-loop.
+    """
+    now = time.time() if now is None else now
+    payload = {
+        "strategies": {
+            name: {
+                "class": type(strategy).__qualname__,
+                "version": strategy.state_version,
+                "state": strategy.export_state(),
+            }
+            for name, strategy in strategies.items()
+            if hasattr(strategy, "export_state")
+        },
+        "cooldowns": {store.namespace: store.entries(now) for store in cooldown_stores},
+    }
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, now) + pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def write(path: Path, captured: bytes, level: int = 6) -> int:
+    """Compress a capture() result and atomically replace `path` with it. Returns the file size."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = captured[:_HEADER.size] + zlib.compress(captured[_HEADER.size:], level)
+    fd, tmp_name = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    return len(data)
+
+
+def read(path: Path) -> Optional[Snapshot]:
+    """The snapshot at `path`; None if there is none or it cannot be used (logged)."""
+    path = Path(path)
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    except OSError as exc:
+        logger.warning(f"Could not read state snapshot {path}: {exc}")
+        return None
+    if len(data) < _HEADER.size:
+        logger.warning(f"Ignoring truncated state snapshot {path}")
+        return None
+    magic, version, created_at = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        logger.warning(f"Ignoring state snapshot {path}: unsupported format ({magic!r} v{version})")
+        return None
+    try:
+        payload = pickle.loads(zlib.decompress(data[_HEADER.size:]))
+    except Exception as exc:
+        logger.warning(f"Ignoring corrupt state snapshot {path}: {exc}")
+        return None
+    return Snapshot(created_at, payload.get("strategies", {}), payload.get("cooldowns", {}))
+
+
+def restore(snapshot: Snapshot, strategies: Dict[str, Any], cooldown_stores: Iterable[Any] = (),
+            now: Optional[float] = None) -> Dict[str, List[str]]:
+    """
+    Load `snapshot` into `strategies` and `cooldown_stores`.
+
+    Returns strategy name -> restored attribute names (strategies missing from the snapshot
+    are left cold).
+    """
+    restored: Dict[str, List[str]] = {}
+    for name, strategy in strategies.items():
+        entry = snapshot.strategies.get(name)
+        if entry is None or not hasattr(strategy, "import_state"):
+            continue
+        # A different class under the same name only shares the base layout
+        version = entry["version"] if entry["class"] == type(strategy).__qualname__ else None
+        restored[name] = strategy.import_state(entry["state"], version)
+    for store in cooldown_stores:
+        store.merge(snapshot.cooldowns.get(store.namespace, ()), now)
+    return restored
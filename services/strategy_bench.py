@@ -0,0 +1,336 @@
+"""
+Per-strategy micro-benchmarks across history sizes.
+
+test_strategies.py checks what each strategy returns; this measures what it costs and how
+that cost grows with the history it is handed:
+
+- Every strategy registered in SignalGenerator.strategies and AIEnsemble.strategies
+  (one entry per class, with the names it is registered under)
+- Pattern-model strategies: check_for_signal(), each pattern hook (_detect_pattern,
+  _confirm_completion, _get_action_from_pattern, _build_signal) and the legacy run()
+  entry point AIEnsemble.aggregate() calls
+- Multi-timeframe strategies (TrendFollowing, VolatilityBreakout): generate_signal() with the
+  cold-start DB read replaced by a prebuilt 5-minute frame (later repetitions read the
+  streaming bars, i.e. a cycle without a new candle), plus their DataFrame indicator methods
+- Seeded trending, ranging and volatile series at history sizes 60/200/1000/5000
+- Scaling: log-log slope of the median cost between consecutive sizes. A hook whose slope
+  over the largest step exceeds `superlinear_threshold` is flagged (an O(n^2) helper such
+  as a per-bar RSI recompute shows up near 2.0; linear work stays near 1.0)
+
+Cooldown bookkeeping is disabled on the benchmarked instances so a completed pattern is
+evaluated in full on every repetition instead of returning early as a duplicate.
+
+Usage:
+    python scripts/bench_strategies.py --sizes 60,200,1000,5000 --save bench/strategies.json
+"""
+
+import asyncio
+import math
+import os
+import random
+import statistics
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SIZES = (60, 200, 1000, 5000)
+REGIMES = ("trending", "ranging", "volatile")
+SOURCES = ("signal_generator", "ai_ensemble")
+PATTERN_HOOKS = ("_detect_pattern", "_confirm_completion", "_get_action_from_pattern", "_build_signal")
+FRAME_HOOKS = ("analyze_timeframe", "calculate_adx", "calculate_atr", "calculate_volatility_metrics", "detect_breakout")
+BAR_SECONDS = 300  # 5-minute bars, the resolution the DataFrame strategies resample to
+
+BENCH_SYMBOL = "BENCHUSDT"
+RUN_SYMBOL = "BENCHRUN"  # run() rebuilds its own history from closes; keep it off BENCH_SYMBOL
+
+
+# ----------------------------------------------------------------------
+# Synthetic series
+# ----------------------------------------------------------------------
+
+def synthetic_candles(regime: str, n_bars: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Seeded OHLCV candles (StrategyBase.update_data format) for one market regime."""
+    if regime not in REGIMES:
+        raise ValueError(f"Unknown regime '{regime}' (expected one of {', '.join(REGIMES)})")
+    rng = random.Random(f"{regime}:{seed}")
+    start = datetime(2024, 1, 1)
+    price = 100.0
+    candles = []
+    for t in range(n_bars):
+        if regime == "trending":
+            vol = 0.002
+            close = price * (1.0 + 0.0012 + rng.gauss(0.0, vol))
+        elif regime == "ranging":
+            vol = 0.0015
+            close = 100.0 * (1.0 + 0.02 * math.sin(t / 15.0)) * (1.0 + rng.gauss(0.0, vol))
+        else:
+            vol = 0.008
+            jump = rng.choice((-1.0, 1.0)) * rng.uniform(0.02, 0.05) if rng.random() < 0.02 else 0.0
+            close = price * (1.0 + jump + rng.gauss(0.0, vol))
+        high = max(price, close) * (1.0 + abs(rng.gauss(0.0, vol / 2)))
+        low = min(price, close) * (1.0 - abs(rng.gauss(0.0, vol / 2)))
+        volume = rng.uniform(500.0, 1_500.0) * (3.0 if rng.random() < 0.05 else 1.0)
+        candles.append({
+            "timestamp": start + timedelta(seconds=BAR_SECONDS * t),
+            "open": price, "high": high, "low": low, "close": close, "volume": volume,
+        })
+        price = close
+    return candles
+
+
+# ----------------------------------------------------------------------
+# Registry
+# ----------------------------------------------------------------------
+
+@dataclass
+class RegisteredStrategy:
+    """One strategy class with the registry names it appears under."""
+
+    strategy: Any
+    names: Dict[str, str] = field(default_factory=dict)  # source -> registry key
+
+    @property
+    def name(self) -> str:
+        return self.names.get("signal_generator") or next(iter(self.names.values()))
+
+
+def registered_strategies(sources: Iterable[str] = SOURCES) -> List[RegisteredStrategy]:
+    """Instantiate the registries and return one entry per strategy class."""
+    by_class: Dict[type, RegisteredStrategy] = {}
+    for source in sources:
+        if source == "signal_generator":
+            registry = _signal_generator_strategies()
+        elif source == "ai_ensemble":
+            from backend.app.services.ai_ensemble import AIEnsemble
+            registry = AIEnsemble().strategies
+        else:
+            raise ValueError(f"Unknown strategy source '{source}' (expected one of {', '.join(SOURCES)})")
+        for name, strategy in registry.items():
+            entry = by_class.setdefault(type(strategy), RegisteredStrategy(strategy))
+            entry.names[source] = name
+    return list(by_class.values())
+
+
+def _signal_generator_strategies() -> Dict[str, Any]:
+    """SignalGenerator().strategies, built with the replay stubs so nothing touches the network."""
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    import signal_generator as sg
+    from services.pipeline_replay import StubAIFilter, StubLivePrices, StubSignalLogger, StubTelegram, _patched
+
+    module_patch = {
+        "AIFilter": lambda **kw: StubAIFilter(),
+        "TelegramNotifier": lambda **kw: StubTelegram(),
+        "SignalLogger": StubSignalLogger,
+        "LivePriceCache": lambda **kw: StubLivePrices(),
+    }
+    with _patched(sg, module_patch), _patched(sg.config, {"COOLDOWN_DB_URL": None}):
+        return sg.SignalGenerator().strategies
+
+
+# ----------------------------------------------------------------------
+# Timing
+# ----------------------------------------------------------------------
+
+def _overrides(strategy: Any, method: str) -> bool:
+    """True if a subclass of StrategyBase defines `method` (base versions just raise)."""
+    from backend.app.strategies.base import StrategyBase
+
+    for klass in type(strategy).__mro__:
+        if klass is StrategyBase:
+            return False
+        if method in klass.__dict__:
+            return True
+    return False
+
+
+def _disable_cooldowns(strategy: Any) -> None:
+    strategy._is_duplicate = lambda symbol, action: False
+    strategy._mark_signal_sent = lambda symbol, action: None
+
+
+def _calls(strategy: Any, candles: List[Dict[str, Any]],
+           loop: asyncio.AbstractEventLoop) -> Dict[str, Callable[[], Any]]:
+    """Zero-argument callables for every benchmarkable hook of `strategy` on `candles`."""
+    calls: Dict[str, Callable[[], Any]] = {}
+
+    if _overrides(strategy, "_confirm_completion"):
+        strategy.price_history[BENCH_SYMBOL] = deque(candles, maxlen=len(candles))
+        # _build_signal reads state the detection hooks leave behind (matched block, gap,
+        # level), so it is only timed on series whose final bar completes a pattern
+        try:
+            completed = bool(strategy._confirm_completion(BENCH_SYMBOL))
+            action = strategy._get_action_from_pattern(BENCH_SYMBOL) if completed else None
+        except Exception:
+            action = None
+        for hook in PATTERN_HOOKS:
+            if not _overrides(strategy, hook):
+                continue
+            if hook == "_build_signal":
+                if action:
+                    calls[hook] = lambda: strategy._build_signal(BENCH_SYMBOL, action)
+            else:
+                calls[hook] = lambda fn=getattr(strategy, hook): fn(BENCH_SYMBOL)
+        calls["check_for_signal"] = lambda: strategy.check_for_signal(BENCH_SYMBOL)
+        closes = [c["close"] for c in candles]
+        calls["run"] = lambda: strategy.run(RUN_SYMBOL, closes)
+        return calls
+
+    if callable(getattr(strategy, "generate_signal", None)):
+        import pandas as pd
+
+        frame = pd.DataFrame(candles).set_index("timestamp")
+        # Drop bars streamed at the previous size so generate_signal re-seeds from `frame`
+        getattr(strategy, "_streams", {}).pop(BENCH_SYMBOL, None)
+
+        async def historical_data(*_args, **_kwargs):
+            return frame
+
+        strategy.get_historical_data = historical_data
+        calls["generate_signal"] = lambda: loop.run_until_complete(strategy.generate_signal(None, BENCH_SYMBOL))
+        atr = None
+        for hook in FRAME_HOOKS:
+            fn = getattr(strategy, hook, None)
+            if fn is None:
+                continue
+            if hook == "calculate_adx":
+                calls[hook] = lambda fn=fn: fn(frame, strategy.adx_period)
+            elif hook == "detect_breakout":
+                if atr is None:
+                    atr = float(strategy.calculate_volatility_metrics(frame)["atr"])
+                calls[hook] = lambda fn=fn, atr=atr: fn(frame, atr)
+            else:
+                calls[hook] = lambda fn=fn: fn(frame)
+    return calls
+
+
+def time_call(fn: Callable[[], Any], min_time: float = 0.02, min_reps: int = 3,
+              max_reps: int = 200) -> Tuple[float, int]:
+    """
+    Median seconds per call and the number of timed calls.
+    The first call warms caches; if it alone exceeds `min_time` it is the only sample
+    (keeps O(n^2) hooks at 5000 bars from dominating the run).
+    """
+    t0 = time.perf_counter()
+    fn()
+    first = time.perf_counter() - t0
+    if first >= min_time:
+        return first, 1
+    samples: List[float] = []
+    total = 0.0
+    while len(samples) < max_reps and (total < min_time or len(samples) < min_reps):
+        t0 = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t0
+        samples.append(elapsed)
+        total += elapsed
+    return statistics.median(samples), len(samples)
+
+
+# ----------------------------------------------------------------------
+# Suite
+# ----------------------------------------------------------------------
+
+def scaling_exponents(sizes: List[int], seconds: List[float]) -> List[float]:
+    """Log-log slope between consecutive sizes (1.0 = linear, 2.0 = quadratic)."""
+    slopes = []
+    for (n0, t0), (n1, t1) in zip(zip(sizes, seconds), zip(sizes[1:], seconds[1:])):
+        if t0 <= 0 or t1 <= 0 or n1 == n0:
+            slopes.append(0.0)
+        else:
+            slopes.append(math.log(t1 / t0) / math.log(n1 / n0))
+    return slopes
+
+
+def run_suite(
+    strategies: Optional[List[RegisteredStrategy]] = None,
+    sizes: Iterable[int] = SIZES,
+    regimes: Iterable[str] = REGIMES,
+    seed: int = 42,
+    min_time: float = 0.02,
+    superlinear_threshold: float = 1.3,
+    min_flag_ms: float = 0.05,
+    only: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Time every hook of every strategy at each (regime, size) and summarise scaling.
+
+    A hook is flagged super-linear when, in any regime, the slope over the largest size
+    step exceeds `superlinear_threshold` and it costs at least `min_flag_ms` at the largest
+    size (tiny hooks are dominated by timer noise).
+    """
+    sizes = sorted(sizes)
+    regimes = list(regimes)
+    strategies = strategies if strategies is not None else registered_strategies()
+    if only:
+        wanted = set(only)
+        strategies = [s for s in strategies if wanted & (set(s.names.values()) | {s.name})]
+    series = {(regime, n): synthetic_candles(regime, n, seed) for regime in regimes for n in sizes}
+
+    rows: List[Dict[str, Any]] = []
+    errors: List[Dict[str, Any]] = []
+    loop = asyncio.new_event_loop()
+    try:
+        for entry in strategies:
+            strategy = entry.strategy
+            _disable_cooldowns(strategy)
+            for regime in regimes:
+                for n in sizes:
+                    for hook, fn in _calls(strategy, series[(regime, n)], loop).items():
+                        try:
+                            seconds, reps = time_call(fn, min_time=min_time)
+                        except Exception as e:
+                            errors.append({"strategy": entry.name, "hook": hook, "regime": regime, "size": n,
+                                           "error": f"{type(e).__name__}: {e}"})
+                            continue
+                        rows.append({"strategy": entry.name, "hook": hook, "regime": regime, "size": n,
+                                     "ms": seconds * 1e3, "reps": reps})
+    finally:
+        loop.close()
+
+    return {
+        "meta": {"sizes": sizes, "regimes": regimes, "seed": seed, "min_time": min_time,
+                 "superlinear_threshold": superlinear_threshold, "min_flag_ms": min_flag_ms},
+        "strategies": {entry.name: entry.names for entry in strategies},
+        "rows": rows,
+        "scaling": summarize_scaling(rows, sizes, superlinear_threshold, min_flag_ms),
+        "errors": errors,
+    }
+
+
+def summarize_scaling(rows: List[Dict[str, Any]], sizes: List[int], superlinear_threshold: float = 1.3,
+                      min_flag_ms: float = 0.05) -> List[Dict[str, Any]]:
+    """One row per (strategy, hook): cost curve per regime, worst final-step slope and the flag."""
+    curves: Dict[Tuple[str, str], Dict[str, Dict[int, float]]] = {}
+    for row in rows:
+        curves.setdefault((row["strategy"], row["hook"]), {}).setdefault(row["regime"], {})[row["size"]] = row["ms"]
+
+    summary = []
+    for (strategy, hook), by_regime in curves.items():
+        worst_slope = 0.0
+        worst_regime = None
+        flagged = False
+        curve_ms: Dict[str, List[float]] = {}
+        for regime, points in by_regime.items():
+            measured = [n for n in sizes if n in points]
+            ms = [points[n] for n in measured]
+            curve_ms[regime] = ms
+            slopes = scaling_exponents(measured, ms)
+            if not slopes:
+                continue
+            if worst_regime is None or slopes[-1] > worst_slope:
+                worst_slope, worst_regime = slopes[-1], regime
+            if slopes[-1] > superlinear_threshold and ms[-1] >= min_flag_ms:
+                flagged = True
+        summary.append({
+            "strategy": strategy, "hook": hook, "curve_ms": curve_ms,
+            "max_ms": max((ms[-1] for ms in curve_ms.values() if ms), default=0.0),
+            "exponent": worst_slope, "worst_regime": worst_regime, "superlinear": flagged,
+        })
+    summary.sort(key=lambda s: (not s["superlinear"], -s["exponent"]))
+    return summary
@@ -0,0 +1,254 @@
+"""
+Strategy Executor
+Runs strategy checks for SignalGenerator under each strategy's execution policy and
+per-cycle time budget.
+
+- "inline": check_for_signal on the event loop (the default; cheap strategies)
+- "thread": in a thread pool, so the loop keeps serving collection, WebSocket reads and
+  Telegram sends while a check runs (numpy-heavy checks release the GIL)
+- "process": in a process pool; the symbol's warm state (StrategyBase.state_attributes) and
+  its active cooldowns are handed to the worker and the updated state is handed back
+- Budget: a strategy may spend timeout seconds per cycle across all symbols. A thread or
+  process check is abandoned when it runs past the remaining budget, and an exhausted
+  strategy is skipped for the rest of the cycle; end_cycle() reports both. A strategy whose
+  check is still running after a timeout is skipped (not fed or re-submitted) until it ends.
+
+The policy comes from StrategyBase.execution_policy / eval_timeout, overridden per strategy
+by config.json strategy_sensitivity.<name>.execution / timeout_seconds.
+"""
+
+import asyncio
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from importlib import import_module
+from multiprocessing import get_context
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from backend.app.core.logger import logger
+from backend.app.core.monitoring import strategy_budget_exceeded, strategy_evals_skipped
+
+POLICIES = ("inline", "thread", "process")
+
+
+# ----------------------------------------------------------------------
+# Process pool side
+# ----------------------------------------------------------------------
+
+_worker_strategies: Dict[str, Any] = {}
+
+
+def _check_in_process(class_path: str, symbol: str, state: Dict[str, Any],
+                      cooldowns: List[Tuple[Any, float, float]]) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+    """Worker: check_for_signal on a handed-over symbol state; returns (signal, updated state)."""
+    strategy = _worker_strategies.get(class_path)
+    if strategy is None:
+        module_name, _, class_name = class_path.partition(":")
+        strategy = _worker_strategies[class_path] = getattr(import_module(module_name), class_name)()
+    strategy.import_symbol_state(symbol, state)
+    strategy.cooldowns.clear()
+    strategy.cooldowns.merge(cooldowns)
+    try:
+        return strategy.check_for_signal(symbol), strategy.export_symbol_state(symbol)
+    finally:
+        strategy.drop_symbol(symbol)
+
+
+# ----------------------------------------------------------------------
+# Event loop side
+# ----------------------------------------------------------------------
+
+class StrategyExecutor:
+    """Per-strategy execution policy and time budget for SignalGenerator."""
+
+    def __init__(
+        self,
+        policies: Dict[str, str],
+        budgets: Dict[str, Optional[float]],
+        thread_workers: int = 4,
+        process_workers: int = 2,
+    ):
+        for name, policy in policies.items():
+            if policy not in POLICIES:
+                raise ValueError(f"Unknown execution policy {policy!r} for strategy {name!r} "
+                                 f"(expected one of {', '.join(POLICIES)})")
+        self.policies = policies
+        self.budgets = budgets  # seconds per cycle, None = unlimited
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._inflight: Dict[str, Future] = {}  # strategy -> abandoned check still running
+        self._spent: Dict[str, float] = {}
+        self._skipped: Dict[str, int] = {}
+        self._timed_out: Dict[str, str] = {}  # strategy -> symbol whose check was abandoned
+
+    @classmethod
+    def from_config(cls, config, strategies: Dict[str, Any]) -> "StrategyExecutor":
+        settings = getattr(config, "STRATEGY_SETTINGS", None) or {}
+        default_budget = getattr(config, "STRATEGY_TIMEOUT_SECONDS", 0.0) or None
+        policies, budgets = {}, {}
+        for name, strategy in strategies.items():
+            overrides = settings.get(name, {})
+            policies[name] = overrides.get("execution", getattr(strategy, "execution_policy", "inline"))
+            budget = overrides.get("timeout_seconds", getattr(strategy, "eval_timeout", None))
+            budgets[name] = (budget or None) if budget is not None else default_budget
+        return cls(
+            policies,
+            budgets,
+            thread_workers=getattr(config, "STRATEGY_THREAD_WORKERS", 4),
+            process_workers=getattr(config, "STRATEGY_PROCESS_WORKERS", 2),
+        )
+
+    # ------------------------------------------------------------------
+    # Cycle bookkeeping
+    # ------------------------------------------------------------------
+
+    def begin_cycle(self) -> None:
+        self._spent.clear()
+        self._skipped.clear()
+        self._timed_out.clear()
+
+    def end_cycle(self) -> Dict[str, Dict[str, Any]]:
+        """Strategies that ran out of budget or were skipped this cycle, logged and counted."""
+        report = {}
+        for name in set(self._skipped) | set(self._timed_out) | {n for n in self._spent if self._over_budget(n)}:
+            report[name] = {
+                "spent_seconds": round(self._spent.get(name, 0.0), 3),
+                "budget_seconds": self.budgets.get(name),
+                "skipped": self._skipped.get(name, 0),
+                "timed_out": self._timed_out.get(name),
+                "still_running": self.busy(name),
+            }
+            strategy_budget_exceeded.labels(strategy=name).inc()
+            logger.warning(
+                f"⏱️ {name} exceeded its {self.budgets.get(name)}s budget: {report[name]['spent_seconds']:.2f}s spent, "
+                f"{report[name]['skipped']} symbol(s) skipped"
+                + (f", check on {report[name]['timed_out']} abandoned" if report[name]["timed_out"] else "")
+            )
+        return report
+
+    def busy(self, name: str) -> bool:
+        """True while an abandoned thread/process check of the strategy is still running."""
+        future = self._inflight.get(name)
+        if future is None:
+            return False
+        if future.done():
+            del self._inflight[name]
+            return False
+        return True
+
+    def should_skip(self, name: str) -> bool:
+        """True (and counted) if the strategy is out of budget this cycle or still busy."""
+        if not (self._over_budget(name) or self.busy(name)):
+            return False
+        self._skipped[name] = self._skipped.get(name, 0) + 1
+        strategy_evals_skipped.labels(strategy=name).inc()
+        return True
+
+    def _over_budget(self, name: str) -> bool:
+        budget = self.budgets.get(name)
+        return budget is not None and self._spent.get(name, 0.0) >= budget
+
+    def _remaining(self, name: str) -> Optional[float]:
+        budget = self.budgets.get(name)
+        return None if budget is None else max(0.0, budget - self._spent.get(name, 0.0))
+
+    # ------------------------------------------------------------------
+    # Running checks
+    # ------------------------------------------------------------------
+
+    async def check(self, name: str, strategy: Any, symbol: str) -> Optional[Dict[str, Any]]:
+        """strategy.check_for_signal(symbol) under the strategy's policy; None if skipped or abandoned."""
+        if self.should_skip(name):
+            return None
+        policy = self.policies.get(name, "inline")
+        start = time.perf_counter()
+        try:
+            if policy == "inline":
+                return strategy.check_for_signal(symbol)
+            if policy == "thread":
+                future = self._thread_pool().submit(strategy.check_for_signal, symbol)
+                return await self._wait(name, symbol, future)
+            return await self._check_in_process(name, strategy, symbol)
+        finally:
+            self._spent[name] = self._spent.get(name, 0.0) + (time.perf_counter() - start)
+
+    async def call(
+        self,
+        name: str,
+        symbol: str,
+        make_call: Callable[[], Awaitable[Any]],
+        on_timeout: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> Any:
+        """
+        Await an async strategy call (generate_signal) within the remaining budget; None if
+        skipped or cancelled. `on_timeout` is awaited after a cancellation, e.g. to roll back
+        the database session the call was querying before anything else uses it.
+        """
+        if self.should_skip(name):
+            return None
+        start = time.perf_counter()
+        try:
+            return await asyncio.wait_for(make_call(), self._remaining(name))
+        except asyncio.TimeoutError:
+            self._timed_out[name] = symbol
+            if on_timeout is not None:
+                try:
+                    await on_timeout()
+                except Exception as exc:
+                    logger.warning(f"Recovery after the cancelled {name} call on {symbol} failed: {exc}")
+            return None
+        finally:
+            self._spent[name] = self._spent.get(name, 0.0) + (time.perf_counter() - start)
+
+    async def _check_in_process(self, name: str, strategy: Any, symbol: str) -> Optional[Dict[str, Any]]:
+        cls = type(strategy)
+        cooldowns = [row for row in strategy.cooldowns.entries() if row[0][:2] == (strategy.name, symbol)]
+        future = self._process_pool().submit(
+            _check_in_process,
+            f"{cls.__module__}:{cls.__qualname__}",
+            symbol,
+            strategy.export_symbol_state(symbol),
+            cooldowns,
+        )
+        try:
+            result = await self._wait(name, symbol, future)
+        except BrokenProcessPool:
+            self._processes = None  # a worker died; the next process check starts a new pool
+            raise
+        if result is None:
+            return None  # abandoned: the strategy keeps its previous state
+        signal, state = result
+        strategy.import_symbol_state(symbol, state)
+        if signal and signal.get("action"):
+            strategy._mark_signal_sent(symbol, signal["action"])
+        return signal
+
+    async def _wait(self, name: str, symbol: str, future: Future) -> Any:
+        try:
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), self._remaining(name))
+        except asyncio.TimeoutError:
+            self._timed_out[name] = symbol
+            if not future.cancel():
+                self._inflight[name] = future
+            return None
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="strategy")
+        return self._threads
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        if self._processes is None:
+            # spawn: forking a process that runs an event loop and pool threads is not safe
+            self._processes = ProcessPoolExecutor(max_workers=self.process_workers, mp_context=get_context("spawn"))
+        return self._processes
+
+    def close(self) -> None:
+        """Shut the pools down without waiting for abandoned checks."""
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._threads = self._processes = None
+        self._inflight.clear()
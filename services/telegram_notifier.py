@@ -6,14 +6,9 @@ Sends trading signal notifications via Telegram bot.
 import httpx
 from typing import Dict, Any, Optional
 from datetime import datetime
-import sys
-from pathlib import Path
 import html
 
-# Add backend to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
-
-from app.core.logger import logger
+from backend.app.core.logger import logger
 
 
 class TelegramNotifier:
@@ -127,8 +122,12 @@ class TelegramNotifier:
             price_age = live_price_data.get('age_seconds', 0.0)
             source = live_price_data.get('source', 'unknown')
             
-            if source == "binance_live":
+            if live_price_data.get('is_stale'):
+                live_price_status = f"\n⚠️ <b>WARNING:</b> Price data is {price_age/60:.1f} minutes old - may be stale!"
+            elif source in ("binance_live", "binance_ws") and price_age < 1:
                 live_price_status = f"\n✅ <b>Live Price:</b> Real-time from Binance (&lt;1s old)"
+            elif source in ("binance_live", "binance_ws") and price_age < 60:
+                live_price_status = f"\n✅ <b>Live Price:</b> Real-time from Binance ({price_age:.0f}s old)"
             elif price_age < 60:
                 live_price_status = f"\n✅ <b>Live Price:</b> Fresh data ({price_age:.0f}s old)"
             elif price_age < 300:
@@ -3,17 +3,19 @@
 VyRaTrader Personal AI Signal Generator
 A locally-running AI signal generator that:
 - Collects market data from multiple free sources
-- Runs 9 trading strategies continuously
+- Runs the strategies enabled in config.json continuously
 - Filters signals with local AI (Ollama) or fallback providers
 - Sends notifications via Telegram
 
 Run with: python signal_generator.py
+Start-up import attribution: python signal_generator.py --import-profile
 """
 
 import asyncio
 import json
 import os
 import sys
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any
@@ -30,6 +32,11 @@ from config.settings import SignalGeneratorConfig
 from services.ai_filter import AIFilter
 from services.telegram_notifier import TelegramNotifier
 from services.signal_logger import SignalLogger
+from services.live_price_cache import LivePriceCache
+from services.signal_consensus import ConsensusIndex
+from services.cycle_profiler import CycleProfiler
+from services import state_snapshot
+from services.strategy_executor import StrategyExecutor
 
 # NOW add backend to path for other imports
 backend_path = str(Path(__file__).parent / "backend")
@@ -45,21 +52,31 @@ LOG_DIR = Path("logs")
 LOG_DIR.mkdir(exist_ok=True)
 logger.add(LOG_DIR / "signal_generator.log", rotation="10 MB", retention="14 days", level="INFO")
 
-from app.services.data_collector import run_periodic, collect_crypto_batch, collect_forex_batch, collect_additional_crypto_forex_batch
-from app.strategies.trend_following import TrendFollowingStrategy
-from app.strategies.mean_reversion import MeanReversionStrategy
-from app.strategies.momentum import MomentumStrategy
-from app.strategies.breakout import BreakoutStrategy
-from app.strategies.volatility_breakout import VolatilityBreakoutStrategy
-from app.strategies.sentiment import SentimentStrategy
-from app.strategies.sentiment_filter import SentimentFilterStrategy
-from app.strategies.social_copy import SocialCopyStrategy
-# Arbitrage removed: Requires millisecond execution, opportunities disappear in seconds (not practical for 10-minute intervals)
-from app.strategies.rsi_macd_momentum import RSI_MACD_MomentumStrategy
-from app.strategies.volume_breakout import VolumeBreakoutStrategy
-from app.db.session import get_session
-from app.db.models import PriceTick
+# Always import through the backend.* package: importing the same modules again as app.*
+# executes them twice (two copies of every model, strategy and logger sink)
+from backend.app.services.data_collector import collect_crypto_batch, collect_forex_batch, collect_additional_crypto_forex_batch
+# Strategies are imported by the registry, and only those enabled in config.json
+from backend.app.strategies.registry import create_strategies, load_strategy_class
+from backend.app.db.session import get_session
+from backend.app.db.models import PriceTick
 from sqlmodel import select
+from backend.app.services.cooldown_store import (
+    CooldownStore,
+    SQLCooldownBackend,
+    flush_cooldown_backend,
+    get_cooldown_store,
+    set_cooldown_backend,
+)
+from backend.app.core.monitoring import (
+    candle_trigger_latency,
+    cycle_latency,
+    monitor_event_loop_lag,
+    observe_stage,
+    record_funnel,
+    stage_errors,
+    stage_latency,
+    start_metrics_server,
+)
 
 # Load environment variables
 load_dotenv()
@@ -77,8 +94,14 @@ class SignalGenerator:
     4. Telegram notifications
     """
     
-    def __init__(self):
-        """Initialize the signal generator with all components."""
+    def __init__(self, strategy_names: Optional[List[str]] = None):
+        """
+        Initialize the signal generator with all components.
+        
+        Args:
+            strategy_names: Strategies to load; None = config.json "strategies" (or the registry
+                defaults). The sharded coordinator passes [] - its workers own the strategies.
+        """
         self.config = config
         self.ai_filter = AIFilter(
             provider=config.AI_PROVIDER,
@@ -93,40 +116,19 @@ class SignalGenerator:
         )
         self.signal_logger = SignalLogger()
         
-        # Initialize professional strategies (prioritize professional implementations)
-        from backend.app.strategies.support_resistance import SupportResistanceStrategy
-        from backend.app.strategies.vwap_strategy import VWAPStrategy
-        from backend.app.strategies.order_blocks import OrderBlocksStrategy
-        from backend.app.strategies.fair_value_gaps import FairValueGapsStrategy
-        from backend.app.strategies.market_structure import MarketStructureStrategy
-        from backend.app.strategies.volume_profile import VolumeProfileStrategy
-        from backend.app.strategies.liquidity_zones import LiquidityZonesStrategy
-        
-        self.strategies = {
-            # INSTITUTIONAL-LEVEL STRATEGIES (Highest Priority)
-            "vwap": VWAPStrategy(),  # VWAP - institutional traders' PRIMARY tool
-            "support_resistance": SupportResistanceStrategy(),  # Pivot-based S/R with order flow
-            "order_blocks": OrderBlocksStrategy(),  # Smart money order placement zones
-            "fair_value_gaps": FairValueGapsStrategy(),  # Price imbalances (90%+ fill rate)
-            "market_structure": MarketStructureStrategy(),  # BOS/CHoCH - eliminates 60% of losses
-            "volume_profile": VolumeProfileStrategy(),  # Price Volume Nodes (PVN)
-            "liquidity_zones": LiquidityZonesStrategy(),  # Stop loss clusters (institutional hunts)
-            
-            # TECHNICAL INDICATOR STRATEGIES
-            "rsi_macd_momentum": RSI_MACD_MomentumStrategy(),  # Professional RSI+MACD
-            "volume_breakout": VolumeBreakoutStrategy(),  # Professional Volume Breakout
-            "trend_following": TrendFollowingStrategy(),
-            "mean_reversion": MeanReversionStrategy(),
-            "momentum": MomentumStrategy(),
-            "breakout": BreakoutStrategy(),
-            "volatility_breakout": VolatilityBreakoutStrategy(),
-            
-            # SENTIMENT/SOCIAL STRATEGIES
-            "sentiment": SentimentStrategy(),
-            "sentiment_filter": SentimentFilterStrategy(),
-            "social_copy": SocialCopyStrategy(),
-            # Arbitrage removed: Requires millisecond execution, not practical for manual trading
-        }
+        # Short-TTL live quote cache (batched Binance refresh, DB fallback, WS warm-up)
+        self.live_prices = LivePriceCache(ttl_seconds=config.LIVE_PRICE_TTL_SECONDS, max_quote_age_seconds=300.0)
+        
+        # Opt-in cycle profiler (PROFILE_CYCLES / --profile); no-op when disabled
+        self.profiler = CycleProfiler.from_config(config)
+        
+        # Strategies enabled in config.json ("strategies", registry defaults when absent).
+        # Only these are imported - see backend/app/strategies/registry.py for the entry points.
+        self.strategies = create_strategies(config.ENABLED_STRATEGIES if strategy_names is None else strategy_names)
+        
+        # Execution policy (inline/thread/process) and per-cycle time budget of each strategy
+        self.executor = StrategyExecutor.from_config(config, self.strategies)
+        self.last_budget_report: Dict[str, Dict[str, Any]] = {}
         
         # Track signal statistics
         self.stats = {
@@ -137,10 +139,15 @@ class SignalGenerator:
             "last_collection": None,
         }
         
-        # Signal deduplication: track recent signals to prevent spam (6 hours cooldown)
-        # Format: {(strategy, symbol, action): timestamp}
-        self.recent_signals: Dict[tuple, datetime] = {}
+        # Signal deduplication: expiring cooldown store to prevent spam (6 hours cooldown)
+        # Keys: (strategy, symbol, action). Persisted so a redeploy doesn't re-send signals still in cooldown.
         self.signal_cooldown_hours = 6  # Don't send same signal within 6 hours (professional standard)
+        if config.COOLDOWN_DB_URL:
+            try:
+                set_cooldown_backend(SQLCooldownBackend(config.COOLDOWN_DB_URL))
+            except Exception as e:
+                logger.warning(f"Signal cooldown persistence unavailable ({e}) - cooldowns will reset on restart")
+        self.cooldowns = get_cooldown_store("signal_generator", ttl_seconds=self.signal_cooldown_hours * 3600)
         
         # Strategy performance-based weights (meta-labeling concept)
         # Higher weights for strategies that historically perform better
@@ -177,6 +184,9 @@ class SignalGenerator:
         self.consensus_min_confidence = 0.45  # Consensus strategies need at least 45% confidence each
         self.weighted_consensus_threshold = 2.0  # Weighted consensus score must be >= 2.0
         
+        # Pause between processed signals so a local LLM is not flooded (replay benchmarks set 0)
+        self.signal_pacing_seconds = 2.0
+        
         logger.info("✅ Signal Generator initialized")
         logger.info(f"   - Monitoring {len(config.ASSETS)} assets ({len(config.CRYPTO_SYMBOLS)} crypto, {len(config.FOREX_PAIRS)} forex)")
         logger.info(f"   - Crypto: {', '.join(config.CRYPTO_SYMBOLS[:5])}{'...' if len(config.CRYPTO_SYMBOLS) > 5 else ''}")
@@ -209,6 +219,60 @@ class SignalGenerator:
         
         logger.info(f"   - Startup grace period: {self.startup_grace_minutes} minutes")
         logger.info(f"   - Signals will start after {(self.startup_time + timedelta(minutes=self.startup_grace_minutes)).strftime('%H:%M:%S')}")
+        
+        # Warm-state snapshots (STATE_SNAPSHOT_PATH, empty disables): restored by run_continuously,
+        # written every STATE_SNAPSHOT_INTERVAL seconds and on shutdown
+        self.snapshot_path = Path(config.STATE_SNAPSHOT_PATH) if config.STATE_SNAPSHOT_PATH else None
+        self._last_snapshot = time.monotonic()
+        
+        # Event-driven mode (EVENT_DRIVEN / --event-driven): symbols with new ticks in the last collection
+        self.last_collected_symbols: set = set()
+    
+    def _cooldown_stores(self) -> List[Any]:
+        """The generator's cooldown store and the strategies' shared ones."""
+        stores = {self.cooldowns.namespace: self.cooldowns}
+        for strategy in self.strategies.values():
+            store = getattr(strategy, 'cooldowns', None)
+            if store is not None:
+                stores.setdefault(store.namespace, store)
+        return list(stores.values())
+    
+    def restore_state_snapshot(self) -> bool:
+        """
+        Restore strategy warm state and cooldowns from the last snapshot.
+        The startup grace period is shortened to the time since the snapshot was written.
+        Returns True if a snapshot was restored.
+        """
+        if self.snapshot_path is None or not self.strategies:
+            return False
+        snapshot = state_snapshot.read(self.snapshot_path)
+        if snapshot is None:
+            return False
+        age_minutes = snapshot.age() / 60
+        if age_minutes > config.STATE_SNAPSHOT_MAX_AGE_HOURS * 60:
+            logger.info(f"State snapshot is {age_minutes / 60:.1f}h old (max {config.STATE_SNAPSHOT_MAX_AGE_HOURS}h) - starting cold")
+            return False
+        
+        with observe_stage("state_restore"):
+            restored = state_snapshot.restore(snapshot, self.strategies, self._cooldown_stores())
+        symbols = {symbol for strategy in self.strategies.values() for symbol in getattr(strategy, 'price_history', {})}
+        self.startup_grace_minutes = min(self.startup_grace_minutes, age_minutes)
+        logger.info(f"♻️ Restored warm state of {len(restored)} strategies ({len(symbols)} symbols) from a {age_minutes:.1f} min old snapshot")
+        logger.info(f"   - Startup grace period shortened to {self.startup_grace_minutes:.1f} minutes")
+        return True
+    
+    async def save_state_snapshot(self) -> None:
+        """Write a warm-state snapshot (state is captured on the loop, compressed and written off it)."""
+        if self.snapshot_path is None or not self.strategies:
+            return
+        try:
+            with observe_stage("state_snapshot"):
+                captured = state_snapshot.capture(self.strategies, self._cooldown_stores())
+                size = await asyncio.to_thread(state_snapshot.write, self.snapshot_path, captured)
+            logger.debug(f"State snapshot written to {self.snapshot_path} ({size / 1024:.0f} KiB)")
+        except Exception as e:
+            logger.warning(f"Could not write state snapshot {self.snapshot_path}: {e}")
+        self._last_snapshot = time.monotonic()
     
     async def collect_market_data(self) -> bool:
         """
@@ -221,39 +285,47 @@ class SignalGenerator:
             
             total_ticks = 0
             sources_count = 0
+            collected_symbols = set()  # symbols that got new ticks (event-driven triggers)
             
             # Collect crypto data if configured
             crypto_symbols = config.CRYPTO_SYMBOLS
             coingecko_ids = config.COINGECKO_IDS
             if crypto_symbols or coingecko_ids:
-                crypto_results = await collect_crypto_batch(crypto_symbols, coingecko_ids)
+                with observe_stage("collect", "crypto"):
+                    crypto_results = await collect_crypto_batch(crypto_symbols, coingecko_ids)
                 crypto_ticks = sum(len(ticks) for ticks in crypto_results.values() if ticks)
                 total_ticks += crypto_ticks
                 sources_count += len([k for k, v in crypto_results.items() if v])
+                collected_symbols.update(getattr(tick, 'symbol', None) for ticks in crypto_results.values() for tick in ticks or ())
                 if crypto_ticks > 0:
                     logger.debug(f"Collected {crypto_ticks} crypto price ticks")
             
             # Collect forex data if configured
             forex_pairs = config.FOREX_PAIRS
             if forex_pairs:
-                forex_results = await collect_forex_batch(forex_pairs)
+                with observe_stage("collect", "forex"):
+                    forex_results = await collect_forex_batch(forex_pairs)
                 forex_ticks = sum(len(ticks) for ticks in forex_results.values() if ticks)
                 total_ticks += forex_ticks
                 sources_count += len([k for k, v in forex_results.items() if v])
+                collected_symbols.update(getattr(tick, 'symbol', None) for ticks in forex_results.values() for tick in ticks or ())
                 if forex_ticks > 0:
                     logger.debug(f"Collected {forex_ticks} forex price ticks")
                 
                 # Also collect from additional sources that support both crypto and forex
-                additional_results = await collect_additional_crypto_forex_batch(forex_pairs)
+                with observe_stage("collect", "additional"):
+                    additional_results = await collect_additional_crypto_forex_batch(forex_pairs)
                 additional_ticks = sum(len(ticks) for ticks in additional_results.values() if ticks)
                 total_ticks += additional_ticks
                 sources_count += len([k for k, v in additional_results.items() if v])
+                collected_symbols.update(getattr(tick, 'symbol', None) for ticks in additional_results.values() for tick in ticks or ())
                 if additional_ticks > 0:
                     logger.debug(f"Collected {additional_ticks} additional price ticks")
             
             logger.info(f"✅ Collected {total_ticks} price ticks from {sources_count} sources")
             
             self.stats["last_collection"] = datetime.utcnow()
+            self.last_collected_symbols = collected_symbols
             return total_ticks > 0
             
         except Exception as e:
@@ -274,8 +346,9 @@ class SignalGenerator:
                 .where(PriceTick.ts >= cutoff)
                 .order_by(PriceTick.ts)  # Oldest first
             )
-            result = await session.exec(stmt)
-            ticks = result.all()
+            with observe_stage("db_fetch"):
+                result = await session.exec(stmt)
+                ticks = result.all()
             
             if not ticks:
                 logger.debug(f"No price data found for {symbol}")
@@ -285,6 +358,8 @@ class SignalGenerator:
             for strategy_name, strategy in self.strategies.items():
                 if strategy_name == "sentiment_filter":
                     continue  # Skip filter strategies
+                if self.executor.busy(strategy_name):
+                    continue  # an abandoned check is still reading its state; it catches up next cycle
                 
                 try:
                     # Check if strategy supports update_data method (pattern completion model)
@@ -308,6 +383,26 @@ class SignalGenerator:
             
             break  # Only use first session
     
+    async def feed_symbols(self, symbols: List[str]) -> None:
+        """Feed the latest candles of `symbols` to the strategies (also during the grace period)."""
+        for symbol in symbols:
+            await self.update_strategies_with_data(symbol)
+    
+    async def evaluate_symbols(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        """Completed-pattern signals of `symbols`, in symbol order (one strategy time-budget cycle)."""
+        all_signals = []
+        self.executor.begin_cycle()
+        for symbol in symbols:
+            all_signals.extend(await self.run_strategies(symbol))
+        self.last_budget_report = self.executor.end_cycle()
+        return all_signals
+    
+    def drop_symbols(self, symbols: List[str]) -> None:
+        """Release the strategy state of `symbols` (they moved to another shard)."""
+        for symbol in symbols:
+            for strategy in self.strategies.values():
+                strategy.drop_symbol(symbol)
+    
     async def run_strategies(self, symbol: str) -> List[Dict[str, Any]]:
         """
         Run all strategies on a symbol using pattern completion model.
@@ -338,8 +433,9 @@ class SignalGenerator:
                 .where(PriceTick.ts >= cutoff)
                 .order_by(PriceTick.ts)
             )
-            result = await session.exec(stmt)
-            ticks = result.all()
+            with observe_stage("db_fetch"):
+                result = await session.exec(stmt)
+                ticks = result.all()
             
             if not ticks:
                 logger.debug(f"No price data found for {symbol}")
@@ -353,6 +449,7 @@ class SignalGenerator:
                 if strategy_name == "sentiment_filter":
                     continue  # Skip filter strategies
                 
+                eval_start = time.perf_counter()
                 try:
                     signal = None
                     
@@ -361,10 +458,15 @@ class SignalGenerator:
                     if hasattr(strategy, 'generate_signal') and callable(getattr(strategy, 'generate_signal')):
                         import inspect
                         sig = inspect.signature(strategy.generate_signal)
-                        if 'portfolio_value' in sig.parameters:
-                            signal = await strategy.generate_signal(session, symbol, portfolio_value=10000.0)
-                        else:
-                            signal = await strategy.generate_signal(session, symbol)
+                        kwargs = {"portfolio_value": 10000.0} if 'portfolio_value' in sig.parameters else {}
+                        # A call cancelled by the time budget may stop mid-query; roll the shared
+                        # session back before the next strategy uses it
+                        signal = await self.executor.call(
+                            strategy_name,
+                            symbol,
+                            lambda: strategy.generate_signal(session, symbol, **kwargs),
+                            on_timeout=session.rollback,
+                        )
                         
                         if signal and "action" not in signal:
                             signal["action"] = signal.get("signal", "hold")
@@ -384,7 +486,8 @@ class SignalGenerator:
                     # Check if strategy supports pattern completion model (check_for_signal)
                     elif hasattr(strategy, 'check_for_signal'):
                         # Pattern completion model - check if pattern just completed
-                        signal = strategy.check_for_signal(symbol)
+                        # (inline, thread or process pool, within the strategy's time budget)
+                        signal = await self.executor.check(strategy_name, strategy, symbol)
                         
                         # Log diagnostic info for strategies that return None
                         if not signal and hasattr(strategy, 'price_history') and symbol in strategy.price_history:
@@ -589,6 +692,7 @@ class SignalGenerator:
                             signals.append(signal)
                             self.stats["by_strategy"][strategy_name] += 1
                             self.stats["total_signals"] += 1
+                            record_funnel(strategy_name, "pattern_completed")
                             logger.info(f"✅ Pattern completed: {strategy_name} {symbol} {signal.get('action')} (confidence: {signal_confidence:.3f})")
                         else:
                             logger.info(f"❌ Signal filtered: {strategy_name} {symbol} confidence {signal_confidence:.3f} < min {min_confidence:.3f}")
@@ -598,14 +702,19 @@ class SignalGenerator:
                         logger.debug(f"Strategy {strategy_name} on {symbol} returned no signal")
                     
                 except ZeroDivisionError as e:
+                    stage_errors.labels(stage="strategy_eval", target=strategy_name).inc()
                     logger.warning(f"Division by zero in {strategy_name} on {symbol}: {e}")
                     continue
                 except ValueError as e:
+                    stage_errors.labels(stage="strategy_eval", target=strategy_name).inc()
                     logger.warning(f"Value error in {strategy_name} on {symbol}: {e}")
                     continue
                 except Exception as e:
+                    stage_errors.labels(stage="strategy_eval", target=strategy_name).inc()
                     logger.warning(f"Error running {strategy_name} on {symbol}: {e}", exc_info=True)
                     continue
+                finally:
+                    stage_latency.labels(stage="strategy_eval", target=strategy_name).observe(time.perf_counter() - eval_start)
             
             break  # Only use first session
         
@@ -631,10 +740,10 @@ class SignalGenerator:
                 else:
                     sig_dt = signal_time
                 
-                # Reject signals generated within first 10 minutes of startup
+                # Reject signals generated within the startup grace period
                 time_since_startup = (datetime.utcnow() - self.startup_time).total_seconds() / 60
-                if time_since_startup < 10:
-                    logger.debug(f"Rejecting signal from startup grace period ({time_since_startup:.1f} min < 10 min)")
+                if time_since_startup < self.startup_grace_minutes:
+                    logger.debug(f"Rejecting signal from startup grace period ({time_since_startup:.1f} min < {self.startup_grace_minutes:.1f} min)")
                     return False
             except:
                 pass  # If parsing fails, continue with other validation
@@ -820,59 +929,28 @@ class SignalGenerator:
             return entry * 0.96
         return entry
     
-    async def _get_live_price(self, symbol: str) -> Optional[Dict[str, Any]]:
+    async def _get_live_price(self, symbol: str, batch: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         """
-        Fetch current live price from exchange (not database).
-        Returns dict with: price, timestamp, source, age_seconds
+        Fetch current live price via the shared live price cache (not a per-signal request).
+        If the cached quote has expired, every symbol in `batch` is refreshed in the same round trip.
+        Returns dict with: price, timestamp, source, age_seconds, cache_age_seconds, is_stale
         """
         try:
-            # Try Binance first (fastest, most reliable for crypto)
-            if symbol.endswith('USDT'):
-                import httpx
-                async with httpx.AsyncClient(timeout=5.0) as client:
-                    response = await client.get(
-                        f"https://api.binance.com/api/v3/ticker/price",
-                        params={"symbol": symbol}
-                    )
-                    if response.status_code == 200:
-                        data = response.json()
-                        return {
-                            "price": float(data["price"]),
-                            "timestamp": datetime.utcnow(),
-                            "source": "binance_live",
-                            "age_seconds": 0.0
-                        }
-            
-            # For forex, use latest database price (forex doesn't have free real-time API)
-            async for session in get_session():
-                from sqlmodel import select, desc
-                from app.db.models import PriceTick
-                
-                stmt = (
-                    select(PriceTick)
-                    .where(PriceTick.symbol == symbol)
-                    .order_by(desc(PriceTick.ts))
-                    .limit(1)
-                )
-                result = await session.exec(stmt)
-                tick = result.first()
-                
-                if tick:
-                    age_seconds = (datetime.utcnow() - tick.ts).total_seconds()
-                    return {
-                        "price": float(tick.price),
-                        "timestamp": tick.ts,
-                        "source": "database",
-                        "age_seconds": age_seconds
-                    }
-                break
-            
-            return None
-            
+            return await self.live_prices.get_live_price(symbol, batch=batch)
         except Exception as e:
             logger.warning(f"Could not fetch live price for {symbol}: {e}")
             return None
     
+    def _attach_live_price_feed(self) -> None:
+        """Keep the live price cache warm from the Binance WebSocket collector if it is running."""
+        try:
+            from backend.app.services.ws_binance import get_running_collector
+            collector = get_running_collector()
+            if collector:
+                self.live_prices.attach_ws_collector(collector)
+        except Exception as e:
+            logger.debug(f"Binance WebSocket collector not available for live prices: {e}")
+    
     def _calculate_time_limit(self, strategy_name: str) -> dict:
         """
         Calculate time limit for trade based on strategy type and timeframe.
@@ -1177,7 +1255,11 @@ class SignalGenerator:
             "estimated_tp_time_minutes": estimated_tp_time_minutes,
         }
     
-    def _calculate_reliability(self, all_signals: List[Dict[str, Any]], signal: Dict[str, Any]) -> Dict[str, Any]:
+    def _build_consensus_index(self, all_signals: List[Dict[str, Any]]) -> ConsensusIndex:
+        """Build the per-cycle (symbol, action) consensus index used for O(1) agreement lookups."""
+        return ConsensusIndex(all_signals, self.strategy_weights, self.consensus_min_confidence)
+    
+    def _calculate_reliability(self, all_signals: List[Dict[str, Any]], signal: Dict[str, Any], consensus: Optional[ConsensusIndex] = None) -> Dict[str, Any]:
         """
         Enhanced reliability calculation with performance-based weighting (meta-labeling concept).
         Based on research: ensemble weighting significantly improves signal accuracy.
@@ -1187,6 +1269,9 @@ class SignalGenerator:
         2. Individual strategy confidence - weighted by strategy performance
         3. Strategy quality/weighting - from historical performance
         
+        Agreeing signals are looked up in the per-cycle consensus index (built from
+        all_signals if not supplied), so scoring a whole cycle is O(n) instead of O(n²).
+        
         Returns dict with:
         - is_reliable: bool (True if signal should be sent)
         - reliability_score: float (0.0-1.0)
@@ -1203,31 +1288,23 @@ class SignalGenerator:
         # Get strategy weight (default to 1.0 if unknown)
         strategy_weight = self.strategy_weights.get(strategy_name, 1.0)
         
-        # Find all signals for the same symbol+action (consensus)
-        agreeing_signals = [
-            s for s in all_signals
-            if s.get("symbol") == symbol 
-            and s.get("action") == action
-            and s.get("confidence", 0.0) >= self.consensus_min_confidence
-        ]
+        # Look up all signals for the same symbol+action (consensus)
+        if consensus is None:
+            consensus = self._build_consensus_index(all_signals)
+        group = consensus.lookup(symbol, action)
         
-        consensus_count = len(agreeing_signals)
+        consensus_count = group.count
         
-        # Calculate weighted consensus score (meta-labeling approach)
+        # Weighted consensus score (meta-labeling approach)
         # Each strategy's contribution = confidence * weight
-        weighted_consensus_score = 0.0
-        for sig in agreeing_signals:
-            sig_strategy = sig.get("strategy", "unknown")
-            sig_confidence = sig.get("confidence", 0.0)
-            sig_weight = self.strategy_weights.get(sig_strategy, 1.0)
-            weighted_consensus_score += sig_confidence * sig_weight
+        weighted_consensus_score = group.weighted_sum
         
         # Add current signal's weighted contribution
         weighted_consensus_score += confidence * strategy_weight
         
         # Calculate average confidence (unweighted for display)
-        max_confidence = max([s.get("confidence", 0.0) for s in agreeing_signals] + [confidence])
-        avg_confidence = sum([s.get("confidence", 0.0) for s in agreeing_signals]) / len(agreeing_signals) if agreeing_signals else confidence
+        max_confidence = max(group.max_confidence, confidence) if consensus_count else confidence
+        avg_confidence = group.avg_confidence if consensus_count else confidence
         
         # Enhanced reliability score calculation
         # Formula: (weighted_consensus_bonus + confidence_bonus) / 2
@@ -1284,10 +1361,12 @@ class SignalGenerator:
             "reasoning": reasoning,
         }
     
-    def _apply_multi_indicator_filter(self, signal: Dict[str, Any], all_signals: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    def _apply_multi_indicator_filter(self, signal: Dict[str, Any], consensus: Optional[ConsensusIndex] = None) -> Optional[Dict[str, Any]]:
         """
         SIMPLIFIED professional signal filtering (1-2 confirmations needed).
         Based on research: Most professional bots use 1-2 confirmations, not 3-5.
+        Confirmations are per-signal; cross-signal agreement comes from the consensus
+        index (O(1) lookup) and is only recorded on the signal, never rescanned.
         
         Returns:
             Signal dict with 'confirmations' list if passed, None if rejected
@@ -1363,6 +1442,8 @@ class SignalGenerator:
         if total_score >= min_required:
             signal['confirmations'] = confirmations
             signal['pre_ai_score'] = len(full_confirmations)
+            if consensus is not None:
+                signal['agreeing_strategies'] = sorted(consensus.lookup(symbol, action).strategies)
             logger.info(f"✅ Signal passed filter: {len(full_confirmations)} confirmations + {len(partial_confirmations)} partial ({', '.join(confirmations)})")
             return signal
         else:
@@ -1380,16 +1461,10 @@ class SignalGenerator:
             signal.get('action', 'unknown')
         )
         
-        # Clean up old signals (older than cooldown period)
-        cutoff = datetime.utcnow() - timedelta(hours=self.signal_cooldown_hours)
-        self.recent_signals = {
-            k: v for k, v in self.recent_signals.items() if v > cutoff
-        }
-        
-        # Check if we've seen this signal recently
-        if signal_key in self.recent_signals:
-            last_sent = self.recent_signals[signal_key]
-            hours_ago = (datetime.utcnow() - last_sent).total_seconds() / 3600
+        # Expired cooldowns are evicted by the store as time passes
+        if self.cooldowns.is_active(signal_key):
+            last_sent = self.cooldowns.last_marked(signal_key)
+            hours_ago = (datetime.utcnow() - last_sent).total_seconds() / 3600 if last_sent else 0.0
             logger.debug(f"Duplicate signal detected: {signal_key} was sent {hours_ago:.1f} hours ago (cooldown: {self.signal_cooldown_hours} hours)")
             return True
         
@@ -1405,6 +1480,14 @@ class SignalGenerator:
         multi_indicator_passed = 0
         ai_passed = 0
         
+        # Build the consensus index once per cycle (O(n)) for O(1) agreement lookups
+        consensus = self._build_consensus_index(signals)
+        
+        # Refresh live prices for every symbol with pending signals in one batched call
+        self._attach_live_price_feed()
+        with observe_stage("live_price_refresh"):
+            await self.live_prices.refresh(s.get('symbol') for s in signals)
+        
         for idx, signal in enumerate(signals, 1):
             try:
                 logger.info(f"Processing signal {idx}/{len(signals)}: {signal['strategy']} {signal['symbol']} {signal['action']} (confidence: {signal.get('confidence', 0.0):.2f})")
@@ -1419,7 +1502,8 @@ class SignalGenerator:
                 
                 # PROFESSIONAL MULTI-INDICATOR CONFIRMATION FILTER
                 # Professional bots require multiple confirmations before sending signals
-                confirmed_signal = self._apply_multi_indicator_filter(signal, signals)
+                with observe_stage("multi_indicator_filter", signal.get('strategy', 'unknown')):
+                    confirmed_signal = self._apply_multi_indicator_filter(signal, consensus)
                 if not confirmed_signal:
                     logger.info(f"🚫 Signal rejected by multi-indicator filter: {signal['strategy']} {signal['symbol']} {signal['action']}")
                     self.stats["ai_filtered"] += 1
@@ -1427,6 +1511,7 @@ class SignalGenerator:
                 
                 multi_indicator_passed += 1
                 signal = confirmed_signal  # Use confirmed signal with confirmations list
+                record_funnel(signal.get('strategy'), "filter_passed")
                 
                 # CRITICAL: Ensure signal has expiration/duration information
                 # This is essential for users to know when to close the trade
@@ -1441,7 +1526,7 @@ class SignalGenerator:
                 
                 # RELIABILITY INFO: Calculate for context but DON'T filter
                 # (Multi-indicator filter already handled quality)
-                reliability = self._calculate_reliability(signals, signal)
+                reliability = self._calculate_reliability(signals, signal, consensus)
                 logger.info(f"Reliability info: {reliability['reasoning']}")
                 # Add to signal for AI context but don't reject
                 signal['_reliability_info'] = reliability
@@ -1454,7 +1539,9 @@ class SignalGenerator:
                 symbol = signal.get('symbol')
                 logger.info(f"Fetching live price for {symbol}...")
                 
-                live_price_data = await self._get_live_price(symbol)
+                pending_symbols = [s.get('symbol') for s in signals[idx:]]
+                with observe_stage("live_price"):
+                    live_price_data = await self._get_live_price(symbol, batch=pending_symbols)
                 
                 if live_price_data:
                     live_price = live_price_data['price']
@@ -1468,9 +1555,12 @@ class SignalGenerator:
                         price_change_pct = 0.0
                     
                     logger.info(f"   Signal entry: ${old_entry:.5f}")
-                    logger.info(f"   Live price:   ${live_price:.5f} (age: {price_age:.1f}s)")
+                    logger.info(f"   Live price:   ${live_price:.5f} (age: {price_age:.1f}s, source: {live_price_data['source']})")
                     logger.info(f"   Movement:     {price_change_pct:+.2f}%")
                     
+                    if live_price_data.get('is_stale'):
+                        logger.warning(f"⚠️  Live price for {symbol} is {price_age/60:.1f} minutes old - treat entry with caution")
+                    
                     # WARNING: If price moved significantly (>2%), signal may be stale
                     if abs(price_change_pct) > 2.0:
                         logger.warning(f"⚠️  PRICE MOVED {price_change_pct:+.2f}% since signal generation!")
@@ -1530,7 +1620,8 @@ class SignalGenerator:
                 # OPTION: For highly reliable signals, we could skip AI filter, but let's try with intelligent fallback first
                 logger.info(f"Waiting for AI analysis (this may take 30-120 seconds)...")
                 try:
-                    ai_result = self.ai_filter.filter_signal(signal)
+                    with observe_stage("ai_filter", self.ai_filter.provider):
+                        ai_result = self.ai_filter.filter_signal(signal)
                 except Exception as ai_error:
                     logger.error(f"AI filter error: {ai_error}", exc_info=True)
                     # Continue to next signal if AI fails
@@ -1548,6 +1639,7 @@ class SignalGenerator:
                     continue
                 
                 ai_passed += 1
+                record_funnel(signal.get('strategy'), "ai_approved")
                 
                 # Add reliability info to AI result for notification
                 ai_result["reliability"] = reliability
@@ -1562,17 +1654,19 @@ class SignalGenerator:
                 logger.info(f"   AI Confidence: {ai_result.get('ai_confidence', 0.0):.1f}/10")
                 
                 try:
-                    success = await self.telegram.send_signal_notification(signal, ai_result)
+                    with observe_stage("telegram_send", "signal"):
+                        success = await self.telegram.send_signal_notification(signal, ai_result)
                     
                     if success:
                         self.stats["telegram_sent"] += 1
+                        record_funnel(signal.get('strategy'), "sent")
                         # Mark this signal as recently sent
                         signal_key = (
                             signal.get('strategy', 'unknown'),
                             signal.get('symbol', 'unknown'),
                             signal.get('action', 'unknown')
                         )
-                        self.recent_signals[signal_key] = datetime.utcnow()
+                        self.cooldowns.mark(signal_key)
                         weighted_score = reliability.get('weighted_consensus_score', 0.0)
                         strategy_weight = reliability.get('strategy_weight', 1.0)
                         logger.info(f"✅✅✅ Telegram notification SENT successfully!")
@@ -1582,6 +1676,7 @@ class SignalGenerator:
                         logger.info(f"   Strategy Weight: {strategy_weight:.1f}x")
                         logger.info(f"   Consensus: {reliability['consensus_count']} strategies")
                     else:
+                        stage_errors.labels(stage="telegram_send", target="signal").inc()
                         logger.error(f"❌❌❌ FAILED to send Telegram notification!")
                         logger.error(f"   Signal: {signal['strategy']} {signal['symbol']} {signal['action']}")
                         logger.error(f"   Check Telegram bot token and chat ID in .env file")
@@ -1592,8 +1687,8 @@ class SignalGenerator:
                     logger.error(f"   Signal: {signal['strategy']} {signal['symbol']} {signal['action']}")
                 
                 # Add small delay between signals to avoid overwhelming Ollama
-                if idx < len(signals):
-                    await asyncio.sleep(2)  # 2 second pause between signal processing
+                if idx < len(signals) and self.signal_pacing_seconds > 0:
+                    await asyncio.sleep(self.signal_pacing_seconds)  # pause between signal processing
                 
             except Exception as e:
                 logger.exception(f"Error processing signal: {e}")
@@ -1612,6 +1707,8 @@ class SignalGenerator:
         """
         Run one complete cycle: collect data, run strategies, process signals.
         """
+        cycle_start = time.perf_counter()
+        self.profiler.start_cycle()
         try:
             # 1. Collect market data
             data_collected = await self.collect_market_data()
@@ -1621,10 +1718,7 @@ class SignalGenerator:
                 return
             
             # 2. Run strategies on all monitored assets
-            all_signals = []
-            for symbol in config.ASSETS:
-                signals = await self.run_strategies(symbol)
-                all_signals.extend(signals)
+            all_signals = await self.evaluate_symbols(config.ASSETS)
             
             # Log signal breakdown by strategy
             if all_signals:
@@ -1676,6 +1770,10 @@ class SignalGenerator:
             
         except Exception as e:
             logger.exception(f"Error in run_cycle: {e}")
+        finally:
+            elapsed = time.perf_counter() - cycle_start
+            cycle_latency.observe(elapsed)
+            self.profiler.finish_cycle(elapsed)
     
     async def run_continuously(self) -> None:
         """
@@ -1685,9 +1783,13 @@ class SignalGenerator:
         logger.info("🚀 Starting trading signal monitor...")
         logger.info("   - Waiting for high-probability setups...")
         logger.info(f"   - Monitoring {len(config.ASSETS)} assets with {len(self.strategies)} strategies")
-        logger.info(f"   - Check interval: {config.POLLING_INTERVAL} seconds")
+        logger.info(f"   - Check interval: {config.POLLING_INTERVAL} seconds" + (" (collection; evaluation on closed candles)" if config.EVENT_DRIVEN else ""))
         logger.info(f"   - Press Ctrl+C to stop")
         
+        self._start_metrics_server()
+        self.restore_state_snapshot()
+        lag_monitor = asyncio.create_task(monitor_event_loop_lag(config.EVENT_LOOP_LAG_INTERVAL)) if config.EVENT_LOOP_LAG_INTERVAL > 0 else None
+        
         # Send startup notification (if Telegram configured)
         if config.TELEGRAM_BOT_TOKEN and config.TELEGRAM_CHAT_ID:
             try:
@@ -1706,6 +1808,10 @@ class SignalGenerator:
         grace_logged = False
         
         try:
+            if config.EVENT_DRIVEN:
+                await self.run_event_driven()
+                return
+            
             while True:
                 # Check if in grace period and log status
                 if self.grace_period_active and not grace_logged:
@@ -1728,10 +1834,14 @@ class SignalGenerator:
                         
                         grace_logged = True  # Only log once per cycle
                 
+                cycle_start = time.perf_counter()
+                self.profiler.start_cycle()
+                
                 # Fetch new market data
                 data_collected = await self.collect_market_data()
                 
                 if not data_collected:
+                    self.profiler.finish_cycle(time.perf_counter() - cycle_start)
                     logger.debug("No data collected, waiting for next cycle...")
                     await asyncio.sleep(config.POLLING_INTERVAL)
                     continue
@@ -1740,14 +1850,10 @@ class SignalGenerator:
                 grace_logged = False
                 
                 # Update all strategies with new data (for pattern completion detection)
-                for symbol in config.ASSETS:
-                    await self.update_strategies_with_data(symbol)
+                await self.feed_symbols(config.ASSETS)
                 
                 # Check each strategy for completed patterns
-                all_signals = []
-                for symbol in config.ASSETS:
-                    signals = await self.run_strategies(symbol)
-                    all_signals.extend(signals)
+                all_signals = await self.evaluate_symbols(config.ASSETS)
                 
                 # Log diagnostic info periodically
                 heartbeat_counter += 1
@@ -1825,6 +1931,13 @@ class SignalGenerator:
                     if self._diagnostic_counter % 5 == 0:  # Every 5 cycles (~5 minutes)
                         self._log_diagnostic_info()
                 
+                elapsed = time.perf_counter() - cycle_start
+                cycle_latency.observe(elapsed)
+                self.profiler.finish_cycle(elapsed)
+                
+                if time.monotonic() - self._last_snapshot >= config.STATE_SNAPSHOT_INTERVAL:
+                    await self.save_state_snapshot()
+                
                 # Wait before next cycle
                 await asyncio.sleep(config.POLLING_INTERVAL)
                 
@@ -1837,6 +1950,7 @@ class SignalGenerator:
                     pass
             self.log_statistics()
             self.signal_logger.generate_daily_summary()
+            await self.live_prices.aclose()
             
         except Exception as e:
             logger.exception(f"Fatal error: {e}")
@@ -1846,6 +1960,103 @@ class SignalGenerator:
                 except:
                     pass
             raise
+        
+        finally:
+            if lag_monitor is not None:
+                lag_monitor.cancel()
+            self.executor.close()
+            await self.save_state_snapshot()
+            flush_cooldown_backend()
+    
+    async def run_event_driven(self) -> None:
+        """
+        Evaluate a symbol's strategies when a new candle for it closes, instead of every symbol
+        every POLLING_INTERVAL. Triggers come from the collector polls (symbols that got new ticks)
+        and, for crypto, from the 1m candles the Binance WebSocket collector builds from its
+        trade stream; triggers that arrive together are coalesced into one batch.
+        Called by run_continuously when EVENT_DRIVEN is set.
+        """
+        from services.candle_events import CandleEventBus
+        
+        bus = CandleEventBus(coalesce_seconds=config.EVENT_COALESCE_SECONDS)
+        await self._attach_candle_feed(bus)
+        poller = asyncio.create_task(self._poll_collectors(bus))
+        logger.info(f"⚡ Event-driven mode: evaluating symbols as their candles close (coalescing {config.EVENT_COALESCE_SECONDS}s)")
+        
+        try:
+            while True:
+                batch = await bus.next_batch(timeout=config.STATE_SNAPSHOT_INTERVAL)
+                if poller.done():
+                    poller.result()  # surface a crashed poll loop
+                if batch:
+                    await self._evaluate_triggered(list(batch), batch)
+                if time.monotonic() - self._last_snapshot >= config.STATE_SNAPSHOT_INTERVAL:
+                    await self.save_state_snapshot()
+        finally:
+            poller.cancel()
+    
+    async def _evaluate_triggered(self, symbols: List[str], published_at: Dict[str, float]) -> None:
+        """Evaluate the triggered symbols and process their signals (one event-driven cycle)."""
+        cycle_start = time.perf_counter()
+        self.profiler.start_cycle()
+        try:
+            if self.grace_period_active:
+                await self.feed_symbols(symbols)  # run_strategies does not feed during the grace period
+            all_signals = await self.evaluate_symbols(symbols)
+            evaluated = time.monotonic()
+            for symbol in symbols:
+                candle_trigger_latency.observe(evaluated - published_at[symbol])
+            logger.debug(f"Evaluated {len(symbols)} triggered symbol(s): {', '.join(symbols)}")
+            
+            if all_signals:
+                logger.info(f"Found {len(all_signals)} completed pattern(s) on {len(symbols)} triggered symbol(s)")
+                for sig in all_signals:
+                    logger.info(f"   - {sig['strategy']} {sig['symbol']} {sig['action']} (confidence: {sig.get('confidence', 0.0):.2f})")
+                # Triggers arriving meanwhile are coalesced into the next batch
+                await self.process_signals(all_signals)
+        except Exception as e:
+            logger.exception(f"Error evaluating triggered symbols {symbols}: {e}")
+        finally:
+            elapsed = time.perf_counter() - cycle_start
+            cycle_latency.observe(elapsed)
+            self.profiler.finish_cycle(elapsed)
+    
+    async def _poll_collectors(self, bus: Any) -> None:
+        """Collect every POLLING_INTERVAL and trigger the monitored symbols that got new ticks."""
+        while True:
+            if await self.collect_market_data():
+                for symbol in config.ASSETS:
+                    if symbol in self.last_collected_symbols:
+                        bus.publish(symbol, source="collector")
+            await asyncio.sleep(config.POLLING_INTERVAL)
+    
+    async def _attach_candle_feed(self, bus: Any) -> None:
+        """Trigger crypto symbols from the Binance WebSocket collector's closed 1m candles (EVENT_WS_CANDLES)."""
+        if not (config.EVENT_WS_CANDLES and config.CRYPTO_SYMBOLS):
+            return
+        try:
+            from backend.app.services.ws_binance import start_binance_collector
+            collector = await start_binance_collector(config.CRYPTO_SYMBOLS)
+        except Exception as e:
+            logger.warning(f"Binance WebSocket candles unavailable ({e}) - triggering from collector polls only")
+            return
+        assets = set(config.ASSETS)
+        collector.persist_candles = True  # the strategies read candles from the database
+        collector.add_candle_listener(
+            lambda candle: bus.publish(candle["symbol"], source="websocket") if candle["symbol"] in assets else None
+        )
+        self.live_prices.attach_ws_collector(collector)
+        logger.info(f"   - Binance WebSocket 1m candles trigger {len(assets & set(collector.symbols))} crypto symbols")
+    
+    def _start_metrics_server(self) -> None:
+        """Expose Prometheus /metrics for this process (METRICS_PORT, 0 disables)."""
+        if not config.METRICS_PORT:
+            return
+        try:
+            start_metrics_server(config.METRICS_PORT, addr=config.METRICS_ADDR)
+            logger.info(f"📈 Prometheus metrics on http://{config.METRICS_ADDR}:{config.METRICS_PORT}/metrics")
+        except OSError as e:
+            logger.warning(f"Could not start metrics server on port {config.METRICS_PORT}: {e}")
     
     def _log_diagnostic_info(self) -> None:
         """
@@ -1930,6 +2141,49 @@ class SignalGenerator:
         logger.info(f"   - By strategy: {dict(self.stats['by_strategy'])}")
 
 
+class ShardedSignalGenerator(SignalGenerator):
+    """
+    SignalGenerator that evaluates strategies in SHARD_WORKERS processes.
+    
+    config.ASSETS is partitioned over the workers by consistent hashing; each worker owns its
+    symbols' strategy state and feeds/evaluates them, and their signals come back here for
+    consensus, cooldowns, the AI filter and Telegram (see services/shard_coordinator.py).
+    Collection also stays here: workers read the ticks it writes from the database.
+    """
+    
+    def __init__(self, workers: int, engine: Optional[str] = None):
+        from services.shard_coordinator import DEFAULT_ENGINE, ShardCoordinator
+        
+        super().__init__(strategy_names=[])  # strategies live in the workers
+        self.snapshot_path = None
+        self.shards = ShardCoordinator(workers, engine=engine or DEFAULT_ENGINE)
+        logger.info(f"   - Sharded mode: {workers} worker processes")
+    
+    async def feed_symbols(self, symbols: List[str]) -> None:
+        """Workers feed their own symbols as part of each evaluation."""
+    
+    async def evaluate_symbols(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        with observe_stage("shard_cycle"):
+            signals = await self.shards.run_cycle(symbols)
+        for signal in signals:
+            strategy_name = signal.get("strategy", "unknown")
+            self.stats["by_strategy"][strategy_name] += 1
+            self.stats["total_signals"] += 1
+            record_funnel(strategy_name, "pattern_completed")
+        for worker, lag in self.shards.lag_report().items():
+            logger.debug(
+                f"   {worker}: {lag['symbols']} symbols, round trip {lag['round_trip_seconds']:.2f}s "
+                f"(queue {lag['queue_seconds']:.2f}s, eval {lag['eval_seconds']:.2f}s), {lag['cycles_behind']} cycles behind"
+            )
+        return signals
+    
+    async def run_continuously(self) -> None:
+        try:
+            await super().run_continuously()
+        finally:
+            self.shards.stop()
+
+
 async def run_self_test():
     """
     Self-test to verify strategies are implemented correctly (QuantConnect LEAN pattern).
@@ -1966,7 +2220,7 @@ async def run_self_test():
     try:
         # Update strategy with data
         await generator.update_strategies_with_data(test_symbol)
-        strategy = generator.strategies.get("momentum", MomentumStrategy())
+        strategy = generator.strategies.get("momentum") or load_strategy_class("momentum")()
         if hasattr(strategy, 'price_history') and test_symbol in strategy.price_history:
             history_count = len(strategy.price_history[test_symbol])
             if history_count < 50:
@@ -1997,7 +2251,9 @@ async def run_self_test():
             }
             fake_history.append(candle)
         
-        test_strategy = MomentumStrategy()
+        test_strategy = load_strategy_class("momentum")()
+        # Private in-memory store: the TEST cooldown must not reach the shared (persisted) one
+        test_strategy.cooldowns = CooldownStore("self_test", ttl_seconds=test_strategy.min_signal_gap)
         
         # Feed all candles except last one
         for candle in fake_history[:-1]:
@@ -2028,7 +2284,9 @@ async def run_self_test():
     # Test 4: Duplicate prevention
     logger.info("\n[TEST 4] Testing duplicate signal prevention...")
     try:
-        test_strategy = MomentumStrategy()
+        test_strategy = load_strategy_class("momentum")()
+        # Private in-memory store: the TEST cooldown must not reach the shared (persisted) one
+        test_strategy.cooldowns = CooldownStore("self_test", ttl_seconds=test_strategy.min_signal_gap)
         # Manually mark a signal as sent
         test_strategy._mark_signal_sent("TEST", "buy")
         # Check if duplicate is detected
@@ -2097,7 +2355,10 @@ async def main():
             logger.error("❌ Self-test failed! Fix issues before deploying.")
             sys.exit(1)
         
-        generator = SignalGenerator()
+        if config.SHARD_WORKERS > 1 and config.EVENT_DRIVEN:
+            logger.warning("Event-driven mode is not supported with sharded workers - polling every POLLING_INTERVAL")
+            config.EVENT_DRIVEN = False
+        generator = ShardedSignalGenerator(config.SHARD_WORKERS) if config.SHARD_WORKERS > 1 else SignalGenerator()
         logger.info("\n🚀 Starting continuous monitoring...")
         await generator.run_continuously()
     except Exception as e:
@@ -2105,6 +2366,46 @@ async def main():
         sys.exit(1)
 
 
+def parse_args(argv: Optional[List[str]] = None):
+    """Command-line overrides for the environment-based config."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="VyRaTrader signal generator")
+    parser.add_argument("--profile", action="store_true", help="Enable cycle profiling (same as PROFILE_CYCLES=true)")
+    parser.add_argument("--profile-every", type=int, help="Profile one in every N cycles (0 = threshold only)")
+    parser.add_argument("--profile-threshold", type=float, help="Profile any cycle slower than this many seconds (0 = off)")
+    parser.add_argument("--profile-mode", choices=CycleProfiler.MODES, help="sample (collapsed stacks) or cprofile (.prof)")
+    parser.add_argument("--shards", type=int, help="Evaluate strategies in N worker processes (same as SHARD_WORKERS=N)")
+    parser.add_argument("--event-driven", action="store_true",
+                        help="Evaluate a symbol when a new candle for it closes instead of every POLLING_INTERVAL (same as EVENT_DRIVEN=true)")
+    parser.add_argument("--import-profile", nargs="?", type=int, const=25, metavar="TOP",
+                        help="Print -X importtime attribution of start-up (import + SignalGenerator()) and exit")
+    args = parser.parse_args(argv)
+    
+    if args.import_profile is not None:
+        from services.import_profile import format_report, profile_startup
+        
+        # A fresh interpreter: this one has already paid for its imports
+        report = profile_startup("import signal_generator; signal_generator.SignalGenerator()")
+        print(format_report(report, top=args.import_profile))
+        sys.exit(0)
+    
+    if args.profile:
+        config.PROFILE_CYCLES = True
+    if args.profile_every is not None:
+        config.PROFILE_EVERY_N = args.profile_every
+    if args.profile_threshold is not None:
+        config.PROFILE_THRESHOLD_SECONDS = args.profile_threshold
+    if args.profile_mode:
+        config.PROFILE_MODE = args.profile_mode
+    if args.shards is not None:
+        config.SHARD_WORKERS = args.shards
+    if args.event_driven:
+        config.EVENT_DRIVEN = True
+    return args
+
+
 if __name__ == "__main__":
+    parse_args()
     asyncio.run(main())
 